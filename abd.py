@@ -152,7 +152,7 @@ def run_all_plots():
 
         fig.subplots_adjust(right=0.95, top=0.95, bottom=0.05, hspace=0.001)
 
-        plt.savefig(settings.IMAGELOC + "ABD_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC + "ABD_ts{}".format(settings.OUTFMT))
         plt.close()
 
     #************************************************************************
@@ -213,6 +213,8 @@ def run_all_plots():
         utils.plot_smooth_map_iris(settings.IMAGELOC + "p2.1_ABD_NIR_{}".format(settings.YEAR), ir_cube, settings.COLOURMAP_DICT["land_surface_r"], bounds, "Anomalies from 2003-{} (%)".format(2010), figtext="(ad) Land Surface Albedo in the Near Infrared")
         utils.plot_smooth_map_iris(settings.IMAGELOC + "ABD_NIR_{}".format(settings.YEAR), ir_cube, settings.COLOURMAP_DICT["land_surface_r"], bounds, "Anomalies from 2003-{} (%)".format(2010))
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
@@ -92,7 +92,7 @@ def run_all_plots():
     for tick in ax2.yaxis.get_major_ticks():
         tick.label2.set_fontsize(settings.FONTSIZE)
 
-    plt.savefig(settings.IMAGELOC+"AGL_ts{}".format(settings.OUTFMT))
+    utils.save_figure(settings.IMAGELOC+"AGL_ts{}".format(settings.OUTFMT))
 
     plt.close()
 
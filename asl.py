@@ -94,7 +94,7 @@ def run_all_plots():
         for tick in ax.xaxis.get_major_ticks():
             tick.label.set_fontsize(settings.FONTSIZE)
 
-        plt.savefig(settings.IMAGELOC + "ASL_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC + "ASL_ts{}".format(settings.OUTFMT))
         plt.close()
 
     #************************************************************************
@@ -192,7 +192,7 @@ def run_all_plots():
 
         fig.subplots_adjust(bottom=0.05, top=0.95, left=0.04, right=0.95, wspace=0.02)
 
-        plt.savefig(settings.IMAGELOC + "ASL_Trends{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC + "ASL_Trends{}".format(settings.OUTFMT))
 
         plt.close()
 
@@ -236,20 +236,9 @@ def run_all_plots():
             ext = ax.get_extent() # save the original extent
 
             cube = all_cubes[a][0]
-            if settings.OUTFMT in [".eps", ".pdf"]:
-                if cube.coord("latitude").points.shape[0] > 180 or cube.coord("longitude").points.shape[0] > 360:
-                    regrid_size = 1.0
-                    print("Regridding cube for {} output to {} degree resolution".format(settings.OUTFMT, regrid_size))
-                    print("Old Shape {}".format(cube.data.shape))
-                    plot_cube = utils.regrid_cube(cube, regrid_size, regrid_size)
-                    print("New Shape {}".format(plot_cube.data.shape))
-                else:
-                    plot_cube = copy.deepcopy(cube)
-            else:
-                plot_cube = copy.deepcopy(cube)
-
+            plot_cube = utils.vector_plot_cube(cube)
 
-            mesh = iris.plot.pcolormesh(plot_cube, cmap=cmap[a], norm=norm, axes=ax)
+            mesh = iris.plot.pcolormesh(plot_cube, cmap=cmap[a], norm=norm, axes=ax, rasterized=True)
 
             ax.set_extent(ext, ax.projection) # fix the extent change from colormesh
             ax.text(0.0, 1.0, PLOTLABELS[a], fontsize=settings.FONTSIZE * 0.8, transform=ax.transAxes)
@@ -269,7 +258,7 @@ def run_all_plots():
 
         fig.subplots_adjust(bottom=0.05, top=0.95, left=0.04, right=0.95, wspace=0.02)
 
-        plt.savefig(settings.IMAGELOC + "ASL_Trends{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC + "ASL_Trends{}".format(settings.OUTFMT))
 
         plt.close()
 
@@ -333,9 +322,11 @@ def run_all_plots():
 
             ax.text(0.02, 0.9, LABELS[name], transform=ax.transAxes, fontsize=settings.FONTSIZE)
 
-            plt.savefig(settings.IMAGELOC+"ASL_ts_{}{}".format(cube.var_name, settings.OUTFMT))
+            utils.save_figure(settings.IMAGELOC+"ASL_ts_{}{}".format(cube.var_name, settings.OUTFMT))
             plt.close()
  
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
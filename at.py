@@ -145,7 +145,7 @@ def run_all_plots():
 
     fig.subplots_adjust(right=0.96, top=0.98, bottom=0.04, hspace=0.001)
 
-    plt.savefig(settings.IMAGELOC + "AT_ts{}".format(settings.OUTFMT))
+    utils.save_figure(settings.IMAGELOC + "AT_ts{}".format(settings.OUTFMT))
     plt.close()
 
     return # run_all_plots
@@ -0,0 +1,668 @@
+#!/usr/bin/env python
+#************************************************************************
+#
+#  Benchmarks of the main utility routines, run on synthetic data
+#       so no network or real data are needed
+#
+#  Compute and render timings are recorded separately, along with
+#       peak memory, and written as JSON.
+#
+#  Each run (and any profile report) is also appended to a history
+#       file keyed on git commit and machine, and --compare reports
+#       significant slowdowns or memory growth between commits - exit
+#       status 1 if there are any, for use in pre-merge checks.
+#
+#  --imports reports the import cost of the section modules, and the
+#       packages each one pulls in.
+#
+#************************************************************************
+#                                 START
+#************************************************************************
+from __future__ import absolute_import
+from __future__ import print_function
+
+import os
+import sys
+import time
+import json
+import shutil
+import hashlib
+import subprocess
+import platform
+import tempfile
+import tracemalloc
+import datetime as dt
+import numpy as np
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import scipy.stats
+
+import iris
+import iris.coords
+import iris.cube
+import cartopy
+import shapely.geometry
+
+import utils # RJHD utilities
+import settings
+
+# grid spacing (degrees) of the real datasets
+RESOLUTIONS = {"HadSLP" : 5.0, \
+                   "GHCNDEX" : 2.5, \
+                   "1deg" : 1.0, \
+                   "ERA5" : 0.28125, \
+                   "GLE" : 0.25}
+
+# smoothing is vectorised, but cartopy projecting the contour polygons of the
+#   fine grids takes minutes (0.28125 deg ~2 min, 0.25 deg ~3 min), so only run on the coarser grids
+CONTOUR_RESOLUTIONS = ["HadSLP", "GHCNDEX", "1deg"]
+
+START_YEAR = 1850
+HISTORY_FILE = "bench_history.jsonl"
+BOUNDS = np.array([-10, -1.5, -1, -0.5, 0, 0.5, 1, 1.5, 10])
+
+#************************************************************************
+class SyntheticFeature(object):
+    '''
+    Stand-in for cartopy's NaturalEarthFeature when the shapefiles
+    are not available locally - a handful of box continents
+    '''
+
+    def __init__(self, category, name, scale, **kwargs):
+        self.name = name
+
+    def geometries(self):
+        boxes = [(-160, 15, -60, 70), (-80, -55, -35, 10), (-10, 35, 140, 75), \
+                     (-15, -35, 50, 35), (115, -40, 155, -12), (-180, -90, 180, -65)]
+        if self.name == "land":
+            return [shapely.geometry.box(*b) for b in boxes]
+        return [shapely.geometry.box(*b).exterior for b in boxes]
+
+#************************************************************************
+def natural_earth_available(resolution="110m"):
+    '''
+    Check whether the Natural Earth shapefiles are already on disk
+
+    :param str resolution: Natural Earth resolution
+
+    :returns: bool
+    '''
+
+    shapefile = os.path.join(cartopy.config["data_dir"], "shapefiles", "natural_earth", \
+                                 "physical", "ne_{}_land.shp".format(resolution))
+
+    return os.path.exists(shapefile) # natural_earth_available
+
+#************************************************************************
+def synthetic_grid(delta):
+    '''
+    Cell-centre latitudes and longitudes of a global grid
+
+    :param float delta: grid spacing (degrees)
+
+    :returns: lats, lons
+    '''
+
+    lats = np.arange(-90 + delta/2., 90, delta)
+    lons = np.arange(-180 + delta/2., 180, delta)
+
+    return lats, lons # synthetic_grid
+
+#************************************************************************
+def synthetic_field(lats, lons, ntimes=0, seed=0):
+    '''
+    Smooth anomaly pattern plus noise, with a land-sea style mask
+    over roughly a third of the grid
+
+    :param array lats: latitudes
+    :param array lons: longitudes
+    :param int ntimes: number of time steps (0 for a single field)
+    :param int seed: random seed
+
+    :returns: masked array (time x) lat x lon
+    '''
+
+    rng = np.random.RandomState(seed)
+
+    lon2d, lat2d = np.meshgrid(np.deg2rad(lons), np.deg2rad(lats))
+    pattern = 1.5 * np.sin(2 * lat2d) * np.cos(3 * lon2d)
+    mask = np.sin(lat2d * 3) * np.cos(lon2d * 2) > 0.5
+
+    if ntimes == 0:
+        data = pattern + rng.normal(0, 0.3, pattern.shape)
+    else:
+        data = pattern[None, :, :] + rng.normal(0, 0.3, (ntimes,) + pattern.shape)
+        mask = np.broadcast_to(mask, data.shape)
+
+    return np.ma.array(data, mask=mask) # synthetic_field
+
+#************************************************************************
+def synthetic_series(monthly=True, seed=0):
+    '''
+    Trend plus noise from START_YEAR to the current report year
+
+    :param bool monthly: monthly rather than annual values
+    :param int seed: random seed
+
+    :returns: Timeseries
+    '''
+
+    rng = np.random.RandomState(seed)
+
+    if monthly:
+        times = START_YEAR + np.arange(12 * (int(settings.YEAR) - START_YEAR + 1)) / 12.
+    else:
+        times = np.arange(START_YEAR, int(settings.YEAR) + 1).astype(float)
+
+    data = 0.01 * (times - START_YEAR) + rng.normal(0, 0.2, times.shape[0])
+
+    return utils.Timeseries("synthetic", times, data) # synthetic_series
+
+#************************************************************************
+def run_case(name, phase, function, args, repeat=3, kwargs={}):
+    '''
+    Time a function, and then run it once more to trace peak memory
+    (tracing slows the code, so is kept out of the timings)
+
+    :param str name: case name
+    :param str phase: "compute" or "render"
+    :param func function: function to benchmark
+    :param func args: function returning the arguments for a call, given the repeat number
+    :param int repeat: number of timed calls
+    :param dict kwargs: keyword arguments for the function
+
+    :returns: dict of results
+    '''
+
+    print("{:40s}".format(name), end="")
+    sys.stdout.flush()
+
+    times = []
+    try:
+        for r in range(repeat):
+            call_args = args(r)
+            start = time.perf_counter()
+            function(*call_args, **kwargs)
+            times += [time.perf_counter() - start]
+            plt.close("all")
+
+        call_args = args(repeat)
+        tracemalloc.start()
+        function(*call_args, **kwargs)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        plt.close("all")
+
+    except Exception as e:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        print("failed - {}".format(e))
+        return {"name" : name, "phase" : phase, "error" : repr(e)}
+
+    print("best {:8.3f}s  mean {:8.3f}s  peak {:8.1f}MB".format(min(times), np.mean(times), peak / 1.e6))
+
+    return {"name" : name, "phase" : phase, "repeat" : repeat, "times" : times, \
+                "best" : min(times), "mean" : float(np.mean(times)), \
+                "peak_memory_mb" : peak / 1.e6} # run_case
+
+#************************************************************************
+def compute_cases(resolutions, repeat):
+    '''
+    Benchmarks of the data handling routines
+
+    :param list resolutions: names of grids to use
+    :param int repeat: number of timed calls
+
+    :returns: list of result dicts
+    '''
+
+    results = []
+
+    for monthly in [False, True]:
+        ts = synthetic_series(monthly=monthly)
+        results += [run_case("median_pairwise_slopes/{}".format("monthly" if monthly else "annual"), "compute", \
+                                 utils.median_pairwise_slopes, lambda r: (ts.times, ts.data, -99.9), repeat=repeat)]
+
+    for res in resolutions:
+        lats, lons = synthetic_grid(RESOLUTIONS[res])
+
+        # a year of monthly fields (stored time x lon x lat)
+        data = np.ma.transpose(synthetic_field(lats, lons, ntimes=12), (0, 2, 1))
+        times = np.arange(12) * 30 + 15
+        results += [run_case("make_iris_cube_3d/{}".format(res), "compute", utils.make_iris_cube_3d, \
+                                 lambda r: (data, times, "days since {}-01-01 00:00".format(settings.YEAR), lons, lats, "anomalies", "K"), \
+                                 repeat=repeat)]
+
+        cube = utils.make_iris_cube_2d(synthetic_field(lats, lons), lats, lons, "anomalies", "K")
+        results += [run_case("regrid_cube/{}".format(res), "compute", utils.regrid_cube, \
+                                 lambda r: (cube, 1.0, 1.0), repeat=repeat)]
+
+    # gridbox ranks of 70 years of GHCNDEX-style annual values (YYYYMMDD times)
+    import tex
+    lats, lons = synthetic_grid(RESOLUTIONS["GHCNDEX"])
+    years = np.arange(int(settings.YEAR) - 69, int(settings.YEAR) + 1)
+    field = synthetic_field(lats, lons, ntimes=years.shape[0])
+    cube = iris.cube.Cube(np.ma.array(field.data, mask=field.mask.copy()), long_name="Ann")
+    cube.add_dim_coord(iris.coords.DimCoord(years * 10000 + 101, long_name="time", units="1"), 0)
+    cube.add_dim_coord(iris.coords.DimCoord(lats, standard_name="latitude", units="degrees"), 1)
+    cube.add_dim_coord(iris.coords.DimCoord(lons, standard_name="longitude", units="degrees"), 2)
+    results += [run_case("get_ranks/GHCNDEX", "compute", tex.get_ranks, lambda r: (cube,), repeat=repeat)]
+
+    return results # compute_cases
+
+#************************************************************************
+def render_cases(resolutions, repeat, outloc):
+    '''
+    Benchmarks of the plotting routines - each call writes a new file,
+    so the full drawing and saving is timed
+
+    :param list resolutions: names of grids to use
+    :param int repeat: number of timed calls
+    :param str outloc: directory for the figures
+
+    :returns: list of result dicts
+    '''
+
+    results = []
+    cmap = settings.COLOURMAP_DICT["temperature"]
+
+    for res in resolutions:
+        lats, lons = synthetic_grid(RESOLUTIONS[res])
+        cube = utils.make_iris_cube_2d(synthetic_field(lats, lons), lats, lons, "anomalies", "K")
+
+        name = "plot_smooth_map_iris/{}".format(res)
+        results += [run_case(name, "render", utils.plot_smooth_map_iris, \
+                                 lambda r, name=name: (os.path.join(outloc, "{}_{}".format(name.replace("/", "_"), r)), cube, cmap, BOUNDS, "K"), \
+                                 repeat=repeat)]
+
+        if res in CONTOUR_RESOLUTIONS:
+            name = "plot_smooth_map_iris_contour/{}".format(res)
+            results += [run_case(name, "render", utils.plot_smooth_map_iris, \
+                                     lambda r, name=name: (os.path.join(outloc, "{}_{}".format(name.replace("/", "_"), r)), cube, cmap, BOUNDS, "K"), \
+                                     repeat=repeat, kwargs={"contour" : True})]
+
+    # monthly zonal means on the GHCNDEX grid (lat x time)
+    lats, lons = synthetic_grid(RESOLUTIONS["GHCNDEX"])
+    ts = synthetic_series(monthly=True)
+    zonal = np.ma.mean(synthetic_field(lats, lons, ntimes=ts.times.shape[0]), axis=2).T
+
+    results += [run_case("plot_hovmuller/monthly", "render", utils.plot_hovmuller, \
+                             lambda r: (os.path.join(outloc, "hovmuller_{}".format(r)), ts.times, lats, zonal, cmap, BOUNDS, "K"), \
+                             repeat=repeat)]
+
+    return results # render_cases
+
+#************************************************************************
+def git_commit():
+    '''
+    Current commit of the code being benchmarked
+
+    :returns: commit hash ("unknown" outside git), and whether there are uncommitted changes
+    '''
+
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=here, stderr=subprocess.DEVNULL).decode().strip()
+        dirty = subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"], cwd=here, \
+                                            stderr=subprocess.DEVNULL).decode().strip() != ""
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+    return commit, dirty # git_commit
+
+#************************************************************************
+def machine_fingerprint():
+    '''
+    Short hash identifying the machine, so that only like-for-like runs are compared
+
+    :returns: fingerprint, dict of what went into it
+    '''
+
+    machine = {"host" : platform.node(), \
+                   "machine" : platform.machine(), \
+                   "processor" : platform.processor(), \
+                   "cpus" : os.cpu_count(), \
+                   "python" : platform.python_version()}
+
+    fingerprint = hashlib.sha1(json.dumps(machine, sort_keys=True).encode()).hexdigest()[:12]
+
+    return fingerprint, machine # machine_fingerprint
+
+#************************************************************************
+def append_history(results, source, history=HISTORY_FILE):
+    '''
+    Append a set of results to the history file (one JSON record per line)
+
+    :param list results: result dicts, each with "name", and "times" and "peak_memory_mb" if successful
+    :param str source: what produced the results ("bench" or the profiled script)
+    :param str history: history file
+    '''
+
+    commit, dirty = git_commit()
+    fingerprint, machine = machine_fingerprint()
+
+    record = {"created" : dt.datetime.now().isoformat(timespec="seconds"), \
+                  "commit" : commit, \
+                  "dirty" : dirty, \
+                  "fingerprint" : fingerprint, \
+                  "machine" : machine, \
+                  "source" : source, \
+                  "results" : [r for r in results if "times" in r]}
+
+    with open(history, "a") as outfile:
+        outfile.write(json.dumps(record) + "\n")
+
+    print("{} results for {} added to {}".format(len(record["results"]), commit[:10], history))
+
+    return # append_history
+
+#************************************************************************
+def profile_results(filename):
+    '''
+    Convert a profile report (utils.write_profile_report) into result dicts,
+    one per figure, phase and function
+
+    :param str filename: profile JSON file
+
+    :returns: source, list of result dicts
+    '''
+
+    with open(filename, "r") as infile:
+        report = json.load(infile)
+
+    results = []
+    for record in report["records"]:
+        results += [{"name" : "profile/{}/{}/{}/{}".format(report["script"], record["figure"], record["phase"], record["function"]), \
+                         "phase" : record["phase"], \
+                         "times" : [record["wall"]], \
+                         "peak_memory_mb" : record["peak_traced_mb"]}]
+
+    return report["script"], results # profile_results
+
+#************************************************************************
+def read_history(history=HISTORY_FILE):
+    '''
+    Read all the records in the history file
+
+    :param str history: history file
+
+    :returns: list of records, oldest first
+    '''
+
+    records = []
+    with open(history, "r") as infile:
+        for line in infile:
+            if line.strip() != "":
+                records += [json.loads(line)]
+
+    return records # read_history
+
+#************************************************************************
+def compare_history(history=HISTORY_FILE, baseline="", current="", alpha=0.05, tolerance=0.05, memory_tolerance=0.1, \
+                        min_seconds=0.005):
+    '''
+    Compare the runs of two commits on this machine.  All runs of a commit are
+    pooled, and a case is a slowdown if its times are significantly larger
+    (one-sided Mann-Whitney U test) and the median is more than the tolerance
+    slower (and by more than min_seconds).  Memory growth is a median peak
+    more than memory_tolerance larger.
+
+    :param str history: history file
+    :param str baseline: baseline commit (or prefix), default the most recent other commit
+    :param str current: commit to check (or prefix), default the current commit
+    :param float alpha: significance level
+    :param float tolerance: fractional slowdown to ignore
+    :param float memory_tolerance: fractional memory growth to ignore
+    :param float min_seconds: slowdowns smaller than this are timer noise
+
+    :returns: list of regression descriptions
+    '''
+
+    fingerprint, machine = machine_fingerprint()
+    records = [r for r in read_history(history) if r["fingerprint"] == fingerprint]
+
+    if current == "":
+        current = git_commit()[0]
+    current_records = [r for r in records if r["commit"].startswith(current)]
+    if len(current_records) == 0:
+        print("No runs of {} on this machine ({}) in {}".format(current[:10], fingerprint, history))
+        return []
+    current = current_records[-1]["commit"]
+
+    if baseline == "":
+        earlier = [r["commit"] for r in records if r["commit"] != current]
+        if len(earlier) == 0:
+            print("No other commits to compare {} with".format(current[:10]))
+            return []
+        baseline = earlier[-1]
+    baseline_records = [r for r in records if r["commit"].startswith(baseline) and r["commit"] != current]
+    if len(baseline_records) == 0:
+        print("No runs of {} on this machine ({}) in {}".format(baseline[:10], fingerprint, history))
+        return []
+    baseline = baseline_records[-1]["commit"]
+
+    def pool(records):
+        times, peaks = {}, {}
+        for record in records:
+            for result in record["results"]:
+                times.setdefault(result["name"], []).extend(result["times"])
+                peaks.setdefault(result["name"], []).append(result["peak_memory_mb"])
+        return times, peaks
+
+    base_times, base_peaks = pool(baseline_records)
+    new_times, new_peaks = pool(current_records)
+
+    print("{} ({} runs) against {} ({} runs)".format(current[:10], len(current_records), baseline[:10], len(baseline_records)))
+    print("{:50s} {:>10s} {:>10s} {:>8s} {:>8s} {:>10s}".format("case", "base (s)", "new (s)", "ratio", "p", "peak (MB)"))
+
+    regressions = []
+    for name in sorted(set(base_times) & set(new_times)):
+        base, new = np.median(base_times[name]), np.median(new_times[name])
+        ratio = new / base if base > 0 else 1.
+
+        if len(base_times[name]) > 1 and len(new_times[name]) > 1 and base_times[name] != new_times[name]:
+            p = scipy.stats.mannwhitneyu(new_times[name], base_times[name], alternative="greater").pvalue
+        else:
+            # too few samples to test
+            p = np.nan
+
+        base_peak, new_peak = np.median(base_peaks[name]), np.median(new_peaks[name])
+
+        flags = []
+        if p <= alpha and ratio > 1 + tolerance and new - base > min_seconds:
+            flags += ["SLOWER"]
+            regressions += ["{}: {:.3f}s -> {:.3f}s (x{:.2f}, p={:.3f})".format(name, base, new, ratio, p)]
+        if new_peak > base_peak * (1 + memory_tolerance) and new_peak - base_peak > 1.:
+            flags += ["MEMORY"]
+            regressions += ["{}: peak {:.1f}MB -> {:.1f}MB".format(name, base_peak, new_peak)]
+
+        print("{:50s} {:10.3f} {:10.3f} {:8.2f} {:8.3f} {:10.1f} {}".format(name[:50], base, new, ratio, p, new_peak, " ".join(flags)))
+
+    if len(regressions) == 0:
+        print("No regressions")
+    else:
+        print("{} regressions:".format(len(regressions)))
+        for regression in regressions:
+            print("  {}".format(regression))
+
+    return regressions # compare_history
+
+#************************************************************************
+def import_costs(module, top=10):
+    '''
+    Time a fresh import of a module (python -X importtime, in a new process
+    run from the current directory so that configuration.txt is found)
+
+    :param str module: module name
+    :param int top: number of imported packages to report
+
+    :returns: cumulative import time (s), list of (package, cumulative time (s)) of the largest direct imports
+    '''
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = "import sys; sys.path.insert(0, {!r}); import {}".format(here, module)
+
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], \
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if process.returncode != 0:
+        raise ImportError("{} failed to import".format(module))
+
+    # "import time: self [us] | cumulative | imported package", nested by indentation
+    total, children = 0, []
+    for line in process.stderr.decode().splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_time, cumulative, package = line[len("import time:"):].split("|")
+        depth = (len(package) - len(package.lstrip()) - 1) // 2
+
+        if depth == 0:
+            if package.strip() == module:
+                total = int(cumulative) / 1.e6
+            else:
+                # imported before the module (e.g. by site), so outside its cost
+                children = []
+        elif depth == 1:
+            children += [(package.strip(), int(cumulative) / 1.e6)]
+
+    children.sort(key=lambda c: -c[1])
+
+    return total, children[:top] # import_costs
+
+#************************************************************************
+def import_audit(modules, top=10):
+    '''
+    Print the import cost of each module and its most expensive direct imports
+
+    :param list modules: module names
+    :param int top: number of imported packages to report
+    '''
+
+    for module in modules:
+        try:
+            total, children = import_costs(module, top=top)
+        except ImportError as e:
+            print("{:20s} {}".format(module, e))
+            continue
+
+        print("{:20s} {:8.3f}s".format(module, total))
+        for package, cumulative in children:
+            print("    {:36s} {:8.3f}s".format(package, cumulative))
+
+    return # import_audit
+
+#************************************************************************
+def main(outfile="bench_results.json", repeat=3, resolutions=[], phases=["compute", "render"], history=HISTORY_FILE):
+    '''
+    Run the benchmarks and write the results
+
+    :param str outfile: JSON output file
+    :param int repeat: number of timed calls per case
+    :param list resolutions: names of grids to use (default all)
+    :param list phases: which phases to run
+    :param str history: history file to add the results to ("" for none)
+    '''
+
+    if resolutions == []:
+        resolutions = sorted(RESOLUTIONS, key=lambda r: -RESOLUTIONS[r])
+
+    natural_earth_feature = cartopy.feature.NaturalEarthFeature
+    if natural_earth_available():
+        coastlines = "natural_earth"
+    else:
+        print("Natural Earth shapefiles not found - using synthetic coastlines")
+        coastlines = "synthetic"
+        cartopy.feature.NaturalEarthFeature = SyntheticFeature
+
+    results = []
+    outloc = tempfile.mkdtemp(prefix="sotc_bench_")
+    try:
+        if "compute" in phases:
+            results += compute_cases(resolutions, repeat)
+        if "render" in phases:
+            results += render_cases(resolutions, repeat, outloc)
+    finally:
+        shutil.rmtree(outloc, ignore_errors=True)
+        utils.close_map_templates()
+        # base maps drawn with the synthetic coastlines are not kept either
+        if cartopy.feature.NaturalEarthFeature is not natural_earth_feature:
+            cartopy.feature.NaturalEarthFeature = natural_earth_feature
+            utils.BASEMAP_CACHE.clear()
+
+    # peak resident memory of the whole run (kB on Linux)
+    try:
+        import resource
+        max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1.e3
+    except ImportError:
+        max_rss_mb = None
+
+    output = {"created" : dt.datetime.now().isoformat(timespec="seconds"), \
+                  "host" : platform.node(), \
+                  "python" : platform.python_version(), \
+                  "numpy" : np.__version__, \
+                  "matplotlib" : mpl.__version__, \
+                  "iris" : iris.__version__, \
+                  "cartopy" : cartopy.__version__, \
+                  "outfmt" : settings.OUTFMT, \
+                  "draft" : settings.DRAFT, \
+                  "coastlines" : coastlines, \
+                  "resolutions" : {r : RESOLUTIONS[r] for r in resolutions}, \
+                  "max_rss_mb" : max_rss_mb, \
+                  "results" : results}
+
+    with open(outfile, "w") as outf:
+        json.dump(output, outf, indent=1)
+
+    print("Results written to {}".format(outfile))
+
+    if history != "":
+        append_history(results, "bench", history=history)
+
+    return # main
+
+#************************************************************************
+if __name__ == "__main__":
+
+    import argparse
+
+    # set up keyword arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--output', dest='outfile', action='store', default="bench_results.json",
+                        help='JSON file for the results')
+    parser.add_argument('--repeat', dest='repeat', action='store', default=3, type=int,
+                        help='Number of timed calls per case')
+    parser.add_argument('--resolutions', dest='resolutions', action='store', default="",
+                        help='Comma separated grids to use, from {}'.format(", ".join(RESOLUTIONS)))
+    parser.add_argument('--phases', dest='phases', action='store', default="compute,render",
+                        help='Comma separated phases to run (compute, render)')
+    parser.add_argument('--history', dest='history', action='store', default=HISTORY_FILE,
+                        help='History file of all runs ("" to not record)')
+    parser.add_argument('--record-profile', dest='profile', action='store', default="",
+                        help='Add a profile report (JSON) to the history instead of benchmarking')
+    parser.add_argument('--compare', dest='compare', action='store_true', default=False,
+                        help='Compare the history of two commits instead of benchmarking')
+    parser.add_argument('--baseline', dest='baseline', action='store', default="",
+                        help='Commit to compare against (default the previous one in the history)')
+    parser.add_argument('--current', dest='current', action='store', default="",
+                        help='Commit to check (default the current one)')
+    parser.add_argument('--imports', dest='imports', action='store', default="",
+                        help='Comma separated modules to report the import cost of, instead of benchmarking')
+
+    args = parser.parse_args()
+
+    if args.imports != "":
+        import_audit(args.imports.split(","))
+    elif args.compare:
+        regressions = compare_history(history=args.history, baseline=args.baseline, current=args.current)
+        sys.exit(1 if len(regressions) > 0 else 0)
+    elif args.profile != "":
+        source, results = profile_results(args.profile)
+        append_history(results, source, history=args.history)
+    else:
+        main(outfile=args.outfile, repeat=args.repeat, \
+                 resolutions=[r for r in args.resolutions.split(",") if r != ""], \
+                 phases=args.phases.split(","), history=args.history)
+
+#************************************************************************
+#                                 END
+#************************************************************************
@@ -76,9 +76,9 @@ def read_csv(filenameroot, name, make_annual=False):
 
         monthly = indata[:, 1].astype(float)
 
-        annual = np.sum(monthly.reshape(-1, 12), axis=1)/1000.
-
-        years = (years.reshape(-1, 12)[:, 0])
+        # incomplete years masked, rather than summed as low totals
+        years, annual = utils.annual_resample(times, monthly, how="sum", min_months=12)
+        annual = annual/1000.
 
         if years[-1] == int(settings.YEAR) + 1:
             print("skipping final year {} ".format(years[-1]))
@@ -114,9 +114,9 @@ def read_gfas_csv(filename, name, make_annual=False):
 
         monthly = 1.14*indata[:, column].astype(float)
 
-        annual = np.sum(monthly.reshape(-1, 12), axis=1)/1000.
-
-        years = (years.reshape(-1, 12)[:, 0])
+        # incomplete years masked, rather than summed as low totals
+        years, annual = utils.annual_resample(times, monthly, how="sum", min_months=12)
+        annual = annual/1000.
 
         if years[-1] == int(settings.YEAR) + 1:
             print("skipping final year {} ".format(years[-1]))
@@ -151,9 +151,9 @@ def read_gfed_csv(filename, name, make_annual=False):
 
         monthly = indata[:, column].astype(float)
 
-        annual = np.sum(monthly.reshape(-1, 12), axis=1)/1000.
-
-        years = (years.reshape(-1, 12)[:, 0])
+        # incomplete years masked, rather than summed as low totals
+        years, annual = utils.annual_resample(times, monthly, how="sum", min_months=12)
+        annual = annual/1000.
 
         if years[-1] == int(settings.YEAR) + 1:
             print("skipping final year {} ".format(years[-1]))
@@ -166,6 +166,21 @@ def read_gfed_csv(filename, name, make_annual=False):
 
     return timeseries # read_gfed_csv
 
+#************************************************************************
+def grey_YlOrBr():
+    '''
+    YlOrBr with the lowest colours greyed out, to mask out <1 gC/m2/yr (Feb 2018)
+
+    :returns: (256, 4) array of RGBA values
+    '''
+
+    lut = settings.base_lut("YlOrBr")
+    lut[:30] = (0.75, 0.75, 0.75, 1.0)
+
+    return lut # grey_YlOrBr
+
+settings.register_colourmap("grey_YlOrBr", grey_YlOrBr)
+
 #************************************************************************
 def run_all_plots():
 
@@ -208,7 +223,7 @@ def run_all_plots():
 
         fig.subplots_adjust(right = 0.95, top = 0.95, hspace = 0.001)
 
-        plt.savefig(settings.IMAGELOC+"BOB_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"BOB_ts{}".format(settings.OUTFMT))
 
         plt.close()
 
@@ -238,7 +253,7 @@ def run_all_plots():
         # sort labelling
         ax.text(0.02, 0.9, "Global", transform=ax.transAxes, fontsize=settings.LABEL_FONTSIZE)
 
-        plt.savefig(settings.IMAGELOC+"BOB_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"BOB_ts{}".format(settings.OUTFMT))
         plt.close()
 
     #************************************************************************
@@ -281,7 +296,7 @@ def run_all_plots():
 
         fig.subplots_adjust(right = 0.96, top = 0.98, bottom=0.05, hspace = 0.001)
 
-        plt.savefig(settings.IMAGELOC+"BOB_regional_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"BOB_regional_ts{}".format(settings.OUTFMT))
 
         plt.close()
 
@@ -319,11 +334,7 @@ def run_all_plots():
         bounds = [0, 1, 5, 10, 40, 80, 120, 160, 200, 500]
 
         # adjust to mask out <1 gC/m2/yr (Feb 2018)
-        cmap = plt.cm.YlOrBr
-        cmaplist = [cmap(i) for i in range(cmap.N)]
-        for i in range(30):
-            cmaplist[i] = (0.75, 0.75, 0.75, 1.0)
-        cmap = cmap.from_list('Custom cmap', cmaplist, cmap.N)
+        cmap = settings.get_colourmap("grey_YlOrBr")
 
         cube.data = np.ma.masked_where(cube.data < 1, cube.data)
 
@@ -345,6 +356,8 @@ def run_all_plots():
 
 
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
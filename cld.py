@@ -43,7 +43,7 @@ def read_ts(filename, anomaly=False, fullbase=False):
     :param bool anomaly: run anomalies
     :param bool fullbase: run anomalies using full baseperiod
 
-    :returns: Timeseries object s
+    :returns: TimeseriesCollection
     '''
 
     raw_data = np.genfromtxt(filename, dtype=(float), skip_header=1)
@@ -52,31 +52,18 @@ def read_ts(filename, anomaly=False, fullbase=False):
 
     times = raw_data[:, 0]
 
-    cstart, = np.where(times == CLIMSTART)
-    cend, = np.where(times == CLIMEND)
-
-    if fullbase:
-        clims = np.ma.mean(raw_data, axis=0)
-    else:
-        clims = np.ma.mean(raw_data[cstart[0]:cend[0]], axis=0)
+    collection = utils.TimeseriesCollection(["PATMOS-x/AVHRR", "HIRS", "MISR", "AQUA MODIS C6", "CALIPSO", \
+                                                  "CERES", "SatCORPS", "CLARA-A2", "PATMOS-x/AQUA MODIS", \
+                                                  "Cloud CCI AVHRR-PMv3"], times, raw_data[:, 1:11])
 
     if anomaly:
-        data = raw_data - clims
-    else:
-        data = raw_data
-
-    patmosx = utils.Timeseries("PATMOS-x/AVHRR", times, data[:, 1])
-    hirs = utils.Timeseries("HIRS", times, data[:, 2])
-    misr = utils.Timeseries("MISR", times, data[:, 3])
-    modis = utils.Timeseries("AQUA MODIS C6", times, data[:, 4])
-    calipso = utils.Timeseries("CALIPSO", times, data[:, 5])
-    ceres = utils.Timeseries("CERES", times, data[:, 6])
-    satcorps = utils.Timeseries("SatCORPS", times, data[:, 7])
-    clara_a2 = utils.Timeseries("CLARA-A2", times, data[:, 8])
-    patmosdx = utils.Timeseries("PATMOS-x/AQUA MODIS", times, data[:, 9])
-    cci = utils.Timeseries("Cloud CCI AVHRR-PMv3", times, data[:, 10])
+        if fullbase:
+            collection = collection.anomalies(times.min(), times.max())
+        else:
+            # CLIMEND itself not included
+            collection = collection.anomalies(CLIMSTART, CLIMEND - 1)
 
-    return patmosx, hirs, misr, modis, calipso, ceres, satcorps, clara_a2, patmosdx, cci # read_ts
+    return collection # read_ts
 
 
 #************************************************************************
@@ -129,7 +116,7 @@ def run_all_plots():
         ax1.set_ylim([-4.4, 6.9])
         ax2.set_ylim([0, 95])
 
-        plt.savefig(settings.IMAGELOC+"CLD_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"CLD_ts{}".format(settings.OUTFMT))
         plt.close()
 
     #************************************************************************
@@ -180,7 +167,7 @@ def run_all_plots():
         ax2.set_ylim([0, 95])
 
 
-        plt.savefig(settings.IMAGELOC+"CLD_ts_fullbaseperiod{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"CLD_ts_fullbaseperiod{}".format(settings.OUTFMT))
         plt.close()
 
     #************************************************************************
@@ -237,6 +224,8 @@ def run_all_plots():
 
         utils.plot_hovmuller(settings.IMAGELOC + "CLD_hovmuller", times, lats, anoms, settings.COLOURMAP_DICT["hydrological"], bounds, "Anomaly (%)")
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
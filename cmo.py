@@ -73,7 +73,7 @@ print("missing linear trend")
 
 # fig.text(0.03, 0.5, "Tg", va='center', rotation='vertical', fontsize=settings.FONTSIZE)
 
-# plt.savefig(image_loc + "CMO_ts{}".format(settings.OUTFMT))
+# utils.save_figure(image_loc + "CMO_ts{}".format(settings.OUTFMT))
 # plt.close()
 
 #************************************************************************
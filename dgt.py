@@ -106,7 +106,7 @@ def run_all_plots():
         ax2.set_xlim([float(settings.YEAR)-0.09, float(settings.YEAR)+0.99])
         ax2.text(int(settings.YEAR)+0.1, 27, settings.YEAR)
 
-        plt.savefig(settings.IMAGELOC+"DGT_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"DGT_ts{}".format(settings.OUTFMT))
         plt.close()
 
 
@@ -160,6 +160,8 @@ def run_all_plots():
 
         utils.plot_smooth_map_iris_multipanel(settings.IMAGELOC + "DGR_{}_{}_{}".format(settings.YEAR, YEARS[0], YEARS[1]), cube_list, settings.COLOURMAP_DICT["hydrological"], bounds, "Categories relative to 1901-2015 (self-calibrating PSDI)", shape=(2, 1), title=[str(y) for y in YEARS], figtext=["(a)", "(b)"])
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
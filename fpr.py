@@ -37,6 +37,7 @@ print("faking time axis - monthly")
 times = np.arange(0, DURATION/12., 1/12.) + 1998
 
 #************************************************************************
+@utils.profiled("load")
 def read_binary(filename):
     '''
     Read from binary file - using "struct"
@@ -53,6 +54,7 @@ def read_binary(filename):
     return np.array(data) # read_binary
 
 #************************************************************************
+@utils.profiled("load")
 def read_binary_ts(filename):
     '''
     Read from binary file - using "struct"
@@ -121,7 +123,7 @@ def run_all_plots():
     for tick in ax.xaxis.get_major_ticks():
         tick.label.set_fontsize(settings.FONTSIZE)
 
-    plt.savefig(settings.IMAGELOC + "FPR_ts{}".format(settings.OUTFMT))
+    utils.save_figure(settings.IMAGELOC + "FPR_ts{}".format(settings.OUTFMT))
     plt.close()
 
     #************************************************************************
@@ -158,6 +160,8 @@ def run_all_plots():
     utils.plot_smooth_map_iris(settings.IMAGELOC + "FPR_{}".format(settings.YEAR), cube, settings.COLOURMAP_DICT["phenological"], bounds, "Anomalies from 1998-{} (FAPAR)".format(2010))
 
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 
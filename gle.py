@@ -156,7 +156,7 @@ def run_all_plots():
 
         utils.thicken_panel_border(ax2)
 
-        plt.savefig(settings.IMAGELOC+"GLE_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"GLE_ts{}".format(settings.OUTFMT))
 
         plt.close()
 
@@ -171,6 +171,8 @@ def run_all_plots():
                              "Anomaly (mm month"+r'$^{-1}$'+")")
 
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
@@ -32,9 +32,10 @@ BBOX = (0, 0.9)
 
 
 #*********************************************
+@utils.profiled("load")
 def read_ts(filename, var, domain):
 
-    indata = np.genfromtxt(filename, skip_header=1, dtype=float)
+    indata = utils.genfromtxt(filename, skip_header=1, dtype=float)
 
     years = indata[:, 0]
 
@@ -46,24 +47,11 @@ def read_ts(filename, var, domain):
         elif var == "rh":
             off = 22
 
-        hadisdh = utils.Timeseries("HadISDH", years, indata[:, 1+off])
-        hadcruh = utils.Timeseries("HadCRUH", years, indata[:, 2+off])
-        hadcruhext = utils.Timeseries("HadCRUHExt", years, indata[:, 3+off])
-        dai = utils.Timeseries("Dai", years, indata[:, 4+off])
-        era5_msk = utils.Timeseries("ERA5 mask", years, indata[:, 5+off])
-        merra_msk = utils.Timeseries("MERRA-2 mask", years, indata[:, 6+off])
-        jra_msk = utils.Timeseries("JRA-55 mask", years, indata[:, 7+off])
-        era5 = utils.Timeseries("ERA5", years, indata[:, 8+off])
-        erai = utils.Timeseries("ERA-Interim", years, indata[:, 9+off])
-        merra = utils.Timeseries("MERRA-2", years, indata[:, 10+off])
-        jra = utils.Timeseries("JRA-55", years, indata[:, 11+off])
-        cr20 = utils.Timeseries("20CRv3", years, indata[:, 12+off])
-
-        hadcruhext.ls = "--"
-        era5_msk.ls = "--"
-        erai.ls = "--"
-        merra_msk.ls = "--"
-        jra_msk.ls = "--"
+        # name : column, in the order returned
+        columns = {"HadISDH" : 1+off, "HadCRUH" : 2+off, "HadCRUHExt" : 3+off, "Dai" : 4+off, \
+                       "ERA-Interim" : 9+off, "ERA5" : 8+off, "MERRA-2" : 10+off, "JRA-55" : 11+off, \
+                       "ERA5 mask" : 5+off, "MERRA-2 mask" : 6+off, "20CRv3" : 12+off}
+        dashed = ["HadCRUHExt", "ERA5 mask", "ERA-Interim", "MERRA-2 mask"]
 
     elif domain == "M":
         if var == "q":
@@ -73,32 +61,25 @@ def read_ts(filename, var, domain):
             off = 34
             extra = -2
 
-        hadisdh = utils.Timeseries("HadISDH", years, indata[:, 1+off])
-        hadcruh = utils.Timeseries("HadCRUH", years, indata[:, 2+off])
-        dai = utils.Timeseries("Dai", years, indata[:, 3+off])
-        nocs = utils.Timeseries("NOCS v2.0", years, indata[:, 4+off]) # not in RH
-        hoaps = utils.Timeseries("HOAPS", years, indata[:, 5+off]) #  not in RH
-        era5 = utils.Timeseries("ERA5", years, indata[:, 6+off+extra])
-        erai = utils.Timeseries("ERA-Interim", years, indata[:, 7+off+extra])
-        merra = utils.Timeseries("MERRA-2", years, indata[:, 8+off+extra])
-        jra = utils.Timeseries("JRA-55", years, indata[:, 9+off+extra])
-        cr20 = utils.Timeseries("20CRv3", years, indata[:, 10+off+extra])
+        # NOCS and HOAPS not in RH
+        columns = {"HadISDH" : 1+off, "HadCRUH" : 2+off, "Dai" : 3+off, "NOCS v2.0" : 4+off, \
+                       "HOAPS" : 5+off, "ERA-Interim" : 7+off+extra, "ERA5" : 6+off+extra, \
+                       "MERRA-2" : 8+off+extra, "JRA-55" : 9+off+extra, "20CRv3" : 10+off+extra}
+        dashed = ["ERA-Interim"]
+
+    collection = utils.TimeseriesCollection(list(columns.keys()), years, indata[:, list(columns.values())], \
+                                                 styles={name : {"ls" : "--"} for name in dashed})
 
     # mask out early ERA data
-    pre79, = np.where(years < 1979)
-    erai.data.mask[pre79] = True
-    erai.ls = "--"
+    collection.mask_period(end=1979, names=["ERA-Interim"])
 
-
-    if domain == "L":
-        return [hadisdh, hadcruh, hadcruhext, dai, erai, era5, merra, jra, era5_msk, merra_msk, cr20] # read_ts
-    elif domain == "M":
-        return [hadisdh, hadcruh, dai, nocs, hoaps, erai, era5, merra, jra, cr20] # read_ts
+    return collection # read_ts
 
 #*********************************************
+@utils.profiled("load")
 def read_ts_unc(filename, var, domain):
 
-    indata = np.genfromtxt(filename, skip_header=1, dtype=float)
+    indata = utils.genfromtxt(filename, skip_header=1, dtype=float)
 
     years = indata[:, 0]
 
@@ -151,12 +132,13 @@ def read_ts_unc(filename, var, domain):
 
 
 #*********************************************
+@utils.profiled("load")
 def read_maps(filename, name, units, footer=False):
 
     if footer:
-        indata = np.genfromtxt(filename, dtype=(float), skip_footer=2)
+        indata = utils.genfromtxt(filename, dtype=(float), skip_footer=2)
     else:
-        indata = np.genfromtxt(filename, dtype=(float))
+        indata = utils.genfromtxt(filename, dtype=(float))
 
     indata = np.ma.masked_where(indata <= -99.999, indata)
 
@@ -275,7 +257,7 @@ def run_all_plots():
 
         fig.subplots_adjust(right=0.98, top=0.95, bottom=0.05, hspace=0.001)
 
-        plt.savefig(settings.IMAGELOC + "HUM_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC + "HUM_ts{}".format(settings.OUTFMT))
         plt.close()
 
     #*********************************************
@@ -382,7 +364,7 @@ def run_all_plots():
 
         fig.subplots_adjust(right=0.98, top=0.95, bottom=0.05, hspace=0.001)
 
-        plt.savefig(settings.IMAGELOC + "HUM_ts_unc{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC + "HUM_ts_unc{}".format(settings.OUTFMT))
         plt.close()
 
     input("stOP")
@@ -459,6 +441,8 @@ def run_all_plots():
 
 
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
@@ -17,7 +17,6 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 import matplotlib as mpl
-import matplotlib.path as mpath
 from matplotlib.ticker import MultipleLocator
 import matplotlib.image as mpimg
 
@@ -98,35 +97,15 @@ def run_all_plots():
         fig = plt.figure(figsize=(8, 9.5))
         plt.clf()
 
-         # boundary circle
-        theta = np.linspace(0, 2*np.pi, 100)
-        center, radius = [0.5, 0.5], 0.5
-        verts = np.vstack([np.sin(theta), np.cos(theta)]).T
-        circle = mpath.Path(verts * radius + center)
-
         # axes for polar plot
-        ax = plt.axes([0.01, 0.02, 0.98, 0.98], projection=cartopy.crs.NorthPolarStereo(central_longitude=300.0))
-
-        plot_cube = cube
+        ax = utils.polar_map_axes(fig, [0.01, 0.02, 0.98, 0.98], min_lat=30, central_longitude=300.0)
 
         # regrid depending on output format
-        if settings.OUTFMT in [".eps", ".pdf"]:
-            if plot_cube.coord("latitude").points.shape[0] > 90 or plot_cube.coord("longitude").points.shape[0] > 360:
-                regrid_size = 1.0
-                print("Regridding cube for {} output to {} degree resolution".format(settings.OUTFMT, regrid_size))
-                print("Old Shape {}".format(plot_cube.data.shape))
-                plot_cube = utils.regrid_cube(plot_cube, regrid_size, regrid_size)
-                print("New Shape {}".format(plot_cube.data.shape))
-
-        # prettify
-        ax.gridlines() #draw_labels=True)
-        ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-        ax.coastlines()
-        ax.set_boundary(circle, transform=ax.transAxes)
+        plot_cube = utils.vector_plot_cube(cube, max_lat=90)
 
         cmap = COLORS[name]
         norm = mpl.cm.colors.BoundaryNorm(BOUNDS, cmap.N)
-        mesh = iris.plot.pcolormesh(plot_cube, cmap=cmap, norm=norm, axes=ax)
+        mesh = utils.plot_polar_mesh(ax, plot_cube, cmap, norm, min_lat=30)
 
         # label axes
         ax.text(0.01, 1.0, "{}".format(LABELS[name]), fontsize=settings.FONTSIZE, transform=ax.transAxes)
@@ -145,7 +124,7 @@ def run_all_plots():
         for lat in range(30, 100, 10):
             ax.text(180, lat, '{}$^\circ$N'.format(lat), transform=cartopy.crs.Geodetic())
 
-        plt.savefig(settings.IMAGELOC + "LIC_map_{}_{}{}".format(settings.YEAR, "".join(name.split()), settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC + "LIC_map_{}_{}{}".format(settings.YEAR, "".join(name.split()), settings.OUTFMT))
 
 
     #************************************************************************
@@ -158,35 +137,15 @@ def run_all_plots():
     fig = plt.figure(figsize=(8, 9.5))
     plt.clf()
 
-     # boundary circle
-    theta = np.linspace(0, 2*np.pi, 100)
-    center, radius = [0.5, 0.5], 0.5
-    verts = np.vstack([np.sin(theta), np.cos(theta)]).T
-    circle = mpath.Path(verts * radius + center)
-
     # axes for polar plot
-    ax = plt.axes([0.01, 0.02, 0.98, 0.98], projection=cartopy.crs.NorthPolarStereo(central_longitude=300.0))
-
-    plot_cube = cube
+    ax = utils.polar_map_axes(fig, [0.01, 0.02, 0.98, 0.98], min_lat=30, central_longitude=300.0)
 
     # regrid depending on output format
-    if settings.OUTFMT in [".eps", ".pdf"]:
-        if plot_cube.coord("latitude").points.shape[0] > 90 or plot_cube.coord("longitude").points.shape[0] > 360:
-            regrid_size = 1.0
-            print("Regridding cube for {} output to {} degree resolution".format(settings.OUTFMT, regrid_size))
-            print("Old Shape {}".format(plot_cube.data.shape))
-            plot_cube = utils.regrid_cube(plot_cube, regrid_size, regrid_size)
-            print("New Shape {}".format(plot_cube.data.shape))
-
-    # prettify
-    ax.gridlines() #draw_labels=True)
-    ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-    ax.coastlines()
-    ax.set_boundary(circle, transform=ax.transAxes)
+    plot_cube = utils.vector_plot_cube(cube, max_lat=90)
 
     cmap = plt.cm.RdBu_r
     norm = mpl.cm.colors.BoundaryNorm(BOUNDS, cmap.N)
-    mesh = iris.plot.pcolormesh(plot_cube, cmap=cmap, norm=norm, axes=ax)
+    mesh = utils.plot_polar_mesh(ax, plot_cube, cmap, norm, min_lat=30)
 
     # label axes
     ax.text(0.01, 1.0, "(d) Nov-Apr Air Temperature", fontsize=settings.FONTSIZE, transform=ax.transAxes)
@@ -205,7 +164,7 @@ def run_all_plots():
     for lat in range(30, 100, 10):
         ax.text(180, lat, '{}$^\circ$N'.format(lat), transform=cartopy.crs.Geodetic())
 
-    plt.savefig(settings.IMAGELOC + "LIC_map_{}_{}{}".format(settings.YEAR, "AirT", settings.OUTFMT))
+    utils.save_figure(settings.IMAGELOC + "LIC_map_{}_{}{}".format(settings.YEAR, "AirT", settings.OUTFMT))
 
     #************************************************************************
     # Timeseries
@@ -245,7 +204,7 @@ def run_all_plots():
     fig.subplots_adjust(bottom=0.05, right=0.95, top=0.95, hspace=0.001)
   
 
-    plt.savefig(settings.IMAGELOC + "LIC_ts_{}{}".format(settings.YEAR, settings.OUTFMT))
+    utils.save_figure(settings.IMAGELOC + "LIC_ts_{}{}".format(settings.YEAR, settings.OUTFMT))
 
     #************************************************************************
     # Timeseries
@@ -264,7 +223,7 @@ def run_all_plots():
     for tick in ax.xaxis.get_major_ticks():
         tick.label.set_fontsize(settings.FONTSIZE)
 
-    plt.savefig(settings.IMAGELOC + "LIC_GL_ts_{}{}".format(settings.YEAR, settings.OUTFMT))
+    utils.save_figure(settings.IMAGELOC + "LIC_GL_ts_{}{}".format(settings.YEAR, settings.OUTFMT))
 
     return # run_all_plots
 
@@ -236,7 +236,7 @@ ax3.axhline(35-33, c="0.5", ls="--")
 utils.thicken_panel_border(ax3)
 ax3.set_ylabel("As (b)")
 #
-plt.savefig(image_loc + "LKT_ts_hovmuller{}".format(settings.OUTFMT))
+utils.save_figure(image_loc + "LKT_ts_hovmuller{}".format(settings.OUTFMT))
 plt.close()
 plt.clf()
 
@@ -288,7 +288,7 @@ ax = plt.axes(axes[0], projection=cartopy.crs.LambertConformal())
 
 ax.gridlines() #draw_labels=True)
 ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-ax.coastlines(resolution="50m")
+ax.coastlines(resolution=utils.map_resolution("50m"))
 ax.set_extent([-140, -50, 20, 70], cartopy.crs.PlateCarree())
 
 mesh = iris.plot.pcolormesh(cube, cmap=this_cmap, norm=norm, axes=ax)
@@ -303,7 +303,7 @@ ax = plt.axes(axes[1], projection=cartopy.crs.LambertConformal(central_longitude
 
 ax.gridlines() #draw_labels=True)
 ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-ax.coastlines(resolution="50m")
+ax.coastlines(resolution=utils.map_resolution("50m"))
 ax.set_extent([-20, 70, 30, 70], cartopy.crs.PlateCarree())
 
 mesh = iris.plot.pcolormesh(cube, cmap=this_cmap, norm=norm, axes=ax)
@@ -323,7 +323,7 @@ cb.outline.set_linewidth(2)
 cb.dividers.set_color('k')
 cb.dividers.set_linewidth(2)
 
-plt.savefig(image_loc + "LKT_USA_EU_scatter_map{}".format(settings.OUTFMT))
+utils.save_figure(image_loc + "LKT_USA_EU_scatter_map{}".format(settings.OUTFMT))
 plt.close()
 
 
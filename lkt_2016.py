@@ -184,7 +184,7 @@ ax.xaxis.set_minor_locator(minorLocator)
 
 utils.thicken_panel_border(ax)
 
-plt.savefig(image_loc + "LKT_hovmuller{}".format(settings.OUTFMT))
+utils.save_figure(image_loc + "LKT_hovmuller{}".format(settings.OUTFMT))
 plt.close()
 
 #***************
@@ -237,7 +237,7 @@ plot_lakes(ax, trends[1], trends[0], trends[2]*10, cmap, norm, "Lake Temperature
 #ax = plt.axes(axes[2], projection=cartopy.crs.Robinson())     
 #plot_lakes(ax, anomalies[1], anomalies[0], anomalies[2], cmap, norm, "Lake Temperature Anomaly\n("+r"$^{\circ}$"+"C)", bounds, "(c)")
 
-plt.savefig(image_loc + "LKT_ts_maps{}".format(settings.OUTFMT))
+utils.save_figure(image_loc + "LKT_ts_maps{}".format(settings.OUTFMT))
 plt.close()
 
 
@@ -178,7 +178,7 @@ def run_all_plots():
         fig.text(0.01, 0.35, "Anomaly from 1996-2016 ("+r'$^\circ$'+"C)", fontsize=settings.FONTSIZE, rotation="vertical")
         fig.subplots_adjust(bottom=0.03, right=0.96, top=0.99, hspace=0.001)
 
-        plt.savefig(settings.IMAGELOC+"LKT_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"LKT_ts{}".format(settings.OUTFMT))
 
         plt.close()
 
@@ -228,18 +228,8 @@ def run_all_plots():
         # annual_cube = iris.load(DATALOC + "amaps_annual_2018_250km.nc")[0]
 
         cube = iris.load(DATALOC + "lswt_anom_1979_2019.nc")[0]
-        if settings.OUTFMT in [".eps", ".pdf"]:
-            if cube.coord("latitude").points.shape[0] > 180 or cube.coord("longitude").points.shape[0] > 360:
-                regrid_size = 1.0
-                print("Regridding cube for {} output to {} degree resolution".format(settings.OUTFMT, regrid_size))
-                print("Old Shape {}".format(cube.data.shape))
-                plot_cube = utils.regrid_cube(cube, regrid_size, regrid_size)
-                print("New Shape {}".format(plot_cube.data.shape))
-            else:
-                plot_cube = copy.deepcopy(cube)
-        else:
-            plot_cube = copy.deepcopy(cube)
-        
+        plot_cube = utils.vector_plot_cube(cube)
+
 
         # make axes by hand
         axes = ([0.01, 0.55, 0.59, 0.41], [0.565, 0.45, 0.47, 0.50], [0.01, 0.13, 0.59, 0.41], [0.61, 0.07, 0.38, 0.41],[0.1, 0.1, 0.8, 0.03])
@@ -249,11 +239,11 @@ def run_all_plots():
 
         ax.gridlines() #draw_labels=True)
         ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-        ax.coastlines(resolution="50m")
+        ax.coastlines(resolution=utils.map_resolution("50m"))
         #ax.add_feature(cartopy.feature.BORDERS.with_scale('110m'), linewidth=.5)
         ax.set_extent([-25, 40, 34, 72], cartopy.crs.PlateCarree())
 
-        mesh = iris.plot.pcolormesh(plot_cube, cmap=this_cmap, norm=norm, axes=ax)
+        mesh = iris.plot.pcolormesh(plot_cube, cmap=this_cmap, norm=norm, axes=ax, rasterized=True)
         plt.scatter(anomalies[1], anomalies[0], c=anomalies[2], cmap=this_cmap, norm=norm, s=25, \
                                 transform=cartopy.crs.Geodetic(), edgecolor='0.1', linewidth=0.5, zorder=10)
 
@@ -265,7 +255,7 @@ def run_all_plots():
 
         ax.gridlines() #draw_labels=True)
         ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-        ax.coastlines(resolution="50m")
+        ax.coastlines(resolution=utils.map_resolution("50m"))
         #ax.add_feature(cartopy.feature.BORDERS.with_scale('110m'), linewidth=.5)
         ax.set_extent([-19, 43, -40, 33], cartopy.crs.PlateCarree())
 
@@ -279,7 +269,7 @@ def run_all_plots():
         # mesh = iris.plot.pcolormesh(nh_cube, cmap=this_cmap, norm=norm, axes=ax)
         # mesh = iris.plot.pcolormesh(trop_cube, cmap=this_cmap, norm=norm, axes=ax)
         # mesh = iris.plot.pcolormesh(sh_cube, cmap=this_cmap, norm=norm, axes=ax)
-        mesh = iris.plot.pcolormesh(plot_cube, cmap=this_cmap, norm=norm, axes=ax)
+        mesh = iris.plot.pcolormesh(plot_cube, cmap=this_cmap, norm=norm, axes=ax, rasterized=True)
 
         plt.scatter(anomalies[1], anomalies[0], c=anomalies[2], cmap=this_cmap, norm=norm, s=25, \
                                 transform=cartopy.crs.Geodetic(), edgecolor='0.1', linewidth=0.5, zorder=10)
@@ -292,11 +282,11 @@ def run_all_plots():
 
         ax.gridlines() #draw_labels=True)
         ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-        ax.coastlines(resolution="50m")
+        ax.coastlines(resolution=utils.map_resolution("50m"))
         #ax.add_feature(cartopy.feature.BORDERS.with_scale('110m'), linewidth=.5)
         ax.set_extent([-140, -55, 42, 82], cartopy.crs.PlateCarree())
 
-        mesh = iris.plot.pcolormesh(plot_cube, cmap=this_cmap, norm=norm, axes=ax)
+        mesh = iris.plot.pcolormesh(plot_cube, cmap=this_cmap, norm=norm, axes=ax, rasterized=True)
         plt.scatter(anomalies[1], anomalies[0], c=anomalies[2], cmap=this_cmap, norm=norm, s=25, \
                                 transform=cartopy.crs.Geodetic(), edgecolor='0.1', linewidth=0.5, zorder=10)
 
@@ -308,11 +298,11 @@ def run_all_plots():
 
         ax.gridlines() #draw_labels=True)
         ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-        ax.coastlines(resolution="50m")
+        ax.coastlines(resolution=utils.map_resolution("50m"))
         ax.add_feature(cartopy.feature.BORDERS.with_scale('50m'), linewidth=.5)
         ax.set_extent([78, 102, 28, 39], cartopy.crs.PlateCarree())
 
-        mesh = iris.plot.pcolormesh(plot_cube, cmap=this_cmap, norm=norm, axes=ax)
+        mesh = iris.plot.pcolormesh(plot_cube, cmap=this_cmap, norm=norm, axes=ax, rasterized=True)
         plt.scatter(anomalies[1], anomalies[0], c=anomalies[2], cmap=this_cmap, norm=norm, s=25, \
                                 transform=cartopy.crs.Geodetic(), edgecolor='0.1', linewidth=0.5, zorder=10)
 
@@ -331,9 +321,12 @@ def run_all_plots():
         cb.dividers.set_color('k')
         cb.dividers.set_linewidth(2)
 
-        plt.savefig(settings.IMAGELOC + "LKT_Regions_scatter_map{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC + "LKT_Regions_scatter_map{}".format(settings.OUTFMT))
         plt.close()
 
+    utils.close_map_templates()
+
+    return # run_all_plots
 
 #************************************************************************
 if __name__ == "__main__":
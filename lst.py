@@ -44,22 +44,12 @@ def read_csv(filename):
 
     indata = np.ma.masked_where(indata == -99.9, indata)
 
-    raobcore = utils.Timeseries("RAOBCORE v1.7", indata[:, 0], indata[:, 1])
-    rich = utils.Timeseries("RICH v1.7", indata[:, 0], indata[:, 2])
-    ratpac = utils.Timeseries("RATPAC A2", indata[:, 0], indata[:, 3])
- #   unsw = utils.Timeseries("UNSW v1.0", indata[:, 0], indata[:, 4])
-    UAH = utils.Timeseries("UAH v6.0", indata[:, 0], indata[:, 4])
-    rss = utils.Timeseries("RSS v4.0", indata[:, 0], indata[:, 5])
-    noaa = utils.Timeseries("NOAA v4.1", indata[:, 0], indata[:, 6])
+    # name : column, in the order returned
+    columns = {"UAH v6.0" : 4, "RSS v4.0" : 5, "RATPAC A2" : 3, "RAOBCORE v1.7" : 1, "RICH v1.7" : 2, \
+                   "NOAA v4.1" : 6, "JRA-55" : 7, "MERRA-2" : 8}
+    # (UNSW v1.0, ERA5, CMIP5 and SSU-3 were in earlier files)
 
-#    era5 = utils.Timeseries("ERA5", indata[:, 0], indata[:, 8])
-    jra = utils.Timeseries("JRA-55", indata[:, 0], indata[:, 7])
-    merra = utils.Timeseries("MERRA-2", indata[:, 0], indata[:, 8])
-
-#    cmip = utils.Timeseries("CMIP5", indata[:, 0], indata[:, 11])
-#    ssu3 = utils.Timeseries("SSU-3", indata[:, 0], indata[:, 12])
-
-    return UAH, rss, ratpac, raobcore, rich, noaa, jra, merra # read_csv
+    return utils.TimeseriesCollection(list(columns.keys()), indata[:, 0], indata[:, list(columns.values())]) # read_csv
 
 #************************************************************************
 def read_ssu_csv(filename):
@@ -282,7 +272,7 @@ def run_all_plots():
         fig.text(0.01, 0.45, "Anomaly ("+r'$^\circ$'+"C)", fontsize=settings.FONTSIZE, rotation="vertical")
         fig.subplots_adjust(right=0.98, top=0.98, bottom=0.04, hspace=0.001)
 
-        plt.savefig(settings.IMAGELOC+"LST_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"LST_ts{}".format(settings.OUTFMT))
 
         plt.close()
 
@@ -325,7 +315,7 @@ def run_all_plots():
         fig.text(0.01, 0.45, "Anomaly ("+r'$^\circ$'+"C)", fontsize=settings.FONTSIZE, rotation="vertical")
         fig.subplots_adjust(right=0.98, top=0.98, bottom=0.04, hspace=0.001)
 
-        plt.savefig(settings.IMAGELOC+"LST_SSU_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"LST_SSU_ts{}".format(settings.OUTFMT))
 
         plt.close()
 
@@ -418,7 +408,7 @@ def run_all_plots():
         fig.text(0.01, 0.55, "Anomaly ("+r'$^\circ$'+"C)", fontsize=settings.FONTSIZE, rotation="vertical")
         fig.subplots_adjust(right=0.98, top=0.98, bottom=0.04, hspace=0.001)
 
-        plt.savefig(settings.IMAGELOC+"LST_combined_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"LST_combined_ts{}".format(settings.OUTFMT))
 
         plt.close()
 
@@ -438,7 +428,7 @@ def run_all_plots():
 
         utils.thicken_panel_border(ax1)
 
-        plt.savefig(settings.IMAGELOC+"LST_polar_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"LST_polar_ts{}".format(settings.OUTFMT))
 
         for tick in ax1.yaxis.get_major_ticks():
             tick.label.set_fontsize(settings.FONTSIZE)
@@ -496,7 +486,7 @@ def run_all_plots():
 
     # fig.subplots_adjust(right=0.95, top=0.95, hspace=0.001)
 
-    # plt.savefig(settings.IMAGELOC+"LST_qbo_ts{}".format(settings.OUTFMT))
+    # utils.save_figure(settings.IMAGELOC+"LST_qbo_ts{}".format(settings.OUTFMT))
 
     # plt.close()
 
@@ -545,7 +535,7 @@ def run_all_plots():
 
     # fig.subplots_adjust(right = 0.95, top = 0.95, hspace = 0.001)
 
-    # plt.savefig(settings.IMAGELOC+"LST_merra_ts{}".format(settings.OUTFMT))
+    # utils.save_figure(settings.IMAGELOC+"LST_merra_ts{}".format(settings.OUTFMT))
 
     # plt.close()
 
@@ -588,7 +578,7 @@ def run_all_plots():
 
     # fig.subplots_adjust(right = 0.95, top = 0.95, hspace = 0.001)
 
-    # plt.savefig(settings.IMAGELOC+"LST_profiles{}".format(settings.OUTFMT))
+    # utils.save_figure(settings.IMAGELOC+"LST_profiles{}".format(settings.OUTFMT))
 
     # plt.close()
 
@@ -661,6 +651,8 @@ def run_all_plots():
     #                                           title = MONTHS, \
     #                                           figtext = ["(a)","(b)","(c)","(d)", "(e)","(f)","(g)","(h)","(i)","(j)","(k)","(l)"])
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
@@ -47,19 +47,9 @@ def read_csv(filename):
 
     indata = np.ma.masked_where(indata == "", indata)
 
-    raobcore = utils.Timeseries("RAOBCORE v1.7", indata[:, 0], indata[:, 1])
-    rich = utils.Timeseries("RICH v1.7", indata[:, 0], indata[:, 2])
-    ratpac = utils.Timeseries("RATPAC A2", indata[:, 0], indata[:, 3])
-#    unsw = utils.Timeseries("UNSW v1.0", indata[:, 0], indata[:, 4])
-
-    UAH = utils.Timeseries("UAH v6.0", indata[:, 0], indata[:, 4])
-    rss = utils.Timeseries("RSS v4.0", indata[:, 0], indata[:, 5])
-
-    era5 = utils.Timeseries("ERA5", indata[:, 0], indata[:, 6])
-    jra = utils.Timeseries("JRA-55", indata[:, 0], indata[:, 7])
-    merra = utils.Timeseries("MERRA-2", indata[:, 0], indata[:, 8])
-
-    return raobcore, rich, ratpac, UAH, rss, era5, jra, merra # read_csv
+    # columns 1-8, UNSW v1.0 no longer in column 4
+    return utils.TimeseriesCollection(["RAOBCORE v1.7", "RICH v1.7", "RATPAC A2", "UAH v6.0", "RSS v4.0", \
+                                           "ERA5", "JRA-55", "MERRA-2"], indata[:, 0], indata[:, 1:9]) # read_csv
 
 #************************************************************************
 def read_mei(filename):
@@ -184,7 +174,7 @@ def run_all_plots():
 
             fig.subplots_adjust(right=0.98, top=0.98, bottom=0.05, hspace=0.001)
 
-            plt.savefig(settings.IMAGELOC+"LTT_ts_{}{}".format(region, settings.OUTFMT))
+            utils.save_figure(settings.IMAGELOC+"LTT_ts_{}{}".format(region, settings.OUTFMT))
 
             plt.close()
 
@@ -207,7 +197,7 @@ def run_all_plots():
     #     tick.label.set_fontsize(settings.FONTSIZE)
     # utils.thicken_panel_border(ax1)
 
-    # plt.savefig(settings.IMAGELOC+"LTT_land_area_ts{}".format(settings.OUTFMT))
+    # utils.save_figure(settings.IMAGELOC+"LTT_land_area_ts{}".format(settings.OUTFMT))
 
     # plt.close()
 
@@ -322,6 +312,8 @@ def run_all_plots():
     #                          "Anomaly ("+r'$^{\circ}$'+"C)", cosine=True, extra_ts=mei)
 
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
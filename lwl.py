@@ -140,7 +140,7 @@ def run_all_plots():
 
     fig.text(0.01, 0.5, "Lake Level (m)", rotation = "vertical", va="center", fontsize=settings.FONTSIZE)
     fig.subplots_adjust(left=0.07, right=0.99, bottom=0.05, top=0.99, hspace=0.001)
-    plt.savefig(settings.IMAGELOC + "LWL_ts_{}{}".format(settings.YEAR, settings.OUTFMT))
+    utils.save_figure(settings.IMAGELOC + "LWL_ts_{}{}".format(settings.YEAR, settings.OUTFMT))
 
     #***************
     # Lake Cutouts
@@ -164,7 +164,7 @@ def run_all_plots():
         ax.add_feature(cartopy.feature.OCEAN.with_scale('10m'), zorder=0, facecolor="#e0ffff", edgecolor="k")
         ax.add_feature(cartopy.feature.LAKES.with_scale('10m'), zorder=0, facecolor="#e0ffff", edgecolor="k")
         ax.add_feature(cartopy.feature.RIVERS.with_scale('10m'), zorder=0, edgecolor="#e0ffff")
-        ax.coastlines(resolution="10m", linewidth=0.5)
+        ax.coastlines(resolution=utils.map_resolution("10m"), linewidth=0.5)
 
         # add other features
         gl = ax.gridlines(draw_labels=True)
@@ -185,9 +185,11 @@ def run_all_plots():
             ax.text(-89, 42, "Michigan", fontsize=settings.FONTSIZE, transform=cartopy.crs.Geodetic())
             ax.text(-84.5, 44.5, "Huron", fontsize=settings.FONTSIZE, transform=cartopy.crs.Geodetic())
   
-        plt.savefig(settings.IMAGELOC + "LWL_map_{}".format(region) + settings.OUTFMT)
+        utils.save_figure(settings.IMAGELOC + "LWL_map_{}".format(region) + settings.OUTFMT)
         plt.close()
 
+    utils.close_map_templates()
+
     return # run_all_plots
 #************************************************************************
 if __name__ == "__main__":
@@ -129,7 +129,7 @@ def run_all_plots():
 
         # ax1.text(0.02, 0.9, "(a) Land in Situ", transform=ax1.transAxes, fontsize=settings.LABEL_FONTSIZE)
 
-        plt.savefig(settings.IMAGELOC+"PCP_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"PCP_ts{}".format(settings.OUTFMT))
         plt.close()
 
     # old 3-panel plot for 2015 report
@@ -210,7 +210,7 @@ def run_all_plots():
         ax3.text(0.02, 0.9, "(c) Globe", transform=ax3.transAxes, fontsize=settings.LABEL_FONTSIZE)
 
 
-        plt.savefig(settings.IMAGELOC+"PCP_ts_3panel{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"PCP_ts_3panel{}".format(settings.OUTFMT))
         plt.close()
 
     # 3-panel plot for 2019 report
@@ -252,7 +252,7 @@ def run_all_plots():
         ax2.text(0.02, 0.9, "(b) Ocean", transform=ax2.transAxes, fontsize=settings.LABEL_FONTSIZE)
         ax3.text(0.02, 0.9, "(c) Globe", transform=ax3.transAxes, fontsize=settings.LABEL_FONTSIZE)
 
-        plt.savefig(settings.IMAGELOC+"PCP_ts_3panel{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"PCP_ts_3panel{}".format(settings.OUTFMT))
         plt.close()
 
     #************************************************************************
@@ -288,6 +288,8 @@ def run_all_plots():
     # utils.plot_smooth_map_iris(settings.IMAGELOC + "PCP_{}_anoms_gpcp_ocean".format(settings.YEAR), cube, settings.COLOURMAP_DICT["hydrological"], bounds, "Anomalies from 1981-2000 (mm)")
 
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
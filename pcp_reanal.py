@@ -58,7 +58,7 @@ states_provinces = cfeature.NaturalEarthFeature(
     scale='50m',
     facecolor='none')
 ax.add_feature(states_provinces, edgecolor='gray', lw=1)
-ax.coastlines(resolution="10m", linewidth=1, edgecolor="k")
+ax.coastlines(resolution=utils.map_resolution("10m"), linewidth=1, edgecolor="k")
 ax.add_feature(land_10m, zorder=0, facecolor="0.9", edgecolor="k")
 
 # add other features
@@ -98,7 +98,7 @@ cb.dividers.set_linewidth(2)
 ax.set_extent(ext, ax.projection) # fix the extent change from colormesh
 
 # save
-plt.savefig(image_loc + "SB2.1_{}_prcp_rnl_USA".format(settings.YEAR) + settings.OUTFMT)
+utils.save_figure(image_loc + "SB2.1_{}_prcp_rnl_USA".format(settings.YEAR) + settings.OUTFMT)
 plt.close()
 
 
@@ -123,42 +123,35 @@ def GetYears(cube):
     return years
 
 #************************************************************************
+@utils.profiled("compute")
 def ApplyClimatology(cube):
 
     years = GetYears(cube)
 
-    clim_years=np.where((years >= CLIMSTART) & (years <= CLIMEND))
-    
-    climatology = np.ma.mean(cube.data[clim_years], axis=0)
-    
-    cube.data = cube.data - climatology                                
+    climatology = utils.get_climatology(years, cube.data, CLIMSTART, CLIMEND)
+
+    cube.data = utils.apply_climatology(years, cube.data, climatology)
         
     return cube
 
 #************************************************************************
+@utils.profiled("load")
 def obtain_timeseries(filename, cube_name, ts_name):
 
     # re-read the file to overwrite memory of what was done to this cube.
-    cube_list = iris.load(filename)
+    cube_list = utils.load_cubes(filename)
     names = np.array([cube.name() for cube in cube_list])
 
     selected_cube, = np.where(names == cube_name)
 
-    cube = cube_list[selected_cube]
+    cube = cube_list[selected_cube[0]]
     cube.coord('latitude').guess_bounds()
     cube.coord('longitude').guess_bounds()  
 
-    nyears = np.ma.count(cube.data, axis=0)
-
-    # repeat so selection will work across all years
-    nyears = np.array([nyears for i in range(cube.data.shape[0])])
-
-    cube.data = np.ma.masked_where(nyears < THRESHOLD * cube.data.shape[0], cube.data)
-
-    weight_areas = iris.analysis.cartography.area_weights(cube)
-    ts = cube.collapsed(['latitude', 'longitude'], iris.analysis.MEAN, weights=weight_areas)
+    # mask gridboxes with low coverage
+    mean, coverage, norm = utils.area_weighted_mean_and_coverage(cube, threshold=THRESHOLD)
 
-    ts = utils.Timeseries(ts_name, GetYears(ts), ts.data * 3.65)
+    ts = utils.Timeseries(ts_name, GetYears(cube), mean * 3.65)
 
     return ts
 
@@ -242,6 +235,7 @@ def calc_rank(data):
 
 
 #************************************************************************
+@utils.profiled("compute")
 def get_ranks(incube):
 
 
@@ -265,6 +259,7 @@ def get_ranks(incube):
     return cube # get_ranks
 
 #************************************************************************
+@utils.profiled("render")
 def plot_rank_map(outname, cube, cmap, bounds, cb_label, scatter=[], figtext="", title=""):
     '''
     Standard scatter map
@@ -278,41 +273,26 @@ def plot_rank_map(outname, cube, cmap, bounds, cb_label, scatter=[], figtext="",
 
     norm = mpl.cm.colors.BoundaryNorm(bounds, cmap.N)
 
-    fig = plt.figure(figsize=(8, 5.5))
+    template = utils.get_map_template(("map", False), (8, 5.5), rects=[[0.01, 0.12, 0.98, 0.88]])
+    fig, ax = template.fig, template.axes[0]
+    ext = template.extents[0]
 
-    plt.clf()
-    ax = plt.axes([0.01, 0.12, 0.98, 0.88], projection=cartopy.crs.Robinson())
-    ax.gridlines() #draw_labels=True)
-    ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-    ax.coastlines()
-
-    ext = ax.get_extent() # save the original extent
-
-    mesh = iris.plot.pcolormesh(cube, cmap=cmap, norm=norm)
+    mesh = utils.plot_cube_mesh(ax, cube, cmap, norm)
 
     if len(scatter) > 0:
 
         lons, lats, data = scatter
 
-        plt.scatter(lons, lats, c=data, cmap=cmap, norm=norm, s=25, \
+        ax.scatter(lons, lats, c=data, cmap=cmap, norm=norm, s=25, \
                         transform=cartopy.crs.Geodetic(), edgecolor='0.5', linewidth=0.5)
 
 
-    cb = plt.colorbar(mesh, orientation='horizontal', pad=0.05, fraction=0.05, \
-                        aspect=30, ticks=bounds[1:-1], drawedges=True)
-
-    # thicken border of colorbar and the dividers
-    # http://stackoverflow.com/questions/14477696/customizing-colorbar-border-color-on-matplotlib
+    cb = template.colorbar(mesh, bounds)
     cb.set_ticklabels(["{:g}".format(b) for b in bounds[1:-1]])
     cb.ax.tick_params(axis='x', labelsize=settings.FONTSIZE, direction='in', size=0)
 
     cb.set_label(label=cb_label, fontsize=settings.FONTSIZE)
 
-#    cb.outline.set_color('k')
-    cb.outline.set_linewidth(2)
-    cb.dividers.set_color('k')
-    cb.dividers.set_linewidth(2)
-
     # label colorbar with sensibly placed and named labels
     cb.ax.get_xaxis().set_ticks([])
     cb.ax.get_xaxis().set_ticklabels([""])
@@ -321,11 +301,10 @@ def plot_rank_map(outname, cube, cmap, bounds, cb_label, scatter=[], figtext="",
 
     ax.set_extent(ext, ax.projection) # fix the extent change from colormesh
 
-    plt.title(title)
-    fig.text(0.03, 0.95, figtext, fontsize=settings.FONTSIZE)
+    ax.set_title(title)
+    template.text("figtext", 0.03, 0.95, figtext, fontsize=settings.FONTSIZE)
 
-    plt.savefig(outname + settings.OUTFMT)
-    plt.close()
+    utils.save_figure(outname + settings.OUTFMT, fig=fig)
 
     return # plot_rank_map_iris
 
@@ -483,7 +462,7 @@ def run_all_plots():
             tick.label.set_fontsize(settings.FONTSIZE)
 
 #        ax1.text(0.02, 0.9, "(e)", transform=ax1.transAxes, fontsize=settings.FONTSIZE)
-        plt.savefig(settings.IMAGELOC+"PEX_CEI_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"PEX_CEI_ts{}".format(settings.OUTFMT))
 
         plt.close()
 
@@ -494,9 +473,10 @@ def run_all_plots():
     if True:
 
         for index in ETCCDI_INDICES:
+            utils.profile_figure("PEX_{}".format(index))
 
 
-            cube_list = iris.load(DATALOC + "GHCND_{}_1951-{}_RegularGrid_global_2.5x2.5deg_LSmask.nc".format(index, int(settings.YEAR) + 1))
+            cube_list = utils.load_cubes(DATALOC + "GHCND_{}_1951-{}_RegularGrid_global_2.5x2.5deg_LSmask.nc".format(index, int(settings.YEAR) + 1))
             names = np.array([cube.name() for cube in cube_list])
 
             #*************
@@ -570,51 +550,14 @@ def run_all_plots():
 
             if index in ["Rx1day", "Rx5day"]:
 
-                for sc, cube in enumerate([total_cube, anoms]):
-
-                    season_list = []
-                    for season in SEASONS:
+                # seasonal maxima, then their anomalies
+                month_cubes = utils.select_month_cubes(cube_list, names)
+                years = GetYears(month_cubes[0])
 
-                        # extract each month
-                        month_data = []
-                        months = SEASON_DICT[season]
-                        for month in months:
+                for sc in range(2):
 
-                            selected_cube, = np.where(names == month)
-                            cube = cube_list[selected_cube[0]]
-
-                            if month == "Dec":
-                                # need to extract from previous year - cheat by rolling data around
-                                cube.data = np.roll(cube.data, 1, axis=0)
-                                cube.data.mask[0, :, :] = True # and mask out the previous years'
-
-                            month_data += [cube.data]
-
-                        # finished getting all months, make a dummy cube to populate
-                        month_data = np.ma.array(month_data)
-                        season_cube = copy.deepcopy(cube)
-
-                        # take appropriate seasonal value
-                        season_cube.data = np.ma.max(month_data, axis=0)
-
-                        # mask if fewer that 2 months present
-                        nmonths_locs = np.ma.count(month_data, axis=0)
-                        season_cube.data = np.ma.masked_where(nmonths_locs < 2, season_cube.data)
-
-                        # make anomalies
-                        if sc == 1:
-                            season_cube = ApplyClimatology(season_cube)
-
-                        # fix for plotting
-                        season_cube.coord('latitude').guess_bounds()
-                        season_cube.coord('longitude').guess_bounds()
-
-                        # select the year to plot
-                        years = GetYears(cube)
-                        loc, = np.where(years == SELECTED_YEAR)
-
-                        # add to list
-                        season_list += [season_cube[loc[0]]]
+                    season_list = utils.seasonal_cubes(month_cubes, years, SELECTED_YEAR, how="max", min_months=2, \
+                                                           base_period=None if sc == 0 else (CLIMSTART, CLIMEND))
 
                     # sort the bounds and colourbars
                     if sc == 0:
@@ -639,11 +582,12 @@ def run_all_plots():
     # DWD indices
     if True:
         for index in DWD_INDICES:
+            utils.profile_figure("PEX_{}".format(index))
             print(index)
             if not os.path.exists(DATALOC + "First_Guess_Daily_{}_{}.nc".format(settings.YEAR, index)):
                 print("File {} missing".format("First_Guess_Daily_{}_{}.nc".format(settings.YEAR, index)))
                 continue
-            cube_list = iris.load(DATALOC + "First_Guess_Daily_{}_{}.nc".format(settings.YEAR, index))
+            cube_list = utils.load_cubes(DATALOC + "First_Guess_Daily_{}_{}.nc".format(settings.YEAR, index))
 
             if len(cube_list) == 1:
                 cube = cube_list[0]
@@ -694,11 +638,12 @@ def run_all_plots():
     # DWD differences indices
     if True:
         for index in DWD_INDICES:
+            utils.profile_figure("PEX_{}".format(index))
             print(index)
             if not os.path.exists(DATALOC + "Diff_{}-Mean_{}.nc".format(index, settings.YEAR)):
                 print("File {} missing".format("Diff_{}-Mean_{}.nc".format(index, settings.YEAR)))
                 continue
-            cube_list = iris.load(DATALOC + "Diff_{}-Mean_{}.nc".format(index, settings.YEAR))
+            cube_list = utils.load_cubes(DATALOC + "Diff_{}-Mean_{}.nc".format(index, settings.YEAR))
 
             if len(cube_list) == 1:
                 cube = cube_list[0]
@@ -734,7 +679,7 @@ def run_all_plots():
     # MERRA map
     if True:
         index = "R10mm"
-        cube = iris.load(DATALOC + "MERRA2_ann_2019_r10mm_gl_anom.nc")[0]
+        cube = utils.load_cubes(DATALOC + "MERRA2_ann_2019_r10mm_gl_anom.nc")[0]
         
         bounds = [-50, -30, -20, -10, -5, 0, 5, 10, 20, 30, 50]
         cmap = settings.COLOURMAP_DICT["hydrological"]
@@ -780,7 +725,7 @@ def run_all_plots():
      
 #        dwd_cube = read_dwd_percentile(DATALOC + "GPCC_perzentile_{}.xyzras".format(settings.YEAR))
 
-        cube_list = iris.load(DATALOC + "Quantile_12month_{}01-{}12.nc".format(settings.YEAR, settings.YEAR))
+        cube_list = utils.load_cubes(DATALOC + "Quantile_12month_{}01-{}12.nc".format(settings.YEAR, settings.YEAR))
         dwd_cube = cube_list[0][0]
 
         bounds = [0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
@@ -794,7 +739,7 @@ def run_all_plots():
      
 #        dwd_cube = read_dwd_percentile(DATALOC + "GPCC_perzentile_{}.xyzras".format(settings.YEAR))
 
-        cube_list = iris.load(DATALOC + "GPCC_DI_201912_12.nc")
+        cube_list = utils.load_cubes(DATALOC + "GPCC_DI_201912_12.nc")
         dwd_cube = cube_list[0][0]
 
         bounds = [-10, -5, -3, -2, -1, 0, 1, 2, 3, 5, 10]
@@ -817,6 +762,7 @@ def run_all_plots():
                                                 facecolor=cfeature.COLORS['land'])
 
         for index in ["Rx5day", "Rx1day"]:
+            utils.profile_figure("PEX_{}".format(index))
             for state in ["03-neaus", "07-japan", "08-hawaii"]:
 
                 print("{} - {}".format(state, index))
@@ -861,7 +807,7 @@ def run_all_plots():
                         scale='50m',
                         facecolor='none')
                     ax.add_feature(states_provinces, edgecolor='gray')
-                    ax.coastlines(resolution="10m", linewidth=0.5)
+                    ax.coastlines(resolution=utils.map_resolution("10m"), linewidth=0.5)
                     ax.add_feature(land_50m, zorder=0, facecolor="0.9", edgecolor="k")
 
                     # add other features
@@ -900,10 +846,12 @@ def run_all_plots():
                     ax1.text(0.05, 1.05, "(d)", transform=ax1.transAxes, fontsize=settings.FONTSIZE*0.8)
 
 
-                plt.savefig(settings.IMAGELOC + "PEX_{}_{}-{}".format(index, NAMES[state[3:]], state[:2]) + settings.OUTFMT)
+                utils.save_figure(settings.IMAGELOC + "PEX_{}_{}-{}".format(index, NAMES[state[3:]], state[:2]) + settings.OUTFMT)
                 plt.close()
 
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
@@ -20,7 +20,6 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 import matplotlib as mpl
-import matplotlib.path as mpath
 from matplotlib.ticker import MultipleLocator
 import matplotlib.image as mpimg
 
@@ -332,7 +331,7 @@ def run_all_plots():
     # plt.setp([a.get_xticklabels() for a in [ax1, ax2]], visible=False)
     # fig.subplots_adjust(right=0.95, top=0.95, bottom=0.05, hspace=0.001)
 
-    # plt.savefig(image_loc+"PHEN_tree_ts{}".format(settings.OUTFMT))
+    # utils.save_figure(image_loc+"PHEN_tree_ts{}".format(settings.OUTFMT))
     # plt.close()
 
 
@@ -381,7 +380,7 @@ def run_all_plots():
 
     # # plt.setp(ax1.get_xticklabels(), visible=False)
 
-    # # plt.savefig(image_loc+"PHEN_bartlett_ts{}".format(settings.OUTFMT))
+    # # utils.save_figure(image_loc+"PHEN_bartlett_ts{}".format(settings.OUTFMT))
     # # plt.close()
 
     # #***********************
@@ -446,7 +445,7 @@ def run_all_plots():
     # fig.subplots_adjust(right=0.95, top=0.95, hspace=0.001)
 
 
-    # plt.savefig(image_loc+"PHEN_bartlett_ts_gap{}".format(settings.OUTFMT))
+    # utils.save_figure(image_loc+"PHEN_bartlett_ts_gap{}".format(settings.OUTFMT))
     # plt.close()
 
     # #***********************
@@ -537,7 +536,7 @@ def run_all_plots():
     # ax7.set_title("Duke")
 
 
-    # plt.savefig(image_loc+"PHEN_Bartlett_GPP_Duke_separate{}".format(settings.OUTFMT))
+    # utils.save_figure(image_loc+"PHEN_Bartlett_GPP_Duke_separate{}".format(settings.OUTFMT))
     # plt.close()
 
     # #***********************
@@ -588,7 +587,7 @@ def run_all_plots():
     
     # # fig.subplots_adjust(right = 0.95, top = 0.95, hspace = 0.001)
 
-    # # plt.savefig(image_loc+"PHEN_Bartlett_GPP_Duke_combined{}".format(settings.OUTFMT))
+    # # utils.save_figure(image_loc+"PHEN_Bartlett_GPP_Duke_combined{}".format(settings.OUTFMT))
     # # plt.close()
 
     # #***********************
@@ -624,7 +623,7 @@ def run_all_plots():
     # cb.dividers.set_color('k')
     # cb.dividers.set_linewidth(2)
 
-    # plt.savefig(image_loc + "PHEN_UK_map{}".format(settings.OUTFMT))
+    # utils.save_figure(image_loc + "PHEN_UK_map{}".format(settings.OUTFMT))
     # plt.close()
 
 
@@ -659,38 +658,18 @@ def run_all_plots():
     CUBES = [sos_cube]# eos_cube]
     LABELS = ["(a) Start of Season (SOS)"]#, "(b) End of Season (EOS)"]
 
-    # boundary circle
-    theta = np.linspace(0, 2*np.pi, 100)
-    center, radius = [0.5, 0.5], 0.5
-    verts = np.vstack([np.sin(theta), np.cos(theta)]).T
-    circle = mpath.Path(verts * radius + center)
-
     # spin through axes
     for a in range(1):  
 
-        ax = plt.subplot(1, 1, a+1, projection=cartopy.crs.NorthPolarStereo())
-
-        plot_cube = CUBES[a]
+        ax = utils.polar_map_axes(fig, (1, 1, a+1), min_lat=45)
 
-        if settings.OUTFMT in [".eps", ".pdf"]:
-            if plot_cube.coord("latitude").points.shape[0] > 90 or plot_cube.coord("longitude").points.shape[0] > 360:
-                regrid_size = 1.0
-                print("Regridding cube for {} output to {} degree resolution".format(settings.OUTFMT, regrid_size))
-                print("Old Shape {}".format(plot_cube.data.shape))
-                plot_cube = utils.regrid_cube(plot_cube, regrid_size, regrid_size)
-                print("New Shape {}".format(plot_cube.data.shape))
-
-        ax.gridlines() #draw_labels=True)
-        ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-        ax.coastlines()
-        ax.set_boundary(circle, transform=ax.transAxes)
-        ax.set_extent([-180, 180, 45, 90], cartopy.crs.PlateCarree())
+        plot_cube = utils.vector_plot_cube(CUBES[a], max_lat=90)
 
         ext = ax.get_extent() # save the original extent
 
         cmap = CMAPS[a]
         norm = mpl.cm.colors.BoundaryNorm(BOUNDS[a], cmap.N)
-        mesh = iris.plot.pcolormesh(plot_cube, cmap=cmap, norm=norm, axes=ax)
+        mesh = utils.plot_polar_mesh(ax, plot_cube, cmap, norm, min_lat=45)
 
         ax.set_extent(ext, ax.projection) # fix the extent change from colormesh
         ax.text(-0.1, 1.0, LABELS[a], fontsize=settings.FONTSIZE * 0.8, transform=ax.transAxes)
@@ -708,7 +687,7 @@ def run_all_plots():
 
     plt.title("")
 
-    plt.savefig(image_loc + "PHEN_modis_polar{}".format(settings.OUTFMT))
+    utils.save_figure(image_loc + "PHEN_modis_polar{}".format(settings.OUTFMT))
     plt.close()
 
     del eos_cube
@@ -755,7 +734,7 @@ def run_all_plots():
 
     # ax.set_extent([-180, 180, 45, 90], cartopy.crs.PlateCarree())
 
-    # plt.savefig(image_loc + "PHEN_modis_lai{}".format(settings.OUTFMT))
+    # utils.save_figure(image_loc + "PHEN_modis_lai{}".format(settings.OUTFMT))
     # plt.close()
 
     #***********************
@@ -815,7 +794,7 @@ def run_all_plots():
     # plt.setp(ax1.get_xticklabels(), visible=False)
     # fig.subplots_adjust(right=0.95, top=0.95, hspace=0.001)
 
-    # plt.savefig(image_loc+"PHEN_modis_ts{}".format(settings.OUTFMT))
+    # utils.save_figure(image_loc+"PHEN_modis_ts{}".format(settings.OUTFMT))
     # plt.close()
 
     #***********************
@@ -889,7 +868,7 @@ def run_all_plots():
     plt.setp([a.get_xticklabels() for a in [ax1]], visible=False)
     fig.subplots_adjust(left=0.1, right=0.85, top=0.95, bottom=0.05, hspace=0.001)
 
-    plt.savefig(image_loc+"PHEN_modis_ts{}".format(settings.OUTFMT))
+    utils.save_figure(image_loc+"PHEN_modis_ts{}".format(settings.OUTFMT))
     plt.close()
 
 
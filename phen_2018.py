@@ -20,7 +20,6 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 import matplotlib as mpl
-import matplotlib.path as mpath
 from matplotlib.ticker import MultipleLocator
 import matplotlib.image as mpimg
 
@@ -270,34 +269,15 @@ def run_all_plots():
 
     LABELS = "(c) Start of Season (SOS)" #, "(b) End of Season (EOS)"]
 
-    # boundary circle
-    theta = np.linspace(0, 2*np.pi, 100)
-    center, radius = [0.5, 0.5], 0.5
-    verts = np.vstack([np.sin(theta), np.cos(theta)]).T
-    circle = mpath.Path(verts * radius + center)
-
     # axes for polar plot
-    ax = plt.axes([0.05, 0.01, 0.9, 0.65], projection=cartopy.crs.NorthPolarStereo(central_longitude=300.0))
-
-    plot_cube = sos_cube
-
-    if settings.OUTFMT in [".eps", ".pdf"]:
-        if plot_cube.coord("latitude").points.shape[0] > 90 or plot_cube.coord("longitude").points.shape[0] > 360:
-            regrid_size = 1.0
-            print("Regridding cube for {} output to {} degree resolution".format(settings.OUTFMT, regrid_size))
-            print("Old Shape {}".format(plot_cube.data.shape))
-            plot_cube = utils.regrid_cube(plot_cube, regrid_size, regrid_size)
-            print("New Shape {}".format(plot_cube.data.shape))
+    ax = utils.polar_map_axes(fig, [0.05, 0.01, 0.9, 0.65], min_lat=30, central_longitude=300.0)
 
-    ax.gridlines() #draw_labels=True)
-    ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-    ax.coastlines()
-    ax.set_boundary(circle, transform=ax.transAxes)
+    plot_cube = utils.vector_plot_cube(sos_cube, max_lat=90)
 
 
     cmap = settings.COLOURMAP_DICT["phenological_r"]
     norm = mpl.cm.colors.BoundaryNorm(BOUNDS, cmap.N)
-    mesh = iris.plot.pcolormesh(plot_cube, cmap=cmap, norm=norm, axes=ax)
+    mesh = utils.plot_polar_mesh(ax, plot_cube, cmap, norm, min_lat=30)
 
     # plot scatter
     COL = "yellow"
@@ -376,7 +356,7 @@ def run_all_plots():
     fig.text(0.05, 0.92, "SOS Anomaly (days)", rotation="vertical")
     fig.text(0.95, 0.92, "Temperature Anomaly ("+r'$^{\circ}$'+"C)", rotation="vertical")
 
-    plt.savefig(image_loc + "PHEN_modis_{}{}".format(settings.YEAR, settings.OUTFMT))
+    utils.save_figure(image_loc + "PHEN_modis_{}{}".format(settings.YEAR, settings.OUTFMT))
 
     #***********************
     # US timeseries - 2018
@@ -441,7 +421,7 @@ def run_all_plots():
 
     fig.text(0.03, 0.835, "Day of year", rotation = "vertical")
 
-    plt.savefig(image_loc + "PHEN_timeseries_{}{}".format(settings.YEAR, settings.OUTFMT))
+    utils.save_figure(image_loc + "PHEN_timeseries_{}{}".format(settings.YEAR, settings.OUTFMT))
     plt.close()
 
 
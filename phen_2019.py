@@ -20,7 +20,6 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 import matplotlib as mpl
-import matplotlib.path as mpath
 from matplotlib.ticker import MultipleLocator
 import matplotlib.image as mpimg
 
@@ -38,6 +37,7 @@ LEGEND_LOC = 'lower left'
 
 
 #************************************************************************
+@utils.profiled("load")
 def read_modis_ts(filename):
     '''
     Read the timeseries data, and returning Timeseries objects.
@@ -46,7 +46,7 @@ def read_modis_ts(filename):
     :returns: Timeseries object s
     '''
 
-    raw_data = np.genfromtxt(filename, dtype=(float), skip_header=1, delimiter=",")
+    raw_data = utils.genfromtxt(filename, dtype=(float), skip_header=1, delimiter=",")
 
     years = raw_data[:, 0]  
 
@@ -71,6 +71,7 @@ def read_modis_ts(filename):
     return sos_nh, eos_nh, sprt_nh, falt_nh # read_modis_ts
 
 #************************************************************************
+@utils.profiled("load")
 def read_modis_uk_ts(filename):
     '''
     Read the timeseries data, and returning Timeseries objects.
@@ -79,7 +80,7 @@ def read_modis_uk_ts(filename):
     :returns: Timeseries object s
     '''
 
-    raw_data = np.genfromtxt(filename, dtype=(float), skip_header=1, delimiter=",")
+    raw_data = utils.genfromtxt(filename, dtype=(float), skip_header=1, delimiter=",")
 
     years = raw_data[:, 0]  
 
@@ -91,9 +92,10 @@ def read_modis_uk_ts(filename):
     return sos_uk, eos_uk # read_modis_uk_ts
 
 #************************************************************************
+@utils.profiled("load")
 def read_us_phenocam(filename):
     
-    raw_data = np.genfromtxt(filename, dtype=(str), skip_header=1)
+    raw_data = utils.genfromtxt(filename, dtype=(str), skip_header=1)
 
     lat = raw_data[:, 1].astype(float)
     lon = raw_data[:, 0].astype(float)
@@ -153,6 +155,7 @@ def plot_modis_ts(axl, sos, sprt, dummy, label, anomalies, legend_loc):
     return # plot_modis_ts
 
 #************************************************************************
+@utils.profiled("load")
 def read_uk_oak_csv(filename):
     '''
     Read the timeseries data, and returning Timeseries objects.
@@ -161,7 +164,7 @@ def read_uk_oak_csv(filename):
     :returns: Timeseries object s
     '''
 
-    raw_data = np.genfromtxt(filename, dtype=(str), skip_header=1, skip_footer=2, delimiter=",")
+    raw_data = utils.genfromtxt(filename, dtype=(str), skip_header=1, skip_footer=2, delimiter=",")
     
     indata = raw_data[:, 1:].astype(float)
     indata = np.ma.masked_where(indata == -99, indata)
@@ -172,6 +175,7 @@ def read_uk_oak_csv(filename):
     return oak_sos, oak_eos  # read_uk_oak_csv
 
 #************************************************************************
+@utils.profiled("load")
 def read_windermere_csv(filename):
     '''
     Read the timeseries data, and returning Timeseries objects.
@@ -180,7 +184,7 @@ def read_windermere_csv(filename):
     :returns: Timeseries objects
     '''
 
-    raw_data = np.genfromtxt(filename, dtype=(int), skip_header=1, delimiter=",")
+    raw_data = utils.genfromtxt(filename, dtype=(int), skip_header=1, delimiter=",")
     
     times = raw_data[:, 0]
     north = utils.Timeseries("North Basin", times, raw_data[:, 1])
@@ -189,9 +193,10 @@ def read_windermere_csv(filename):
     return north, south  # read_windermere_csv
 
 #************************************************************************
+@utils.profiled("load")
 def read_us_phenocam_csv(filename):
 
-    raw_data = np.genfromtxt(filename, dtype=(str), delimiter=",", encoding="latin-1")
+    raw_data = utils.genfromtxt(filename, dtype=(str), delimiter=",", encoding="latin-1")
 
     times = raw_data[0, 2:].astype(int)
     modis_sos = utils.Timeseries("MODIS", times, raw_data[1, 2:].astype(int)) 
@@ -299,31 +304,11 @@ def run_all_plots():
             fig = plt.figure(figsize=(8, 11))
             plt.clf()
 
-             # boundary circle
-            theta = np.linspace(0, 2*np.pi, 100)
-            center, radius = [0.5, 0.5], 0.5
-            verts = np.vstack([np.sin(theta), np.cos(theta)]).T
-            circle = mpath.Path(verts * radius + center)
-
             # axes for polar plot
-            ax = plt.axes([0.01, 0.02, 0.98, 0.65], projection=cartopy.crs.NorthPolarStereo(central_longitude=300.0))
-
-            plot_cube = cube
+            ax = utils.polar_map_axes(fig, [0.01, 0.02, 0.98, 0.65], min_lat=30, central_longitude=300.0)
 
             # regrid depending on output format
-            if settings.OUTFMT in [".eps", ".pdf"]:
-                if plot_cube.coord("latitude").points.shape[0] > 90 or plot_cube.coord("longitude").points.shape[0] > 360:
-                    regrid_size = 1.0
-                    print("Regridding cube for {} output to {} degree resolution".format(settings.OUTFMT, regrid_size))
-                    print("Old Shape {}".format(plot_cube.data.shape))
-                    plot_cube = utils.regrid_cube(plot_cube, regrid_size, regrid_size)
-                    print("New Shape {}".format(plot_cube.data.shape))
-
-            # prettify
-            ax.gridlines() #draw_labels=True)
-            ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-            ax.coastlines()
-            ax.set_boundary(circle, transform=ax.transAxes)
+            plot_cube = utils.vector_plot_cube(cube, max_lat=90)
 
             if season == "SOS":
                 cmap = settings.COLOURMAP_DICT["phenological_r"]
@@ -331,7 +316,7 @@ def run_all_plots():
                 cmap = settings.COLOURMAP_DICT["phenological"]
 
             norm = mpl.cm.colors.BoundaryNorm(BOUNDS, cmap.N)
-            mesh = iris.plot.pcolormesh(plot_cube, cmap=cmap, norm=norm, axes=ax)
+            mesh = utils.plot_polar_mesh(ax, plot_cube, cmap, norm, min_lat=30)
 
             # # read in sites
             if season == "EOS":
@@ -404,7 +389,7 @@ def run_all_plots():
                 plot_modis_ts(ax, eos_nh, falt_nh, falt_nh_orig, label, anomalies, LEGEND_LOC)
 
 
-            plt.savefig(settings.IMAGELOC + "PHEN_modis_{}_{}{}".format(settings.YEAR, season, settings.OUTFMT))
+            utils.save_figure(settings.IMAGELOC + "PHEN_modis_{}_{}{}".format(settings.YEAR, season, settings.OUTFMT))
 
         del cubelist
 
@@ -437,7 +422,7 @@ def run_all_plots():
 
         fig.text(0.02, 0.97, "(a)", transform=ax.transAxes, fontsize=settings.FONTSIZE)
         fig.text(0.02, 0.3, "Day of year", rotation = "vertical", fontsize=settings.FONTSIZE)
-        plt.savefig(settings.IMAGELOC + "PHEN_UStimeseries_{}{}".format(settings.YEAR, settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC + "PHEN_UStimeseries_{}{}".format(settings.YEAR, settings.OUTFMT))
         plt.close()
 
 
@@ -467,7 +452,7 @@ def run_all_plots():
         plot_images(ax, "HarvardForest_20190511.jpg")
 
         fig.text(0.02, 0.4, "Day of year", rotation = "vertical", fontsize=settings.FONTSIZE)
-        plt.savefig(settings.IMAGELOC + "PHEN_UStimeseries_{}{}".format(settings.YEAR, settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC + "PHEN_UStimeseries_{}{}".format(settings.YEAR, settings.OUTFMT))
         plt.close()
    
 
@@ -524,7 +509,7 @@ def run_all_plots():
         fig.text(0.02, 0.97, "(b)", transform=ax.transAxes, fontsize=settings.FONTSIZE)
         fig.text(0.02, 0.3, "Day of year", rotation = "vertical", fontsize=settings.FONTSIZE)
 
-        plt.savefig(settings.IMAGELOC + "PHEN_UKtimeseries_{}{}".format(settings.YEAR, settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC + "PHEN_UKtimeseries_{}{}".format(settings.YEAR, settings.OUTFMT))
         plt.close()
 
     #***********************
@@ -562,7 +547,7 @@ def run_all_plots():
         utils.thicken_panel_border(ax)
  
         plt.ylabel("Day of year", fontsize=settings.FONTSIZE)
-        plt.savefig(settings.IMAGELOC + "PHEN_lakes_boxplot_{}{}".format(settings.YEAR, settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC + "PHEN_lakes_boxplot_{}{}".format(settings.YEAR, settings.OUTFMT))
         plt.close()
 
         
@@ -15,6 +15,12 @@
 from __future__ import absolute_import
 from __future__ import print_function
 
+import os
+import glob
+import pickle
+import hashlib
+import inspect
+import multiprocessing
 import matplotlib.pyplot as plt
 import datetime as dt
 import numpy as np
@@ -166,565 +172,747 @@ def toYearFraction(date):
 #************************************************************************
 def annual_from_monthly(indata):
 
-    try:
-        times = indata.times.reshape(-1, 12)
-        monthly = indata.data.reshape(-1, 12)
-        annuals = np.ma.mean(monthly, axis=1)
+    annuals = utils.annual_timeseries(indata)
 
-        return utils.Timeseries(indata.name, times[:, 0], annuals) # annual_from_monthly
-    except:
+    # plotted at the first month of each year, as before
+    years, first = np.unique(utils.decimal_year_parts(indata.years)[0], return_index=True)
+    annuals.times = indata.times[first]
 
-        annuals = []
-        times = []
-        year = int(indata.times[0])
-        
-        while year < int(settings.YEAR)+1:
-            times += [year]
+    return annuals # annual_from_monthly
 
-            locs, = np.where(np.logical_and(indata.times >= year, indata.times < year + 1))
+#************************************************************************
+#************************************************************************
+# Fetch stage - one function per panel, returning the layers to plot
+#   as a list of (timeseries list, colour, make_plot keywords)
 
-            annuals += [np.ma.mean(indata.data[locs])]
+#***************************
+def fetch_a():
+    # A - NH POLAR STRATOSPHERIC
+    print("NH Polar Stratospheric Ozone")
 
-            year += 1
+    import soz
+    nh = soz.read_ts(DATALOC + "{}/NH_polar_ozone.txt".format("SOZ"))
 
-        return utils.Timeseries(indata.name, times, annuals) # annual_from_monthly
+    return [([nh], insitu, {"plot_label" : "(a) N. Hemisphere Polar Stratospheric Ozone (Mar)\n(actual values)", "ylabel" : "DU", "ylim" : [340, 530]})] # fetch_a
 
+#***************************
+def fetch_b():
+    # B - SH POLAR STRATOSPHERIC
+    print("SH Polar Stratospheric Ozone")
 
+    import soz
+    sh = soz.read_ts(DATALOC + "{}/SH_polar_ozone.txt".format("SOZ"))
 
+    return [([sh], insitu, {"plot_label" : "(b) S. Hemisphere Polar Stratospheric Ozone (Oct)\n(actual values)", "ylabel" : "DU", "ylim" : [180, 449]})] # fetch_b
 
+#***************************
+def fetch_c():
+    # C - APPARENT TRANSMISSION
+    print("Apparent Transmission")
 
+    import at
+    at, at24 = at.read_csv(DATALOC + "{}/mlo_trans_csv.txt".format("AT"))
+    annuals = annual_from_monthly(at)
 
-#************************************************************************
-#************************************************************************
-# 3 col 11 row plot
+    print("Using Arctic Temperature - Jessica/Deke")
 
-WIDTH = 0.80/3. # leave 0.2 for axes labels
-HEIGHT = 0.95/11.
+    #arctic = read_arct(DATALOC + "{}/arctic-60N-temps.csv".format("PLT1_1"))
+    #make_plot(ax_c, [arctic], insitu, plot_label="(c) Arctic Temperature (60-90N)\n(1981-2010)", ylabel='$^{\circ}$'+"C", ylim=[-1.9, 2.4])
 
-W_OFFSET = 0.2/3 * 0.9 # start 90% of way through spare.
-H_OFFSET = 0.04
+    return [([annuals], insitu, {"plot_label" : "(c) Apparent Transmission (Mauna Loa)\n(actual values)", "ylabel" : "AT", "ylim" : [0.81,0.99]})] # fetch_c
+
+#***************************
+def fetch_d():
+    # D - SURFACE TEMPERATURE
+    print("Surface Air Temperature")
 
-# 
-plt.figure(figsize = (16, 20))
+    import sat
+    # in situ
+    noaa, nasa, jma = sat.read_global_t(DATALOC + "{}/{}_LO.csv".format("SAT", sat.IS_timeseries_root))
+    hadcrut = sat.read_hadcrut_crutem(DATALOC+"{}/hadcrut4.1981-2010.csv".format("SAT"))
 
-# col 1
-ax_a = plt.axes([W_OFFSET, H_OFFSET + (10 * HEIGHT), WIDTH, HEIGHT])
-ax_b = plt.axes([W_OFFSET, H_OFFSET + (9 * HEIGHT), WIDTH, HEIGHT], sharex=ax_a)
-ax_c = plt.axes([W_OFFSET, H_OFFSET + (8 * HEIGHT), WIDTH, HEIGHT], sharex=ax_a)
-ax_d = plt.axes([W_OFFSET, H_OFFSET + (7 * HEIGHT), WIDTH, HEIGHT], sharex=ax_a)
-ax_e = plt.axes([W_OFFSET, H_OFFSET + (6 * HEIGHT), WIDTH, HEIGHT], sharex=ax_a)
-ax_f = plt.axes([W_OFFSET, H_OFFSET + (5 * HEIGHT), WIDTH, HEIGHT], sharex=ax_a)
-ax_g = plt.axes([W_OFFSET, H_OFFSET + (4 * HEIGHT), WIDTH, HEIGHT], sharex=ax_a)
-ax_h = plt.axes([W_OFFSET, H_OFFSET + (3 * HEIGHT), WIDTH, HEIGHT], sharex=ax_a)
-ax_i = plt.axes([W_OFFSET, H_OFFSET + (2 * HEIGHT), WIDTH, HEIGHT], sharex=ax_a)
-ax_j = plt.axes([W_OFFSET, H_OFFSET + (1 * HEIGHT), WIDTH, HEIGHT], sharex=ax_a)
-ax_k = plt.axes([W_OFFSET, H_OFFSET + (0 * HEIGHT), WIDTH, HEIGHT], sharex=ax_a)
+    # reanalyses
+    merra = utils.read_merra(settings.REANALYSISLOC + "MERRA-2_SfcAnom{}.dat".format(settings.YEAR), "temperature", "LO")
+    jra_actuals, jra_anoms = utils.read_jra55(settings.REANALYSISLOC + "JRA-55_tmp2m_global_ts.txt", "temperature")
 
-# col 2
-ax_l = plt.axes([(2 * W_OFFSET) + (1 * WIDTH), H_OFFSET + (10 * HEIGHT), WIDTH, HEIGHT])
-ax_m = plt.axes([(2 * W_OFFSET) + (1 * WIDTH), H_OFFSET + (9 * HEIGHT), WIDTH, HEIGHT], sharex=ax_l)
-ax_n = plt.axes([(2 * W_OFFSET) + (1 * WIDTH), H_OFFSET + (8 * HEIGHT), WIDTH, HEIGHT], sharex=ax_l)
-ax_o = plt.axes([(2 * W_OFFSET) + (1 * WIDTH), H_OFFSET + (7 * HEIGHT), WIDTH, HEIGHT], sharex=ax_l)
-ax_p = plt.axes([(2 * W_OFFSET) + (1 * WIDTH), H_OFFSET + (6 * HEIGHT), WIDTH, HEIGHT], sharex=ax_l)
-ax_q = plt.axes([(2 * W_OFFSET) + (1 * WIDTH), H_OFFSET + (5 * HEIGHT), WIDTH, HEIGHT], sharex=ax_l)
-ax_r = plt.axes([(2 * W_OFFSET) + (1 * WIDTH), H_OFFSET + (4 * HEIGHT), WIDTH, HEIGHT], sharex=ax_l)
-ax_s = plt.axes([(2 * W_OFFSET) + (1 * WIDTH), H_OFFSET + (3 * HEIGHT), WIDTH, HEIGHT], sharex=ax_l)
-ax_t = plt.axes([(2 * W_OFFSET) + (1 * WIDTH), H_OFFSET + (2 * HEIGHT), WIDTH, HEIGHT], sharex=ax_l)
-ax_u = plt.axes([(2 * W_OFFSET) + (1 * WIDTH), H_OFFSET + (1 * HEIGHT), WIDTH, HEIGHT], sharex=ax_l)
-ax_v = plt.axes([(2 * W_OFFSET) + (1 * WIDTH), H_OFFSET + (0 * HEIGHT), WIDTH, HEIGHT], sharex=ax_l)
+    era5_globe, era5_ocean, era5_land, era5tropics = utils.era5_ts_read(settings.REANALYSISLOC, "sat", annual=True)
+    global_era5_clim, global_era5_anoms = utils.calculate_climatology_and_anomalies_1d(era5_globe, 1981, 2010)
 
-# col 3
-ax_w = plt.axes([(3 * W_OFFSET) + (2 * WIDTH), H_OFFSET + (10 * HEIGHT), WIDTH, HEIGHT])
-ax_x = plt.axes([(3 * W_OFFSET) + (2 * WIDTH), H_OFFSET + (9 * HEIGHT), WIDTH, HEIGHT], sharex=ax_w)
-ax_y = plt.axes([(3 * W_OFFSET) + (2 * WIDTH), H_OFFSET + (8 * HEIGHT), WIDTH, HEIGHT], sharex=ax_w)
-ax_z = plt.axes([(3 * W_OFFSET) + (2 * WIDTH), H_OFFSET + (7 * HEIGHT), WIDTH, HEIGHT], sharex=ax_w)
-ax_aa = plt.axes([(3 * W_OFFSET) + (2 * WIDTH), H_OFFSET + (6 * HEIGHT), WIDTH, HEIGHT], sharex = ax_w)
-ax_ab = plt.axes([(3 * W_OFFSET) + (2 * WIDTH), H_OFFSET + (5 * HEIGHT), WIDTH, HEIGHT], sharex = ax_w)
-ax_ac = plt.axes([(3 * W_OFFSET) + (2 * WIDTH), H_OFFSET + (4 * HEIGHT), WIDTH, HEIGHT], sharex = ax_w)
-ax_ad = plt.axes([(3 * W_OFFSET) + (2 * WIDTH), H_OFFSET + (3 * HEIGHT), WIDTH, HEIGHT], sharex = ax_w)
-ax_ae = plt.axes([(3 * W_OFFSET) + (2 * WIDTH), H_OFFSET + (2 * HEIGHT), WIDTH, HEIGHT], sharex = ax_w)
-ax_af = plt.axes([(3 * W_OFFSET) + (2 * WIDTH), H_OFFSET + (1 * HEIGHT), WIDTH, HEIGHT], sharex = ax_w)
-ax_ag = plt.axes([(3 * W_OFFSET) + (2 * WIDTH), H_OFFSET + (0 * HEIGHT), WIDTH, HEIGHT], sharex = ax_w)
+    return [([noaa, nasa, jma, hadcrut], insitu, {}), \
+            ([merra, jra_anoms, era5_globe], reanalyses, {"plot_label" : "(d) Surface Temperature\n(1981-2010)", "ylabel" : '$^{\circ}$'+"C", "ylim" : [-0.9, 1.2]})] # fetch_d
 
 #***************************
-# A - NH POLAR STRATOSPHERIC
-print("NH Polar Stratospheric Ozone")
+def fetch_e():
+    # E - LOWER TROP TEMPERATURE
+    print("Lower Tropospheric Temperature")
 
-import soz
-nh = soz.read_ts(DATALOC + "{}/NH_polar_ozone.txt".format("SOZ"))
+    import ltt
 
-make_plot(ax_a, [nh], insitu, plot_label="(a) N. Hemisphere Polar Stratospheric Ozone (Mar)\n(actual values)", ylabel="DU", ylim=[340, 530])
+    raobcore, rich, ratpac, UAH, rss, era5, jra,  merra= ltt.read_csv(DATALOC + "{}/SotC_AnnTemps_2020_0220_LTTGL.csv".format("LTT"))
+
+    jra_actuals, jra_anoms = utils.read_jra55(settings.REANALYSISLOC + "JRA-55_MSUch2LT_global_ts.txt", "temperature")
+    merra_actuals, merra_anoms = utils.read_merra_LT_LS(settings.REANALYSISLOC + "MERRA2_MSU_Tanom_ann_{}.dat".format(settings.YEAR), LT=True)
+
+    # in situ, satellite, reanalyses
+    return [([raobcore, rich, ratpac], insitu, {}), \
+            ([UAH, rss], satellite, {}), \
+            ([era5, jra_anoms, merra_anoms], reanalyses, {"plot_label" : "(e) Lower Tropospheric Temperature\n(1981-2010)", "ylabel" : '$^{\circ}$'+"C", "ylim" : [-0.9, 1.2]})] # fetch_e
 
 #***************************
-# B - SH POLAR STRATOSPHERIC
-print("SH Polar Stratospheric Ozone")
+def fetch_f():
+    # F - LOWER STRAT TEMPERATURE
+    print("Lower Stratospheric Temperature")
+
+    import lst
+
+    UAH, rss, ratpac, raobcore, rich, noaa, jra, merra = lst.read_csv(DATALOC + "{}/SotC_AnnTemps_2020_0220_LSTGL.csv".format("LST"))
+
+    # upper stratosphere for completeness
+    ssu1, ssu1_2, ssu2, ssu2_2, ssu3, ssu3_2 = lst.read_ssu(DATALOC + "{}/SSU.dat".format("LST"))
 
-sh = soz.read_ts(DATALOC + "{}/SH_polar_ozone.txt".format("SOZ"))
+    eral, erao, eralo = lst.read_era5(DATALOC + "{}/ERA5_TLS_GLOBAL".format("LST"))
+    era5 = utils.Timeseries("ERA5", np.reshape(eralo.times, [-1, 12])[:,0], utils.annual_average(eralo.data))
 
-make_plot(ax_b, [sh], insitu, plot_label="(b) S. Hemisphere Polar Stratospheric Ozone (Oct)\n(actual values)", ylabel="DU", ylim=[180, 449])
+    jra_actuals, jra_anoms = utils.read_jra55(settings.REANALYSISLOC + "JRA-55_MSUch4_global_ts.txt", "temperature")
+    merra_actuals, merra_anoms = utils.read_merra_LT_LS(settings.REANALYSISLOC + "MERRA2_MSU_Tanom_ann_{}.dat".format(settings.YEAR), LS=True)
+
+    # in situ, satellite, reanalyses
+    return [([raobcore, rich, ratpac], insitu, {}), \
+            ([UAH, noaa, rss], satellite, {}), \
+            ([era5, jra_anoms, merra_anoms], reanalyses, {"plot_label" : "(f) Lower Stratospheric Temperature\n(1981-2010)", "ylabel" : '$^{\circ}$'+"C", "ylim" : [-0.9, 2.7]})] # fetch_f
 
 #***************************
-# C - APPARENT TRANSMISSION
-print("Apparent Transmission")
+def fetch_g():
+    # G - Extreme Warm/Cool Days
+    print("Temperature Extremes")
+
+    import tex
+
+    tx90p, cover = tex.obtain_timeseries(DATALOC + "{}/GHCND_{}_1951-{}_RegularGrid_global_2.5x2.5deg_LSmask.nc".format("TEX", "TX90p", int(settings.YEAR) + 1), "Ann", "GHCNDEX", "TX90p")
+    tx10p, cover = tex.obtain_timeseries(DATALOC + "{}/GHCND_{}_1951-{}_RegularGrid_global_2.5x2.5deg_LSmask.nc".format("TEX", "TX10p", int(settings.YEAR) + 1), "Ann", "GHCNDEX", "TX10p")
+
+    print("Axis in % days, so resetting back to original values (x3.65 applied in tex.py)")
 
-import at
-at, at24 = at.read_csv(DATALOC + "{}/mlo_trans_csv.txt".format("AT"))
-annuals = annual_from_monthly(at)
+    tx90p.data = tx90p.data / 3.65
+    tx10p.data = tx10p.data / 3.65
 
-make_plot(ax_c, [annuals], insitu, plot_label="(c) Apparent Transmission (Mauna Loa)\n(actual values)", ylabel="AT", ylim=[0.81,0.99])
+    # in situ
+    return [([tx90p], insitu, {}), \
+            ([tx10p], insitu, {"plot_label" : "(g) Extremes [Warm Days and Cool days (dotted)]\n(1961-1990)", "ylabel" : "% days", "ylim" : [5, 25], "ls" : ":"})] # fetch_g
 
-print("Using Arctic Temperature - Jessica/Deke")
+#***************************
+def fetch_h():
+    # H - Arctic Sea Ice Extent - Jessica/Deke give data
+    print("Arctic Sea Ice - Jessica/Deke")
+
+    arctic_max, arctic_min, antarctic_min, antarctic_max = read_sie(DATALOC +"{}/SIE.dat".format("PLT1_1"))
 
-#arctic = read_arct(DATALOC + "{}/arctic-60N-temps.csv".format("PLT1_1"))
+    return [([arctic_max], insitu, {}), \
+            ([arctic_min], insitu, {"plot_label" : "(h) Arctic Sea Ice Extent [max and min (dotted)]\n1981-2010", "ylabel" : "x 10"+r'$^6$'+" km"+r'$^2$', "ylim" : [-2.9, 2.9], "ls" : ":"})] # fetch_h
 
-#make_plot(ax_c, [arctic], insitu, plot_label="(c) Arctic Temperature (60-90N)\n(1981-2010)", ylabel='$^{\circ}$'+"C", ylim=[-1.9, 2.4])
 #***************************
-# D - SURFACE TEMPERATURE
-print("Surface Air Temperature")
+def fetch_i():
+    # I - Antarctic Sea Ice Extent - Jessica/Deke give data
+    print("Antarctic Sea Ice - Jessica/Deke")
 
-import sat
-# in situ
-noaa, nasa, jma = sat.read_global_t(DATALOC + "{}/{}_LO.csv".format("SAT", sat.IS_timeseries_root))
-hadcrut = sat.read_hadcrut_crutem(DATALOC+"{}/hadcrut4.1981-2010.csv".format("SAT"))
+    arctic_max, arctic_min, antarctic_min, antarctic_max = read_sie(DATALOC +"{}/SIE.dat".format("PLT1_1"))
 
-make_plot(ax_d, [noaa, nasa, jma, hadcrut], insitu)
+    return [([antarctic_max], insitu, {}), \
+            ([antarctic_min], insitu, {"plot_label" : "(i) Antarctic Sea Ice Extent [max and min (dotted)]\n1981-2010", "ylabel" : "x 10"+r'$^6$'+" km"+r'$^2$', "ylim" : [-1.2, 3.0], "ls" : ":"})] # fetch_i
 
-# reanalyses
-merra = utils.read_merra(settings.REANALYSISLOC + "MERRA-2_SfcAnom{}.dat".format(settings.YEAR), "temperature", "LO")
-jra_actuals, jra_anoms = utils.read_jra55(settings.REANALYSISLOC + "JRA-55_tmp2m_global_ts.txt", "temperature")
+#***************************
+def fetch_j():
+    # J - Glacier Mass Balance
+    print("Glacier Mass Balance")
 
-era5_globe, era5_ocean, era5_land, era5tropics = utils.era5_ts_read(settings.REANALYSISLOC, "sat", annual=True)
-global_era5_clim, global_era5_anoms = utils.calculate_climatology_and_anomalies_1d(era5_globe, 1981, 2010)
+    import agl
+    balance, cumul_balance = agl.read_glacier(DATALOC + "{}/global_mass_balance_{}.csv".format("AGL", settings.YEAR))
 
-make_plot(ax_d, [merra, jra_anoms, era5_globe], reanalyses, plot_label="(d) Surface Temperature\n(1981-2010)", ylabel='$^{\circ}$'+"C", ylim=[-0.9, 1.2])
+    # in situ
+    return [([cumul_balance], insitu, {"plot_label" : "(j) Glacier Cumulative Mean Specific Balance\n(actual values)", "ylabel" : "equivalent depth\n in water (m)", "ylim" : [-22, 9]})] # fetch_j
 
 #***************************
-# E - LOWER TROP TEMPERATURE
-print("Lower Tropospheric Temperature")
+def fetch_k():
+    # K - Snow Cover
+    print("NH Snow Cover")
 
-import ltt
+    import snw
 
-raobcore, rich, ratpac, UAH, rss, era5, jra,  merra= ltt.read_csv(DATALOC + "{}/SotC_AnnTemps_2020_0220_LTTGL.csv".format("LTT"))
+    NH, Eurasia, NAmer = snw.read_snow(DATALOC + "{}/Robinson-snow-cover-{}.csv".format("SNW", settings.YEAR))
 
-# in situ
-make_plot(ax_e, [raobcore, rich, ratpac], insitu)
-# satellite
-make_plot(ax_e, [UAH, rss], satellite)
+    # satellite
+    return [([annual_from_monthly(NH)], satellite, {"plot_label" : "(k) Northern Hemisphere Snow Cover Extent\n(1966-{})".format(settings.YEAR), "ylabel" : "x 10"+r'$^6$'+" km"+r'$^2$', "ylim" : [-1.9, 3.6]})] # fetch_k
+
+#***************************
+def fetch_l():
+    # L - Lower Stratospheric Water Vapour
 
-jra_actuals, jra_anoms = utils.read_jra55(settings.REANALYSISLOC + "JRA-55_MSUch2LT_global_ts.txt", "temperature")
-merra_actuals, merra_anoms = utils.read_merra_LT_LS(settings.REANALYSISLOC + "MERRA2_MSU_Tanom_ann_{}.dat".format(settings.YEAR), LT=True)
+    swv = read_swv(DATALOC + "{}/Plate1_StratWV_83hPa_BLD_{}.txt".format("SWV", settings.YEAR))
 
-# reanalyses
-make_plot(ax_e, [era5, jra_anoms, merra_anoms], reanalyses, plot_label="(e) Lower Tropospheric Temperature\n(1981-2010)", ylabel='$^{\circ}$'+"C", ylim=[-0.9, 1.2])
+    # in situ
+    return [([swv], insitu, {"plot_label" : "(l) Lower Stratospheric Water Vapor\n(actual values)", "ylabel" : "ppmv", "ylim" : [2.01, 6.99], "scatter" : True})] # fetch_l
 
 #***************************
-# F - LOWER STRAT TEMPERATURE
-print("Lower Stratospheric Temperature")
+def fetch_m():
+    # M - CLOUDINESS
+    print("Cloudiness")
 
-import lst
+    import cld
 
-UAH, rss, ratpac, raobcore, rich, noaa, jra, merra = lst.read_csv(DATALOC + "{}/SotC_AnnTemps_2020_0220_LSTGL.csv".format("LST"))
+    patmosx, hirs, misr, modis, calipso, ceres, satcorps, clara_a2, patmosdx, cci = cld.read_ts(DATALOC + "{}/{}_global_cloudiness_timeseries.txt".format("CLD", settings.YEAR), anomaly=True)
 
-# upper stratosphere for completeness
-ssu1, ssu1_2, ssu2, ssu2_2, ssu3, ssu3_2 = lst.read_ssu(DATALOC + "{}/SSU.dat".format("LST")) 
+    # satellite
+    return [([patmosx, hirs, misr, modis, calipso, ceres, satcorps, clara_a2, patmosdx, cci], satellite, {"plot_label" : "(m) Cloudiness\n(2003-2015)", "ylabel" : "%", "ylim" : [-6, 9]})] # fetch_m
 
-eral, erao, eralo = lst.read_era5(DATALOC + "{}/ERA5_TLS_GLOBAL".format("LST"))
-era5 = utils.Timeseries("ERA5", np.reshape(eralo.times, [-1, 12])[:,0], utils.annual_average(eralo.data))
+#***************************
+def fetch_n():
+    # N - Total Column Water - Land
+    print("Total Column Water Vapour - Land")
 
-# in situ
-make_plot(ax_f, [raobcore, rich, ratpac], insitu)
-# satellite
-make_plot(ax_f, [UAH, noaa, rss], satellite)
+    import tcw
 
-jra_actuals, jra_anoms = utils.read_jra55(settings.REANALYSISLOC + "JRA-55_MSUch4_global_ts.txt", "temperature")
-merra_actuals, merra_anoms = utils.read_merra_LT_LS(settings.REANALYSISLOC + "MERRA2_MSU_Tanom_ann_{}.dat".format(settings.YEAR), LS=True)
+    #merra2_land, erai_land, era5_land, jra_land, cosmic_land, gnss_land = tcw.read_csv(DATALOC + "{}/time_series_tpw_land.txt".format("TCW"), domain="L")
+    merra2_land, era5_land, jra_land, cosmic_land, gnss_land=tcw.read_ncdf_ts(DATALOC + "{}/TPW_{}_anom_TS.v2.nc".format("TCW", settings.YEAR), domain="L")
+    gnss_land.name = "GNSS (Ground Based)"
 
-# reanalyses
-make_plot(ax_f, [era5, jra_anoms, merra_anoms], reanalyses, plot_label="(f) Lower Stratospheric Temperature\n(1981-2010)", ylabel='$^{\circ}$'+"C", ylim=[-0.9, 2.7])
+    # updated file June 2020
+    print("remove TCW from June 2020")
+    alldata = np.genfromtxt(DATALOC + "TCW/TCWV_2020_ts_updated.dat")
+    alldata = np.ma.masked_where(alldata == 0.0, alldata)
+    cosmic_land = utils.Timeseries("COSMIC RO", alldata[:, 0], alldata[:, 7])
 
-#***************************
-# G - Extreme Warm/Cool Days
-print("Temperature Extremes")
+    # satellite, in situ, reanalyses
+    return [([cosmic_land], satellite, {}), \
+            ([gnss_land], insitu, {}), \
+            ([era5_land, jra_land, merra2_land], reanalyses, {"plot_label" : "(n) Total Column Water Vapour - Land\n(1981-2010)", "ylabel" : "mm", "ylim" : [-1.2, 1.9]})] # fetch_n
 
-import tex
+#***************************
+def fetch_o():
+    # O - Total Column Water - Ocean
+    print("Total Column Water Vapour - Marine")
 
-tx90p, cover = tex.obtain_timeseries(DATALOC + "{}/GHCND_{}_1951-{}_RegularGrid_global_2.5x2.5deg_LSmask.nc".format("TEX", "TX90p", int(settings.YEAR) + 1), "Ann", "GHCNDEX", "TX90p")
-tx10p, cover = tex.obtain_timeseries(DATALOC + "{}/GHCND_{}_1951-{}_RegularGrid_global_2.5x2.5deg_LSmask.nc".format("TEX", "TX10p", int(settings.YEAR) + 1), "Ann", "GHCNDEX", "TX10p")
+    import tcw
 
-print("Axis in % days, so resetting back to original values (x3.65 applied in tex.py)")
+    #merra2_ocean, era5_ocean, jra_ocean, cosmic_ocean, radiometer_ocean = tcw.read_csv(DATALOC + "{}/time_series_tpw_ocean.txt".format("TCW"), domain="O")
+    merra2_ocean, era5_ocean, jra_ocean, cosmic_ocean, radiometer_ocean = tcw.read_ncdf_ts(DATALOC + "{}/TPW_{}_anom_TS.v2.nc".format("TCW", settings.YEAR), domain="O")
+    radiometer_ocean.name = "RSS Satellite"
 
-tx90p.data = tx90p.data / 3.65
-tx10p.data = tx10p.data / 3.65
+    # updated file June 2020
+    print("remove TCW from June 2020")
+    alldata = np.genfromtxt(DATALOC + "TCW/TCWV_2020_ts_updated.dat")
+    alldata = np.ma.masked_where(alldata == 0.0, alldata)
+    cosmic_ocean = utils.Timeseries("COSMIC RO", alldata[:, 0], alldata[:, 2])
 
-# in situ
-make_plot(ax_g, [tx90p], insitu)
-make_plot(ax_g, [tx10p], insitu, plot_label="(g) Extremes [Warm Days and Cool days (dotted)]\n(1961-1990)", ylabel="% days", ylim=[5, 25], ls=":")
+    # satellite, reanalyses
+    return [([radiometer_ocean, cosmic_ocean], satellite, {}), \
+            ([era5_ocean, jra_ocean, merra2_ocean], reanalyses, {"plot_label" : "(o) Total Column Water Vapour - Ocean\n(1981-2010)", "ylabel" : "mm", "ylim" : [-1.2, 2.6]})] # fetch_o
 
 #***************************
-# H - Arctic Sea Ice Extent - Jessica/Deke give data
-print("Arctic Sea Ice - Jessica/Deke")
+def fetch_p():
+    # P - Upper Tropospheric Humidity
+    print("Upper Tropospheric Humidity")
+
+    import uth
 
-arctic_max, arctic_min, antarctic_min, antarctic_max = read_sie(DATALOC +"{}/SIE.dat".format("PLT1_1"))
+    HIRSSTART = 1979
+    MWSTART = 1999
+    ERASTART = 1979
+    hirs = uth.read_ts(DATALOC + "{}/hirs_data.aa".format("UTH"), HIRSSTART, "HIRS", smooth=12)
+    mw = uth.read_ts(DATALOC + "{}/mw_data.aa".format("UTH"), MWSTART, "Microwave", smooth=12)
+    era5 = uth.read_ts(DATALOC + "{}/era5_data.aa".format("UTH"), ERASTART, "ERA5", smooth=3)
 
-make_plot(ax_h, [arctic_max], insitu)
-make_plot(ax_h, [arctic_min], insitu, plot_label="(h) Arctic Sea Ice Extent [max and min (dotted)]\n1981-2010", ylabel="x 10"+r'$^6$'+" km"+r'$^2$', ylim=[-2.9, 2.9], ls=":")
+    # satellite, reanalyses
+    return [([annual_from_monthly(hirs), annual_from_monthly(mw)], satellite, {}), \
+            ([annual_from_monthly(era5)], reanalyses, {"plot_label" : "(p) Upper Tropospheric Humidity\n(2001-2010)", "ylabel" : "% rh", "ylim" : [-0.59, 0.89]})] # fetch_p
 
 #***************************
-# I - Antarctic Sea Ice Extent - Jessica/Deke give data
-print("Antarctic Sea Ice - Jessica/Deke")
+def fetch_q():
+    # Q - Specific Humidity - Land
+    print("Specific Humidity - Land")
 
-make_plot(ax_i, [antarctic_max], insitu)
-make_plot(ax_i, [antarctic_min], insitu, plot_label="(i) Antarctic Sea Ice Extent [max and min (dotted)]\n1981-2010", ylabel="x 10"+r'$^6$'+" km"+r'$^2$', ylim=[-1.2, 3.0], ls=":")
+    import hum
+
+    hadisdhLQ, hadcruhLQ, hadcruhextLQ, daiLQ, eraiLQ, era5LQ, merraLQ, jraLQ, era5_mskLQ, merra_mskLQ, cr20LQ = hum.read_ts(DATALOC + "{}/HUM_timeseries_ALL{}.txt".format("HUM", settings.YEAR), "q", "L")
+
+    # in situ, reanalyses
+    return [([hadisdhLQ] , insitu, {}), \
+            ([ era5LQ, merraLQ, jraLQ, cr20LQ], reanalyses, {"plot_label" : "(q) Specific Humidity - Land\n(1979-2003)", "ylabel" : "g kg"+r'$^{-1}$', "ylim" : [-0.5, 0.8]})] # fetch_q
 
 #***************************
-# J - Glacier Mass Balance
-print("Glacier Mass Balance")
+def fetch_r():
+    # R - Specific Humidity - Ocean
+    print("Specific Humidity - Marine")
+
+    import hum
 
-import agl
-balance, cumul_balance = agl.read_glacier(DATALOC + "{}/global_mass_balance_{}.csv".format("AGL", settings.YEAR))
+    hadisdhMQ, hadcruhMQ, daiMQ, nocsMQ, hoapsMQ, eraiMQ, era5MQ, merraMQ, jraMQ, cr20MQ = hum.read_ts(DATALOC + "{}/HUM_timeseries_ALL{}.txt".format("HUM", settings.YEAR), "q", "M")
 
-# in situ
-make_plot(ax_j, [cumul_balance], insitu, plot_label="(j) Glacier Cumulative Mean Specific Balance\n(actual values)", ylabel="equivalent depth\n in water (m)", ylim=[-22, 9])
+    # in situ, reanalyses
+    # satellite - [hoapsMQ] not for 2019
+    return [([hadisdhMQ, nocsMQ], insitu, {}), \
+            ([era5MQ, merraMQ, jraMQ, cr20MQ], reanalyses, {"plot_label" : "(r) Specific Humidity - Ocean\n(1979-2003)", "ylabel" : "g kg"+r'$^{-1}$', "ylim" : [-0.5,0.8]})] # fetch_r
 
 #***************************
-# K - Snow Cover
-print("NH Snow Cover")
+def fetch_s():
+    # S - Relative Humidity - Land
+    print("Relative Humidity - Land")
 
-import snw
+    import hum
 
-NH, Eurasia, NAmer = snw.read_snow(DATALOC + "{}/Robinson-snow-cover-{}.csv".format("SNW", settings.YEAR))
+    hadisdhLR, hadcruhLR, hadcruhextLR, daiLR, eraiLR, era5LR, merraLR, jraLR, era5_mskLR, merra_mskLR, cr20LR = hum.read_ts(DATALOC + "{}/HUM_timeseries_ALL{}.txt".format("HUM", settings.YEAR), "rh", "L")
 
-# satellite
-make_plot(ax_k, [annual_from_monthly(NH)], satellite, plot_label="(k) Northern Hemisphere Snow Cover Extent\n(1966-{})".format(settings.YEAR), ylabel="x 10"+r'$^6$'+" km"+r'$^2$', ylim=[-1.9, 3.6])
+    # in situ, reanalyses
+    return [([hadisdhLR, hadcruhLR, hadcruhextLR, daiLR,], insitu, {}), \
+            ([era5LR, jraLR, cr20LR], reanalyses, {"plot_label" : "(s) Relative Humidity - Land\n(1979-2003)", "ylabel" : "% rh", "ylim" : [-1.5, 2.5]})] # fetch_s
 
 #***************************
-# L - Lower Stratospheric Water Vapour
+def fetch_t():
+    # T - Relative Humidity - Ocean
+    print("Relative Humidity - Marine")
 
-swv = read_swv(DATALOC + "{}/Plate1_StratWV_83hPa_BLD_{}.txt".format("SWV", settings.YEAR))
+    import hum
 
-# in situ
-make_plot(ax_l, [swv], insitu, plot_label="(l) Lower Stratospheric Water Vapor\n(actual values)", ylabel="ppmv", ylim=[2.01, 6.99], scatter=True)
+    hadisdhMR, hadcruhMR, daiMR, nocsMR, hoapsMR, eraiMR, era5MR, merraMR, jraMR, cr20MR = hum.read_ts(DATALOC + "{}/HUM_timeseries_ALL{}.txt".format("HUM", settings.YEAR), "rh", "M")
 
+    # in situ, reanalyses
+    return [([hadisdhMR], insitu, {}), \
+            ([era5MR, jraMR, cr20MR], reanalyses, {"plot_label" : "(t) Relative Humidity - Ocean\n(1979-2003)", "ylabel" : "% rh", "ylim" : [-0.7, 1.5]})] # fetch_t
 
 #***************************
-# M - CLOUDINESS
-print("Cloudiness")
+def fetch_u():
+    # U - Precipitation - Land
+    print("Precipitation - Land")
 
-import cld
+    import pcp
+    ghcn, gpcc, gpcp = pcp.read_land(DATALOC + "{}/Land_insitu_timeseries-1979.dat".format("PCP"))
 
-patmosx, hirs, misr, modis, calipso, ceres, satcorps, clara_a2, patmosdx, cci = cld.read_ts(DATALOC + "{}/{}_global_cloudiness_timeseries.txt".format("CLD", settings.YEAR), anomaly=True)
+    # in situ
+    # reanalyses - [erai, merra] not for 2019
+    return [([ghcn, gpcc, gpcp], insitu, {"plot_label" : "(u) Precipitation - Land\n(1981-2010)", "ylabel" : "u"})] # fetch_u
+
+#***************************
+def fetch_v():
+    # V - Precipitation - Ocean
 
-# satellite
-make_plot(ax_m, [patmosx, hirs, misr, modis, calipso, ceres, satcorps, clara_a2, patmosdx, cci], satellite, plot_label="(m) Cloudiness\n(2003-2015)", ylabel="%", ylim=[-6, 9])
+    import pcp
+    gpcp = pcp.read_ocean(DATALOC + "{}/Ocean_insitu_timeseries-1979.dat".format("PCP"))
 
+    # Southern Oscillation Index (slp.read_soi) no longer plotted in this panel
+
+    # in situ
+    return [([gpcp], insitu, {"plot_label" : "(v) Precipitation - Ocean\n(1981-2010)", "ylabel" : "v"})] # fetch_v
 
 #***************************
-# N - Total Column Water - Land
-print("Total Column Water Vapour - Land")
+def fetch_w():
+    # W - OHC - Jessica & Deke provide
+    print("Ocean Heat- Jessica/Deke")
 
-import tcw
+    hadley, csiro, pmel, ncei, mri, iap = read_ohc(DATALOC + "{}/OHC.dat".format("PLT1_1"))
 
-#merra2_land, erai_land, era5_land, jra_land, cosmic_land, gnss_land = tcw.read_csv(DATALOC + "{}/time_series_tpw_land.txt".format("TCW"), domain="L")
-merra2_land, era5_land, jra_land, cosmic_land, gnss_land=tcw.read_ncdf_ts(DATALOC + "{}/TPW_{}_anom_TS.v2.nc".format("TCW", settings.YEAR), domain="L")
-gnss_land.name = "GNSS (Ground Based)"
+    return [([hadley, csiro, pmel, ncei, mri, iap], insitu, {"plot_label" : "(w) Ocean Heat Content (0-700m)\n(1983-{})".format(settings.YEAR), "ylabel" : '$10^{21}$'+"J", "ylim" : [-140, 140]})] # fetch_w
 
+#***************************
+def fetch_x():
+    # X - Sea Level Rise - Jessica & Deke provide
+    print("Sea Level Rise - Jessica/Deke")
 
-# updated file June 2020
-print("remove TCW from June 2020")
-alldata = np.genfromtxt(DATALOC + "TCW/TCWV_2020_ts_updated.dat")
-alldata = np.ma.masked_where(alldata == 0.0, alldata)
-cosmic_land = utils.Timeseries("COSMIC RO", alldata[:, 0], alldata[:, 7])
+    slr = read_slr(DATALOC + "{}/SLR.dat".format("PLT1_1"))
 
-# satellite
-make_plot(ax_n, [cosmic_land], satellite)
-# in situ
-make_plot(ax_n, [gnss_land], insitu)
-# reanalyses
-make_plot(ax_n, [era5_land, jra_land, merra2_land], reanalyses, plot_label="(n) Total Column Water Vapour - Land\n(1981-2010)", ylabel="mm", ylim=[-1.2, 1.9])
+    return [([slr], insitu, {"plot_label" : "(x) Sea Level Rise\n(actual values)", "ylabel" : "mm", "ylim" : [-21, 120]})] # fetch_x
 
 #***************************
-# O - Total Column Water - Ocean
-print("Total Column Water Vapour - Marine")
+def fetch_y():
+    # Y - Tropospheric Ozone
+    print("Tropospheric Ozone - need actuals")
 
-#merra2_ocean, era5_ocean, jra_ocean, cosmic_ocean, radiometer_ocean = tcw.read_csv(DATALOC + "{}/time_series_tpw_ocean.txt".format("TCW"), domain="O")
-merra2_ocean, era5_ocean, jra_ocean, cosmic_ocean, radiometer_ocean = tcw.read_ncdf_ts(DATALOC + "{}/TPW_{}_anom_TS.v2.nc".format("TCW", settings.YEAR), domain="O")
-radiometer_ocean.name = "RSS Satellite"
+    import tco
 
-# updated file June 2020
-print("remove TCW from June 2020")
-alldata = np.genfromtxt(DATALOC + "TCW/TCWV_2020_ts_updated.dat")
-alldata = np.ma.masked_where(alldata == 0.0, alldata)
-cosmic_ocean = utils.Timeseries("COSMIC RO", alldata[:, 0], alldata[:, 2])
+    tco = tco.read_data(DATALOC + "{}/BAMS_SOTC_TROPOSPHERIC_OZONE_TG_60Sto60N_{}.txt".format("TCO", settings.YEAR), "TCO")
 
-# satellite
-make_plot(ax_o, [radiometer_ocean, cosmic_ocean], satellite)
-# reanalyses
-make_plot(ax_o, [era5_ocean, jra_ocean, merra2_ocean], reanalyses, plot_label="(o) Total Column Water Vapour - Ocean\n(1981-2010)", ylabel="mm", ylim=[-1.2, 2.6])
+    # satellite
+    return [([annual_from_monthly(tco)], satellite, {"plot_label" : "(y) Tropospheric Ozone\n(actual values)", "ylabel" : "Ozone Burden (Tg)", "ylim" : [280, 320]})] # fetch_y
 
 #***************************
-# P - Upper Tropospheric Humidity
-print("Upper Tropospheric Humidity")
+def fetch_z():
+    # Z - Tropospheric Wind Speed
+    print("Tropospheric Wind Speed")
 
-import uth
+    import uaw
 
-HIRSSTART = 1979
-MWSTART = 1999
-ERASTART = 1979
-hirs = uth.read_ts(DATALOC + "{}/hirs_data.aa".format("UTH"), HIRSSTART, "HIRS", smooth=12)
-mw = uth.read_ts(DATALOC + "{}/mw_data.aa".format("UTH"), MWSTART, "Microwave", smooth=12)
-era5 = uth.read_ts(DATALOC + "{}/era5_data.aa".format("UTH"), ERASTART, "ERA5", smooth=3)
+    era5, erai, merra, jra55 = uaw.read_uaw_ts(DATALOC + "{}/Globe850.nc".format("UAW"), smooth=True)
 
-# satellite
-make_plot(ax_p, [annual_from_monthly(hirs), annual_from_monthly(mw)], satellite,)
-# reanalyses
-make_plot(ax_p, [annual_from_monthly(era5)], reanalyses, plot_label="(p) Upper Tropospheric Humidity\n(2001-2010)", ylabel="% rh", ylim=[-0.59, 0.89])
+    # sonde - [annual_from_monthly(grasp)]
+    # reanalyses
+    return [([annual_from_monthly(erai), annual_from_monthly(era5), annual_from_monthly(merra), annual_from_monthly(jra55)], reanalyses, {"plot_label" : "(z) Tropospheric Wind Speed at 850hPa\n(1981-2010)", "ylabel" : "m s"+r'$^{-1}$', "ylim" : [-0.5, 0.7]})] # fetch_z
 
 #***************************
-# Q - Specific Humidity - Land
-print("Specific Humidity - Land")
+def fetch_aa():
+    # AA - LAND WIND SPEED
+    print("Near Surface Wind Speed - Land")
 
-import hum
+    import wnd
 
-hadisdhLQ, hadcruhLQ, hadcruhextLQ, daiLQ, eraiLQ, era5LQ, merraLQ, jraLQ, era5_mskLQ, merra_mskLQ, cr20LQ = hum.read_ts(DATALOC + "{}/HUM_timeseries_ALL{}.txt".format("HUM", settings.YEAR), "q", "L")
+    # in situ
+    Globe = wnd.Region("Globe (excl Austr)", "GlobalNoOz", "black")
+    years, anomalies, m3, m10 = wnd.read_hadisd_annual_anomalies(Globe)
+    lwnd = utils.Timeseries("HadISD", years, anomalies)
 
-# in situ
-make_plot(ax_q, [hadisdhLQ] , insitu)
-# reanalyses
-make_plot(ax_q, [ era5LQ, merraLQ, jraLQ, cr20LQ], reanalyses, plot_label="(q) Specific Humidity - Land\n(1979-2003)", ylabel="g kg"+r'$^{-1}$', ylim=[-0.5, 0.8])
+    return [([lwnd], insitu, {"plot_label" : "(aa) Land Wind Speed\n(1981-2010)", "ylabel" : "m s"+r'$^{-1}$', "ylim" : [-0.29, 0.39]})] # fetch_aa
 
 #***************************
-# R - Specific Humidity - Ocean
-print("Specific Humidity - Marine")
+def fetch_ab():
+    # AB - OCEAN WIND SPEED
+    print("Near Surface Wind Speed - Ocean")
 
-hadisdhMQ, hadcruhMQ, daiMQ, nocsMQ, hoapsMQ, eraiMQ, era5MQ, merraMQ, jraMQ, cr20MQ = hum.read_ts(DATALOC + "{}/HUM_timeseries_ALL{}.txt".format("HUM", settings.YEAR), "q", "M")
+    import wnd
 
-# in situ
-make_plot(ax_r, [hadisdhMQ, nocsMQ], insitu)
-# satellite
-# make_plot(ax_r, [hoapsMQ], satellite) # not for 2019
-# reanalyses
-make_plot(ax_r, [era5MQ, merraMQ, jraMQ, cr20MQ], reanalyses, plot_label="(r) Specific Humidity - Ocean\n(1979-2003)", ylabel="g kg"+r'$^{-1}$', ylim=[-0.5,0.8])
+    ownd = wnd.read_ts_cube(DATALOC + "{}/rss_wind_trend_anomaly_SOTC_{}.nc".format("WND", settings.YEAR), "RSS_wind_global_annual_anom_ts", "Satellite MW Radiometers")
+    ocean_obs_clim, ocean_obs_anoms = utils.calculate_climatology_and_anomalies_1d(ownd, 1981, 2010)
 
+    # reanalyses
+    jra_actuals, jra_anoms = utils.read_jra55(settings.REANALYSISLOC + "JRA-55_ws10m_globalocean_ts.txt", "wind")
+    merra_anoms = utils.read_merra(settings.REANALYSISLOC + "MERRA-2_SfcAnom{}.dat".format(settings.YEAR), "wind", "O", anomalies=True)
+    era5_globe, era5_ocean, era5_land, era5tropics = utils.era5_ts_read(settings.REANALYSISLOC, "wnd", annual=True)
+    ocean_era5_clim, ocean_era5_anoms = utils.calculate_climatology_and_anomalies_1d(era5_ocean, 1981, 2010)
+    twenty_cr_actuals = utils.read_20cr(settings.REANALYSISLOC + "wspd10m.ocean.txt", "wind speed")
+    ocean_20cr_clim, ocean_20cr_anoms = utils.calculate_climatology_and_anomalies_1d(twenty_cr_actuals, 1981, 2010)
+
+    # satellite, reanalyses
+    return [([ocean_obs_anoms], satellite, {}), \
+            ([ocean_era5_anoms, merra_anoms, ocean_20cr_anoms], reanalyses, {"plot_label" : "(ab) Ocean Wind Speed\n(1981-2010)", "ylabel" : "m s"+r'$^{-1}$', "ylim" : [-0.29,0.49]})] # fetch_ab
 
 #***************************
-# S - Relative Humidity - Land
-print("Relative Humidity - Land")
+def fetch_ac():
+    # AC - Biomass Burning
+    print("Biomass Burning")
 
-hadisdhLR, hadcruhLR, hadcruhextLR, daiLR, eraiLR, era5LR, merraLR, jraLR, era5_mskLR, merra_mskLR, cr20LR = hum.read_ts(DATALOC + "{}/HUM_timeseries_ALL{}.txt".format("HUM", settings.YEAR), "rh", "L")
+    import bob
 
-# in situ
-make_plot(ax_s, [hadisdhLR, hadcruhLR, hadcruhextLR, daiLR,], insitu)
-# reanalyses
-make_plot(ax_s, [era5LR, jraLR, cr20LR], reanalyses, plot_label="(s) Relative Humidity - Land\n(1979-2003)", ylabel="% rh", ylim=[-1.5, 2.5])
+    gfed = bob.read_gfed_csv(DATALOC + "{}/data4Johannes.txt".format("BOB"), "global", make_annual=True)
+    gfas = bob.read_csv(DATALOC + "{}/timeseries_glob".format("BOB"), "GFAS1p4", make_annual=True)
 
+    return [([gfed, gfas], satellite, {"plot_label" : "(ac) Biomass Burning\n(actual values)", "ylabel" : "Pg C yr"+r'$^{-1}$', "ylim" : [1.25, 3.7]})] # fetch_ac
 
 #***************************
-# T - Relative Humidity - Ocean
-print("Relative Humidity - Marine")
+def fetch_ad():
+    # AD - Soil Moisture
+    print("Soil Moisture")
+
+    import sms
 
-hadisdhMR, hadcruhMR, daiMR, nocsMR, hoapsMR, eraiMR, era5MR, merraMR, jraMR, cr20MR = hum.read_ts(DATALOC + "{}/HUM_timeseries_ALL{}.txt".format("HUM", settings.YEAR), "rh", "M")
+    cube_list = np.array(iris.load(DATALOC + "{}/ESA_CCI_SM_COMBINED_monthAnomaliesPerHemisphere.nc".format("SMS")))
+    names = np.array([c.var_name for c in cube_list])
+    glob = cube_list[names == "Anomalies_global"][0]
+    years = sms.convert_times(glob)
 
-# in situ
-make_plot(ax_t, [hadisdhMR], insitu)
-# reanalyses
-make_plot(ax_t, [era5MR, jraMR, cr20MR], reanalyses, plot_label="(t) Relative Humidity - Ocean\n(1979-2003)", ylabel="% rh", ylim=[-0.7, 1.5])
+    annuals = annual_from_monthly(utils.Timeseries("SMS", years, glob.data))
+    print(annuals)
 
+    return [([annuals], satellite, {"plot_label" : "(ad) Soil Moisture\n(1991-2010)", "ylabel" : "m"+r'$^{3}$', "ylim" : [-0.009, 0.009]})] # fetch_ad
 
 #***************************
-# U - Precipitation - Land
-print("Precipitation - Land")
+def fetch_ae():
+    # AE - Terrestrial Water Storage
+    print("Terrestrial Water Storage")
 
-import pcp
-ghcn, gpcc, gpcp = pcp.read_land(DATALOC + "{}/Land_insitu_timeseries-1979.dat".format("PCP"))
+    import tws
 
-# in situ
-make_plot(ax_u, [ghcn, gpcc, gpcp], insitu, plot_label="(u) Precipitation - Land\n(1981-2010)", ylabel="u")
-# reanalyses - not for 2019
-# make_plot(ax_u, [erai, merra], reanalyses, plot_label="(u) Precipitation - Land\n(1981-2010)", ylabel="u)
+    grace = tws.read_ts(DATALOC + "{}/avg_JPLM06v2_land.txt".format("TWS"), "GRACE")
+    # NOTE, model used for 2018 report alongside GRACE
+    annuals = annual_from_monthly(grace)
+
+    return [([annuals], satellite, {"plot_label" : "(ae) Terrestrial Water Storage\n(2005-2010)", "ylabel" : "equivalent depth\nin water (cm)", "ylim" : [-2.3, 1.4]})] # fetch_ae
 
 #***************************
-# V - Precipitation - Ocean
-gpcp = pcp.read_ocean(DATALOC + "{}/Ocean_insitu_timeseries-1979.dat".format("PCP"))
+def fetch_af():
+    # AF - FAPAR
+    print("FAPAR")
+
+    import fpr
+
+    data = fpr.read_binary_ts(DATALOC + "{}/TimeSeries_faparanomaliesglobal_bams_v2018_C6_2020.bin".format("FPR"))
 
-# in situ
-make_plot(ax_v, [gpcp], insitu, plot_label="(v) Precipitation - Ocean\n(1981-2010)", ylabel="v")
+    layers = []
+    for dataset in data:
+        if dataset.name == "Globe":
+            annuals = annual_from_monthly(dataset)
+            layers += [([annuals], satellite, {"plot_label" : "(af) FAPAR\n(1998-{})".format(settings.YEAR), "ylabel" : "FAPAR", "ylim" : [-0.009, 0.019]})]
+
+    return layers # fetch_af
 
 #***************************
-# V - Southern Oscillation Index
-print("Southern Oscillation Index")
+def fetch_ag():
+    # AG - Land Surface Albedo
+    print("Land Surface Albedo")
 
-import slp
+    import abd
 
-soi = slp.read_soi(DATALOC + "{}/soiplaintext.html".format("SLP"))
+    IRdata = abd.read_binary_ts(DATALOC + "{}/TimeseriesBHRNIR_C7_poids_{}.bin".format("ABD", int(settings.YEAR)+1))
+    Vdata = abd.read_binary_ts(DATALOC + "{}/TimeseriesBHRV_C7_poids_{}.bin".format("ABD", int(settings.YEAR)+1))
 
-#make_plot(ax_v, [soi], insitu, plot_label="(v) Southern Oscillation Index\n ", ylabel="Standard Units", ylim=[-40, 49])
+    layers = []
+    for dataset in Vdata:
+        if dataset.name == "Globe":
+            annuals = annual_from_monthly(dataset)
+            layers += [([annuals], satellite, {})]
 
-#***************************
-# W - OHC - Jessica & Deke provide
-print("Ocean Heat- Jessica/Deke")
+    for dataset in IRdata:
+        if dataset.name == "Globe":
+            annuals = annual_from_monthly(dataset)
+            layers += [([annuals], satellite, {"plot_label" : "(ag) Land Surface Albedo - visible & infrared (dotted)\n(2003-{})".format(settings.YEAR), "ylabel" : "%", "ylim" : [-4, 5], "ls" : ":"})]
 
-hadley, csiro, pmel, ncei, mri, iap = read_ohc(DATALOC + "{}/OHC.dat".format("PLT1_1"))
+    return layers # fetch_ag
 
-make_plot(ax_w, [hadley, csiro, pmel, ncei, mri, iap], insitu, plot_label="(w) Ocean Heat Content (0-700m)\n(1983-{})".format(settings.YEAR), ylabel='$10^{21}$'+"J", ylim=[-140, 140])
 
-#***************************
-# X - Sea Level Rise - Jessica & Deke provide
-print("Sea Level Rise - Jessica/Deke")
+#************************************************************************
+# panel name, fetch function and the input files (glob patterns) it depends on
+PANELS = [("a", fetch_a, [DATALOC + "SOZ/NH_polar_ozone.txt"]), \
+          ("b", fetch_b, [DATALOC + "SOZ/SH_polar_ozone.txt"]), \
+          ("c", fetch_c, [DATALOC + "AT/mlo_trans_csv.txt"]), \
+          ("d", fetch_d, [DATALOC + "SAT/*", settings.REANALYSISLOC + "MERRA-2_SfcAnom*", \
+                              settings.REANALYSISLOC + "JRA-55_tmp2m_global_ts.txt", settings.REANALYSISLOC + "era5_t2m_*"]), \
+          ("e", fetch_e, [DATALOC + "LTT/*", settings.REANALYSISLOC + "JRA-55_MSUch2LT_global_ts.txt", \
+                              settings.REANALYSISLOC + "MERRA2_MSU_Tanom_ann_*"]), \
+          ("f", fetch_f, [DATALOC + "LST/*", settings.REANALYSISLOC + "JRA-55_MSUch4_global_ts.txt", \
+                              settings.REANALYSISLOC + "MERRA2_MSU_Tanom_ann_*"]), \
+          ("g", fetch_g, [DATALOC + "TEX/GHCND_TX*"]), \
+          ("h", fetch_h, [DATALOC + "PLT1_1/SIE.dat"]), \
+          ("i", fetch_i, [DATALOC + "PLT1_1/SIE.dat"]), \
+          ("j", fetch_j, [DATALOC + "AGL/*"]), \
+          ("k", fetch_k, [DATALOC + "SNW/*"]), \
+          ("l", fetch_l, [DATALOC + "SWV/Plate1_StratWV_*"]), \
+          ("m", fetch_m, [DATALOC + "CLD/*"]), \
+          ("n", fetch_n, [DATALOC + "TCW/*"]), \
+          ("o", fetch_o, [DATALOC + "TCW/*"]), \
+          ("p", fetch_p, [DATALOC + "UTH/*"]), \
+          ("q", fetch_q, [DATALOC + "HUM/HUM_timeseries_ALL*"]), \
+          ("r", fetch_r, [DATALOC + "HUM/HUM_timeseries_ALL*"]), \
+          ("s", fetch_s, [DATALOC + "HUM/HUM_timeseries_ALL*"]), \
+          ("t", fetch_t, [DATALOC + "HUM/HUM_timeseries_ALL*"]), \
+          ("u", fetch_u, [DATALOC + "PCP/Land_insitu_timeseries-1979.dat"]), \
+          ("v", fetch_v, [DATALOC + "PCP/Ocean_insitu_timeseries-1979.dat"]), \
+          ("w", fetch_w, [DATALOC + "PLT1_1/OHC.dat"]), \
+          ("x", fetch_x, [DATALOC + "PLT1_1/SLR.dat"]), \
+          ("y", fetch_y, [DATALOC + "TCO/*"]), \
+          ("z", fetch_z, [DATALOC + "UAW/Globe850.nc"]), \
+          ("aa", fetch_aa, [DATALOC + "WND/*"]), \
+          ("ab", fetch_ab, [DATALOC + "WND/rss_wind_*", settings.REANALYSISLOC + "JRA-55_ws10m_globalocean_ts.txt", \
+                                settings.REANALYSISLOC + "MERRA-2_SfcAnom*", settings.REANALYSISLOC + "era5_ws10_*", \
+                                settings.REANALYSISLOC + "wspd10m.ocean.txt"]), \
+          ("ac", fetch_ac, [DATALOC + "BOB/*"]), \
+          ("ad", fetch_ad, [DATALOC + "SMS/*"]), \
+          ("ae", fetch_ae, [DATALOC + "TWS/*"]), \
+          ("af", fetch_af, [DATALOC + "FPR/*"]), \
+          ("ag", fetch_ag, [DATALOC + "ABD/*"])]
+
+CACHELOC = DATALOC + "PLT1_1/cache/"
+# bump to discard every cached panel
+CACHE_VERSION = 1
+# where the section modules are
+CODELOC = os.path.dirname(os.path.abspath(__file__))
 
-slr = read_slr(DATALOC + "{}/SLR.dat".format("PLT1_1"))
+#************************************************************************
+def panel_modules(fetch):
+    """
+    Source files of the code a fetch function depends on - utils.py,
+    settings.py and every section module it imports.  Whole files are used
+    on purpose: the readers reach utils through many helpers, so any edit to
+    utils.py or settings.py refetches every panel rather than risk a stale one.
 
-make_plot(ax_x, [slr], insitu, plot_label="(x) Sea Level Rise\n(actual values)", ylabel="mm", ylim=[-21, 120])
+    :param func fetch: fetch function
 
-#***************************
-# Y - Tropospheric Ozone
-print("Tropospheric Ozone - need actuals")
+    :returns: list of filenames
+    """
 
-import tco
+    # names used by the function (imports included) and any nested code
+    codes = [fetch.__code__]
+    names = set()
+    while codes:
+        code = codes.pop()
+        names.update(code.co_names)
+        codes += [const for const in code.co_consts if inspect.iscode(const)]
 
-tco = tco.read_data(DATALOC + "{}/BAMS_SOTC_TROPOSPHERIC_OZONE_TG_60Sto60N_{}.txt".format("TCO", settings.YEAR), "TCO")
+    modules = [os.path.join(CODELOC, "utils.py"), os.path.join(CODELOC, "settings.py")]
+    for name in sorted(names):
+        filename = os.path.join(CODELOC, "{}.py".format(name))
+        if os.path.exists(filename) and filename not in modules:
+            modules += [filename]
 
-# satellite
-make_plot(ax_y, [annual_from_monthly(tco)], satellite, plot_label="(y) Tropospheric Ozone\n(actual values)", ylabel="Ozone Burden (Tg)", ylim=[280, 320])
+    return modules # panel_modules
 
+#************************************************************************
+def panel_signature(fetch, sources):
+    """
+    Fingerprint of a panel - CACHE_VERSION, the code of its fetch function,
+    the contents of the modules it uses, and the name, size and modification
+    time of each of its input files
 
-#***************************
-# Z - Tropospheric Wind Speed
-print("Tropospheric Wind Speed")
+    :param func fetch: fetch function
+    :param list sources: glob patterns of input files
 
-import uaw
+    :returns: signature string
+    """
 
-era5, erai, merra, jra55 = uaw.read_uaw_ts(DATALOC + "{}/Globe850.nc".format("UAW"), smooth=True)
+    signature = hashlib.sha1("{}\n{}".format(CACHE_VERSION, inspect.getsource(fetch)).encode())
+    for filename in panel_modules(fetch):
+        with open(filename, "rb") as infile:
+            signature.update(infile.read())
+    for pattern in sources:
+        for filename in sorted(glob.glob(pattern)):
+            stat = os.stat(filename)
+            signature.update("{} {} {}".format(filename, stat.st_size, stat.st_mtime).encode())
 
-# sonde
-# make_plot(ax_z, [annual_from_monthly(grasp)], insitu)
-# reanalyses
-make_plot(ax_z, [annual_from_monthly(erai), annual_from_monthly(era5), annual_from_monthly(merra), annual_from_monthly(jra55)], reanalyses, plot_label="(z) Tropospheric Wind Speed at 850hPa\n(1981-2010)", ylabel="m s"+r'$^{-1}$', ylim=[-0.5, 0.7])
+    return signature.hexdigest() # panel_signature
 
-#***************************
-# AA - LAND WIND SPEED
-print("Near Surface Wind Speed - Land")
+#************************************************************************
+def fetch_panel(panel):
+    """
+    Run the fetch function for a panel, and cache the layers
 
-import wnd
+    :param str panel: panel name
 
-# in situ
-Globe = wnd.Region("Globe (excl Austr)", "GlobalNoOz", "black")
-years, anomalies, m3, m10 = wnd.read_hadisd_annual_anomalies(Globe)
-lwnd = utils.Timeseries("HadISD", years, anomalies)
+    :returns: layers
+    """
 
-make_plot(ax_aa, [lwnd], insitu, plot_label="(aa) Land Wind Speed\n(1981-2010)", ylabel="m s"+r'$^{-1}$', ylim=[-0.29, 0.39])
+    name, fetch, sources = [p for p in PANELS if p[0] == panel][0]
 
-#***************************
-# AB - OCEAN WIND SPEED
-print("Near Surface Wind Speed - Ocean")
+    layers = fetch()
 
-ownd = wnd.read_ts_cube(DATALOC + "{}/rss_wind_trend_anomaly_SOTC_{}.nc".format("WND", settings.YEAR), "RSS_wind_global_annual_anom_ts", "Satellite MW Radiometers")
-ocean_obs_clim, ocean_obs_anoms = utils.calculate_climatology_and_anomalies_1d(ownd, 1981, 2010)
+    with open(os.path.join(CACHELOC, "{}.pkl".format(name)), "wb") as outfile:
+        pickle.dump((panel_signature(fetch, sources), layers), outfile, pickle.HIGHEST_PROTOCOL)
 
-make_plot(ax_ab, [ocean_obs_anoms], satellite)
+    return layers # fetch_panel
 
-# reanalyses
-jra_actuals, jra_anoms = utils.read_jra55(settings.REANALYSISLOC + "JRA-55_ws10m_globalocean_ts.txt", "wind")
-merra_anoms = utils.read_merra(settings.REANALYSISLOC + "MERRA-2_SfcAnom{}.dat".format(settings.YEAR), "wind", "O", anomalies=True)
-era5_globe, era5_ocean, era5_land, era5tropics = utils.era5_ts_read(settings.REANALYSISLOC, "wnd", annual=True)
-ocean_era5_clim, ocean_era5_anoms = utils.calculate_climatology_and_anomalies_1d(era5_ocean, 1981, 2010)
-twenty_cr_actuals = utils.read_20cr(settings.REANALYSISLOC + "wspd10m.ocean.txt", "wind speed")
-ocean_20cr_clim, ocean_20cr_anoms = utils.calculate_climatology_and_anomalies_1d(twenty_cr_actuals, 1981, 2010)
+#************************************************************************
+def clear_cache():
+    """
+    Delete all the cached panel layers
+    """
 
-make_plot(ax_ab, [ocean_era5_anoms, merra_anoms, ocean_20cr_anoms], reanalyses, plot_label="(ab) Ocean Wind Speed\n(1981-2010)", ylabel="m s"+r'$^{-1}$', ylim=[-0.29,0.49])
+    for cachefile in glob.glob(os.path.join(CACHELOC, "*.pkl")):
+        os.remove(cachefile)
 
-#***************************
-# AC - Biomass Burning
-print("Biomass Burning")
+    return # clear_cache
 
-import bob
+#************************************************************************
+def get_all_panels(processes=None, refresh=False):
+    """
+    Layers for every panel, from the cache if the inputs are unchanged,
+    otherwise fetched and annualised in parallel.  Panels whose inputs
+    would exceed the memory budget are fetched one at a time afterwards.
 
-gfed = bob.read_gfed_csv(DATALOC + "{}/data4Johannes.txt".format("BOB"), "global", make_annual=True)
-gfas = bob.read_csv(DATALOC + "{}/timeseries_glob".format("BOB"), "GFAS1p4", make_annual=True)
+    :param int processes: number of worker processes (default all CPUs)
+    :param bool refresh: ignore the cache
 
-make_plot(ax_ac, [gfed, gfas], satellite, plot_label="(ac) Biomass Burning\n(actual values)", ylabel="Pg C yr"+r'$^{-1}$', ylim=[1.25, 3.7])
+    :returns: dict of panel name : layers
+    """
 
+    if not os.path.exists(CACHELOC):
+        os.makedirs(CACHELOC)
 
-#***************************
-# AD - Soil Moisture
-print("Soil Moisture")
+    all_layers = {}
+    to_fetch = []
+    for name, fetch, sources in PANELS:
+        cachefile = os.path.join(CACHELOC, "{}.pkl".format(name))
 
-import sms
+        if not refresh and os.path.exists(cachefile):
+            with open(cachefile, "rb") as infile:
+                signature, layers = pickle.load(infile)
+            if signature == panel_signature(fetch, sources):
+                all_layers[name] = layers
+                continue
 
-cube_list = np.array(iris.load(DATALOC + "{}/ESA_CCI_SM_COMBINED_monthAnomaliesPerHemisphere.nc".format("SMS")))
-names = np.array([c.var_name for c in cube_list])
-glob = cube_list[names == "Anomalies_global"][0]
-years = sms.convert_times(glob)
+        to_fetch += [name]
 
-annuals = annual_from_monthly(utils.Timeseries("SMS", years, glob.data))
-print(annuals)
-make_plot(ax_ad, [annuals], satellite, plot_label="(ad) Soil Moisture\n(1991-2010)", ylabel="m"+r'$^{3}$', ylim=[-0.009, 0.009])
+    print("{} panels from cache".format(len(all_layers)))
 
+    footprints = [utils.estimate_footprint([f for pattern in p[2] for f in glob.glob(pattern)]) \
+                      for p in PANELS if p[0] in to_fetch]
+    light, heavy = utils.split_by_footprint(to_fetch, footprints)
 
-#***************************
-# AE - Terrestrial Water Storage
-print("Terrestrial Water Storage")
+    if len(light) > 0:
+        print("Fetching panels {}".format(", ".join(light)))
+        pool = multiprocessing.Pool(processes)
+        all_layers.update(zip(light, pool.map(fetch_panel, light)))
+        pool.close()
+        pool.join()
 
-import tws
+    for name in heavy:
+        print("Fetching panel {} on its own".format(name))
+        all_layers[name] = fetch_panel(name)
 
-grace = tws.read_ts(DATALOC + "{}/avg_JPLM06v2_land.txt".format("TWS"), "GRACE")
-# NOTE, model used for 2018 report alongside GRACE
-annuals = annual_from_monthly(grace)
-make_plot(ax_ae, [annuals], satellite, plot_label="(ae) Terrestrial Water Storage\n(2005-2010)", ylabel="equivalent depth\nin water (cm)", ylim=[-2.3, 1.4])
+    return all_layers # get_all_panels
 
-#***************************
-# AF - FAPAR
-print("FAPAR")
+#************************************************************************
+def render(all_layers):
+    """
+    Draw the 3 col 11 row plate from the panel layers
 
-import fpr
+    :param dict all_layers: panel name : layers
+    """
 
-data = fpr.read_binary_ts(DATALOC + "{}/TimeSeries_faparanomaliesglobal_bams_v2018_C6_2020.bin".format("FPR"))
+    WIDTH = 0.80/3. # leave 0.2 for axes labels
+    HEIGHT = 0.95/11.
 
-for dataset in data:
-    if dataset.name == "Globe":
-        
-        annuals = annual_from_monthly(dataset)
-        make_plot(ax_af, [annuals], satellite, plot_label="(af) FAPAR\n(1998-{})".format(settings.YEAR), ylabel="FAPAR", ylim=[-0.009, 0.019])
+    W_OFFSET = 0.2/3 * 0.9 # start 90% of way through spare.
+    H_OFFSET = 0.04
 
+    fig = plt.figure(figsize = (16, 20))
 
-#***************************
-# AG - Land Surface Albedo
-print("Land Surface Albedo")
+    # columns of panels, top to bottom, sharing x-axis with the top panel
+    columns = [["a", "b", "c", "d", "e", "f", "g", "h", "i", "j", "k"], \
+               ["l", "m", "n", "o", "p", "q", "r", "s", "t", "u", "v"], \
+               ["w", "x", "y", "z", "aa", "ab", "ac", "ad", "ae", "af", "ag"]]
 
-import abd
+    axes = {}
+    for c, column in enumerate(columns):
+        for r, name in enumerate(column):
+            rect = [((c + 1) * W_OFFSET) + (c * WIDTH), H_OFFSET + ((10 - r) * HEIGHT), WIDTH, HEIGHT]
+            if r == 0:
+                axes[name] = plt.axes(rect)
+            else:
+                axes[name] = plt.axes(rect, sharex=axes[column[0]])
 
-IRdata = abd.read_binary_ts(DATALOC + "{}/TimeseriesBHRNIR_C7_poids_{}.bin".format("ABD", int(settings.YEAR)+1))
-Vdata = abd.read_binary_ts(DATALOC + "{}/TimeseriesBHRV_C7_poids_{}.bin".format("ABD", int(settings.YEAR)+1))
+    for name, fetch, sources in PANELS:
+        for ts_list, color, kwargs in all_layers[name]:
+            make_plot(axes[name], ts_list, color, **kwargs)
 
-for dataset in Vdata:
-    if dataset.name == "Globe":
-        annuals = annual_from_monthly(dataset)
-        make_plot(ax_ag, [annuals], satellite)
+    # tidy up
+    for name in axes:
+        axes[name].axhline(0, ls="--", color="0.5")
 
-for dataset in IRdata:
-    if dataset.name == "Globe":
-        annuals = annual_from_monthly(dataset)
-        make_plot(ax_ag, [annuals], satellite, plot_label="(ag) Land Surface Albedo - visible & infrared (dotted)\n(2003-{})".format(settings.YEAR), ylabel="%", ylim=[-4, 5], ls=":")
+    axes["a"].set_xlim([1950, int(settings.YEAR)+2])
+    axes["l"].set_xlim([1960, int(settings.YEAR)+2])
+    axes["w"].set_xlim([1980, int(settings.YEAR)+2])
 
+    # remove x-tick labels on all but lowest 3.
+    plt.setp([axes[name].get_xticklabels() for column in columns for name in column[:-1]], visible=False)
 
-#************************************************************************
-# tidy up
-all_axes = [ax_a, ax_b, ax_c, ax_d, ax_e, ax_f, ax_g, ax_h, ax_i, ax_j, ax_k, ax_l, ax_m, ax_n, ax_o, ax_p, ax_q, ax_r, ax_s, ax_t, ax_u, ax_v, ax_w, ax_x, ax_y, ax_z, ax_aa, ax_ab, ax_ac, ax_ad, ax_ae, ax_af, ax_ag]
+    utils.save_figure(settings.IMAGELOC + "plate_1_1{}".format(settings.OUTFMT), fig=fig)
 
-for ax in all_axes:
-    ax.axhline(0, ls="--", color="0.5")
+    plt.close(fig)
 
-ax_a.set_xlim([1950, int(settings.YEAR)+2])
-ax_l.set_xlim([1960, int(settings.YEAR)+2])
-ax_w.set_xlim([1980, int(settings.YEAR)+2])
+    return # render
 
-# remove x-tick labels on all but lowest 3.
-plt.setp([a.get_xticklabels() for a in [ax_a, ax_b, ax_c, ax_d, ax_e, ax_f, ax_g, ax_h, ax_i, ax_j, ax_l, ax_m, ax_n, ax_o, ax_p, ax_q, ax_r, ax_s, ax_t, ax_u, ax_w, ax_x, ax_y, ax_z, ax_aa, ax_ab, ax_ac, ax_ad, ax_ae, ax_af]], visible=False)
+#************************************************************************
+if __name__ == "__main__":
 
+    import argparse
 
+    # set up keyword arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--refresh', dest='refresh', action='store_true', default=False,
+                        help='Ignore cached panel data')
+    parser.add_argument('--no-cache', dest='no_cache', action='store_true', default=False,
+                        help='Delete the cached panel data (in {}) and fetch every panel again'.format(CACHELOC))
+    parser.add_argument('--processes', dest='processes', action='store', default=None, type=int,
+                        help='Number of processes for reading panel data')
 
-plt.savefig(settings.IMAGELOC + "plate_1_1{}".format(settings.OUTFMT))
+    args = parser.parse_args()
+    if args.no_cache:
+        clear_cache()
+    render(get_all_panels(processes=args.processes, refresh=args.refresh))
 
-plt.close()
 #************************************************************************
 #                                 END
 #************************************************************************
@@ -360,7 +360,7 @@ def run_all_plots():
 
         fig.subplots_adjust(right=0.96, top=0.995, bottom=0.02, hspace=0.001)
 
-        plt.savefig(settings.IMAGELOC+"SAT_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"SAT_ts{}".format(settings.OUTFMT))
 
         plt.close()
 
@@ -513,6 +513,8 @@ def run_all_plots():
                                        settings.COLOURMAP_DICT["temperature"], bounds, \
                                        "Anomalies from 1981-2010 ("+r'$^{\circ}$'+"C)", title="NASA GISS")
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
@@ -16,55 +16,82 @@ from __future__ import print_function
 #                                 START
 #************************************************************************
 import matplotlib.pyplot as plt
+import matplotlib.colors as mpl_colors
 import numpy as np
 
 import os
+import inspect
+import hashlib
 import configparser
 
 #************************************************************************
-def adjust_RdYlBu():
+def base_lut(name, N=256):
     '''
-    Original RdYlBu has a greenish colour on the blue end, which doesn't contrast
-    well with the yellow.  As this is a diverging colourmap, want to have a larger
-    distinction for the positives and negatives.
+    Lookup table of a matplotlib colourmap
 
-    Take the colourmap, move the blues along a bit, and repeat at the end.
+    :param str name: name of matplotlib colourmap
+    :param int N: number of entries
+
+    :returns: (N, 4) array of RGBA values
     '''
 
-    print("for 2017/18 - change to match the purple adjustment")
+    return plt.colormaps[name].resampled(N)(np.arange(N)) # base_lut
 
-    cmap = plt.cm.RdYlBu
+#************************************************************************
+def white_centre(lut):
+    '''
+    Enforce white for the centre of the colour range
 
-    cmaplist = [cmap(i) for i in range(cmap.N)]
+    :param array lut: (256, 4) array of RGBA values
 
-    # ignore first 20 of the blues
-    N = 20
-    retained_colours = np.array(cmaplist[255//2 + N :])
+    :returns: lut
+    '''
 
-    stretched = np.ones((len(cmaplist[255//2:]), 4))
+    lut[126:130] = 1.0
 
-    # interpolate out
-    for i in range(stretched.shape[1]):
-        stretched[:, i] = np.interp(np.linspace(0, retained_colours.shape[0], stretched.shape[0]), \
-                                        list(range(retained_colours.shape[0])), retained_colours[:, i])
+    return lut # white_centre
 
-    # convert to tuple
-    new_colours = []
-    for c in stretched:
-        new_colours += [tuple(c)]
+#************************************************************************
+def stretch_upper(lut, N=20):
+    '''
+    Drop the first N colours of the upper half of the lookup table and
+    stretch the remainder back out to fill it (linear interpolation).
+
+    :param array lut: (256, 4) array of RGBA values
+    :param int N: number of colours to drop
+
+    :returns: lut
+    '''
 
-    # copy back
-    cmaplist[255//2:] = new_colours
+    retained_colours = lut[255//2 + N :]
+    nout = lut.shape[0] - 255//2
 
-    # enforce white for the centre of the colour range
-    for i in [126, 127, 128, 129]:
-        cmaplist[i] = (1.0, 1.0, 1.0, 1.0)
+    # fractional index into retained colours, clamped at the end as np.interp does
+    locs = np.clip(np.linspace(0, retained_colours.shape[0], nout), 0, retained_colours.shape[0] - 1)
+    lower = np.floor(locs).astype(int)
+    upper = np.minimum(lower + 1, retained_colours.shape[0] - 1)
+    weight = (locs - lower)[:, None]
 
-    # and make the colour map
-    cmap = cmap.from_list('Custom cmap', cmaplist, cmap.N)
-    cmap_r = cmap.from_list('Custom cmap', cmaplist[::-1], cmap.N)
+    lut[255//2:] = (retained_colours[lower] * (1. - weight)) + (retained_colours[upper] * weight)
 
-    return cmap, cmap_r # adjust_RdYlBu
+    return lut # stretch_upper
+
+#************************************************************************
+def adjust_RdYlBu():
+    '''
+    Original RdYlBu has a greenish colour on the blue end, which doesn't contrast
+    well with the yellow.  As this is a diverging colourmap, want to have a larger
+    distinction for the positives and negatives.
+
+    Take the colourmap, move the blues along a bit, and repeat at the end.
+
+    :returns: (256, 4) array of RGBA values
+    '''
+
+    print("for 2017/18 - change to match the purple adjustment")
+
+    # ignore first 20 of the blues
+    return white_centre(stretch_upper(base_lut("RdYlBu"), N=20)) # adjust_RdYlBu
 
 #************************************************************************
 def adjust_PuOr():
@@ -74,85 +101,196 @@ def adjust_PuOr():
     distinction for the positives and negatives.
 
     Take the colourmap, move the purples along a bit, and repeat at the end.
+
+    :returns: (256, 4) array of RGBA values
+    '''
+
+    # ignore first 20 of the purples
+    return white_centre(stretch_upper(base_lut("PuOr"), N=20)) # adjust_PuOr
+
+#************************************************************************
+def make_BrBu():
     '''
+    Use the BrBG and the RdBu colourmaps to create a BrBu map in style of Brewer colours
 
-    cmap = plt.cm.PuOr
+    :returns: (256, 4) array of RGBA values
+    '''
 
-    cmaplist = [cmap(i) for i in range(cmap.N)]
+    lut = base_lut("BrBG")
+    lut[255//2:] = base_lut("RdBu")[255//2:]
 
-    # ignore first 20 of the purples
-    N = 20    
-    retained_colours = np.array(cmaplist[255//2 + N :])
+    return white_centre(lut) # make_BrBu
 
-    stretched = np.ones((len(cmaplist[255//2:]), 4))
+#************************************************************************
+def make_BrBG():
+    '''
+    Enforce white at centre of BrBG (not the case using the default)
 
-    # interpolate out
-    for i in range(stretched.shape[1]):
-        stretched[:, i] = np.interp(np.linspace(0, retained_colours.shape[0], stretched.shape[0]), \
-                                    list(range(retained_colours.shape[0])), retained_colours[:, i])
+    :returns: (256, 4) array of RGBA values
+    '''
 
-    # convert to tuple
-    new_colours = []
-    for c in stretched:
-        new_colours += [tuple(c)]
+    return white_centre(base_lut("BrBG")) # make_BrBG
 
-    # copy back
-    cmaplist[255//2:] = new_colours
+#************************************************************************
+# name : function returning the (N, 4) lookup table
+COLOURMAP_REGISTRY = {"RdYlBu" : adjust_RdYlBu, \
+                          "PuOr" : adjust_PuOr, \
+                          "BrBu" : make_BrBu, \
+                          "BrBG" : make_BrBG}
 
-    # enforce white for the centre of the colour range
-    for i in [126, 127, 128, 129]:
-        cmaplist[i] = (1.0, 1.0, 1.0, 1.0)
+#************************************************************************
+def register_colourmap(name, builder):
+    '''
+    Add a colourmap to the registry.  Nothing is built until it is first used.
 
-    # and make the colour map
-    cmap = cmap.from_list('Custom cmap', cmaplist, cmap.N)
-    cmap_r = cmap.from_list('Custom cmap', cmaplist[::-1], cmap.N)
+    :param str name: name of colourmap (without "_r")
+    :param func builder: function returning (N, 4) array of RGBA values
+    '''
 
-    return cmap, cmap_r # adjust_RdYlBu
+    COLOURMAP_REGISTRY[name] = builder
+    LUTS.pop(name, None)
+    COLOURMAPS.pop(name, None)
+    COLOURMAPS.pop(name + "_r", None)
+
+    return # register_colourmap
 
 #************************************************************************
-def make_BrBu():
+# bump to discard every cached lookup table
+LUT_VERSION = 1
+
+def _builder_sources(function, seen=None):
     '''
-    Use the BrBG and the RdBu colourmaps to create a BrBu map in style of Brewer colours
+    Source of a function and of every module-level function it calls, in turn
+
+    :param func function: function to read
+    :param set seen: functions already included
+
+    :returns: list of str
     '''
 
+    if seen is None:
+        seen = set()
+    if function in seen:
+        return []
+    seen.add(function)
+
+    try:
+        sources = [inspect.getsource(function)]
+    except (OSError, TypeError):
+        # no source (e.g. defined interactively) - use the code and its constants
+        code = function.__code__
+        sources = [repr((code.co_code, code.co_consts, function.__defaults__))]
+
+    # names used by the function (and any nested functions or lambdas)
+    codes = [function.__code__]
+    names = set()
+    while codes:
+        code = codes.pop()
+        names.update(code.co_names)
+        codes += [const for const in code.co_consts if inspect.iscode(const)]
+
+    for name in sorted(names):
+        helper = function.__globals__.get(name)
+        if inspect.isfunction(helper):
+            sources += _builder_sources(helper, seen)
+
+    return sources # _builder_sources
+
+#************************************************************************
+def lut_key(name, builder):
+    '''
+    Cache key for a lookup table - changes with the source of the builder and
+    the helpers it calls (so including constants and defaults), the
+    matplotlib version and LUT_VERSION
 
-    cmap = plt.cm.BrBG
-    cmaplist = [cmap(i) for i in range(cmap.N)]
+    :param str name: name of colourmap (without "_r")
+    :param func builder: function returning (N, 4) array of RGBA values
 
-    cmap_R = plt.cm.RdBu
-    cmaplist_R = [cmap_R(i) for i in range(cmap_R.N)]
+    :returns: str
+    '''
 
-    cmaplist[255//2:] = cmaplist_R[255//2:]
+    sources = "\n".join(_builder_sources(builder))
 
-    # enforce white for the centre of the colour range
-    for i in [126, 127, 128, 129]:
-        cmaplist[i] = (1.0, 1.0, 1.0, 1.0)
+    return hashlib.sha1("{} {} {} {}".format(name, LUT_VERSION, sources, plt.matplotlib.__version__).encode()).hexdigest()[:12] # lut_key
 
-    # and make the colour map
-    cmap = cmap.from_list('Custom cmap', cmaplist, cmap.N)
-    cmap_r = cmap.from_list('Custom cmap', cmaplist[::-1], cmap.N)
+#************************************************************************
+LUTS = {}
+def get_lut(name):
+    '''
+    Lookup table for a registered colourmap, read from the .npy cache
+    if present, otherwise built and saved
 
-    return cmap, cmap_r # make_BrBu
+    :param str name: name of colourmap (without "_r")
+
+    :returns: (N, 4) array of RGBA values
+    '''
+
+    try:
+        lut = LUTS[name]
+    except KeyError:
+        builder = COLOURMAP_REGISTRY[name]
+
+        # keyed on the builder source and matplotlib version, so stale tables are not used
+        filename = os.path.join(LUTLOC, "{}_{}.npy".format(name, lut_key(name, builder)))
+
+        try:
+            lut = np.load(filename)
+        except (IOError, ValueError):
+            lut = np.asarray(builder(), dtype=float)
+            try:
+                if not os.path.exists(LUTLOC):
+                    os.makedirs(LUTLOC)
+                np.save(filename + ".tmp.npy", lut)
+                os.replace(filename + ".tmp.npy", filename)
+            except OSError:
+                # read-only area, rebuild next time
+                pass
+
+        LUTS[name] = lut
+
+    return lut # get_lut
 
 #************************************************************************
-def make_BrBG():
+COLOURMAPS = {}
+def get_colourmap(name):
     '''
-    Enforce white at centre of BrBG (not the case using the default)
+    Colourmap from the registry, created on first use
+
+    :param str name: name of colourmap, with "_r" for the reversed version
+
+    :returns: ListedColormap
     '''
 
+    try:
+        cmap = COLOURMAPS[name]
+    except KeyError:
+        if name.endswith("_r") and name not in COLOURMAP_REGISTRY:
+            lut = get_lut(name[:-2])[::-1]
+        else:
+            lut = get_lut(name)
+
+        cmap = mpl_colors.ListedColormap(lut, name='Custom cmap')
+        COLOURMAPS[name] = cmap
 
-    cmap = plt.cm.BrBG
-    cmaplist = [cmap(i) for i in range(cmap.N)]
+    return cmap # get_colourmap
 
-    # enforce white for the centre of the colour range
-    for i in [126, 127, 128, 129]:
-        cmaplist[i] = (1.0, 1.0, 1.0, 1.0)
+#************************************************************************
+class ColourmapDict(dict):
+    '''
+    Dictionary of colourmaps, where string entries are names in the colourmap
+    registry and only created when looked up
+    '''
 
-    # and make the colour map
-    cmap = cmap.from_list('Custom cmap', cmaplist, cmap.N)
-    cmap_r = cmap.from_list('Custom cmap', cmaplist[::-1], cmap.N)
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if isinstance(value, str):
+            value = get_colourmap(value)
+        return value
 
-    return cmap, cmap_r # make_BrBu
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
 
 
 #************************************************************************
@@ -169,9 +307,30 @@ config.read(CONFIG_FILE)
 
 # main settings
 ROOTLOC = config.get("Paths", "rootloc")
+# ERA5 extremes indices are kept outside the data tree
+ERA5_INDICESLOC = config.get("Paths", "era5_indices", fallback="/data/users/rdunn/reanalyses/data/era5/v20200409/indices/")
 YEAR = config.get("Misc", "year")
+# per-figure phase timings and memory, written at the end of the run
+PROFILE = config.getboolean("Misc", "profile", fallback=False)
+# span tracing of the whole run, written as a Chrome trace for Perfetto
+TRACE = config.getboolean("Misc", "trace", fallback=False)
+# memory (MB) each worker may use before large cube operations are chunked - 0 for half the available memory
+MEMORY_BUDGET = config.getint("Misc", "memory_budget", fallback=0)
 OUTFMT = config.get("Format", "outfmt")
 FONTSIZE = config.getint("Format", "fontsize")
+# data layers in vector output are rasterised at this resolution, rather than regridded
+RASTER_DPI = config.getint("Format", "raster_dpi", fallback=300)
+VECTOR_REGRID = config.getboolean("Format", "vector_regrid", fallback=False)
+# Web-Mercator tile pyramids of the single-panel maps, for the online viewer
+TILES = config.getboolean("Format", "tiles", fallback=False)
+TILE_ZOOM = config.getint("Format", "tile_zoom", fallback=4)
+# side-by-side images of any figures which change between runs - opt in, as
+#   vector figures then also need a low resolution preview rendered each save
+DIFF_REPORT = config.getboolean("Format", "diff_report", fallback=False)
+# draft mode - quick low resolution previews for tuning bounds and colourmaps
+DRAFT = config.getboolean("Format", "draft", fallback=False)
+DRAFT_DPI = config.getint("Format", "draft_dpi", fallback=50)
+DRAFT_RESOLUTION = config.getfloat("Format", "draft_resolution", fallback=2.0)
 
 # derived settings
 LEGEND_FONTSIZE = 0.8 * FONTSIZE
@@ -180,6 +339,22 @@ LABEL_FONTSIZE = 0.9 * FONTSIZE
 IMAGELOC = "{}/{}/images/".format(ROOTLOC, YEAR)
 REANALYSISLOC = "{}/{}/data/RNL/".format(ROOTLOC, YEAR)
 
+if DRAFT:
+    # previews are always raster, and kept apart from the full-quality images
+    OUTFMT = ".png"
+    IMAGELOC = "{}/{}/images/preview/".format(ROOTLOC, YEAR)
+    if not os.path.exists(IMAGELOC):
+        os.makedirs(IMAGELOC)
+    plt.rcParams["savefig.dpi"] = DRAFT_DPI
+elif OUTFMT in [".eps", ".pdf"]:
+    plt.rcParams["savefig.dpi"] = RASTER_DPI
+
+DIFFLOC = IMAGELOC + "diff/"
+# cached colourmap lookup tables
+LUTLOC = "{}/colourmaps/".format(ROOTLOC)
+PROFILELOC = "{}/{}/profile/".format(ROOTLOC, YEAR)
+TRACELOC = "{}/{}/trace/".format(ROOTLOC, YEAR)
+
 #************************************************************************
 COLOURS = {"temperature" : {"ERA-Interim" : "orange", \
                                 "ERA5" : "orange", \
@@ -325,20 +500,10 @@ COLOURS = {"temperature" : {"ERA-Interim" : "orange", \
 # Can probably make up from Kate's code if better match needed.
 
 
-RdYlBu, RdYlBu_r = adjust_RdYlBu()
-PuOr, PuOr_r = adjust_PuOr()
-# Composition & Land Surface - create a version of Brown-Blue brewer colours
-BrBu, BrBu_r = make_BrBu()
-# adjust BrBG to ensure has central colours equal to white
-BrBG, BrBG_r = make_BrBG()
-
-COLOURMAP_DICT = {"temperature" : RdYlBu_r, "temperature_r" : RdYlBu, \
-                      "hydrological" : BrBG, "hydrological_r" : BrBG_r, \
-                      "precip_sequential" : plt.cm.YlGnBu, "precip_sequential_r" : plt.cm.YlGnBu_r,\
-                      "circulation" : PuOr, "circulation_r" : PuOr_r, \
-                      "composition" : BrBu_r, "composition_r" : BrBu, \
-                      "land_surface" : BrBu_r, "land_surface_r" : BrBu, \
-                      "phenological" : BrBG, "phenological_r" : BrBG_r}
-
-
-
+COLOURMAP_DICT = ColourmapDict({"temperature" : "RdYlBu_r", "temperature_r" : "RdYlBu", \
+                                  "hydrological" : "BrBG", "hydrological_r" : "BrBG_r", \
+                                  "precip_sequential" : plt.cm.YlGnBu, "precip_sequential_r" : plt.cm.YlGnBu_r,\
+                                  "circulation" : "PuOr", "circulation_r" : "PuOr_r", \
+                                  "composition" : "BrBu_r", "composition_r" : "BrBu", \
+                                  "land_surface" : "BrBu_r", "land_surface_r" : "BrBu", \
+                                  "phenological" : "BrBG", "phenological_r" : "BrBG_r"})
@@ -17,9 +17,6 @@ from __future__ import absolute_import
 from __future__ import print_function
 
 import os
-import subprocess
-#import urllib2
-import urllib.request, urllib.error, urllib.parse
 import gc
 import datetime as dt
 
@@ -27,7 +24,6 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 import matplotlib as mpl
-import matplotlib.path as mpath
 from matplotlib.ticker import MultipleLocator
 
 import iris
@@ -65,6 +61,7 @@ def http(host, remote_loc, filename, local_loc, diagnostics=False):
     """
     from socket import error as SocketError
     import errno
+    import urllib.request, urllib.error, urllib.parse
 
     success = 0
     try:
@@ -113,6 +110,7 @@ def doftp(host, remote_loc, filename, local_loc, diagnostics=False):
     :param str local_loc: local directory
     :param bool diagnostics: extra output
     """
+    import subprocess
 
     try:
         if diagnostics:
@@ -136,6 +134,7 @@ def doftp(host, remote_loc, filename, local_loc, diagnostics=False):
     return # doftp
 
 #************************************************************************
+@utils.profiled("load")
 def read_hadslp(filename):
     '''
     Read monthly HadSLP2 fields, returns cube
@@ -181,13 +180,14 @@ def read_hadslp(filename):
 
 
 #************************************************************************
+@utils.profiled("load")
 def read_a_ao(filename, name, skip):
     '''
     Read the AO and AAO data, returns Timeseries
 
     '''
 
-    all_data = np.genfromtxt(filename, dtype=(float), skip_header=skip)
+    all_data = utils.genfromtxt(filename, dtype=(float), skip_header=skip)
 
     years = all_data[:, 0]
     months = all_data[:, 1]
@@ -198,16 +198,17 @@ def read_a_ao(filename, name, skip):
     return utils.Timeseries(name, times, data) # read_ao
 
 #************************************************************************
+@utils.profiled("load")
 def read_soi(filename):
     '''
     Read the SOI data, returns Timeseries
 
     '''
     try:
-        all_data = np.genfromtxt(filename, dtype=(float), skip_header=11, skip_footer=3)
+        all_data = utils.genfromtxt(filename, dtype=(float), skip_header=11, skip_footer=3)
     except ValueError:
         # presume last year has incomplete months
-        all_data = np.genfromtxt(filename, dtype=(float), skip_header=11, skip_footer=4)
+        all_data = utils.genfromtxt(filename, dtype=(float), skip_header=11, skip_footer=4)
     
     years = all_data[:, 0]
     data = all_data[:, 1:]
@@ -217,13 +218,14 @@ def read_soi(filename):
     return utils.Timeseries("SOI", times, data.reshape(-1)) # read_a_ao
 
 #************************************************************************
+@utils.profiled("load")
 def read_snao(filename):
     '''
     Read the SNAO data, returns Timeseries
 
     '''
 
-    all_data = np.genfromtxt(filename, dtype=(float), skip_header=0)
+    all_data = utils.genfromtxt(filename, dtype=(float), skip_header=0)
 
     years = all_data[:, 0]
     data = all_data[:, 1]
@@ -231,13 +233,14 @@ def read_snao(filename):
     return utils.Timeseries("SNAO", years, data) # read_snao
 
 #************************************************************************
+@utils.profiled("load")
 def read_nao(filename):
     '''
     Read the NAO data, returns Timeseries
 
     '''
 
-    all_data = np.genfromtxt(filename, dtype=(float), skip_header=9)
+    all_data = utils.genfromtxt(filename, dtype=(float), skip_header=9)
 
     years = all_data[:, 0]
     data = all_data[:, 1] # just get DJF column
@@ -273,6 +276,7 @@ def plt_bars(ax, ts, text, w=1./12., invert=False, label=True):
     return # plt_months
 
 #************************************************************************
+@utils.profiled("load")
 def read_winter_nao(DATALOC, years):
     '''
     Read the NAO data, returns Timeseries and smoothed version
@@ -284,7 +288,7 @@ def read_winter_nao(DATALOC, years):
     
     for y in years:
 
-        all_data = np.genfromtxt(DATALOC + "SLP_WinterNAOtimeseries_{}.txt".format(y), dtype=(float), skip_header=1)
+        all_data = utils.genfromtxt(DATALOC + "SLP_WinterNAOtimeseries_{}.txt".format(y), dtype=(float), skip_header=1)
 
         days = all_data[:, 1].astype(int)
         months = all_data[:, 0].astype(int)
@@ -357,7 +361,7 @@ def run_all_plots(download=False):
             for tick in ax.yaxis.get_major_ticks():
                 tick.label.set_fontsize(settings.FONTSIZE)
 
-        plt.savefig(settings.IMAGELOC+"SLP_ts_winter_nao{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"SLP_ts_winter_nao{}".format(settings.OUTFMT))
         plt.close()
 
     #************************************************************************
@@ -446,7 +450,7 @@ def run_all_plots(download=False):
 
         ax5.set_ylabel("Standard Units", fontsize=settings.FONTSIZE)
 
-        plt.savefig(settings.IMAGELOC+"SLP_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"SLP_ts{}".format(settings.OUTFMT))
 
         plt.close()
 
@@ -514,17 +518,10 @@ def run_all_plots(download=False):
         PLOTYEARS = [2017, 2018, 2019]
         PLOTLABELS = ["(a) 2017/18", "(b) 2018/19", "(c) 2019/20"]
 
-        # boundary circle
-        theta = np.linspace(0, 2*np.pi, 100)
-        center, radius = [0.5, 0.5], 0.5
-        verts = np.vstack([np.sin(theta), np.cos(theta)]).T
-        circle = mpath.Path(verts * radius + center)
-
-
         # spin through axes
         for a in range(3):  
 
-            ax = plt.subplot(3, 1, a+1, projection=cartopy.crs.NorthPolarStereo())
+            ax = utils.polar_map_axes(fig, (3, 1, a+1), min_lat=0)
 
             plot_cube = iris.cube.Cube.copy(anoms)
 
@@ -542,15 +539,9 @@ def run_all_plots(download=False):
             except iris.exceptions.CoordinateCollapseError:
                 pass
 
-            ax.gridlines() #draw_labels=True)
-            ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-            ax.coastlines()
-            ax.set_boundary(circle, transform=ax.transAxes)
-            ax.set_extent([-180, 180, 0, 90], cartopy.crs.PlateCarree())
-
             ext = ax.get_extent() # save the original extent
 
-            mesh = iris.plot.pcolormesh(plot_cube, cmap=cmap, norm=norm, axes=ax)
+            mesh = utils.plot_polar_mesh(ax, plot_cube, cmap, norm, min_lat=0)
 
             ax.set_extent(ext, ax.projection) # fix the extent change from colormesh
             ax.text(0.0, 1.02, PLOTLABELS[a], fontsize=settings.FONTSIZE, transform=ax.transAxes)
@@ -573,7 +564,7 @@ def run_all_plots(download=False):
         plt.title("")
         fig.text(0.03, 0.95, "", fontsize=settings.FONTSIZE * 0.8)
 
-        plt.savefig(settings.IMAGELOC + "SLP_polar{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC + "SLP_polar{}".format(settings.OUTFMT))
         plt.close()
 
         del plot_cube
@@ -619,7 +610,7 @@ def run_all_plots(download=False):
             # and the timeseries
             ax = plt.axes(axes[1])
 
-            snao = np.genfromtxt(DATALOC+"{} DAILY SNAO.txt".format(settings.YEAR), dtype=(float))
+            snao = utils.genfromtxt(DATALOC+"{} DAILY SNAO.txt".format(settings.YEAR), dtype=(float))
 
             data = snao[:, 1]
             times = np.array([dt.datetime(int(settings.YEAR), 7, 1) + dt.timedelta(days=i) for i in range(len(data))])
@@ -638,7 +629,7 @@ def run_all_plots(download=False):
 
             utils.thicken_panel_border(ax3)
 
-            plt.savefig(settings.IMAGELOC + "SLP_SNAO{}".format(settings.OUTFMT))
+            utils.save_figure(settings.IMAGELOC + "SLP_SNAO{}".format(settings.OUTFMT))
             plt.close()
 
             del ja_cube
@@ -698,7 +689,7 @@ def run_all_plots(download=False):
             # and the timeseries
             ax3 = plt.axes(axes[2])
 
-            snao = np.genfromtxt(DATALOC+"{} DAILY SNAO.txt".format(settings.YEAR), dtype=(float))
+            snao = utils.genfromtxt(DATALOC+"{} DAILY SNAO.txt".format(settings.YEAR), dtype=(float))
 
             data = snao[:, 1]
             times = np.array([dt.datetime(int(settings.YEAR), 7, 1) + dt.timedelta(days=i) for i in range(len(data))])
@@ -718,7 +709,7 @@ def run_all_plots(download=False):
 
             utils.thicken_panel_border(ax3)
 
-            plt.savefig(settings.IMAGELOC + "SLP_NAtlantic{}".format(settings.OUTFMT))
+            utils.save_figure(settings.IMAGELOC + "SLP_NAtlantic{}".format(settings.OUTFMT))
             plt.close()
 
             del cube
@@ -726,6 +717,8 @@ def run_all_plots(download=False):
             gc.collect()
 
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
@@ -124,7 +124,7 @@ def run_all_plots():
         ax1.set_xlim([lims[0]-100, lims[1]+100])
     #    ax2.set_xticklabels("")
 
-        plt.savefig(settings.IMAGELOC+"SMS_ts_esa_cci{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"SMS_ts_esa_cci{}".format(settings.OUTFMT))
         plt.close()
 
     #************************************************************************
@@ -190,6 +190,8 @@ def run_all_plots():
         utils.plot_hovmuller(settings.IMAGELOC + "SMS_hovmuller", times, latitudes, anoms, settings.COLOURMAP_DICT["hydrological"], bounds, "Anomaly (m"+r'$^{3}$'+"m"+r'$^{-3}$'+")")
 
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 
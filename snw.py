@@ -96,7 +96,7 @@ def run_all_plots():
     for tick in ax.yaxis.get_major_ticks():
         tick.label.set_fontsize(settings.FONTSIZE) 
 
-    plt.savefig(settings.IMAGELOC+"SNW_ts{}".format(settings.OUTFMT))
+    utils.save_figure(settings.IMAGELOC+"SNW_ts{}".format(settings.OUTFMT))
 
     plt.close()
 
@@ -112,7 +112,9 @@ def run_all_plots():
         plt.title("Polar Ozone")
 
         plt.legend()
-        plt.savefig(settings.IMAGELOC + "SOZ_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC + "SOZ_ts{}".format(settings.OUTFMT))
+
+    utils.close_map_templates()
 
     return # run_all_plots
 
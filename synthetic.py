@@ -0,0 +1,562 @@
+#!/usr/bin/env python
+#************************************************************************
+#
+#  Write a synthetic copy of the input data tree, in the same formats,
+#       shapes and masks as the files the section scripts read, plus
+#       a configuration.txt pointing at it.  For offline end-to-end
+#       runs and benchmarks without access to the real data.
+#
+#  Values are a trend, a smooth spatial pattern and noise - they
+#       only need to exercise the code, not to look like the climate.
+#
+#  Run from anywhere, as this does not read configuration.txt itself,
+#       and then run the section scripts from the directory holding
+#       the new configuration.txt.
+#
+#************************************************************************
+#                                 START
+#************************************************************************
+from __future__ import absolute_import
+from __future__ import print_function
+
+import os
+import datetime as dt
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+import iris
+import iris.coords
+import iris.cube
+import cf_units
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# crude continents (lon/lat boxes) for the land-sea masks
+CONTINENTS = [(-160, 15, -60, 70), (-80, -55, -35, 10), (-10, 35, 140, 75), \
+                  (-15, -35, 50, 35), (115, -40, 155, -12), (-180, -90, 180, -65)]
+
+#************************************************************************
+def regular_grid(delta, scale=1.):
+    '''
+    Cell-centre latitudes and longitudes of a global grid
+
+    :param float delta: grid spacing (degrees) of the real dataset
+    :param float scale: points per axis relative to the real dataset
+
+    :returns: lats, lons
+    '''
+
+    delta = delta / scale
+
+    lats = np.arange(-90 + delta/2., 90, delta)
+    lons = np.arange(-180 + delta/2., 180, delta)
+
+    return lats, lons # regular_grid
+
+#************************************************************************
+def land_mask(lats, lons):
+    '''
+    Boolean land mask from the box continents
+
+    :param array lats: latitudes
+    :param array lons: longitudes
+
+    :returns: array lat x lon, True over land
+    '''
+
+    lon2d, lat2d = np.meshgrid(lons, lats)
+
+    land = np.zeros(lon2d.shape, dtype=bool)
+    for west, south, east, north in CONTINENTS:
+        land |= (lon2d >= west) & (lon2d <= east) & (lat2d >= south) & (lat2d <= north)
+
+    return land # land_mask
+
+#************************************************************************
+def anomaly_fields(lats, lons, ntimes, rng, amplitude=1., trend=0.):
+    '''
+    Smooth pattern plus noise and a linear trend
+
+    :param array lats: latitudes
+    :param array lons: longitudes
+    :param int ntimes: number of time steps
+    :param RandomState rng: random number generator
+    :param float amplitude: size of the pattern and noise
+    :param float trend: change per time step
+
+    :returns: array time x lat x lon
+    '''
+
+    lon2d, lat2d = np.meshgrid(np.deg2rad(lons), np.deg2rad(lats))
+    pattern = np.sin(2 * lat2d) * np.cos(3 * lon2d)
+
+    data = amplitude * (pattern[None, :, :] + rng.normal(0, 0.5, (ntimes,) + pattern.shape))
+    data += trend * np.arange(ntimes)[:, None, None]
+
+    return data.astype(np.float32) # anomaly_fields
+
+#************************************************************************
+def anomaly_series(ntimes, rng, amplitude=1., trend=0.):
+    '''
+    Red noise plus a linear trend
+
+    :param int ntimes: number of time steps
+    :param RandomState rng: random number generator
+    :param float amplitude: standard deviation of the noise
+    :param float trend: change per time step
+
+    :returns: array
+    '''
+
+    noise = rng.normal(0, amplitude, ntimes)
+    for t in range(1, ntimes):
+        noise[t] += 0.5 * noise[t-1]
+
+    return noise + trend * np.arange(ntimes) # anomaly_series
+
+#************************************************************************
+def make_cube(data, lats, lons, time_coord, name, units):
+    '''
+    Cube with both name() and var_name set to name
+
+    :param array data: time x lat x lon
+    :param array lats: latitudes
+    :param array lons: longitudes
+    :param DimCoord time_coord: time coordinate
+    :param str name: cube name
+    :param str units: cube units
+
+    :returns: cube
+    '''
+
+    latcoord = iris.coords.DimCoord(lats, standard_name="latitude", units="degrees")
+    loncoord = iris.coords.DimCoord(lons, standard_name="longitude", units="degrees")
+
+    cube = iris.cube.Cube(data, long_name=name, var_name=name, units=units)
+    cube.add_dim_coord(time_coord, 0)
+    cube.add_dim_coord(latcoord, 1)
+    cube.add_dim_coord(loncoord, 2)
+
+    return cube # make_cube
+
+#************************************************************************
+def write_columns(filename, rows, fmt="{:10.3f}", header=[], footer=[], sep=" "):
+    '''
+    Whitespace (or sep) separated text file
+
+    :param str filename: file to write
+    :param array rows: rows of values
+    :param str fmt: format of each value
+    :param list header: lines before the data
+    :param list footer: lines after the data
+    :param str sep: separator between values
+    '''
+
+    with open(filename, "w") as outfile:
+        for line in header:
+            outfile.write(line + "\n")
+        for row in rows:
+            outfile.write(sep.join([fmt.format(v) for v in row]) + "\n")
+        for line in footer:
+            outfile.write(line + "\n")
+
+    return # write_columns
+
+#************************************************************************
+def write_tex(root, year, scale, rng):
+    '''
+    GHCNDEX (2.5 degree, YYYYMMDD integer times) and ERA5 (1 degree,
+    CF times) temperature extremes indices, annual plus monthly cubes
+
+    '''
+
+    dataloc = os.path.join(root, year, "data", "TEX")
+    era5loc = os.path.join(root, "era5_indices")
+    for loc in [dataloc, era5loc]:
+        if not os.path.exists(loc):
+            os.makedirs(loc)
+
+    INDICES = {"TX90p" : 10., "TN90p" : 10., "TX10p" : 10., "TN10p" : 10., \
+                   "TXx" : 30., "TNx" : 20., "TXn" : -5., "TNn" : -15.}
+
+    for dataset, delta, start in [("GHCNDEX", 2.5, 1951), ("ERA5", 1.0, 1979)]:
+
+        lats, lons = regular_grid(delta, scale)
+        years = np.arange(start, int(year) + 1)
+        ocean = ~land_mask(lats, lons)
+        # stations come online over time, so coverage fills in over the years
+        first_year = rng.uniform(0, 1, ocean.shape)[None, :, :] < np.linspace(0.3, 0, len(years))[:, None, None]
+
+        if dataset == "GHCNDEX":
+            time_coord = iris.coords.DimCoord(years * 10000 + 101, long_name="time", var_name="time", units="1")
+        else:
+            time_unit = cf_units.Unit("days since {}-01-01 00:00".format(start), calendar=cf_units.CALENDAR_GREGORIAN)
+            time_coord = iris.coords.DimCoord([time_unit.date2num(dt.datetime(y, 7, 1)) for y in years], \
+                                                  standard_name="time", var_name="time", units=time_unit)
+
+        for index, base in INDICES.items():
+            # percentile indices get more warm and fewer cold days
+            if index in ["TX90p", "TN90p", "TXx", "TNx", "TXn", "TNn"]:
+                trend = 0.03
+            else:
+                trend = -0.03
+
+            cubes = iris.cube.CubeList()
+            for name in ["Ann"] + MONTHS:
+                data = base + anomaly_fields(lats, lons, len(years), rng, amplitude=2., trend=trend)
+                if index[-1] == "p":
+                    data = np.clip(data, 0, 100)
+
+                mask = np.broadcast_to(ocean, data.shape)
+                if dataset == "GHCNDEX":
+                    mask = mask | first_year
+
+                cubes.append(make_cube(np.ma.array(data, mask=mask), lats, lons, time_coord.copy(), name, "1"))
+
+            if dataset == "GHCNDEX":
+                filename = os.path.join(dataloc, "GHCND_{}_1951-{}_RegularGrid_global_2.5x2.5deg_LSmask.nc".format(index, int(year) + 1))
+            else:
+                filename = os.path.join(era5loc, "ERA5_{}_1979-{}.nc".format(index, year))
+            iris.save(cubes, filename, zlib=True)
+
+    return # write_tex
+
+#************************************************************************
+def write_slp(root, year, scale, rng):
+    '''
+    HadSLP2r fields (fixed 5 degree ASCII grid) and the circulation
+    index text files
+
+    '''
+
+    dataloc = os.path.join(root, year, "data", "SLP")
+    if not os.path.exists(dataloc):
+        os.makedirs(dataloc)
+
+    # HadSLP2r - year/month line then 37 rows (90N first) of 72 values in hPa*100
+    lats = np.arange(90, -90 - 5, -5.)
+    lons = np.arange(-177.5, 180, 5.)
+    years = np.arange(1850, int(year) + 1)
+    fields = 1013. + anomaly_fields(lats, lons, 12 * len(years), rng, amplitude=3.)
+    with open(os.path.join(dataloc, "hadslp2r.asc"), "w") as outfile:
+        for m, field in enumerate(fields):
+            outfile.write("{:6d}{:4d}\n".format(years[m // 12], (m % 12) + 1))
+            for row in np.round(field * 100).astype(int):
+                outfile.write("".join(["{:7d}".format(v) for v in row]) + "\n")
+
+    # SOI - year + 12 months, in an HTML page
+    years = np.arange(1876, int(year) + 1)
+    soi = anomaly_series(12 * len(years), rng, amplitude=8.).reshape(-1, 12)
+    write_columns(os.path.join(dataloc, "soiplaintext.html"), np.column_stack((years, soi)), fmt="{:7.1f}", \
+                      header=["<html>", "<head>", "<title>Southern Oscillation Index</title>", "</head>", "<body>", "<pre>", \
+                                  "", "Southern Oscillation Index (synthetic)", "", "", "Year    Jan    Feb    Mar    Apr    May    Jun    Jul    Aug    Sep    Oct    Nov    Dec"], \
+                      footer=["</pre>", "</body>", "</html>"])
+
+    # AO and AAO - year, month, value
+    for filename, start, nheader in [("monthly.ao.index.b50.current.ascii", 1950, 3), \
+                                         ("monthly.aao.index.b79.current.ascii", 1979, 5)]:
+        years = np.arange(start, int(year) + 1)
+        rows = np.column_stack((np.repeat(years, 12), np.tile(np.arange(1, 13), len(years)), anomaly_series(12 * len(years), rng)))
+        write_columns(os.path.join(dataloc, filename), rows, fmt="{:8.3f}", \
+                          header=["synthetic index"] + ["" for h in range(nheader - 1)])
+
+    # station NAO - year + DJF MAM JJA SON ANN
+    years = np.arange(1865, int(year) + 1)
+    rows = np.column_stack([years] + [anomaly_series(len(years), rng, amplitude=1.5) for s in range(5)])
+    write_columns(os.path.join(dataloc, "nao_station_seasonal.txt"), rows, fmt="{:8.2f}", \
+                      header=["synthetic station NAO"] + ["" for h in range(7)] + ["year DJF MAM JJA SON ANN"])
+
+    # winter NAO - daily from 1 December, month, day, value, smoothed
+    for y in ["2017", "2018", "2019"]:
+        days = [dt.datetime(int(y), 12, 1) + dt.timedelta(days=d) for d in range(90)]
+        daily = anomaly_series(len(days), rng, amplitude=20.)
+        smoothed = np.convolve(daily, np.ones(7)/7., mode="same")
+        rows = np.column_stack(([d.month for d in days], [d.day for d in days], daily, smoothed))
+        write_columns(os.path.join(dataloc, "SLP_WinterNAOtimeseries_{}.txt".format(y)), rows, fmt="{:8.2f}", \
+                          header=["month day NAO smoothed"])
+
+    # summer NAO - daily from 1 July
+    rows = np.column_stack((np.arange(62), anomaly_series(62, rng)))
+    write_columns(os.path.join(dataloc, "{} DAILY SNAO.txt".format(year)), rows, fmt="{:8.3f}")
+
+    return # write_slp
+
+#************************************************************************
+def write_fpr(root, year, scale, rng):
+    '''
+    FAPAR raw binary files (native doubles and floats, fixed shapes)
+
+    '''
+
+    dataloc = os.path.join(root, year, "data", "FPR")
+    if not os.path.exists(dataloc):
+        os.makedirs(dataloc)
+
+    duration = (int(year) - 1998 + 1) * 12
+
+    # globe, north, south as doubles, then four smoothed series as floats
+    series = np.array([anomaly_series(duration, rng, amplitude=0.005) for s in range(3)])
+    smoothed = np.array([np.convolve(s, np.ones(12)/12., mode="same") for s in np.vstack((series, series[:1]))])
+    smoothed[:, :6] = 0
+    smoothed[:, -6:] = 0
+    with open(os.path.join(dataloc, "TimeSeries_faparanomaliesglobal_bams_v{}_C6_2020.bin".format(int(year) - 1)), "wb") as outfile:
+        outfile.write(series.astype(np.float64).tobytes())
+        outfile.write(smoothed.astype(np.float32).tobytes())
+
+    # latitude x time Hovmuller, zero where missing
+    hovmuller = anomaly_series(360 * duration, rng, amplitude=0.01).reshape(360, duration)
+    hovmuller[:60, :] = 0
+    hovmuller.astype(np.float64).tofile(os.path.join(dataloc, "Hovmuller_Global_lat_fapar1998_2010_bams_trois_C6.eps_{}.bin".format(int(year) + 1)))
+
+    # 0.5 degree map, 90S first, -100 over the ocean
+    lats = np.arange(-90, 90, 0.5)
+    lons = np.arange(-180, 180, 0.5)
+    field = 0.02 * anomaly_fields(lats, lons, 1, rng)[0].astype(np.float64)
+    field[~land_mask(lats, lons)] = -100.
+    field.tofile(os.path.join(dataloc, "DataXFigure1fapar1998_2010_bams_trois_C6_v2.eps_v2020.bin"))
+
+    return # write_fpr
+
+#************************************************************************
+def write_tws(root, year, scale, rng):
+    '''
+    GRACE land mean, monthly zonal means (one file per month) and
+    the annual difference map (lat, lon, value for land boxes)
+
+    '''
+
+    dataloc = os.path.join(root, year, "data", "TWS")
+    if not os.path.exists(dataloc):
+        os.makedirs(dataloc)
+
+    # decimal year and value, 998 for missing
+    times = np.array([y + (m - 0.5)/12. for y in range(2002, int(year) + 1) for m in range(1, 13)])[3:]
+    land_mean = anomaly_series(len(times), rng, amplitude=10.)
+    land_mean[rng.uniform(0, 1, len(times)) < 0.05] = 998.0
+    write_columns(os.path.join(dataloc, "avg_JPLM06v2_land.txt"), np.column_stack((times, land_mean)), fmt="{:10.4f}")
+
+    # every month is written - the reader only fills gaps listed in its NOGRACE
+    lats = regular_grid(0.5, scale)[0][::-1]
+    for t in times:
+        rows = np.column_stack((lats, 50 * np.sin(np.deg2rad(lats)) + rng.normal(0, 10, len(lats))))
+        write_columns(os.path.join(dataloc, "avg_lat_JPLM06v2_{:04d}.{:02d}.txt".format(int(t), int(round((t - int(t)) * 100)))), \
+                          rows, fmt="{:10.3f}")
+
+    lats, lons = regular_grid(1.0, scale)
+    field = 10 * anomaly_fields(lats, lons, 1, rng)[0]
+    land = land_mask(lats, lons)
+    lon2d, lat2d = np.meshgrid(lons, lats)
+    write_columns(os.path.join(dataloc, "tws_changes_{}-{}_2.txt".format(year, int(year) - 1)), \
+                      np.column_stack((lat2d[land], lon2d[land], field[land])), fmt="{:10.3f}")
+
+    return # write_tws
+
+#************************************************************************
+def write_hum(root, year, scale, rng):
+    '''
+    Humidity timeseries tables and anomaly maps (90N first, with a
+    two-line footer)
+
+    '''
+
+    dataloc = os.path.join(root, year, "data", "HUM")
+    if not os.path.exists(dataloc):
+        os.makedirs(dataloc)
+
+    years = np.arange(1973, int(year) + 1)
+    for suffix, ncolumns in [("", 42), ("_unc", 35)]:
+        columns = [anomaly_series(len(years), rng, amplitude=0.3, trend=0.01) for c in range(ncolumns)]
+        table = np.column_stack([years] + columns)
+        # reanalyses start later
+        table[:6, -8:] = -99.99
+        write_columns(os.path.join(dataloc, "HUM_timeseries_ALL{}{}.txt".format(year, suffix)), table, fmt="{:9.3f}", \
+                          header=["YEAR " + " ".join(["COL{}".format(c + 1) for c in range(ncolumns)])])
+
+    for var, amplitude in [("rh", 2.), ("q", 0.3)]:
+        for dataset, delta in [("HADISDHland", 5.), ("HADISDH", 5.), ("ERA5", 1.), ("MERRA2", 1.)]:
+            lats, lons = regular_grid(delta, scale)
+            field = anomaly_fields(lats, lons, 1, rng, amplitude=amplitude)[0]
+            if dataset == "HADISDHland":
+                field[~land_mask(lats, lons)] = -99.999
+            elif dataset == "HADISDH":
+                field[rng.uniform(0, 1, field.shape) < 0.3] = -99.999
+            write_columns(os.path.join(dataloc, "HUM{}_anomalymap_{}{}.txt".format(var, dataset, year)), field[::-1], \
+                              fmt="{:9.3f}", footer=["synthetic {} anomalies".format(var), "{}".format(dataset)])
+
+    return # write_hum
+
+#************************************************************************
+def write_phen(root, year, scale, rng):
+    '''
+    Phenology - MODIS CMG anomaly fields (0.05 degree, NaN missing),
+    the regional timeseries tables and the photographs
+
+    '''
+
+    dataloc = os.path.join(root, year, "data", "PHEN")
+    if not os.path.exists(dataloc):
+        os.makedirs(dataloc)
+
+    # SOS and EOS anomalies in days, NaN over ocean
+    lats, lons = regular_grid(0.05, scale)
+    time_unit = cf_units.Unit("days since {}-01-01 00:00".format(year), calendar=cf_units.CALENDAR_GREGORIAN)
+    time_coord = iris.coords.DimCoord([0], standard_name="time", var_name="time", units=time_unit)
+    cubes = iris.cube.CubeList()
+    for season in ["SOS", "EOS"]:
+        data = anomaly_fields(lats, lons, 1, rng, amplitude=8.)
+        data[:, ~land_mask(lats, lons)] = np.nan
+        cubes.append(make_cube(data, lats, lons, time_coord.copy(), season, "days")[0])
+    iris.save(cubes, os.path.join(dataloc, "MODIS.CMG.{}.SOS.EOS.Anomaly.nc".format(year)), zlib=True)
+
+    # year + SOS, EOS, spring and autumn temperature, each for NH, NA, EA and one spare
+    years = np.arange(2000, int(year) + 1)
+    table = np.column_stack([years] + [anomaly_series(len(years), rng, amplitude=3.) for c in range(16)])
+    write_columns(os.path.join(dataloc, "MODIS.CMG.{}.SOS.EOS.SPRT.FALT.TS.csv".format(year)), table, fmt="{:.3f}", \
+                      header=["year," + ",".join(["col{}".format(c + 1) for c in range(16)])], sep=",")
+
+    with open(os.path.join(dataloc, "MODIS.CMG.{}.SOS.EOS.SPRT.FALT.TS.UK_DH.csv".format(year)), "w") as outfile:
+        outfile.write("year,sos,eos\n")
+        for y, sos, eos in zip(years, 110 + anomaly_series(len(years), rng, amplitude=5.), 290 + anomaly_series(len(years), rng, amplitude=5.)):
+            outfile.write("{},{:.1f},{:.1f}\n".format(y, sos, eos))
+
+    # oak leafing - year, then four columns (-99 missing), two-line footer
+    with open(os.path.join(dataloc, "UK_Oakleaf_data.csv"), "w") as outfile:
+        outfile.write("year,bare tree,a,b,first leaf\n")
+        for y in range(1999, int(year) + 1):
+            values = [int(v) for v in [300, 0, 0, 115] + anomaly_series(4, rng, amplitude=5.)]
+            if rng.uniform() < 0.1:
+                values[0] = -99
+            outfile.write("{},{}\n".format(y, ",".join(["{}".format(v) for v in values])))
+        outfile.write("\nsynthetic data\n")
+
+    # lake locations - whitespace separated lon, lat
+    write_columns(os.path.join(dataloc, "lake_coords.csv"), \
+                      np.column_stack((rng.uniform(-120, -70, 30), rng.uniform(30, 50, 30))), fmt="{:10.4f}", header=["lon lat"])
+
+    # US PhenoCam and MODIS - years across, empty cells before PhenoCam starts
+    years = np.arange(2001, int(year) + 1)
+    pheno_start = len(years) - 12
+    with open(os.path.join(dataloc, "Richardson Data for SOC 2019 Figures.csv"), "w", encoding="latin-1") as outfile:
+        def row(label, values, pheno=False):
+            cells = ["{}".format(int(v)) for v in values]
+            if pheno:
+                cells = ["" for c in cells[:pheno_start]] + cells[pheno_start:]
+            outfile.write("{},,{}\n".format(label, ",".join(cells)))
+
+        row("Year", years)
+        row("MODIS SOS", 120 + anomaly_series(len(years), rng, amplitude=5.))
+        row("MODIS EOS", 290 + anomaly_series(len(years), rng, amplitude=5.))
+        for season, base in [("SOS", 120), ("EOS", 290)]:
+            row("PhenoCam {}".format(season), np.zeros(len(years)), pheno=True)
+            for threshold in [10, 25, 50]:
+                row("{} {}%".format(season, threshold), base + threshold / 5. + anomaly_series(len(years), rng, amplitude=5.), pheno=True)
+            row("", np.zeros(len(years)), pheno=True)
+            row("{} -".format(season), np.full(len(years), 3), pheno=True)
+            row("{} +".format(season), np.full(len(years), 3), pheno=True)
+
+    # lake ice-off dates - year plus 11 lakes
+    with open(os.path.join(dataloc, "LakeData_forRobert.csv"), "w") as outfile:
+        outfile.write("Year,{}\n".format(",".join(["Lake{} (day of year)".format(l) for l in range(11)])))
+        for y in range(2000, int(year) + 1):
+            outfile.write("{},{}\n".format(y, ",".join(["{:.0f}".format(v) for v in 100 + anomaly_series(11, rng, amplitude=10.)])))
+
+    # photographs
+    for name in ["HarvardForest_{}0511.jpg".format(year), "HarvardForest_{}1024.jpg".format(year), \
+                     "Sarah Burgess first leaf.jpg", "Judith Garforth oak bare tree {}.jpg".format(year)]:
+        image = np.clip(rng.normal(0.5, 0.2, (int(480 * scale), int(640 * scale), 3)), 0, 1)
+        plt.imsave(os.path.join(dataloc, name), image)
+
+    return # write_phen
+
+# writer for each section data directory
+WRITERS = {"TEX" : write_tex, \
+               "SLP" : write_slp, \
+               "FPR" : write_fpr, \
+               "TWS" : write_tws, \
+               "HUM" : write_hum, \
+               "PHEN" : write_phen}
+
+#************************************************************************
+def write_configuration(filename, root, year):
+    '''
+    configuration.txt pointing at the synthetic tree
+
+    :param str filename: file to write
+    :param str root: root of the synthetic tree
+    :param str year: report year
+    '''
+
+    with open(filename, "w") as outfile:
+        outfile.write("[Paths]\n")
+        outfile.write("rootloc = {}\n".format(root))
+        outfile.write("era5_indices = {}/\n".format(os.path.join(root, "era5_indices")))
+        outfile.write("[Misc]\n")
+        outfile.write("year = {}\n".format(year))
+        outfile.write("[Format]\n")
+        outfile.write("outfmt = .png\n")
+        outfile.write("fontsize = 12\n")
+
+    return # write_configuration
+
+#************************************************************************
+def main(root, year="2019", scale=1., sections=[], seed=0):
+    '''
+    Write the synthetic data tree and its configuration.txt
+
+    :param str root: root of the synthetic tree
+    :param str year: report year
+    :param float scale: grid points per axis relative to the real data (fixed-format files are unchanged)
+    :param list sections: which sections to write (default all)
+    :param int seed: random seed
+    '''
+
+    root = os.path.abspath(root)
+
+    if sections == []:
+        sections = sorted(WRITERS)
+
+    rng = np.random.RandomState(seed)
+
+    for section in sections:
+        print("Writing {}".format(section))
+        WRITERS[section](root, year, scale, rng)
+
+    # the section scripts save figures here
+    imageloc = os.path.join(root, year, "images")
+    if not os.path.exists(imageloc):
+        os.makedirs(imageloc)
+
+    write_configuration(os.path.join(root, "configuration.txt"), root, year)
+
+    print("Run the section scripts from {}".format(root))
+
+    return # main
+
+#************************************************************************
+if __name__ == "__main__":
+
+    import argparse
+
+    # set up keyword arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--root', dest='root', action='store', required=True,
+                        help='Directory for the synthetic tree')
+    parser.add_argument('--year', dest='year', action='store', default="2019",
+                        help='Report year')
+    parser.add_argument('--scale', dest='scale', action='store', default=1., type=float,
+                        help='Grid points per axis relative to the real data (e.g. 0.5 halves them)')
+    parser.add_argument('--sections', dest='sections', action='store', default="",
+                        help='Comma separated sections to write, from {}'.format(", ".join(sorted(WRITERS))))
+    parser.add_argument('--seed', dest='seed', action='store', default=0, type=int,
+                        help='Random seed')
+
+    args = parser.parse_args()
+
+    main(args.root, year=args.year, scale=args.scale, \
+             sections=[s for s in args.sections.split(",") if s != ""], seed=args.seed)
+
+#************************************************************************
+#                                 END
+#************************************************************************
@@ -156,19 +156,9 @@ def plot_smooth_map_iris(outname, cube, cmap, bounds, cb_label, scatter=[], \
 
     ext = ax.get_extent() # save the original extent
 
-    if settings.OUTFMT in [".eps", ".pdf"]:
-        if cube.coord("latitude").points.shape[0] > 180 or cube.coord("longitude").points.shape[0] > 360:
-            regrid_size = 1.0
-            print("Regridding cube for {} output to {} degree resolution".format(settings.OUTFMT, regrid_size))
-            print("Old Shape {}".format(cube.data.shape))
-            plot_cube = regrid_cube(cube, regrid_size, regrid_size)
-            print("New Shape {}".format(plot_cube.data.shape))
-        else:
-            plot_cube = copy.deepcopy(cube)
-    else:
-        plot_cube = copy.deepcopy(cube)
-
-    mesh = iris.plot.pcolormesh(plot_cube, cmap=cmap, norm=norm)
+    plot_cube = utils.vector_plot_cube(cube)
+
+    mesh = iris.plot.pcolormesh(plot_cube, cmap=cmap, norm=norm, rasterized=True)
 
     if len(scatter) > 0:
         lons, lats, data = scatter
@@ -198,7 +188,7 @@ def plot_smooth_map_iris(outname, cube, cmap, bounds, cb_label, scatter=[], \
     plt.title(title)
     fig.text(0.03, 0.95, figtext, fontsize=settings.FONTSIZE * 0.8)
 
-    plt.savefig(outname + settings.OUTFMT)
+    utils.save_figure(outname + settings.OUTFMT)
     plt.close()
 
     return # plot_smooth_map_iris
@@ -277,9 +267,11 @@ def run_all_plots():
     for tick in ax.xaxis.get_major_ticks():
         tick.label.set_fontsize(settings.FONTSIZE)
 
-    plt.savefig(settings.IMAGELOC + "TCO_ts{}".format(settings.OUTFMT))
+    utils.save_figure(settings.IMAGELOC + "TCO_ts{}".format(settings.OUTFMT))
     plt.close()
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
@@ -345,7 +345,7 @@ def run_all_plots():
 
         fig.text(0.03, 0.5, "Anomalies (mm)", va='center', rotation='vertical', fontsize=settings.FONTSIZE)
 
-        plt.savefig(settings.IMAGELOC+"TCW_ts_v3{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"TCW_ts_v3{}".format(settings.OUTFMT))
         plt.close()
         
         if False:
@@ -423,6 +423,8 @@ def run_all_plots():
     # utils.plot_smooth_map_iris_multipanel(settings.IMAGELOC + "TCW_{}_year_jra".format(settings.YEAR), cubelist, settings.COLOURMAP_DICT["hydrological"], bounds, "Anomaly (mm)", shape=(2,1), title=plotyears, figtext=["(a)","(b)"])
 
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
@@ -0,0 +1,40 @@
+'''
+Shared set up for the tests
+
+settings.py reads configuration.txt from the working directory when it is
+first imported, so a minimal one is written to a scratch directory and the
+tests run from there.
+'''
+import importlib.util
+import os
+import sys
+import tempfile
+
+import matplotlib
+matplotlib.use("Agg")
+import pytest
+
+REPOLOC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOLOC)
+
+WORKLOC = tempfile.mkdtemp(prefix="sotc_tests_")
+with open(os.path.join(WORKLOC, "configuration.txt"), "w") as outfile:
+    outfile.write("[Paths]\n")
+    outfile.write("rootloc = {}\n".format(WORKLOC))
+    outfile.write("[Misc]\n")
+    outfile.write("year = 2019\n")
+    outfile.write("[Format]\n")
+    outfile.write("outfmt = .png\n")
+    outfile.write("fontsize = 12\n")
+os.chdir(WORKLOC)
+
+#************************************************************************
+@pytest.fixture(scope="session")
+def plate():
+    '''
+    plate_1.1.py as a module (its name is not importable)
+    '''
+    spec = importlib.util.spec_from_file_location("plate_1_1", os.path.join(REPOLOC, "plate_1.1.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,27 @@
+'''
+Tests for the benchmark runner
+'''
+import cartopy.feature
+
+import bench
+import utils
+
+#************************************************************************
+def test_synthetic_coastlines_restored(tmp_path, monkeypatch):
+    monkeypatch.setattr(bench, "natural_earth_available", lambda: False)
+    original = cartopy.feature.NaturalEarthFeature
+
+    def fail(resolutions, repeat):
+        # stand-in in use during the run
+        assert cartopy.feature.NaturalEarthFeature is bench.SyntheticFeature
+        raise RuntimeError("benchmark failed")
+    monkeypatch.setattr(bench, "compute_cases", fail)
+
+    try:
+        bench.main(outfile=str(tmp_path / "results.json"), repeat=1, resolutions=["HadSLP"], \
+                       phases=["compute"], history="")
+    except RuntimeError:
+        pass
+
+    assert cartopy.feature.NaturalEarthFeature is original
+    assert utils.BASEMAP_CACHE == {}
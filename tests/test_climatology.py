@@ -0,0 +1,69 @@
+'''
+Tests for the climatology and anomaly engine
+'''
+import datetime as dt
+
+import numpy as np
+
+import utils
+
+#************************************************************************
+def monthly_series():
+    times = 1971 + np.arange(50 * 12) / 12.
+    data = np.ma.array(np.random.RandomState(0).randn(times.shape[0], 3, 4))
+    return times, data
+
+#************************************************************************
+def test_monthly_climatology():
+    times, data = monthly_series()
+    climatology = utils.get_climatology(times, data, 1981, 2010, monthly=True)
+    expected = data[(1981 - 1971) * 12 : (2011 - 1971) * 12].reshape(30, 12, 3, 4).mean(axis=0)
+    assert climatology.shape == (12, 3, 4)
+    assert np.allclose(climatology, expected)
+
+def test_annual_climatology_and_min_years():
+    times, data = monthly_series()
+    data[(1990 - 1971) * 12 :, 0, 0] = np.ma.masked
+
+    climatology = utils.get_climatology(times, data, 1981, 2010)
+    assert climatology.shape == (3, 4)
+    assert np.isclose(climatology[0, 0], data[(1981 - 1971) * 12 : (1990 - 1971) * 12, 0, 0].mean())
+
+    # 9 years of values in the masked cell, 30 elsewhere
+    climatology = utils.get_climatology(times, data, 1981, 2010, min_years=12 * 10)
+    assert climatology.mask[0, 0]
+    assert climatology.mask.sum() == 1
+
+def test_values_outside_base_period_ignored():
+    times, data = monthly_series()
+    first = utils.get_climatology(times, data, 1981, 2010)
+    changed = data.copy()
+    changed[-1] += 1.
+    assert np.array_equal(utils.get_climatology(times, changed, 1981, 2010), first)
+
+def test_repeated_calls_independent():
+    times, data = monthly_series()
+    first = utils.get_climatology(times, data, 1981, 2010, monthly=True)
+    expected = first.copy()
+    first[:] = 0.
+    second = utils.get_climatology(times, data, 1981, 2010, monthly=True)
+    assert second is not first
+    assert np.allclose(second, expected)
+
+def test_rebaseline_anomalies():
+    times, data = monthly_series()
+    old = utils.apply_climatology(times, data, utils.get_climatology(times, data, 1961, 1990, monthly=True), monthly=True)
+    new = utils.rebaseline_anomalies(times, old, 1991, 2020, monthly=True)
+    expected = utils.apply_climatology(times, data, utils.get_climatology(times, data, 1991, 2020, monthly=True), monthly=True)
+    assert np.allclose(new, expected)
+
+def test_anomalies_1d_datetimes():
+    times = np.array([dt.datetime(year, month, 1) for year in range(1981, 1991) for month in range(1, 13)])
+    data = np.tile(np.arange(12.), 10) + np.repeat(np.arange(10.), 12)
+    indata = utils.Timeseries("test", times, data)
+
+    climatology, anomalies = utils.calculate_climatology_and_anomalies_1d(indata, 1981, 1990, monthly=True)
+
+    assert np.allclose(climatology, np.arange(12.) + 4.5)
+    assert list(anomalies.times) == list(times)
+    assert np.allclose(anomalies.data, np.repeat(np.arange(10.), 12) - 4.5)
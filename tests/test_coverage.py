@@ -0,0 +1,100 @@
+'''
+Tests for the coverage error of an observational area average
+'''
+import iris.coord_systems
+import numpy as np
+import pytest
+
+import tex
+import utils
+
+LATS = np.array([-60., -20., 20., 60.])
+LONS = np.arange(0., 360., 60.)
+
+#************************************************************************
+def reference_coverage_error(obs_coverage, reanalysis, weights, fill_value):
+    '''
+    Month by month loop of the original tex.compute_coverage_error
+    '''
+    offset = np.zeros(obs_coverage.shape[0])
+    st_dev = np.zeros(obs_coverage.shape[0])
+
+    for m in range(obs_coverage.shape[0]):
+        if not obs_coverage[m].any():
+            offset[m] = fill_value
+            st_dev[m] = fill_value
+            continue
+
+        total_mean = np.ma.average(reanalysis, axis=1, weights=np.broadcast_to(weights, reanalysis.shape))
+        masked = np.ma.masked_where(~obs_coverage[m][np.newaxis, :] | np.ma.getmaskarray(reanalysis), reanalysis)
+        masked_mean = np.ma.average(masked, axis=1, weights=np.broadcast_to(weights, reanalysis.shape))
+
+        residuals = masked_mean - total_mean
+        offset[m] = np.mean(residuals)
+        st_dev[m] = np.std(residuals, ddof=1)
+
+    return offset, st_dev
+
+def fields():
+    '''
+    Observations (months x lat x lon) with patchy coverage, one month empty,
+    and a reanalysis (times x lat x lon) with one masked cell
+    '''
+    state = np.random.RandomState(1)
+    shape = (LATS.shape[0], LONS.shape[0])
+
+    observations = np.ma.array(state.normal(size=(5,) + shape), mask=state.rand(5, *shape) > 0.6)
+    observations.mask[2] = True
+    observations.fill_value = -99.9
+
+    reanalysis = np.ma.array(state.normal(size=(12,) + shape) + np.cos(np.radians(LATS))[:, None])
+    reanalysis[:, 1, 2] = np.ma.masked
+
+    return observations, reanalysis
+
+def make_cube(data, lat_lon=True):
+    '''
+    Cube of (time x lat x lon) data, or (time x lon x lat) as make_iris_cube_3d gives
+    '''
+    if not lat_lon:
+        data = np.ma.transpose(data, (0, 2, 1))
+    times = np.arange(data.shape[0], dtype=float)
+    if lat_lon:
+        cube = iris.cube.Cube(data, long_name="test")
+        cube.add_dim_coord(iris.coords.DimCoord(times, standard_name="time", units="days since 2000-01-01"), 0)
+        cube.add_dim_coord(iris.coords.DimCoord(LATS, standard_name="latitude", units="degrees"), 1)
+        cube.add_dim_coord(iris.coords.DimCoord(LONS, standard_name="longitude", units="degrees"), 2)
+        for name in ("latitude", "longitude"):
+            cube.coord(name).guess_bounds()
+            cube.coord(name).coord_system = iris.coord_systems.GeogCS(6371229)
+    else:
+        cube = utils.make_iris_cube_3d(data, times, "days since 2000-01-01", LONS, LATS, "test", "1")
+    return cube
+
+#************************************************************************
+@pytest.mark.parametrize("chunk_size", [None, 1, 2])
+def test_coverage_error_matches_loop(chunk_size):
+    observations, reanalysis = fields()
+    obs_coverage = ~np.ma.getmaskarray(observations).reshape(5, -1)
+    reanalysis = reanalysis.reshape(12, -1)
+    weights = np.broadcast_to(np.cos(np.radians(LATS))[:, None], (LATS.shape[0], LONS.shape[0])).reshape(-1)
+
+    offset, st_dev = utils.coverage_error(obs_coverage, reanalysis, weights, -99.9, chunk_size=chunk_size)
+    expected_offset, expected_st_dev = reference_coverage_error(obs_coverage, reanalysis, weights, -99.9)
+
+    assert np.allclose(offset, expected_offset)
+    assert np.allclose(st_dev, expected_st_dev)
+    assert offset[2] == -99.9 and st_dev[2] == -99.9
+
+@pytest.mark.parametrize("obs_lat_lon, reanal_lat_lon", [(True, True), (False, False), (False, True)])
+def test_compute_coverage_error_dimension_order(obs_lat_lon, reanal_lat_lon):
+    observations, reanalysis = fields()
+    weights = np.broadcast_to(np.cos(np.radians(LATS))[:, None], (LATS.shape[0], LONS.shape[0])).reshape(-1)
+    expected_offset, expected_st_dev = reference_coverage_error(~np.ma.getmaskarray(observations).reshape(5, -1), \
+                                                                    reanalysis.reshape(12, -1), weights, -99.9)
+
+    offset, st_dev = tex.compute_coverage_error(make_cube(observations, lat_lon=obs_lat_lon), \
+                                                    make_cube(reanalysis, lat_lon=reanal_lat_lon))
+
+    assert np.allclose(offset, expected_offset)
+    assert np.allclose(st_dev, expected_st_dev)
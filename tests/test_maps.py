@@ -0,0 +1,76 @@
+'''
+Tests that the map helpers leave their input cubes unchanged
+'''
+import cartopy.feature
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import bench
+import utils
+
+CMAP = matplotlib.colormaps["RdBu_r"]
+BOUNDS = [-10, -1, 0, 1, 10]
+
+#************************************************************************
+@pytest.fixture(autouse=True)
+def offline_basemap(monkeypatch):
+    # no Natural Earth download
+    monkeypatch.setattr(cartopy.feature, "NaturalEarthFeature", bench.SyntheticFeature)
+    monkeypatch.setattr(utils, "BASEMAP_CACHE", {})
+    yield
+    utils.close_map_templates()
+
+def make_cube(masked=True):
+    lats = np.arange(-87.5, 90, 5.)
+    lons = np.arange(-177.5, 180, 5.)
+    data = np.random.RandomState(0).randn(lats.size, lons.size)
+    if masked:
+        mask = np.random.RandomState(1).rand(lats.size, lons.size) < 0.2
+        # masked cells along every edge of the domain
+        mask[0, :5] = mask[-1, -5:] = mask[:5, 0] = mask[-5:, -1] = True
+        data = np.ma.array(data, mask=mask)
+        data.data[mask] = data.fill_value
+    return utils.make_iris_cube_2d(data, lats, lons, "test", "K")
+
+#************************************************************************
+@pytest.mark.parametrize("masked", [True, False])
+def test_smooth_masked_field_leaves_input(masked):
+    cube = make_cube(masked=masked)
+    data, mask = cube.data.copy(), np.ma.getmaskarray(cube.data).copy()
+
+    smoothed = utils.smooth_masked_field(cube.data, sigma=0.5)
+
+    assert np.array_equal(np.ma.getdata(cube.data), np.ma.getdata(data))
+    assert np.array_equal(np.ma.getmaskarray(cube.data), mask)
+    assert np.array_equal(np.ma.getmaskarray(smoothed), mask)
+
+@pytest.mark.parametrize("masked", [True, False])
+def test_contour_map_leaves_input(tmp_path, masked):
+    cube = make_cube(masked=masked)
+    data, mask = cube.data.copy(), np.ma.getmaskarray(cube.data).copy()
+
+    utils.plot_smooth_map_iris(str(tmp_path / "map"), cube, CMAP, BOUNDS, "K", contour=True)
+
+    assert np.array_equal(np.ma.getdata(cube.data), np.ma.getdata(data))
+    assert np.array_equal(np.ma.getmaskarray(cube.data), mask)
+    assert (tmp_path / "map.png").exists()
+
+def test_smooth_masked_field_fills_from_neighbours():
+    # a single masked cell takes the mean of its neighbours before smoothing
+    data = np.ma.array(np.ones((5, 5)), mask=np.zeros((5, 5), dtype=bool))
+    data[2, 2] = np.ma.masked
+    smoothed = utils.smooth_masked_field(data, sigma=0.5)
+    assert np.allclose(smoothed.compressed(), 1.)
+    assert smoothed.mask[2, 2]
+
+def test_close_map_templates():
+    template = utils.get_map_template(("map", False), (8, 5.5), rects=[[0.01, 0.12, 0.98, 0.88]])
+    assert utils.get_map_template(("map", False)) is template
+    assert plt.fignum_exists(template.fig.number)
+
+    utils.close_map_templates()
+
+    assert not plt.fignum_exists(template.fig.number)
+    assert utils.FIGURE_POOL == {}
@@ -0,0 +1,93 @@
+'''
+Tests for the memory budget - chunking and the serial/parallel split of plate 1.1
+'''
+import types
+
+import numpy as np
+import pytest
+
+import utils
+
+FETCHED = []
+
+#************************************************************************
+@pytest.fixture
+def budget(monkeypatch):
+    '''
+    Fixed memory budget of 1000 bytes
+    '''
+    monkeypatch.setattr(utils, "MEMORY_STATE", {"budget" : 1000})
+
+class SerialPool(object):
+    '''
+    Pool running the jobs in order in this process, so the order can be checked
+    '''
+    def __init__(self, processes=None):
+        pass
+
+    def map(self, function, jobs):
+        return [function(job) for job in jobs]
+
+    def close(self):
+        pass
+
+    def join(self):
+        pass
+
+def make_fetch(name):
+    def fetch():
+        FETCHED.append(name)
+        return [name]
+    return fetch
+
+#************************************************************************
+@pytest.mark.parametrize("n_items, item_bytes, fixed_bytes, expected", \
+                             [(10, 100, 0, 10), (11, 100, 0, 10), (100, 100, 0, 10), \
+                              (100, 100, 500, 5), (100, 5000, 0, 1), (0, 100, 0, 1)])
+def test_chunk_length(budget, n_items, item_bytes, fixed_bytes, expected):
+    assert utils.chunk_length(n_items, item_bytes, fixed_bytes=fixed_bytes) == expected
+
+def test_chunk_length_no_budget(monkeypatch):
+    monkeypatch.setattr(utils, "MEMORY_STATE", {"budget" : 0})
+    assert utils.chunk_length(10**6, 10**6) == 10**6
+
+def test_split_by_footprint(budget):
+    light, heavy = utils.split_by_footprint(["a", "b", "c", "d", "e"], [10, 1001, 1000, 5000, 0])
+    # at the budget is still light
+    assert light == ["a", "c", "e"]
+    assert heavy == ["b", "d"]
+
+def test_split_by_footprint_no_budget(monkeypatch):
+    monkeypatch.setattr(utils, "MEMORY_STATE", {"budget" : 0})
+    assert utils.split_by_footprint(["a", "b"], [10**12, 10**15]) == (["a", "b"], [])
+
+def test_estimate_footprint(tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"x" * 100)
+    (tmp_path / "b.txt").write_bytes(b"x" * 50)
+    files = [str(tmp_path / name) for name in ("a.txt", "b.txt", "missing.txt")]
+    assert utils.estimate_footprint(files) == 600
+    assert utils.estimate_footprint(files, expansion=1.) == 150
+
+#************************************************************************
+def test_plate_heavy_panels_fetched_alone_and_last(plate, budget, tmp_path, monkeypatch):
+    # footprints of 4x the file size - 40, 4000, 400, 8000, 0 bytes
+    panels = []
+    for name, size in [("a", 10), ("b", 1000), ("c", 100), ("d", 2000), ("e", 0)]:
+        filename = tmp_path / "{}.txt".format(name)
+        filename.write_bytes(b"x" * size)
+        panels += [(name, make_fetch(name), [str(filename)])]
+
+    monkeypatch.setattr(plate, "PANELS", panels)
+    monkeypatch.setattr(plate, "CACHELOC", str(tmp_path / "cache"))
+    monkeypatch.setattr(plate, "multiprocessing", types.SimpleNamespace(Pool=SerialPool))
+    del FETCHED[:]
+
+    layers = plate.get_all_panels()
+
+    assert FETCHED == ["a", "c", "e", "b", "d"]
+    assert layers == {name : [name] for name in "abcde"}
+
+    # all from the cache the second time
+    del FETCHED[:]
+    assert plate.get_all_panels() == layers
+    assert FETCHED == []
@@ -0,0 +1,71 @@
+'''
+Tests for the panel cache of plate_1.1.py
+'''
+import importlib
+import os
+import sys
+
+import pytest
+
+FETCH = '''
+def fetch():
+    import secmod
+    return secmod.read()
+'''
+
+#************************************************************************
+@pytest.fixture
+def codeloc(tmp_path, plate, monkeypatch):
+    '''
+    Code directory with utils, settings and a section module, and a fetch
+    function importing that section module
+    '''
+    for name in ["utils", "settings", "secmod"]:
+        (tmp_path / "{}.py".format(name)).write_text("def read():\n    return 1\n")
+    (tmp_path / "fetches.py").write_text(FETCH)
+    monkeypatch.setattr(plate, "CODELOC", str(tmp_path))
+
+    sys.path.insert(0, str(tmp_path))
+    try:
+        fetches = importlib.import_module("fetches")
+    finally:
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop("fetches")
+
+    return tmp_path, fetches.fetch
+
+#************************************************************************
+def test_panel_modules(plate, codeloc):
+    tmp_path, fetch = codeloc
+    assert [os.path.basename(f) for f in plate.panel_modules(fetch)] == ["utils.py", "settings.py", "secmod.py"]
+
+@pytest.mark.parametrize("name", ["utils", "settings", "secmod"])
+def test_signature_changes_with_module(plate, codeloc, name):
+    tmp_path, fetch = codeloc
+    old = plate.panel_signature(fetch, [])
+    (tmp_path / "{}.py".format(name)).write_text("def read():\n    return 2\n")
+    assert plate.panel_signature(fetch, []) != old
+
+def test_signature_changes_with_input(plate, codeloc):
+    tmp_path, fetch = codeloc
+    (tmp_path / "input.txt").write_text("1")
+    old = plate.panel_signature(fetch, [str(tmp_path / "*.txt")])
+    (tmp_path / "input.txt").write_text("12")
+    assert plate.panel_signature(fetch, [str(tmp_path / "*.txt")]) != old
+
+def test_signature_changes_with_version(plate, codeloc, monkeypatch):
+    tmp_path, fetch = codeloc
+    old = plate.panel_signature(fetch, [])
+    monkeypatch.setattr(plate, "CACHE_VERSION", plate.CACHE_VERSION + 1)
+    assert plate.panel_signature(fetch, []) != old
+
+def test_signature_unchanged(plate, codeloc):
+    tmp_path, fetch = codeloc
+    assert plate.panel_signature(fetch, []) == plate.panel_signature(fetch, [])
+
+def test_clear_cache(plate, tmp_path, monkeypatch):
+    monkeypatch.setattr(plate, "CACHELOC", str(tmp_path))
+    (tmp_path / "a.pkl").write_bytes(b"")
+    (tmp_path / "keep.txt").write_text("")
+    plate.clear_cache()
+    assert sorted(os.listdir(tmp_path)) == ["keep.txt"]
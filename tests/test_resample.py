@@ -0,0 +1,79 @@
+'''
+Tests for the monthly-to-annual resampling
+'''
+import datetime as dt
+
+import numpy as np
+import pytest
+
+import bob
+import utils
+
+#************************************************************************
+def monthly_times(start_year, n_months, start_month=1):
+    months = np.arange(start_month - 1, start_month - 1 + n_months)
+    return start_year + months // 12 + (months % 12) / 12.
+
+#************************************************************************
+@pytest.mark.parametrize("how, expected", [("mean", 6.5), ("sum", 78.), ("max", 12.)])
+def test_annual_resample_aggregations(how, expected):
+    times = monthly_times(2000, 24)
+    data = np.tile(np.arange(1., 13.), 2)
+    years, annual = utils.annual_resample(times, data, how=how)
+    assert list(years) == [2000, 2001]
+    assert np.allclose(annual, expected)
+
+def test_annual_resample_partial_years_masked():
+    # starts in July, ends in March
+    times = monthly_times(2000, 21, start_month=7)
+    years, annual = utils.annual_resample(times, np.ones(21), how="sum", min_months=12)
+    assert list(years) == [2000, 2001, 2002]
+    assert list(np.ma.getmaskarray(annual)) == [True, False, True]
+    assert annual[1] == 12.
+
+def test_annual_resample_missing_months():
+    times = monthly_times(2000, 24)
+    data = np.ma.ones(24)
+    data[3] = np.ma.masked
+    years, annual = utils.annual_resample(times, data, how="mean", min_months=12)
+    assert list(np.ma.getmaskarray(annual)) == [True, False]
+
+    # without a minimum, the mean is over the months present
+    years, annual = utils.annual_resample(times, data, how="mean")
+    assert np.allclose(annual, 1.)
+
+def test_annual_resample_unsorted_and_2d():
+    times = monthly_times(2000, 24)
+    data = np.column_stack((np.arange(24.), -np.arange(24.)))
+    order = np.random.RandomState(0).permutation(24)
+    years, annual = utils.annual_resample(times[order], data[order], how="mean")
+    assert annual.shape == (2, 2)
+    assert np.allclose(annual, [[5.5, -5.5], [17.5, -17.5]])
+
+#************************************************************************
+def test_bob_partial_final_year_masked(tmp_path):
+    times = monthly_times(2015, 29)
+    with open(str(tmp_path / "test_GFED4s.dat"), "w") as outfile:
+        outfile.write("date value\n")
+        for time in times:
+            outfile.write("{:d}{:02d} 1000\n".format(int(time), int(round((time % 1) * 12)) + 1))
+
+    timeseries = bob.read_csv(str(tmp_path / "test"), "GFED4s", make_annual=True)
+
+    assert list(timeseries.times) == [2015, 2016, 2017]
+    assert list(np.ma.getmaskarray(timeseries.data)) == [False, False, True]
+    assert np.allclose(timeseries.data[:2], 12.)
+
+def test_annual_timeseries_datetimes():
+    times = np.array([dt.datetime(2000 + m // 12, m % 12 + 1, 15) for m in range(24)])
+    annual = utils.annual_timeseries(utils.Timeseries("test", times, np.arange(24.)), min_months=12)
+    assert list(annual.times) == [2000, 2001]
+    assert list(annual.data) == [5.5, 17.5]
+
+#************************************************************************
+def test_plate_annual_from_monthly_positions(plate):
+    # starts in July, so the first year is plotted at its first month
+    times = monthly_times(2000, 18, start_month=7)
+    annual = plate.annual_from_monthly(utils.Timeseries("test", times, np.arange(18.)))
+    assert np.allclose(annual.times, [2000.5, 2001.])
+    assert np.allclose(annual.data, [2.5, 11.5])
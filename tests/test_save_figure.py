@@ -0,0 +1,87 @@
+'''
+Tests for save_figure skipping unchanged output
+'''
+import os
+
+import matplotlib.pyplot as plt
+import pytest
+
+import settings
+import utils
+
+#************************************************************************
+@pytest.fixture
+def diffloc(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ROOTLOC", str(tmp_path))
+    monkeypatch.setattr(settings, "DIFFLOC", str(tmp_path / "diff") + "/")
+    monkeypatch.setattr(settings, "DIFF_REPORT", True)
+    yield tmp_path
+    plt.close("all")
+
+def make_figure(lw=1., label="test"):
+    fig = plt.figure(figsize=(4, 3))
+    ax = fig.add_subplot(111)
+    ax.plot([0, 1, 2], [0, 1, 0], lw=lw)
+    ax.set_title(label)
+    return fig
+
+#************************************************************************
+@pytest.mark.parametrize("fmt", ["png", "pdf", "eps", "svg"])
+def test_unchanged_not_rewritten(diffloc, fmt):
+    filename = str(diffloc / "figure.{}".format(fmt))
+    assert utils.save_figure(filename, fig=make_figure())
+    assert not utils.save_figure(filename, fig=make_figure())
+
+def test_pdf_metadata_ignored(diffloc):
+    filename = str(diffloc / "figure.pdf")
+    utils.save_figure(filename, fig=make_figure())
+
+    # as written on another day
+    with open(filename, "rb") as infile:
+        data = infile.read()
+    data = data.replace(b"/CreationDate (D:", b"/CreationDate (D:2099", 1)
+    with open(filename, "wb") as outfile:
+        outfile.write(data)
+
+    assert not utils.save_figure(filename, fig=make_figure())
+
+@pytest.mark.parametrize("fmt", ["pdf", "eps", "svg"])
+def test_small_vector_change_rewritten(diffloc, fmt):
+    # too small a change to show in the low resolution preview
+    filename = str(diffloc / "figure.{}".format(fmt))
+    utils.save_figure(filename, fig=make_figure(lw=1.))
+    assert utils.save_figure(filename, fig=make_figure(lw=1.001))
+
+def test_previews_kept_apart(diffloc):
+    for directory, label in (("a", "first"), ("b", "second")):
+        os.makedirs(str(diffloc / directory))
+        utils.save_figure(str(diffloc / directory / "figure.pdf"), fig=make_figure(label=label))
+
+    previews = diffloc / "diff" / "previews"
+    assert (previews / "a" / "figure.png").exists()
+    assert (previews / "b" / "figure.png").exists()
+    assert (previews / "a" / "figure.png").read_bytes() != (previews / "b" / "figure.png").read_bytes()
+
+def test_no_previews_by_default(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ROOTLOC", str(tmp_path))
+    monkeypatch.setattr(settings, "DIFFLOC", str(tmp_path / "diff") + "/")
+    assert not settings.DIFF_REPORT
+
+    filename = str(tmp_path / "figure.pdf")
+    assert utils.save_figure(filename, fig=make_figure())
+    assert utils.save_figure(filename, fig=make_figure(lw=2.))
+    plt.close("all")
+
+    assert os.path.exists(filename)
+    assert not (tmp_path / "diff").exists()
+
+@pytest.mark.parametrize("fmt", ["pdf", "svg"])
+def test_dates_left_out(diffloc, fmt):
+    assert "SOURCE_DATE_EPOCH" not in os.environ
+
+    filename = str(diffloc / "figure.{}".format(fmt))
+    utils.save_figure(filename, fig=make_figure())
+    with open(filename, "rb") as infile:
+        data = infile.read()
+    assert b"CreationDate" not in data
+    assert b"<dc:date>" not in data
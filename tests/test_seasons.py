@@ -0,0 +1,73 @@
+'''
+Tests for the seasonal aggregation of monthly index cubes
+'''
+import iris.coords
+import iris.cube
+import numpy as np
+import pytest
+
+import tex
+import utils
+
+YEARS = np.arange(1951, 1961)
+
+#************************************************************************
+def month_cubes():
+    '''
+    12 cubes (years x lat x lon), with value year + month/100
+    '''
+    cubes = []
+    for m, month in enumerate(utils.MONTHS):
+        data = np.ma.array(np.broadcast_to((YEARS + (m + 1) / 100.)[:, None, None], (YEARS.shape[0], 3, 4)).copy())
+        cube = iris.cube.Cube(data, long_name=month)
+        cube.add_dim_coord(iris.coords.DimCoord(YEARS.astype(float), long_name="time"), 0)
+        cube.add_dim_coord(iris.coords.DimCoord([-30., 0., 30.], standard_name="latitude", units="degrees"), 1)
+        cube.add_dim_coord(iris.coords.DimCoord([0., 90., 180., 270.], standard_name="longitude", units="degrees"), 2)
+        cubes += [cube]
+    return cubes
+
+#************************************************************************
+def test_select_month_cubes():
+    cubes = month_cubes()[::-1]
+    names = np.array([cube.name() for cube in cubes])
+    assert [cube.name() for cube in utils.select_month_cubes(cubes, names)] == utils.MONTHS
+
+def test_djf_uses_previous_december():
+    monthly = np.ma.stack([cube.data for cube in month_cubes()])
+    seasons = utils.seasonal_aggregate(monthly, how="max", min_months=2)
+    assert seasons.shape == (4,) + monthly.shape[1:]
+    # first DJF has no December, but Jan and Feb are enough
+    assert np.allclose(seasons[0, 0], 1951.02)
+    assert np.allclose(seasons[0, 1:, 0, 0], YEARS[1:] + 0.02)
+    assert np.allclose(seasons[2, :, 0, 0], YEARS + 0.08)
+    # previous December is in the season, so lowers its minimum
+    seasons = utils.seasonal_aggregate(monthly, how="min", min_months=2)
+    assert np.allclose(seasons[0, 1:, 0, 0], YEARS[:-1] + 0.12)
+    # input not changed
+    assert np.allclose(monthly[11, :, 0, 0], YEARS + 0.12)
+
+def test_min_months_masks_seasons():
+    monthly = np.ma.stack([cube.data for cube in month_cubes()])
+    seasons = utils.seasonal_aggregate(monthly, how="mean", min_months=3)
+    assert np.all(np.ma.getmaskarray(seasons[0, 0]))
+    assert not np.any(np.ma.getmaskarray(seasons[1:]))
+
+@pytest.mark.parametrize("base_period", [None, (1951, 1960)])
+def test_seasonal_cubes(base_period):
+    cubes = month_cubes()
+    season_list = utils.seasonal_cubes(cubes, YEARS, 1955, how="mean", scale=2., base_period=base_period)
+
+    assert len(season_list) == 4
+    mam = season_list[1]
+    assert mam.coord("latitude").has_bounds() and mam.coord("longitude").has_bounds()
+    if base_period is None:
+        assert np.allclose(mam.data, 2. * (1955 + 0.04))
+    else:
+        # mean of 1951-60 is 1955.5
+        assert np.allclose(mam.data, 2. * (1955 - 1955.5))
+    # the monthly cubes are not changed
+    assert not cubes[0].coord("latitude").has_bounds()
+
+def test_tex_unknown_index():
+    with pytest.raises(ValueError):
+        tex.GetSeasons(month_cubes(), np.array(utils.MONTHS), "TXmean")
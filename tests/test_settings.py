@@ -0,0 +1,70 @@
+'''
+Tests for the colourmap lookup-table cache in settings.py
+'''
+import importlib
+import sys
+
+import settings
+
+BUILDERS = '''
+import numpy as np
+
+def helper(lut, N={helper_n}):
+    lut[:N] = 0.
+    return lut
+
+def builder():
+    return helper(np.ones(({builder_n}, 4)))
+'''
+
+#************************************************************************
+def load_builders(tmp_path, name, builder_n=20, helper_n=5):
+    '''
+    Import a module of builders written with the given constants
+    '''
+    tmp_path = tmp_path / name
+    tmp_path.mkdir()
+    (tmp_path / "{}.py".format(name)).write_text(BUILDERS.format(builder_n=builder_n, helper_n=helper_n))
+    sys.path.insert(0, str(tmp_path))
+    try:
+        return importlib.import_module(name)
+    finally:
+        sys.path.remove(str(tmp_path))
+
+#************************************************************************
+def test_lut_key_stable(tmp_path):
+    module = load_builders(tmp_path, "builders_stable")
+    assert settings.lut_key("test", module.builder) == settings.lut_key("test", module.builder)
+
+def test_lut_key_changes_with_builder_constant(tmp_path):
+    # only the constant differs, so the bytecode is identical
+    old = load_builders(tmp_path, "builders_old", builder_n=20)
+    new = load_builders(tmp_path, "builders_new", builder_n=30)
+    assert old.builder.__code__.co_code == new.builder.__code__.co_code
+    assert settings.lut_key("test", old.builder) != settings.lut_key("test", new.builder)
+
+def test_lut_key_changes_with_helper_default(tmp_path):
+    old = load_builders(tmp_path, "builders_helper_old", helper_n=5)
+    new = load_builders(tmp_path, "builders_helper_new", helper_n=10)
+    assert settings.lut_key("test", old.builder) != settings.lut_key("test", new.builder)
+
+def test_lut_key_changes_with_version(monkeypatch):
+    builder = settings.COLOURMAP_REGISTRY["RdYlBu"]
+    old = settings.lut_key("RdYlBu", builder)
+    monkeypatch.setattr(settings, "LUT_VERSION", settings.LUT_VERSION + 1)
+    assert settings.lut_key("RdYlBu", builder) != old
+
+def test_get_lut_rebuilds_changed_builder(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "LUTLOC", str(tmp_path / "colourmaps"))
+    old = load_builders(tmp_path, "builders_get_old", builder_n=20)
+    new = load_builders(tmp_path, "builders_get_new", builder_n=30)
+
+    settings.register_colourmap("test", old.builder)
+    assert settings.get_lut("test").shape == (20, 4)
+
+    # a new builder under the same name must not be served the old table
+    settings.register_colourmap("test", new.builder)
+    assert settings.get_lut("test").shape == (30, 4)
+
+    settings.COLOURMAP_REGISTRY.pop("test")
+    settings.LUTS.pop("test")
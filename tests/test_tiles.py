@@ -0,0 +1,57 @@
+'''
+Tests for the Web-Mercator tile pyramid output
+'''
+import json
+import multiprocessing
+import zipfile
+
+import matplotlib
+import numpy as np
+import pytest
+
+import utils
+
+#************************************************************************
+@pytest.fixture(scope="module")
+def pool():
+    pool = multiprocessing.Pool(2)
+    yield pool
+    pool.terminate()
+
+@pytest.fixture
+def cube():
+    lats = np.arange(-87.5, 90, 5.)
+    lons = np.arange(-177.5, 180, 5.)
+    data = np.ma.masked_where(np.random.RandomState(0).rand(lats.size, lons.size) < 0.1, \
+                                  np.random.RandomState(1).randn(lats.size, lons.size))
+    return utils.make_iris_cube_2d(data, lats, lons, "test", "K")
+
+CMAP = matplotlib.colormaps["RdBu_r"]
+BOUNDS = [-3, -1, 0, 1, 3]
+
+#************************************************************************
+def test_unchanged_input_skipped(tmp_path, cube, pool):
+    outname = str(tmp_path / "map")
+    assert utils.write_map_tiles(outname, cube, CMAP, BOUNDS, max_zoom=1, pool=pool) == 5
+    before = (tmp_path / "map.tiles.zip").read_bytes()
+
+    assert utils.write_map_tiles(outname, cube, CMAP, BOUNDS, max_zoom=1, pool=pool) == 0
+    assert (tmp_path / "map.tiles.zip").read_bytes() == before
+
+def test_changed_data_rerendered(tmp_path, cube, pool):
+    outname = str(tmp_path / "map")
+    utils.write_map_tiles(outname, cube, CMAP, BOUNDS, max_zoom=1, pool=pool)
+
+    # one corner only, so the other zoom 1 tiles are copied
+    changed = cube.copy()
+    changed.data[-3:, :3] = 2.5
+    assert utils.write_map_tiles(outname, changed, CMAP, BOUNDS, max_zoom=1, pool=pool) == 2
+
+    with zipfile.ZipFile(outname + ".tiles.zip") as archive:
+        index = json.loads(archive.read("index.json"))
+        assert sorted(index["tiles"]) == sorted(n for n in archive.namelist() if n != "index.json")
+
+def test_changed_colours_rerendered(tmp_path, cube, pool):
+    outname = str(tmp_path / "map")
+    utils.write_map_tiles(outname, cube, CMAP, BOUNDS, max_zoom=1, pool=pool)
+    assert utils.write_map_tiles(outname, cube, CMAP, [-3, -2, 0, 2, 3], max_zoom=1, pool=pool) == 5
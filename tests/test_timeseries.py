@@ -0,0 +1,157 @@
+'''
+Tests for the Timeseries class - alignment and arithmetic
+'''
+import datetime as dt
+import pickle
+
+import numpy as np
+import pytest
+
+import utils
+
+#************************************************************************
+def test_storage_and_style():
+    ts = utils.Timeseries("test", [2000, 2001, 2002], [1, 2, 3], style={"ls" : "-"})
+    assert ts.data.dtype == np.float64
+    assert ts.ls == "-"
+    with pytest.raises(AttributeError):
+        ts.lw
+    ts.lw = 2
+    assert ts.style == {"ls" : "-", "lw" : 2}
+
+    # masked input keeps a full mask
+    ts = utils.Timeseries("test", [2000, 2001], np.ma.array([1, 2], mask=[True, False]))
+    assert list(np.ma.getmaskarray(ts.data)) == [True, False]
+
+def test_decimal_years_datetimes():
+    times = [dt.datetime(2001, 1, 1), dt.datetime(2001, 7, 2, 12), dt.date(2004, 12, 31)]
+    ts = utils.Timeseries("daily", times, [1, 2, 3])
+    assert np.allclose(ts.years[:2], [2001., 2001.5])
+    assert np.isclose(ts.years[2], 2004 + 365/366.)
+
+#************************************************************************
+def test_align_inner():
+    a = utils.Timeseries("a", [2000, 2001, 2002, 2003], [0., 1., 2., 3.])
+    b = utils.Timeseries("b", [2003, 2001, 2002, 2004], [30., 10., 20., 40.])
+
+    a, b = utils.align_timeseries([a, b], how="inner")
+
+    assert list(a.times) == [2001, 2002, 2003]
+    assert list(b.times) == [2001, 2002, 2003]
+    assert list(a.data) == [1., 2., 3.]
+    assert list(b.data) == [10., 20., 30.]
+
+def test_align_outer():
+    a = utils.Timeseries("a", [2000, 2001], [0., 1.], style={"lw" : 2})
+    b = utils.Timeseries("b", [2001, 2002], [10., 20.])
+
+    a, b = a.align(b, how="outer")
+
+    assert list(a.times) == [2000, 2001, 2002]
+    assert list(np.ma.getmaskarray(a.data)) == [False, False, True]
+    assert list(np.ma.getmaskarray(b.data)) == [True, False, False]
+    assert list(b.data.compressed()) == [10., 20.]
+    assert a.lw == 2
+
+    with pytest.raises(ValueError):
+        utils.align_timeseries([a, b], how="left")
+
+def test_align_datetimes():
+    a = utils.Timeseries("a", [dt.datetime(2001, 1, d) for d in (1, 2, 3)], [1., 2., 3.])
+    b = utils.Timeseries("b", [dt.datetime(2001, 1, d) for d in (2, 3, 4)], [20., 30., 40.])
+    a, b = a.align(b)
+    assert list(a.times) == [dt.datetime(2001, 1, 2), dt.datetime(2001, 1, 3)]
+    assert list(b.data) == [20., 30.]
+
+#************************************************************************
+def test_arithmetic_aligns():
+    a = utils.Timeseries("a", [2000, 2001, 2002], [1., 2., 3.], style={"ls" : "--"})
+    b = utils.Timeseries("b", [2001, 2002, 2003], [10., 20., 30.])
+
+    total = a + b
+    assert total.name == "a"
+    assert total.ls == "--"
+    assert list(total.times) == [2001, 2002]
+    assert list(total.data) == [12., 23.]
+
+    assert list((b - a).data) == [8., 17.]
+    assert list((a * b).data) == [20., 60.]
+    assert list((b / a).data) == [5., 20. / 3.]
+
+def test_arithmetic_masked():
+    a = utils.Timeseries("a", [2000, 2001], np.ma.array([1., 2.], mask=[False, True]))
+    b = utils.Timeseries("b", [2000, 2001], [10., 20.])
+    total = a + b
+    assert list(np.ma.getmaskarray(total.data)) == [False, True]
+    assert total.data[0] == 11.
+
+def test_arithmetic_scalars():
+    ts = utils.Timeseries("a", [2000, 2001], [1., 4.])
+
+    assert list((ts + 1).data) == [2., 5.]
+    assert list((1 + ts).data) == [2., 5.]
+    assert list((ts - 1).data) == [0., 3.]
+    assert list((1 - ts).data) == [0., -3.]
+    assert list((2 * ts).data) == [2., 8.]
+    assert list((4 / ts).data) == [4., 1.]
+    assert list((ts / 4).data) == [0.25, 1.]
+    assert list((-ts).data) == [-1., -4.]
+    assert list((-ts).times) == [2000, 2001]
+
+    # original unchanged
+    assert list(ts.data) == [1., 4.]
+
+#************************************************************************
+def test_selection():
+    ts = utils.Timeseries("a", np.arange(2000, 2010), np.arange(10.))
+    ts.upper, ts.lower = np.arange(10.) + 1, np.arange(10.) - 1
+
+    part = ts[2:4]
+    assert list(part.times) == [2002, 2003]
+    assert list(part.upper) == [3., 4.]
+
+    part = ts.period(2003, 2006)
+    assert list(part.times) == [2003, 2004, 2005]
+    assert list(ts.period(end=2002).data) == [0., 1.]
+
+    ts.mask_period(start=2008)
+    assert list(np.ma.getmaskarray(ts.data)) == [False] * 8 + [True] * 2
+
+def test_resample():
+    times = 2000 + np.arange(24) / 12.
+    ts = utils.Timeseries("a", times, np.arange(24.))
+
+    annual = ts.resample()
+    assert list(annual.times) == [2000, 2001]
+    assert list(annual.data) == [5.5, 17.5]
+
+    assert list(ts.resample(how="max").data) == [11., 23.]
+    assert ts.resample(lambda series : series[:1]).data[0] == 0.
+
+def test_pickle():
+    ts = utils.Timeseries("a", [2000, 2001], np.ma.array([1., 2.], mask=[False, True]), style={"zorder" : 3})
+    ts.upper = np.array([2., 3.])
+
+    new = pickle.loads(pickle.dumps(ts))
+
+    assert new.name == "a"
+    assert new.zorder == 3
+    assert list(new.times) == [2000, 2001]
+    assert list(np.ma.getmaskarray(new.data)) == [False, True]
+    assert list(new.upper) == [2., 3.]
+    assert new.lower is None
+
+#************************************************************************
+def test_collection_matches_timeseries():
+    a = utils.Timeseries("a", [2000, 2001, 2002], [1., 2., 3.], style={"lw" : 3})
+    b = utils.Timeseries("b", [2001, 2002, 2003], [10., 20., 30.])
+
+    collection = utils.TimeseriesCollection.from_timeseries([a, b])
+
+    assert len(collection) == 2
+    assert list(collection.times) == [2000, 2001, 2002, 2003]
+    assert collection["a"].lw == 3
+    assert list(collection["b"].data.compressed()) == [10., 20., 30.]
+    ranks = collection.ranks()[:, 0]
+    assert list(np.ma.getmaskarray(ranks)) == [False, False, False, True]
+    assert list(ranks.compressed()) == [3, 2, 1]
@@ -136,23 +136,55 @@ def GetYears(cube, is_era5 = False):
     return years
 
 #************************************************************************
+@utils.profiled("compute")
 def ApplyClimatology(cube, is_era5=False):
 
     years = GetYears(cube, is_era5=is_era5)
 
-    clim_years=np.where((years >= CLIMSTART) & (years <= CLIMEND))
-    
-    climatology = np.ma.mean(cube.data[clim_years], axis = 0)
-    
-    cube.data = cube.data - climatology                                
+    climatology = utils.get_climatology(years, cube.data, CLIMSTART, CLIMEND)
+
+    cube.data = utils.apply_climatology(years, cube.data, climatology)
         
     return cube
 
 #************************************************************************
+def GetSeasons(cube_list, names, index, is_era5=False):
+    '''
+    Seasonal anomaly cubes (DJF, MAM, JJA, SON) for the selected year
+
+    :param obj cube_list: cubes for each month, as read from file
+    :param array names: names of each cube
+    :param str index: index name
+    :param bool is_era5: ERA5 time coordinate
+
+    :returns: list of cubes
+    '''
+
+    # take appropriate seasonal value
+    if index in ["TX90p", "TN90p", "TX10p", "TN10p"]:
+        # change from % to days, assuming a season is 1/4 of a year
+        how, scale = "mean", 3.65/4.
+    elif index in ["TXx", "TNx"]:
+        how, scale = "max", 1.
+    elif index in ["TXn", "TNn"]:
+        how, scale = "min", 1.
+    else:
+        raise ValueError("no seasonal aggregation for index {}".format(index))
+
+    month_cubes = utils.select_month_cubes(cube_list, names)
+    years = GetYears(month_cubes[0], is_era5=is_era5)
+
+    season_list = utils.seasonal_cubes(month_cubes, years, SELECTED_YEAR, how=how, min_months=2, scale=scale, \
+                                           base_period=(CLIMSTART, CLIMEND))
+
+    return season_list # GetSeasons
+
+#************************************************************************
+@utils.profiled("load")
 def obtain_timeseries(filename, cube_name, ts_name, index, is_era5 = False):
 
     # re-read the file to overwrite memory of what was done to this cube.
-    cube_list = iris.load(filename)
+    cube_list = utils.load_cubes(filename)
     names = np.array([cube.name() for cube in cube_list])
 
     selected_cube, = np.where(names == cube_name)
@@ -165,41 +197,19 @@ def obtain_timeseries(filename, cube_name, ts_name, index, is_era5 = False):
     cube.coord('latitude').guess_bounds()
     cube.coord('longitude').guess_bounds()  
 
-    nyears = np.ma.count(cube.data, axis = 0)
+    # mask gridboxes with low coverage, and get %land covered
+    mean, coverage, norm = utils.area_weighted_mean_and_coverage(cube, threshold=THRESHOLD, land_fraction=0.3)
 
-    # repeat so selection will work across all years
-    nyears = np.array([nyears for i in range(cube.data.shape[0])])
-
-    cube.data = np.ma.masked_where(nyears < THRESHOLD * cube.data.shape[0], cube.data)
-
-    weight_areas = iris.analysis.cartography.area_weights(cube)
-    ts = cube.collapsed(['latitude', 'longitude'], iris.analysis.MEAN, weights=weight_areas)
-
-    times = GetYears(ts, is_era5=is_era5)
+    times = GetYears(cube, is_era5=is_era5)
 
     if index in ["TX90p", "TN90p", "TX10p", "TN10p"]:
-        ts = utils.Timeseries(ts_name, times, ts.data * 3.65)
+        ts = utils.Timeseries(ts_name, times, mean * 3.65)
 
     else:
-        ts = utils.Timeseries(ts_name, times, ts.data)
-
-    # get coverage
-    cover_cube = copy.deepcopy(cube)
-    # replace data with 1
-    cover_cube.data.data[:] = 1
-    # and get timeseries
-    weight_areas = iris.analysis.cartography.area_weights(cover_cube)
-    cover_ts = cover_cube.collapsed(['latitude', 'longitude'], iris.analysis.SUM, weights=weight_areas)
-
-    # normalise - obtain max area possible with each gridbox = 1
-    norm_cube = copy.deepcopy(cover_cube)[0]
-    norm_cube.data.mask = False
-    weight_areas = iris.analysis.cartography.area_weights(norm_cube)
-    norm = norm_cube.collapsed(['latitude', 'longitude'], iris.analysis.SUM, weights=weight_areas)
-   
-    # apply normalisation and convert to %.  Also convert to %land.
-    cover_ts = (cover_ts/norm)*100/0.3
-    cover_ts = utils.Timeseries("Coverage", GetYears(cover_ts), cover_ts.data)
+        ts = utils.Timeseries(ts_name, times, mean)
+
+    # convert to %
+    cover_ts = utils.Timeseries("Coverage", times, coverage * 100)
         
     return ts, cover_ts # obtain_timeseries
 
@@ -235,6 +245,7 @@ def calc_rank(data):
 
 
 #************************************************************************
+@utils.profiled("compute")
 def get_ranks(incube):
 
 
@@ -264,6 +275,7 @@ def get_ranks(incube):
     return cube # get_ranks
 
 #************************************************************************
+@utils.profiled("render")
 def plot_rank_map(outname, cube, cmap, bounds, cb_label, scatter = [], figtext = "", title = ""):
     '''
     Standard scatter map
@@ -277,35 +289,21 @@ def plot_rank_map(outname, cube, cmap, bounds, cb_label, scatter = [], figtext =
 
     norm=mpl.cm.colors.BoundaryNorm(bounds,cmap.N)
 
-    fig = plt.figure(figsize=(8, 5.5))
+    template = utils.get_map_template(("map", False), (8, 5.5), rects=[[0.01, 0.12, 0.98, 0.88]])
+    fig, ax = template.fig, template.axes[0]
+    ext = template.extents[0]
 
-    plt.clf()
-    ax = plt.axes([0.01, 0.12, 0.98, 0.88], projection=cartopy.crs.Robinson())
-    ax.gridlines() #draw_labels=True)
-    ax.add_feature(cartopy.feature.LAND, zorder = 0, facecolor = "0.9", edgecolor = "k")
-    ax.coastlines()
-
-    ext = ax.get_extent() # save the original extent
-
-    mesh = iris.plot.pcolormesh(cube, cmap=cmap, norm = norm)
+    mesh = utils.plot_cube_mesh(ax, cube, cmap, norm)
 
     if len(scatter) > 0:
 
         lons, lats, data = scatter
 
-        plt.scatter(lons, lats, c = data, cmap = cmap, norm = norm, s=25, \
+        ax.scatter(lons, lats, c = data, cmap = cmap, norm = norm, s=25, \
                         transform = cartopy.crs.Geodetic(), edgecolor = '0.5', linewidth='0.5')
 
 
-    cb=plt.colorbar(mesh, orientation = 'horizontal', pad = 0.05, fraction = 0.05, \
-                        aspect = 30, ticks = bounds[1:-1], drawedges=True)
-
-    # thicken border of colorbar and the dividers
-    # http://stackoverflow.com/questions/14477696/customizing-colorbar-border-color-on-matplotlib
-#    cb.outline.set_color('k')
-    cb.outline.set_linewidth(2)
-    cb.dividers.set_color('k')
-    cb.dividers.set_linewidth(2)
+    cb = template.colorbar(mesh, bounds)
     cb.set_label(cb_label, labelpad=20)
 
 
@@ -319,11 +317,10 @@ def plot_rank_map(outname, cube, cmap, bounds, cb_label, scatter = [], figtext =
 
     ax.set_extent(ext, ax.projection) # fix the extent change from colormesh
 
-    plt.title(title)
-    fig.text(0.03, 0.95, figtext, fontsize = settings.FONTSIZE * 0.8)
+    ax.set_title(title)
+    template.text("figtext", 0.03, 0.95, figtext, fontsize = settings.FONTSIZE * 0.8)
 
-    plt.savefig(outname + settings.OUTFMT)
-    plt.close()
+    utils.save_figure(outname + settings.OUTFMT, fig=fig)
 
     return # plot_rank_map_iris
 
@@ -346,60 +343,43 @@ def fix_time_coord(incube):
     return incube # fix_time_coord
 
 #*******************************
-def compute_coverage_error(observations, reanalysis):
+def lat_lon_last(cube):
     '''
-    Calculate the coverage error on a monthly basis
+    Data of a cube with latitude and longitude moved to the last two axes
 
-    Takes each month in observations, find all the corresponding calendar months in reanalysis
-    (i.e. for Jan 1973, finds all Jans in ERA).  Then mask by data coverage, and get
-    range of residuals in global average.  Use these residuals to estimate error
-
-    From HadEX3 code
+    :param obj cube: iris cube
 
+    :returns: masked array (... x latitude x longitude)
     '''
-    
-    offset = np.zeros(len(observations.coord("time").points))
-    st_dev = np.zeros(len(observations.coord("time").points))
 
-    # add month names into data
-    iris.coord_categorisation.add_month(reanalysis, 'time', name='month')
-    iris.coord_categorisation.add_month(observations, 'time', name='month')
+    lat_dim, = cube.coord_dims('latitude')
+    lon_dim, = cube.coord_dims('longitude')
 
-    for m, month  in enumerate(observations.coord("time").points):
+    return np.moveaxis(np.ma.asarray(cube.data), [lat_dim, lon_dim], [-2, -1]) # lat_lon_last
 
-        # get weightings for cubes
-        grid_areas = iris.analysis.cartography.cosine_latitude_weights(observations[m]) 
-        area_average = observations[m].collapsed(['longitude', 'latitude'], iris.analysis.MEAN, weights=grid_areas)
+#*******************************
+def compute_coverage_error(observations, reanalysis, chunk_size=None):
+    '''
+    Calculate the coverage error on a monthly basis
 
-        if area_average == observations.data.fill_value:
-            # no data for this month
-            offset[m] = observations.data.fill_value
-            st_dev[m] = observations.data.fill_value
-            
-        else:
-            # make a copy so can update the mask without worrying
-            reanal = copy.deepcopy(reanalysis)
+    Takes each month in observations, and masks the reanalysis by that data coverage.
+    Get range of residuals in global average.  Use these residuals to estimate error
 
-            # get a clean-mean
-            grid_areas = iris.analysis.cartography.cosine_latitude_weights(reanal)              
+    Reanalysis is expected to be regridded to the observation grid.
 
-            total_mean = reanal.collapsed(['longitude', 'latitude'], iris.analysis.MEAN, weights=grid_areas)
+    From HadEX3 code
 
-            # apply the observation coverage mask to all months
-            # combine the lsm with the data mask
-            combined_mask = np.ma.mask_or(np.array([observations[m].data.mask for i in range(reanal.data.shape[0])]), reanal.data.mask)
+    '''
 
-            reanal.data.mask = combined_mask
+    # get weightings for cubes - same grid, so only need to do once
+    grid_areas = utils.grid_area_weights(observations, cosine=True)
 
-            # get a masked mean
-            grid_areas = iris.analysis.cartography.cosine_latitude_weights(reanal)              
-            masked_mean = reanal.collapsed(['longitude', 'latitude'], iris.analysis.MEAN, weights=grid_areas)
-            
-            # calculate residuals and find mean and st_dev
-            residuals = masked_mean.data - total_mean.data
+    # flatten to (time x cells), with cells in the (latitude x longitude) order of the weights
+    obs_coverage = ~np.ma.getmaskarray(lat_lon_last(observations)).reshape(-1, grid_areas.size)
+    reanal_data = lat_lon_last(reanalysis).reshape(-1, grid_areas.size)
 
-            offset[m] = np.mean(residuals)
-            st_dev[m] = np.std(residuals, ddof=1) # to match IDL
+    offset, st_dev = utils.coverage_error(obs_coverage, reanal_data, grid_areas.reshape(-1), \
+                                              observations.data.fill_value, chunk_size=chunk_size)
 
     return offset, st_dev # compute_coverage_error
 
@@ -408,6 +388,7 @@ def run_all_plots():
 
     if True:
         for index in INDICES:
+            utils.profile_figure("TEX_{}".format(index))
 
             # dummy so far
     #        NYEARS = 66
@@ -425,7 +406,7 @@ def run_all_plots():
                 bounds = [-100, -6, -4, -2, -1, 0, 1, 2, 4, 6, 100]
                 cmap=settings.COLOURMAP_DICT["temperature"]
 
-            cube_list = iris.load(DATALOC + "GHCND_{}_1951-{}_RegularGrid_global_2.5x2.5deg_LSmask.nc".format(index, int(settings.YEAR) + 1))
+            cube_list = utils.load_cubes(DATALOC + "GHCND_{}_1951-{}_RegularGrid_global_2.5x2.5deg_LSmask.nc".format(index, int(settings.YEAR) + 1))
             names = np.array([cube.name() for cube in cube_list])
 
             #*************
@@ -463,57 +444,7 @@ def run_all_plots():
             #*************
             # plot season maps (2x2)
 
-            season_list = []
-            for season in SEASONS:
-
-                # extract each month
-                month_data = []
-                months = SEASON_DICT[season]
-                for month in months:
-
-                    selected_cube, = np.where(names == month)[0]
-                    cube = cube_list[selected_cube]
-
-                    if month  == "Dec":
-                        # need to extract from previous year - cheat by rolling data around
-                        cube.data = np.roll(cube.data, 1, axis = 0)
-                        cube.data.mask[0,:,:] = True # and mask out the previous years'
-
-                    if index in ["TX90p", "TN90p", "TX10p", "TN10p"]:
-                        # change from % to days
-                        cube.data = cube.data * (3.65/4.) # assume a season is 1/4 of a year
-
-                    month_data += [cube.data]
-
-                # finished getting all months, make a dummy cube to populate
-                month_data = np.ma.array(month_data)
-                season_cube = copy.deepcopy(cube)
-
-                # take appropriate seasonal value
-                if index in ["TX90p", "TN90p", "TX10p", "TN10p"]:
-                    season_cube.data = np.ma.mean(month_data, axis = 0)
-                elif index in ["TXx", "TNx"]:
-                    season_cube.data = np.ma.max(month_data, axis = 0)
-                elif index in ["TXn", "TNn"]:
-                    season_cube.data = np.ma.min(month_data, axis = 0)
-
-                # mask if fewer that 2 months present
-                nmonths_locs = np.ma.count(month_data, axis = 0)
-                season_cube.data = np.ma.masked_where(nmonths_locs < 2, season_cube.data)
-
-                # make anomalies
-                season_cube = ApplyClimatology(season_cube)
-
-                # fix for plotting
-                season_cube.coord('latitude').guess_bounds()
-                season_cube.coord('longitude').guess_bounds()
-
-                # select the year to plot
-                years = GetYears(cube)
-                loc, = np.where(years == SELECTED_YEAR)
-
-                # add to list
-                season_list += [season_cube[loc[0]]]
+            season_list = GetSeasons(cube_list, names, index)
 
             # sort the bounds and colourbars
             if index in ["TX90p", "TN90p"]:
@@ -587,7 +518,7 @@ def run_all_plots():
 
             fig.subplots_adjust(left=0.1, right = 0.9, top = 0.98, bottom = 0.05, hspace = 0.001)
 
-            plt.savefig(settings.IMAGELOC+"TEX_{}+{}_ts_ghcndex{}".format(index_pair[0], index_pair[1], settings.OUTFMT))
+            utils.save_figure(settings.IMAGELOC+"TEX_{}+{}_ts_ghcndex{}".format(index_pair[0], index_pair[1], settings.OUTFMT))
             plt.close()
 
 
@@ -630,7 +561,7 @@ def run_all_plots():
 
     #     fig.subplots_adjust(right = 0.95, top = 0.95, bottom = 0.05, hspace = 0.001)
 
-    #     plt.savefig(settings.IMAGELOC+"TEX_{}+{}_ts_erai{}".format(index_pair[0], index_pair[1], settings.OUTFMT))
+    #     utils.save_figure(settings.IMAGELOC+"TEX_{}+{}_ts_erai{}".format(index_pair[0], index_pair[1], settings.OUTFMT))
     #     plt.close()
 
 
@@ -742,7 +673,7 @@ def run_all_plots():
 
     #*************
     # timeseries ERA5
-    ERA5LOCTEMP = "/data/users/rdunn/reanalyses/data/era5/v20200409/indices/"
+    ERA5LOCTEMP = settings.ERA5_INDICESLOC
 #    ERA5LOCTEMP = "/scratch/rdunn/reanalyses/era5/final/"
     if True:
  
@@ -780,7 +711,7 @@ def run_all_plots():
 
             fig.subplots_adjust(right = 0.95, top = 0.95, bottom = 0.05, hspace = 0.001)
 
-            plt.savefig(settings.IMAGELOC+"TEX_{}+{}_ts_era5{}".format(index_pair[0], index_pair[1], settings.OUTFMT))
+            utils.save_figure(settings.IMAGELOC+"TEX_{}+{}_ts_era5{}".format(index_pair[0], index_pair[1], settings.OUTFMT))
             plt.close()
 
 
@@ -788,6 +719,7 @@ def run_all_plots():
     # ERA Maps (annual only)
     if True:
         for index in INDICES:
+            utils.profile_figure("TEX_{}".format(index))
 
             # sort the bounds and colourbars
             if index in ["TX90p", "TN90p"]:
@@ -802,7 +734,7 @@ def run_all_plots():
                 bounds = [-100, -6, -4, -2, -1, 0, 1, 2, 4, 6, 100]
                 cmap=settings.COLOURMAP_DICT["temperature"]
 
-            cube_list = iris.load(ERA5LOCTEMP + "ERA5_{}_1979-{}.nc".format(index, settings.YEAR))
+            cube_list = utils.load_cubes(ERA5LOCTEMP + "ERA5_{}_1979-{}.nc".format(index, settings.YEAR))
             names = np.array([cube.var_name for cube in cube_list])
 
             #*************
@@ -830,57 +762,7 @@ def run_all_plots():
             #*************
             # plot season maps (2x2)
 
-            season_list = []
-            for season in SEASONS:
-
-                # extract each month
-                month_data = []
-                months = SEASON_DICT[season]
-                for month in months:
-
-                    selected_cube, = np.where(names == month)[0]
-                    cube = cube_list[selected_cube]
-
-                    if month  == "December":
-                        # need to extract from previous year - cheat by rolling data around
-                        cube.data = np.roll(cube.data, 1, axis = 0)
-                        cube.data.mask[0,:,:] = True # and mask out the previous years'
-
-                    if index in ["TX90p", "TN90p", "TX10p", "TN10p"]:
-                        # change from % to days
-                        cube.data = cube.data * (3.65/4.) # assume a season is 1/4 of a year
-
-                    month_data += [cube.data]
-
-                # finished getting all months, make a dummy cube to populate
-                month_data = np.ma.array(month_data)
-                season_cube = copy.deepcopy(cube)
-
-                # take appropriate seasonal value
-                if index in ["TX90p", "TN90p", "TX10p", "TN10p"]:
-                    season_cube.data = np.ma.mean(month_data, axis = 0)
-                elif index in ["TXx", "TNx"]:
-                    season_cube.data = np.ma.max(month_data, axis = 0)
-                elif index in ["TXn", "TNn"]:
-                    season_cube.data = np.ma.min(month_data, axis = 0)
-
-                # mask if fewer that 2 months present
-                nmonths_locs = np.ma.count(month_data, axis = 0)
-                season_cube.data = np.ma.masked_where(nmonths_locs < 2, season_cube.data)
-
-                # make anomalies
-                season_cube = ApplyClimatology(season_cube, is_era5=True)
-
-                # fix for plotting
-                season_cube.coord('latitude').guess_bounds()
-                season_cube.coord('longitude').guess_bounds()
-
-                # select the year to plot
-                years = GetYears(cube, is_era5 = True)
-                loc, = np.where(years == SELECTED_YEAR)
-
-                # add to list
-                season_list += [season_cube[loc[0]]]
+            season_list = GetSeasons(cube_list, names, index, is_era5=True)
 
             # sort the bounds and colourbars
             if index in ["TX90p", "TN90p"]:
@@ -913,7 +795,7 @@ def run_all_plots():
                 axes[ix].text(0.02, 0.9, "({}) {}".format(string.ascii_lowercase[ix], index), transform = axes[ix].transAxes, fontsize = settings.FONTSIZE)
 
                 # obs cube
-                cube_list = iris.load(DATALOC + "GHCND_{}_1951-{}_RegularGrid_global_2.5x2.5deg_LSmask.nc".format(index, int(settings.YEAR) + 1))
+                cube_list = utils.load_cubes(DATALOC + "GHCND_{}_1951-{}_RegularGrid_global_2.5x2.5deg_LSmask.nc".format(index, int(settings.YEAR) + 1))
                 names = np.array([cube.var_name for cube in cube_list])
                 selected_cube, = np.where(names == "Ann")[0]
 
@@ -927,7 +809,7 @@ def run_all_plots():
                     ghcndex_cube.data = ghcndex_cube.data * 3.65
 
                 # era5 cube
-                cube_list = iris.load(ERA5LOCTEMP + "ERA5_{}_1979-{}.nc".format(index, settings.YEAR))
+                cube_list = utils.load_cubes(ERA5LOCTEMP + "ERA5_{}_1979-{}.nc".format(index, settings.YEAR))
                 names = np.array([cube.var_name for cube in cube_list])
                 selected_cube, = np.where(names == "Ann")[0]
 
@@ -989,10 +871,12 @@ def run_all_plots():
 
             fig.subplots_adjust(left=0.1, right = 0.9, top = 0.98, bottom = 0.05, hspace = 0.001)
 
-            plt.savefig(settings.IMAGELOC+"TEX_{}+{}_ts_ghcndex_uncertainties{}".format(index_pair[0], index_pair[1], settings.OUTFMT))
+            utils.save_figure(settings.IMAGELOC+"TEX_{}+{}_ts_ghcndex_uncertainties{}".format(index_pair[0], index_pair[1], settings.OUTFMT))
             plt.close()
 
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
@@ -79,6 +79,7 @@ def test_if_missing(time):
     return result # test_if_missing
  
 #************************************************************************
+@utils.profiled("load")
 def read_ts(filename, name):
     '''
     Read the GRACE timeseries and return a Timeseries object
@@ -89,7 +90,7 @@ def read_ts(filename, name):
     :returns: Timeseries object
     '''
 
-    indata = np.genfromtxt(filename, dtype=(float))
+    indata = utils.genfromtxt(filename, dtype=(float))
 
     if name == "GRACE":
         data = np.ma.masked_where(indata[:, 1] == 998.0, indata[:, 1])
@@ -111,6 +112,7 @@ def read_ts(filename, name):
     return utils.Timeseries(name, time, data) # read_ts
 
 #************************************************************************
+@utils.profiled("load")
 def read_hovmuller_2015(data_loc):
     '''
     Retired for 2016 SotC but retained in case of value in future
@@ -138,7 +140,7 @@ def read_hovmuller_2015(data_loc):
 
         # if file exists, read in, else read in dummy data of same size
         try:
-            indata = np.genfromtxt(DATALOC + "avg_lat_csr05_ds_{:04g}{:02g}.txt".format(today.year, today.month), dtype=(float))
+            indata = utils.genfromtxt(DATALOC + "avg_lat_csr05_ds_{:04g}{:02g}.txt".format(today.year, today.month), dtype=(float))
 
             data += [indata[:, 1]]
             lats += [indata[:, 0]]     
@@ -167,6 +169,7 @@ def read_hovmuller_2015(data_loc):
     return np.array(time), latitudes, data # read_hovmuller_2015
 
 #************************************************************************
+@utils.profiled("load")
 def read_hovmuller_2017(data_loc):
     '''
     Scrappy subroutine to read in the files - one per month (some missing)
@@ -232,7 +235,7 @@ def read_hovmuller_2017(data_loc):
 
         # if file exists, read in, else read in dummy data of same size
         try:
-            indata = np.genfromtxt(filename, dtype=(float))
+            indata = utils.genfromtxt(filename, dtype=(float))
 
             data += [indata[:, 1]]
             lats += [indata[:, 0]]     
@@ -249,6 +252,7 @@ def read_hovmuller_2017(data_loc):
     return np.array(time), latitudes, data # read_hovmuller_2017
 
 #************************************************************************
+@utils.profiled("load")
 def read_hovmuller(filename):
     '''
     Scrappy subroutine to read in file
@@ -259,7 +263,7 @@ def read_hovmuller(filename):
     :returns: times, latitudes and data
     '''
 
-    indata = np.genfromtxt(filename, dtype=(float))
+    indata = utils.genfromtxt(filename, dtype=(float))
 
     latitudes = np.unique(indata[:, 0])
     latitudes.sort()
@@ -286,6 +290,7 @@ def read_hovmuller(filename):
     return np.array(time), latitudes, data # read_hovmuller
 
 #************************************************************************
+@utils.profiled("load")
 def read_map_data(filename):
     '''
     Read data for maps and convert to cube.  Given as single list files
@@ -295,7 +300,7 @@ def read_map_data(filename):
     :returns: cube
     '''
     
-    grace = np.genfromtxt(filename, dtype=(float))
+    grace = utils.genfromtxt(filename, dtype=(float))
 
     lats = grace[:, 0]
     lons = grace[:, 1]
@@ -360,7 +365,7 @@ def run_all_plots():
         for tick in ax1.xaxis.get_major_ticks():
             tick.label.set_fontsize(settings.FONTSIZE) 
 
-        plt.savefig(settings.IMAGELOC+"TWS_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"TWS_ts{}".format(settings.OUTFMT))
         plt.close()
 
 
@@ -392,6 +397,8 @@ def run_all_plots():
 
         utils.plot_smooth_map_iris(settings.IMAGELOC + "TWS_{}_diffs".format(settings.YEAR), cube, settings.COLOURMAP_DICT["hydrological"], bounds, "Difference between {} and {} Equivalent Depth of Water (cm)".format(settings.YEAR, int(settings.YEAR)-1))
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
@@ -21,7 +21,6 @@ import numpy as np
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 import matplotlib.ticker
-import netCDF4 as ncdf
 import iris
 
 import utils # RJHD utilities
@@ -65,15 +64,7 @@ def make_masked_annual_ts(name, time, data):
     :param array data: data
     '''
 
-    data = data.reshape(-1, 12)
-
-    counts = np.ma.count(data, axis=1)
-
-    annual = np.ma.mean(data, axis=1)
-    
-    annual = np.ma.masked_where(counts < 12, annual)
-
-    years = time.reshape(-1, 12)[:, 0]
+    years, annual = utils.annual_resample(time, data, min_months=12)
 
     ts = utils.Timeseries(name, np.ma.array(years, mask=annual.mask), annual) 
 
@@ -81,6 +72,7 @@ def make_masked_annual_ts(name, time, data):
 
 #************************************************************************
 def read_uaw_ts(filename, smooth=False, annual=False):
+    import netCDF4 as ncdf
 
     # IRIS doesn't like the Conventions attribute
     ncfile = ncdf.Dataset(filename, 'r')
@@ -216,7 +208,7 @@ def run_all_plots():
         ax5.text(0.02, 0.87, "(e) Observations & Reanalyses 10"+r'$^\circ$'+"S - 10"+r'$^\circ$'+"N 50hPa", transform = ax5.transAxes, fontsize = settings.LABEL_FONTSIZE)
 
 
-        plt.savefig(settings.IMAGELOC+"UAW_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"UAW_ts{}".format(settings.OUTFMT))
 
     #************************************************************************
     # Timeseries - 2018
@@ -248,7 +240,7 @@ def run_all_plots():
         # # sort labelling
         ax.text(0.02, 0.87, "Globe 850hPa", transform=ax.transAxes, fontsize=settings.LABEL_FONTSIZE)
 
-        plt.savefig(settings.IMAGELOC+"UAW_globe_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"UAW_globe_ts{}".format(settings.OUTFMT))
 
     #*******
     # Tropics timeseries
@@ -280,13 +272,14 @@ def run_all_plots():
         ax.text(0.02, 0.87, "10"+r'$^\circ$'+"S - 10"+r'$^\circ$'+"N 50hPa", \
                     transform=ax.transAxes, fontsize=settings.LABEL_FONTSIZE)
 
-        plt.savefig(settings.IMAGELOC+"UAW_tropics_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"UAW_tropics_ts{}".format(settings.OUTFMT))
 
 
     #************************************************************************
     # Global Map - ERA5 Anomaly figure
     if True:
         # Read in ERA5 anomalies
+        import netCDF4 as ncdf
 
         # IRIS doesn't like the Conventions attribute
         ncfile = ncdf.Dataset(DATALOC + "ERA5_850_u.nc", 'r')
@@ -387,7 +380,7 @@ def run_all_plots():
 
         utils.thicken_panel_border(ax)
 
-        plt.savefig(settings.IMAGELOC+"UAW_QBO_levels{}".format(settings.OUTFMT))    
+        utils.save_figure(settings.IMAGELOC+"UAW_QBO_levels{}".format(settings.OUTFMT))    
 
 
     #************************************************************************
@@ -469,7 +462,7 @@ def run_all_plots():
 
         utils.thicken_panel_border(ax)
 
-        plt.savefig(settings.IMAGELOC+"UAW_levels{}".format(settings.OUTFMT))    
+        utils.save_figure(settings.IMAGELOC+"UAW_levels{}".format(settings.OUTFMT))    
 
     #************************************************************************
     # 200hPa winds in 1980 and 2018    
@@ -543,7 +536,9 @@ def run_all_plots():
                 tick.label.set_fontsize(settings.FONTSIZE*0.8) 
             utils.thicken_panel_border(ax)
 
-            plt.savefig(settings.IMAGELOC+"UAW_200hPa_Jan{}_ts{}".format(year, settings.OUTFMT))       
+            utils.save_figure(settings.IMAGELOC+"UAW_200hPa_Jan{}_ts{}".format(year, settings.OUTFMT))       
+
+    utils.close_map_templates()
 
     return
 
@@ -139,7 +139,7 @@ def run_all_plots():
         for tick in ax.xaxis.get_major_ticks():
             tick.label.set_fontsize(settings.FONTSIZE)
 
-        plt.savefig(settings.IMAGELOC+"UTH_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"UTH_ts{}".format(settings.OUTFMT))
         plt.close()
 
     #************************************************************************
@@ -163,6 +163,8 @@ def run_all_plots():
         utils.plot_smooth_map_iris(settings.IMAGELOC + "UTH_{}_anoms_mw".format(settings.YEAR), cube, settings.COLOURMAP_DICT["hydrological"], bounds, "Anomalies from 2001-2010 (% rh)")
         utils.plot_smooth_map_iris(settings.IMAGELOC + "p2.1_UTH_{}_anoms_mw".format(settings.YEAR), cube, settings.COLOURMAP_DICT["hydrological"], bounds, "Anomalies from 2001-2010 (% rh)", figtext="(j) Upper Tropospheric Humidity")
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************
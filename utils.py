@@ -16,43 +16,1487 @@ from six.moves import input
 #                                 START
 #************************************************************************
 import math
+import re
 import sys
-import copy
+import os
+import io
+import csv
+import time
+import atexit
+import functools
+import tracemalloc
+import json
+import hashlib
+import datetime as dt
+import zipfile
+import multiprocessing
+import threading
+import importlib
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib as mpl
 from matplotlib.ticker import MultipleLocator
-import scipy.stats
-
-import iris
-import iris.plot
-import cartopy
-import cf_units
 
 import settings # RJHD settings
 
+#************************************************************************
+class LazyModule(object):
+    '''
+    Stand-in for a module which is slow to import, imported (along with the
+    listed submodules) on first use - so sections which only draw timeseries
+    never pay for iris, cartopy or scipy
+    '''
+
+    def __init__(self, name, submodules=[]):
+        self._name = name
+        self._submodules = submodules
+        self._module = None
+
+    def __getattr__(self, attribute):
+        if self._module is None:
+            for submodule in self._submodules:
+                importlib.import_module(submodule)
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+iris = LazyModule("iris", ["iris.plot", "iris.analysis.cartography", "iris.coords", "iris.cube", "iris.coord_systems"])
+cartopy = LazyModule("cartopy", ["cartopy.crs", "cartopy.feature"])
+cf_units = LazyModule("cf_units")
+scipy = LazyModule("scipy", ["scipy.ndimage"])
+
+
+#************************************************************************
+def decimal_years(times):
+    '''
+    Decimal-year equivalent of an array of times - numbers are taken as
+    (decimal) years already, datetimes are converted
+
+    :param array times: times (numbers, datetimes or datetime64)
+
+    :returns: float64 array (NaN where masked or not convertible)
+    '''
+
+    if np.ma.isMaskedArray(times):
+        if times.dtype.kind in "iuf":
+            return times.astype(np.float64).filled(np.nan)
+        times = times.filled(None)
+
+    times = np.asarray(times)
+
+    if times.dtype.kind in "iuf":
+        return times.astype(np.float64)
+    if times.dtype.kind == "M":
+        times = times.astype("datetime64[us]").astype(object)
+
+    years = np.full(times.shape, np.nan)
+    for t, time in enumerate(times.reshape(-1)):
+        if isinstance(time, dt.date):
+            start = dt.datetime(time.year, 1, 1)
+            length = (dt.datetime(time.year + 1, 1, 1) - start).total_seconds()
+            if not isinstance(time, dt.datetime):
+                time = dt.datetime(time.year, time.month, time.day)
+            years.reshape(-1)[t] = time.year + (time - start).total_seconds() / length
+        else:
+            try:
+                years.reshape(-1)[t] = float(time)
+            except (TypeError, ValueError):
+                pass
+
+    return years # decimal_years
 
 #************************************************************************
 class Timeseries(object):
     '''
     Class for timeseries
+
+    times are kept as given (numbers, or datetimes for daily series) in an
+    array, with a float64 decimal-year index (years) alongside for alignment.
+    data are float64, masked (with a full mask) if given masked.  Line style
+    for plotting (ls, lw, zorder) is kept in style, and any uncertainty range
+    in upper and lower.
     '''
 
-    def __init__(self, name, times, data):
+    __slots__ = ("name", "_times", "_years", "_data", "style", "upper", "lower")
+
+    def __init__(self, name, times, data, style=None):
         self.name = name
         self.times = times
         self.data = data
-
+        self.style = {} if style is None else dict(style)
+        self.upper = None
+        self.lower = None
 
     def __str__(self):
         return "timeseries of {}".format(self.name)
 
     __repr__ = __str__
 
+    # storage
+    @property
+    def times(self):
+        return self._times
+
+    @times.setter
+    def times(self, times):
+        if not np.ma.isMaskedArray(times):
+            times = np.asarray(times)
+        self._times = times
+        self._years = None
+
+    @property
+    def years(self):
+        if self._years is None:
+            self._years = decimal_years(self._times)
+        return self._years
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        try:
+            if np.ma.isMaskedArray(data):
+                data = np.ma.array(data, dtype=np.float64, mask=np.ma.getmaskarray(data))
+            else:
+                data = np.ascontiguousarray(data, dtype=np.float64)
+        except (TypeError, ValueError):
+            # not numbers, so keep as they are
+            data = np.asarray(data)
+        self._data = data
+
+    # style, for the attributes which used to be set directly
+    def _get_style(self, item):
+        try:
+            return self.style[item]
+        except KeyError:
+            raise AttributeError(item)
+
+    ls = property(lambda self: self._get_style("ls"), lambda self, value: self.style.__setitem__("ls", value))
+    lw = property(lambda self: self._get_style("lw"), lambda self, value: self.style.__setitem__("lw", value))
+    zorder = property(lambda self: self._get_style("zorder"), lambda self, value: self.style.__setitem__("zorder", value))
+
+    # pickling and copying (no __dict__ with slots)
+    def __getstate__(self):
+        return {"name" : self.name, "times" : self._times, "data" : self._data, \
+                    "style" : self.style, "upper" : self.upper, "lower" : self.lower}
+
+    def __setstate__(self, state):
+        # older pickles stored style as separate attributes
+        self.style = {}
+        self.upper = None
+        self.lower = None
+        for item, value in state.items():
+            setattr(self, item, value)
+
+    def _new(self, times, data):
+        '''
+        Copy of this Timeseries (name and style) with new times and data -
+        any uncertainty range no longer applies, so is not kept
+        '''
+        return Timeseries(self.name, times, data, style=self.style)
+
+    # selection
+    def __getitem__(self, index):
+        new = Timeseries(self.name, self._times[index], self._data[index], style=self.style)
+        if self.upper is not None:
+            new.upper, new.lower = np.asarray(self.upper)[index], np.asarray(self.lower)[index]
+        return new
+
+    def period(self, start=None, end=None):
+        '''
+        Part of the series with start <= decimal year < end
+
+        :param float start: first year (None for the beginning)
+        :param float end: year to stop before (None for the end)
+
+        :returns: Timeseries
+        '''
+        keep = np.ones(self.years.shape, dtype=bool)
+        if start is not None:
+            keep &= self.years >= start
+        if end is not None:
+            keep &= self.years < end
+        return self[keep] # period
+
+    def mask_period(self, start=None, end=None):
+        '''
+        Mask the values with start <= decimal year < end, in place
+
+        :param float start: first year (None for the beginning)
+        :param float end: year to stop before (None for the end)
+        '''
+        remove = np.ones(self.years.shape, dtype=bool)
+        if start is not None:
+            remove &= self.years >= start
+        if end is not None:
+            remove &= self.years < end
+        self.data = np.ma.masked_where(remove, self._data)
+        return # mask_period
+
+    def align(self, other, how="inner"):
+        '''
+        This and another series on a common set of times (see align_timeseries)
+
+        :param Timeseries other: series to align with
+        :param str how: "inner" (common times) or "outer" (all times)
+
+        :returns: aligned copies of this series and other
+        '''
+        return align_timeseries([self, other], how=how) # align
+
+    def resample(self, resampler=None, **kwargs):
+        '''
+        Resampled series - hook for annual_timeseries (default) or any
+        function taking and returning a Timeseries
+
+        :param func resampler: resampling function
+        :param kwargs: passed on to the resampler
+
+        :returns: Timeseries
+        '''
+        if resampler is None:
+            resampler = annual_timeseries
+        return resampler(self, **kwargs) # resample
+
+    # arithmetic - other series are aligned on their common times first
+    def _operate(self, other, operation):
+        if isinstance(other, Timeseries):
+            this, other = align_timeseries([self, other], how="inner")
+            return this._new(this.times, operation(this.data, other.data))
+        return self._new(self._times, operation(self._data, other))
+
+    def __add__(self, other):
+        return self._operate(other, np.add)
+
+    def __sub__(self, other):
+        return self._operate(other, np.subtract)
+
+    def __mul__(self, other):
+        return self._operate(other, np.multiply)
+
+    def __truediv__(self, other):
+        return self._operate(other, np.true_divide)
+
+    def __radd__(self, other):
+        return self._operate(other, lambda a, b: np.add(b, a))
+
+    def __rsub__(self, other):
+        return self._operate(other, lambda a, b: np.subtract(b, a))
+
+    def __rmul__(self, other):
+        return self._operate(other, lambda a, b: np.multiply(b, a))
+
+    def __rtruediv__(self, other):
+        return self._operate(other, lambda a, b: np.true_divide(b, a))
+
+    def __neg__(self):
+        return self._new(self._times, -self._data)
+
+#************************************************************************
+def align_timeseries(series, how="inner", decimals=6):
+    '''
+    Put several series onto a common set of times, matched on their
+    decimal-year index
+
+    :param list series: Timeseries to align
+    :param str how: "inner" (times in all series) or "outer" (times in any, masked where absent)
+    :param int decimals: rounding of the decimal years when matching
+
+    :returns: list of Timeseries
+    '''
+
+    keys = [np.round(ts.years, decimals) for ts in series]
+
+    if how == "inner":
+        common = keys[0]
+        for key in keys[1:]:
+            common = np.intersect1d(common, key)
+    elif how == "outer":
+        common = np.unique(np.concatenate(keys))
+    else:
+        raise ValueError("how must be inner or outer, not {}".format(how))
+    common = common[~np.isnan(common)]
+
+    # times for the common index, from whichever series has them
+    lookup = {}
+    for ts, key in zip(series[::-1], keys[::-1]):
+        lookup.update(zip(key, ts.times))
+    times = np.array([lookup[c] for c in common])
+    if times.dtype.kind == "O" and np.all([isinstance(t, (int, float, np.number)) for t in times]):
+        times = times.astype(np.float64)
+
+    aligned = []
+    for ts, key in zip(series, keys):
+        order = np.argsort(key, kind="stable")
+        locs = np.searchsorted(key[order], common)
+        locs[locs >= len(key)] = 0
+        present = key[order][locs] == common
+        data = np.ma.masked_all(common.shape)
+        data[present] = np.ma.asarray(ts.data)[order][locs[present]]
+        if how == "inner" and not np.ma.isMaskedArray(ts.data):
+            data = data.filled(np.nan)
+        aligned += [Timeseries(ts.name, times, data, style=ts.style)]
+
+    return aligned # align_timeseries
+
+#************************************************************************
+class TimeseriesCollection(object):
+    '''
+    Class for several datasets on one shared time axis
+
+    Stored as columns - a single set of times and a float64 masked array
+    (time x dataset) - so anomalies, annual values and ranks are calculated
+    for all datasets at once.  Indexing (by position or name) and iterating
+    give Timeseries views onto the columns, so readers can return a
+    collection to callers which unpack it, and plot_ts_panel takes it directly.
+    '''
+
+    __slots__ = ("names", "_times", "_years", "data", "styles")
+
+    def __init__(self, names, times, data, styles=None):
+        self.names = list(names)
+        self.times = times
+        data = np.ma.array(data, dtype=np.float64, mask=np.ma.getmaskarray(data))
+        if data.ndim == 1:
+            data = data.reshape(-1, 1)
+        if data.shape != (len(self._times), len(self.names)):
+            raise ValueError("data shape {} does not match {} times x {} names".format(\
+                    data.shape, len(self._times), len(self.names)))
+        self.data = data
+        # per-dataset line styles, keyed on name
+        self.styles = {name : {} for name in self.names}
+        if styles is not None:
+            for name, style in styles.items():
+                self.styles[name].update(style)
+
+    def __str__(self):
+        return "timeseries collection of {}".format(", ".join(self.names))
+
+    __repr__ = __str__
+
+    @classmethod
+    def from_timeseries(cls, series, how="outer"):
+        '''
+        Collection from separate Timeseries, aligned onto common times
+
+        :param list series: Timeseries
+        :param str how: "outer" (all times, masked where absent) or "inner" (common times)
+
+        :returns: TimeseriesCollection
+        '''
+        aligned = align_timeseries(series, how=how)
+        data = np.ma.column_stack([np.ma.asarray(ts.data) for ts in aligned])
+        return cls([ts.name for ts in aligned], aligned[0].times, data, \
+                       styles={ts.name : ts.style for ts in aligned}) # from_timeseries
+
+    # storage
+    @property
+    def times(self):
+        return self._times
+
+    @times.setter
+    def times(self, times):
+        if not np.ma.isMaskedArray(times):
+            times = np.asarray(times)
+        self._times = times
+        self._years = None
+
+    @property
+    def years(self):
+        if self._years is None:
+            self._years = decimal_years(self._times)
+        return self._years
+
+    def _new(self, times, data, names=None):
+        '''
+        Copy of this collection (names and styles) with new times and data
+        '''
+        if names is None:
+            names = self.names
+        return TimeseriesCollection(names, times, data, \
+                                        styles={name : self.styles[name] for name in names})
+
+    # datasets - Timeseries views onto the columns
+    def index(self, name):
+        return self.names.index(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        for column in range(len(self.names)):
+            yield self[column]
+
+    def __getitem__(self, item):
+        if isinstance(item, str):
+            item = self.index(item)
+        name = self.names[item]
+        return Timeseries(name, self._times, self.data[:, item], style=self.styles[name])
+
+    def select(self, names):
+        '''
+        Collection of some of the datasets
+
+        :param list names: dataset names, in the order wanted
+
+        :returns: TimeseriesCollection
+        '''
+        columns = [self.index(name) for name in names]
+        return self._new(self._times, self.data[:, columns], names=names) # select
+
+    def mask_period(self, start=None, end=None, names=None):
+        '''
+        Mask the values with start <= decimal year < end, in place
+
+        :param float start: first year (None for the beginning)
+        :param float end: year to stop before (None for the end)
+        :param list names: datasets to mask (None for all)
+        '''
+        remove = np.ones(self.years.shape, dtype=bool)
+        if start is not None:
+            remove &= self.years >= start
+        if end is not None:
+            remove &= self.years < end
+        if names is None:
+            columns = slice(None)
+        else:
+            columns = [self.index(name) for name in names]
+        self.data[np.ix_(remove, np.arange(len(self.names))[columns])] = np.ma.masked
+        return # mask_period
+
+    # calculations across all datasets at once
+    def anomalies(self, start, end, monthly=False, min_years=0):
+        '''
+        Anomalies of every dataset from its own climatology
+
+        :param int start: first year of base period
+        :param int end: last year of base period (inclusive)
+        :param bool monthly: separate climatology for each calendar month
+        :param int min_years: minimum number of base-period values needed
+
+        :returns: TimeseriesCollection
+        '''
+        climatology = get_climatology(self.years, self.data, start, end, monthly=monthly, min_years=min_years)
+        return self._new(self._times, apply_climatology(self.years, self.data, climatology, monthly=monthly)) # anomalies
+
+    def annual(self, how="mean", min_months=0):
+        '''
+        Annual values of every dataset from monthly ones
+
+        :param str how: aggregation - "mean", "sum" or "max"
+        :param int min_months: minimum number of valid months
+
+        :returns: TimeseriesCollection
+        '''
+        years, annuals = annual_resample(self.years, self.data, how=how, min_months=min_months)
+        return self._new(years, annuals) # annual
+
+    def ranks(self, descending=True):
+        '''
+        Rank of each value within its own dataset, ignoring masked values
+
+        :param bool descending: rank 1 is the highest value (else the lowest)
+
+        :returns: masked int array (time x dataset)
+        '''
+        fill = -np.inf if descending else np.inf
+        values = self.data.filled(fill)
+        if descending:
+            values = -values
+        order = np.argsort(values, axis=0, kind="stable")
+        ranks = np.empty(values.shape, dtype=int)
+        np.put_along_axis(ranks, order, np.arange(1, values.shape[0]+1)[:, None], axis=0)
+        return np.ma.masked_where(np.ma.getmaskarray(self.data), ranks) # ranks
+
+#************************************************************************
+# phase timings per figure, filled only when settings.PROFILE is set
+#   (figure, phase, function) : totals
+PROFILE_RECORDS = {}
+PROFILE_STACK = []
+PROFILE_STATE = {"figure" : ""}
+
+# trace spans, filled only when settings.TRACE is set, and flushed to a
+#   file per process whenever the outermost span closes
+TRACE_EVENTS = []
+TRACE_STATE = {"depth" : 0, "figure" : None, "start" : time.time()}
+
+#************************************************************************
+def _bytes_read():
+    '''
+    Bytes read by this process so far (Linux only, otherwise 0)
+
+    :returns: int
+    '''
+
+    try:
+        with open("/proc/self/io") as infile:
+            for line in infile:
+                if line.startswith("rchar"):
+                    return int(line.split()[1])
+    except IOError:
+        pass
+
+    return 0 # _bytes_read
+
+#************************************************************************
+def _max_rss():
+    '''
+    Peak resident memory of this process so far (MB)
+
+    :returns: float
+    '''
+
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1.e3
+    except ImportError:
+        return 0. # _max_rss
+
+#************************************************************************
+def _figure_tag(filename):
+    '''
+    Figure name from an output filename or root
+
+    :param str filename: output filename
+
+    :returns: str
+    '''
+
+    tag = os.path.basename(filename)
+    if tag.endswith(settings.OUTFMT):
+        tag = tag[: -len(settings.OUTFMT)]
+
+    return tag # _figure_tag
+
+#************************************************************************
+def profile_figure(name):
+    '''
+    Set the figure that subsequent reading and processing is counted against.
+    Plotting and saving are always counted against their output file.
+
+    :param str name: figure name
+    '''
+
+    PROFILE_STATE["figure"] = name
+
+    if settings.TRACE:
+        # figures follow one another, so close the previous one
+        now = time.time()
+        if TRACE_STATE["figure"] is not None:
+            _trace_event(TRACE_STATE["figure"][0], "figure", TRACE_STATE["figure"][1], now, {})
+        TRACE_STATE["figure"] = (name, now)
+
+    return # profile_figure
+
+#************************************************************************
+class profile(object):
+    '''
+    Context manager timing one phase ("load", "compute", "render", "save")
+    of the current figure - wall and CPU time, bytes read and peak memory.
+
+    Time within a nested phase is only counted against the inner one.
+    '''
+
+    def __init__(self, phase, function=""):
+        self.phase = phase
+        self.function = function
+
+    def __enter__(self):
+        if not settings.PROFILE:
+            return self
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if len(PROFILE_STACK) > 0:
+            # keep the outer peak, as it is reset here
+            PROFILE_STACK[-1].peak = max(PROFILE_STACK[-1].peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+        self.peak = 0
+        self.inner = [0., 0., 0]
+        self.start = [time.perf_counter(), time.process_time(), _bytes_read()]
+        PROFILE_STACK.append(self)
+
+        return self
+
+    def __exit__(self, *args):
+        if not settings.PROFILE:
+            return False
+
+        used = [time.perf_counter() - self.start[0], time.process_time() - self.start[1], _bytes_read() - self.start[2]]
+        peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+
+        PROFILE_STACK.pop()
+        if len(PROFILE_STACK) > 0:
+            outer = PROFILE_STACK[-1]
+            outer.inner = [o + u for o, u in zip(outer.inner, used)]
+            outer.peak = max(outer.peak, peak)
+
+        key = (PROFILE_STATE["figure"], self.phase, self.function)
+        try:
+            record = PROFILE_RECORDS[key]
+        except KeyError:
+            record = {"calls" : 0, "wall" : 0., "cpu" : 0., "bytes_read" : 0, "peak_traced_mb" : 0., "max_rss_mb" : 0.}
+            PROFILE_RECORDS[key] = record
+
+        record["calls"] += 1
+        record["wall"] += used[0] - self.inner[0]
+        record["cpu"] += used[1] - self.inner[1]
+        record["bytes_read"] += used[2] - self.inner[2]
+        record["peak_traced_mb"] = max(record["peak_traced_mb"], peak / 1.e6)
+        record["max_rss_mb"] = max(record["max_rss_mb"], _max_rss())
+
+        return False
+
+#************************************************************************
+def _trace_event(name, category, start, end, attributes):
+    '''
+    Store a complete ("X") Chrome trace event
+
+    :param str name: span name
+    :param str category: span category
+    :param float start: start time (seconds since the epoch, so processes line up)
+    :param float end: end time
+    :param dict attributes: extra information shown with the span
+    '''
+
+    TRACE_EVENTS.append({"name" : name, "cat" : category, "ph" : "X", \
+                             "ts" : int(start * 1.e6), "dur" : int((end - start) * 1.e6), \
+                             "pid" : os.getpid(), "tid" : threading.get_ident(), "args" : attributes})
+
+    return # _trace_event
+
+#************************************************************************
+def _trace_run_dir():
+    '''
+    Directory for the trace files of this run, shared with any worker
+    processes through the environment
+
+    :returns: str
+    '''
+
+    try:
+        return os.environ["SOTC_TRACE_RUN"]
+    except KeyError:
+        script = os.path.splitext(os.path.basename(sys.argv[0]))[0] or "interactive"
+        run_dir = os.path.join(settings.TRACELOC, "{}_{}_{}".format(script, dt.datetime.now().strftime("%Y%m%d-%H%M%S"), os.getpid()))
+        os.environ["SOTC_TRACE_RUN"] = run_dir
+        return run_dir # _trace_run_dir
+
+#************************************************************************
+def flush_trace():
+    '''
+    Append the stored trace events of this process to its file in the run directory
+    '''
+
+    if len(TRACE_EVENTS) == 0:
+        return
+
+    run_dir = _trace_run_dir()
+    if not os.path.exists(run_dir):
+        os.makedirs(run_dir, exist_ok=True)
+
+    # forked workers start with a copy of the parent's unflushed events
+    with open(os.path.join(run_dir, "{}.jsonl".format(os.getpid())), "a") as outfile:
+        for event in TRACE_EVENTS:
+            if event["pid"] == os.getpid():
+                outfile.write(json.dumps(event) + "\n")
+    del TRACE_EVENTS[:]
+
+    return # flush_trace
+
+#************************************************************************
+class span(object):
+    '''
+    Context manager tracing one step of the run as a span, with process and
+    thread ids and any given attributes (e.g. file paths).  Does nothing
+    without settings.TRACE.
+    '''
+
+    def __init__(self, name, category, **attributes):
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+
+    def __enter__(self):
+        if settings.TRACE:
+            TRACE_STATE["depth"] += 1
+            self.start = time.time()
+        return self
+
+    def __exit__(self, *args):
+        if not settings.TRACE:
+            return False
+
+        _trace_event(self.name, self.category, self.start, time.time(), self.attributes)
+
+        TRACE_STATE["depth"] -= 1
+        if TRACE_STATE["depth"] == 0:
+            # end of a top-level step - pool workers never reach atexit
+            flush_trace()
+
+        return False
+
+#************************************************************************
+def write_trace():
+    '''
+    Close the section and figure spans, and merge the trace files of every
+    process in this run into one Chrome trace-event JSON file (for Perfetto
+    or chrome://tracing) in settings.TRACELOC
+    '''
+
+    now = time.time()
+    script = os.path.splitext(os.path.basename(sys.argv[0]))[0] or "interactive"
+
+    if TRACE_STATE["figure"] is not None:
+        _trace_event(TRACE_STATE["figure"][0], "figure", TRACE_STATE["figure"][1], now, {})
+        TRACE_STATE["figure"] = None
+    _trace_event(script, "section", TRACE_STATE["start"], now, {"argv" : " ".join(sys.argv)})
+    TRACE_EVENTS.append({"name" : "process_name", "ph" : "M", "pid" : os.getpid(), "args" : {"name" : script}})
+    flush_trace()
+
+    run_dir = _trace_run_dir()
+    events = []
+    for filename in sorted(os.listdir(run_dir)):
+        with open(os.path.join(run_dir, filename), "r") as infile:
+            events += [json.loads(line) for line in infile]
+
+    outfile = run_dir + ".json"
+    with open(outfile, "w") as outf:
+        json.dump({"traceEvents" : events, "displayTimeUnit" : "ms"}, outf)
+
+    print("Trace written to {}".format(outfile))
+
+    return # write_trace
+
+#************************************************************************
+def profiled(phase):
+    '''
+    Decorator timing every call of a function as a phase (see profile),
+    and tracing it as a span (see span).  Plotting and saving functions are
+    tagged with the figure given by their first argument (the output filename).
+    Without settings.PROFILE or settings.TRACE the function is returned untouched.
+
+    :param str phase: phase name
+
+    :returns: decorator
+    '''
+
+    def decorator(function):
+        if not settings.PROFILE and not settings.TRACE:
+            return function
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            previous = PROFILE_STATE["figure"]
+            if phase in ["render", "save"] and len(args) > 0 and isinstance(args[0], str):
+                PROFILE_STATE["figure"] = _figure_tag(args[0])
+
+            attributes = {"figure" : PROFILE_STATE["figure"]}
+            if len(args) > 0 and isinstance(args[0], str):
+                attributes["file"] = args[0]
+            try:
+                with profile(phase, function.__name__), span(function.__name__, phase, **attributes):
+                    return function(*args, **kwargs)
+            finally:
+                PROFILE_STATE["figure"] = previous
+
+        return wrapper
+
+    return decorator # profiled
+
+#************************************************************************
+def write_profile_report():
+    '''
+    Write the phase timings of this run as JSON and CSV into settings.PROFILELOC
+    '''
+
+    if len(PROFILE_RECORDS) == 0:
+        return
+
+    if not os.path.exists(settings.PROFILELOC):
+        os.makedirs(settings.PROFILELOC)
+
+    script = os.path.splitext(os.path.basename(sys.argv[0]))[0] or "interactive"
+    outroot = os.path.join(settings.PROFILELOC, "{}_{}".format(script, dt.datetime.now().strftime("%Y%m%d-%H%M%S")))
+
+    records = []
+    for (figure, phase, function), record in sorted(PROFILE_RECORDS.items()):
+        records += [dict(figure=figure, phase=phase, function=function, **record)]
+
+    # totals per phase, for a quick comparison between runs
+    totals = {}
+    for record in records:
+        total = totals.setdefault(record["phase"], {"wall" : 0., "cpu" : 0., "bytes_read" : 0})
+        for item in total:
+            total[item] += record[item]
+
+    with open(outroot + ".json", "w") as outfile:
+        json.dump({"script" : script, "created" : dt.datetime.now().isoformat(timespec="seconds"), \
+                       "max_rss_mb" : _max_rss(), "totals" : totals, "records" : records}, outfile, indent=1)
+
+    with open(outroot + ".csv", "w", newline="") as outfile:
+        writer = csv.DictWriter(outfile, fieldnames=list(records[0].keys()))
+        writer.writeheader()
+        writer.writerows(records)
+
+    print("Profile written to {}.json/.csv".format(outroot))
+
+    return # write_profile_report
+
+if settings.PROFILE:
+    atexit.register(write_profile_report)
+if settings.TRACE:
+    atexit.register(write_trace)
+
+#************************************************************************
+@profiled("load")
+def load_cubes(filename, *args, **kwargs):
+    '''
+    iris.load, counted as a "load" phase when profiling
+
+    :param str filename: file(s) to load
+
+    :returns: CubeList
+    '''
+
+    return iris.load(filename, *args, **kwargs) # load_cubes
+
+#************************************************************************
+@profiled("load")
+def genfromtxt(filename, *args, **kwargs):
+    '''
+    np.genfromtxt, counted as a "load" phase when profiling
+
+    :param str filename: file to read
+
+    :returns: array
+    '''
+
+    return np.genfromtxt(filename, *args, **kwargs) # genfromtxt
+
+
+#************************************************************************
+BASEMAP_CACHE = {}
+
+def _geometry_paths(geometries, projection, min_lat=-90.):
+    '''
+    Project lat/lon geometries into the map projection as matplotlib paths
+
+    :param iterable geometries: shapely geometries in lat/lon
+    :param obj projection: cartopy projection
+    :param float min_lat: drop anything south of this latitude
+
+    :returns: list of paths
+    '''
+
+    try:
+        from cartopy.mpl.path import shapely_to_path
+        to_paths = lambda geometry: [shapely_to_path(geometry)]
+    except ImportError:
+        # older cartopy
+        from cartopy.mpl.patch import geos_to_path as to_paths
+
+    if min_lat > -90.:
+        import shapely.geometry
+        domain = shapely.geometry.box(-180., min_lat, 180., 90.)
+
+    paths = []
+    for geometry in geometries:
+        if min_lat > -90.:
+            geometry = geometry.intersection(domain)
+            if geometry.is_empty:
+                continue
+        projected = projection.project_geometry(geometry, cartopy.crs.PlateCarree())
+        if not projected.is_empty:
+            paths += to_paths(projected)
+
+    return paths # _geometry_paths
+
+#************************************************************************
+def get_base_map(projection, extent, figsize, resolution="110m", min_lat=-90.):
+    '''
+    Land, coastlines and graticule projected into map coordinates.
+
+    Projecting the Natural Earth geometries is done once per
+    projection/extent/figure size, and cached.
+
+    :param obj projection: cartopy projection
+    :param tuple extent: map extent in projection coordinates
+    :param tuple figsize: figure size (inches)
+    :param str resolution: Natural Earth resolution
+    :param float min_lat: southern limit (e.g. for polar maps)
+
+    :returns: dict of path lists for "land", "coastlines" and "gridlines"
+    '''
+
+    key = (projection.proj4_init, tuple(np.round(extent, 3)), tuple(figsize), resolution, min_lat)
+
+    try:
+        return BASEMAP_CACHE[key]
+    except KeyError:
+        pass
+
+    land = cartopy.feature.NaturalEarthFeature("physical", "land", resolution)
+    coastlines = cartopy.feature.NaturalEarthFeature("physical", "coastline", resolution)
+
+    # graticule every 60 degrees longitude and 30 latitude
+    gridlines = []
+    for lon in np.arange(-180, 181, 60):
+        points = projection.transform_points(cartopy.crs.PlateCarree(), np.full(181, lon, dtype=float), np.linspace(min_lat, 90, 181))
+        gridlines += [mpl.path.Path(points[:, :2])]
+    for lat in np.arange(-60, 61, 30):
+        if lat < min_lat:
+            continue
+        points = projection.transform_points(cartopy.crs.PlateCarree(), np.linspace(-180, 180, 361), np.full(361, lat, dtype=float))
+        gridlines += [mpl.path.Path(points[:, :2])]
+
+    BASEMAP_CACHE[key] = {"land" : _geometry_paths(land.geometries(), projection, min_lat=min_lat), \
+                              "coastlines" : _geometry_paths(coastlines.geometries(), projection, min_lat=min_lat), \
+                              "gridlines" : gridlines}
+
+    return BASEMAP_CACHE[key] # get_base_map
+
+#************************************************************************
+def map_resolution(resolution):
+    '''
+    Natural Earth resolution to draw, the coarsest in draft mode
+
+    :param str resolution: requested resolution
+
+    :returns: resolution
+    '''
+
+    if settings.DRAFT:
+        return "110m"
+
+    return resolution # map_resolution
+
+#************************************************************************
+def add_base_map(ax, resolution="110m", min_lat=-90.):
+    '''
+    Draw grey land, coastlines and gridlines on a map from the cached base map
+
+    :param obj ax: cartopy GeoAxes
+    :param str resolution: Natural Earth resolution
+    :param float min_lat: southern limit (e.g. for polar maps)
+    '''
+
+    base = get_base_map(ax.projection, ax.get_extent(), tuple(ax.figure.get_size_inches()), \
+                            resolution=map_resolution(resolution), min_lat=min_lat)
+
+    ax.add_collection(mpl.collections.PathCollection(base["land"], facecolor="0.9", edgecolor="k", \
+                                                         zorder=0, transform=ax.transData), autolim=False)
+    ax.add_collection(mpl.collections.PathCollection(base["coastlines"], facecolor="none", edgecolor="k", \
+                                                         zorder=1.5, transform=ax.transData), autolim=False)
+    ax.add_collection(mpl.collections.PathCollection(base["gridlines"], facecolor="none", \
+                                                         edgecolor=mpl.rcParams["grid.color"], \
+                                                         linewidth=mpl.rcParams["grid.linewidth"], \
+                                                         zorder=2, transform=ax.transData), autolim=False)
+
+    return # add_base_map
+
+#************************************************************************
+MESH_CACHE = {}
+
+def _cell_edges(coord):
+    '''
+    Contiguous cell edges of a 1-D coordinate, guessing bounds if needed
+    '''
+
+    if not coord.has_bounds():
+        coord = coord.copy()
+        coord.guess_bounds()
+
+    return np.append(coord.bounds[:, 0], coord.bounds[-1, 1]) # _cell_edges
+
+#************************************************************************
+@profiled("compute")
+def get_projected_mesh(cube, projection):
+    '''
+    Cell corners of the latitude/longitude grid of a cube in map coordinates.
+
+    Longitudes are wrapped into the range of the projection.  Cells crossing
+    the map edge are split in two, and gaps are filled with masked cells,
+    so the mesh is a single QuadMesh.  Cached on the grid and projection.
+
+    :param obj cube: 2-D iris cube with latitude and longitude
+    :param obj projection: cartopy projection
+
+    :returns: dict with "x", "y" corner arrays (nlat+1 x ncol+1) and
+              "columns" - source longitude index for each mesh column (nlon for a gap)
+    '''
+
+    key = (projection.proj4_init, _grid_key(cube.coord('latitude')), _grid_key(cube.coord('longitude')))
+
+    try:
+        return MESH_CACHE[key]
+    except KeyError:
+        pass
+
+    lat_edges = np.clip(_cell_edges(cube.coord('latitude')), -90, 90)
+    lon_edges = _cell_edges(cube.coord('longitude'))
+    nlon = lon_edges.shape[0] - 1
+
+    # longitudes relative to the centre of the projection
+    central = projection.proj4_params.get("lon_0", 0.)
+    eps = 1.e-6
+
+    # wrap each cell into [-180, 180), split any crossing the edge
+    pieces = []
+    for col in range(nlon):
+        width = abs(lon_edges[col+1] - lon_edges[col])
+        left = ((min(lon_edges[col], lon_edges[col+1]) - central + 180.) % 360.) - 180.
+        right = left + width
+        if right > 180. + eps:
+            pieces += [(left, 180., col), (-180., right - 360., col)]
+        else:
+            pieces += [(left, right, col)]
+    pieces.sort()
+
+    # build contiguous edges, masked columns for any gaps, skip any overlaps
+    edges = [pieces[0][0]]
+    columns = []
+    for left, right, col in pieces:
+        if right <= edges[-1] + eps:
+            continue
+        if left > edges[-1] + eps:
+            edges += [left]
+            columns += [nlon]
+        edges += [right]
+        columns += [col]
+
+    lons, lats = np.meshgrid(np.array(edges), lat_edges)
+    points = projection.transform_points(cartopy.crs.PlateCarree(central_longitude=central), lons, lats)
+
+    MESH_CACHE[key] = {"x" : points[..., 0], "y" : points[..., 1], "columns" : np.array(columns)}
+
+    return MESH_CACHE[key] # get_projected_mesh
+
+#************************************************************************
+def plot_cube_mesh(ax, cube, cmap, norm):
+    '''
+    Replacement for iris.plot.pcolormesh on a map, using the cached projected mesh
+
+    Only the colour array is new for each plot.
+
+    :param obj ax: cartopy GeoAxes
+    :param obj cube: 2-D iris cube with latitude and longitude
+    :param obj cmap: colourmap to use
+    :param obj norm: colour normalisation
+
+    :returns: QuadMesh
+    '''
+
+    mesh = get_projected_mesh(cube, ax.projection)
+
+    # data in latitude, longitude order, with a masked column for the gaps
+    data = np.ma.asarray(cube.data)
+    if cube.coord_dims('latitude')[0] > cube.coord_dims('longitude')[0]:
+        data = data.T
+    data = np.ma.concatenate((data, np.ma.masked_all((data.shape[0], 1))), axis=1)[:, mesh["columns"]]
 
+    # as pcolormesh - snapped, no antialiasing or edges, else every cell gets a light seam
+    quadmesh = mpl.collections.QuadMesh(np.dstack((mesh["x"], mesh["y"])), cmap=cmap, norm=norm, \
+                                            transform=ax.transData, antialiased=False, edgecolors="none", \
+                                            snap=True)
+    quadmesh.set_array(data.ravel())
+    # single image in vector output, drawn at settings.RASTER_DPI
+    quadmesh.set_rasterized(True)
+    ax.add_collection(quadmesh, autolim=False)
 
+    return quadmesh # plot_cube_mesh
 
 #************************************************************************
+# circle in axes coordinates, for round polar maps
+POLAR_BOUNDARY = mpl.path.Path(np.vstack([np.sin(np.linspace(0, 2*np.pi, 100)), \
+                                              np.cos(np.linspace(0, 2*np.pi, 100))]).T * 0.5 + [0.5, 0.5])
+POLAR_PROJECTIONS = {}
+
+def polar_map_axes(fig, position, min_lat=30., central_longitude=0.):
+    '''
+    Round North Polar Stereographic map with the cached base map
+
+    :param obj fig: figure
+    :param list position: axes rectangle [left, bottom, width, height] or subplot (rows, columns, index)
+    :param float min_lat: southern edge of the map
+    :param float central_longitude: longitude pointing down the page
+
+    :returns: GeoAxes
+    '''
+
+    try:
+        projection = POLAR_PROJECTIONS[central_longitude]
+    except KeyError:
+        projection = POLAR_PROJECTIONS[central_longitude] = cartopy.crs.NorthPolarStereo(central_longitude=central_longitude)
+
+    if len(position) == 4:
+        ax = fig.add_axes(position, projection=projection)
+    else:
+        ax = fig.add_subplot(*position, projection=projection)
+
+    ax.set_extent([-180, 180, min_lat, 90], cartopy.crs.PlateCarree())
+    add_base_map(ax, min_lat=min_lat)
+    ax.set_boundary(POLAR_BOUNDARY, transform=ax.transAxes)
+
+    return ax # polar_map_axes
+
+#************************************************************************
+def plot_polar_mesh(ax, cube, cmap, norm, min_lat=30.):
+    '''
+    Data mesh on a polar map, using the cached projected mesh
+
+    Only rows reaching north of min_lat are drawn.
+
+    :param obj ax: GeoAxes from polar_map_axes
+    :param obj cube: 2-D iris cube with latitude and longitude
+    :param obj cmap: colourmap to use
+    :param obj norm: colour normalisation
+    :param float min_lat: southern edge of the map
+
+    :returns: QuadMesh
+    '''
+
+    spacing = np.median(np.abs(np.diff(cube.coord("latitude").points)))
+    plot_cube = cube.extract(latConstraint([min_lat - spacing, 90]))
+
+    return plot_cube_mesh(ax, plot_cube, cmap, norm) # plot_polar_mesh
+
+#************************************************************************
+FIGURE_POOL = {}
+
+class MapTemplate(object):
+    '''
+    Figure with Robinson map axes, base maps and colourbar axes, built once
+    and reused for every map drawn with the same layout.
+
+    reset() removes everything added since the layout was built (meshes,
+    scatters, contours, colourbar) and blanks the labels, so only the data
+    layer is redrawn for each map.
+    '''
+
+    def __init__(self, figsize, rects=[], shape=(), adjust={}, cbar_rect=[]):
+        '''
+        :param tuple figsize: figure size in inches
+        :param list rects: axes rectangles [left, bottom, width, height]
+        :param tuple shape: (rows, columns) of subplots, if not using rects
+        :param dict adjust: arguments for subplots_adjust
+        :param list cbar_rect: colourbar axes rectangle, else taken from below the first axes
+        '''
+
+        self.fig = plt.figure(figsize=figsize)
+
+        if len(shape) > 0:
+            self.axes = [self.fig.add_subplot(shape[0], shape[1], p + 1, projection=cartopy.crs.Robinson()) \
+                             for p in range(shape[0] * shape[1])]
+        else:
+            self.axes = [self.fig.add_axes(rect, projection=cartopy.crs.Robinson()) for rect in rects]
+
+        for ax in self.axes:
+            add_base_map(ax)
+        self.extents = [ax.get_extent() for ax in self.axes]
+
+        if len(cbar_rect) > 0:
+            self.cax = self.fig.add_axes(cbar_rect)
+        else:
+            self.cax, kwargs = mpl.colorbar.make_axes(self.axes[0], orientation='horizontal', \
+                                                          pad=0.05, fraction=0.05, aspect=30)
+        if len(adjust) > 0:
+            self.fig.subplots_adjust(**adjust)
+
+        # label artists, created on first use
+        self.labels = {}
+
+        self._base = [set(ax.get_children()) for ax in self.axes]
+        self._fig_base = set(self.fig.get_children())
+
+
+    def text(self, name, x, y, s, ax=None, **kwargs):
+        '''
+        Set a named label, reusing its text artist
+
+        :param str name: label name
+        :param float x: x position (figure, or axes if ax given)
+        :param float y: y position
+        :param str s: label text
+        :param obj ax: axes for the label, else figure
+
+        :returns: Text
+        '''
+
+        if ax is not None:
+            kwargs["transform"] = ax.transAxes
+
+        try:
+            label = self.labels[name]
+            label.set_position((x, y))
+            label.set_text(s)
+            label.update(kwargs)
+        except KeyError:
+            self.labels[name] = label = self.fig.text(x, y, s, **kwargs)
+            self._fig_base.add(label)
+
+        return label # text
+
+
+    def colorbar(self, mesh, bounds):
+        '''
+        Redraw the horizontal colourbar with thick border and dividers
+
+        :param obj mesh: mappable to colour by
+        :param array bounds: bounds for discrete colormap
+
+        :returns: Colorbar
+        '''
+
+        self.cax.cla()
+        cb = self.fig.colorbar(mesh, cax=self.cax, orientation='horizontal', \
+                                   ticks=bounds[1:-1], drawedges=True)
+
+        # http://stackoverflow.com/questions/14477696/customizing-colorbar-border-color-on-matplotlib
+        cb.outline.set_linewidth(2)
+        cb.dividers.set_color('k')
+        cb.dividers.set_linewidth(2)
+
+        return cb # colorbar
+
+
+    def reset(self):
+        '''
+        Remove the data layers and blank the labels, leaving the layout and base maps
+        '''
+
+        for ax, base, ext in zip(self.axes, self._base, self.extents):
+            for artist in ax.get_children():
+                if artist not in base:
+                    artist.remove()
+            ax.set_title("")
+            ax.set_extent(ext, ax.projection)
+
+        for artist in self.fig.get_children():
+            if artist not in self._fig_base:
+                artist.remove()
+        for label in self.labels.values():
+            label.set_text("")
+
+        self.cax.cla()
+
+        return # reset
+
+
+    def __str__(self):
+        return "map template with {} axes".format(len(self.axes))
+
+    __repr__ = __str__
+
+#************************************************************************
+def get_map_template(key, *args, **kwargs):
+    '''
+    Pooled map layout, built on first use and reset on each subsequent use
+
+    :param tuple key: name of the layout in the pool
+    :param args: arguments to MapTemplate if the layout is not yet built
+    :param kwargs: keyword arguments to MapTemplate if the layout is not yet built
+
+    :returns: MapTemplate
+    '''
+
+    try:
+        template = FIGURE_POOL[key]
+        template.reset()
+    except KeyError:
+        template = FIGURE_POOL[key] = MapTemplate(*args, **kwargs)
+
+    return template # get_map_template
+
+#************************************************************************
+def close_map_templates():
+    '''
+    Close all pooled map figures - called at the end of each section's run_all_plots
+    '''
+
+    for template in FIGURE_POOL.values():
+        plt.close(template.fig)
+    FIGURE_POOL.clear()
+
+    return # close_map_templates
+
+#************************************************************************
+PREVIEW_DPI = 50
+RASTER_FORMATS = ["png", "jpg", "jpeg", "tif", "tiff"]
+
+# metadata which changes between otherwise identical vector files
+VOLATILE_METADATA = [re.compile(rb"/(CreationDate|ModDate) \(D:[^)]*\)"), \
+                         re.compile(rb"/ID \[<[0-9A-Fa-f]*> ?<[0-9A-Fa-f]*>\]"), \
+                         re.compile(rb"%%CreationDate:[^\n]*"), \
+                         re.compile(rb"<dc:date>[^<]*</dc:date>")]
+# generated ids in SVG (clip paths, markers, glyphs), renumbered in order of appearance
+SVG_ID = re.compile(rb'id="([^"]+)"')
+# dates left out where the backend allows (EPS always has one, removed by _normalise_vector)
+FIXED_METADATA = {"pdf" : {"CreationDate" : None}, "svg" : {"Date" : None}}
+
+def _image_hash(image, size=16):
+    '''
+    Perceptual (average) hash - which cells of a size x size greyscale
+    thumbnail are brighter than the mean
+
+    :param array image: RGB(A) image
+    :param int size: thumbnail size
+
+    :returns: boolean array (size x size)
+    '''
+
+    grey = np.mean(image[..., :3], axis=2)
+
+    rows = np.linspace(0, grey.shape[0], size + 1).astype(int)
+    columns = np.linspace(0, grey.shape[1], size + 1).astype(int)
+    thumbnail = np.add.reduceat(np.add.reduceat(grey, rows[:-1], axis=0), columns[:-1], axis=1)
+    thumbnail /= np.outer(np.diff(rows), np.diff(columns))
+
+    return thumbnail > np.mean(thumbnail) # _image_hash
+
+#************************************************************************
+def _side_by_side(old_image, new_image):
+    '''
+    Previous and new images, and where they differ (dark), side by side
+
+    :param array old_image: previous RGBA image
+    :param array new_image: new RGBA image
+
+    :returns: RGBA image
+    '''
+
+    height = max(old_image.shape[0], new_image.shape[0])
+    width = max(old_image.shape[1], new_image.shape[1])
+
+    panels = []
+    for image in (old_image, new_image):
+        panel = np.ones((height, width, 4), dtype=np.float32)
+        panel[:image.shape[0], :image.shape[1]] = image
+        panels += [panel]
+
+    difference = np.ones((height, width, 4), dtype=np.float32)
+    difference[..., :3] = 1. - np.max(np.abs(panels[0] - panels[1]), axis=2)[..., np.newaxis]
+
+    return np.hstack(panels + [difference]) # _side_by_side
+
+#************************************************************************
+def _normalise_vector(data, fmt):
+    '''
+    Vector file contents with the volatile metadata (dates, file ids) removed
+    and any SVG ids renumbered, so that unchanged figures compare equal
+
+    :param bytes data: file contents
+    :param str fmt: file format (extension without the dot)
+
+    :returns: bytes
+    '''
+
+    for pattern in VOLATILE_METADATA:
+        data = pattern.sub(b"", data)
+
+    if fmt == "svg":
+        for n, svg_id in enumerate(dict.fromkeys(SVG_ID.findall(data))):
+            data = re.sub(rb"(?<=[\"#])" + re.escape(svg_id) + rb"(?=[\")])", "id{}".format(n).encode(), data)
+
+    return data # _normalise_vector
+
+#************************************************************************
+def _preview_name(filename):
+    '''
+    Name for the files kept in settings.DIFFLOC for an output figure - its path
+    relative to settings.ROOTLOC, so figures with the same basename in different
+    directories are kept apart
+
+    :param str filename: output filename
+
+    :returns: str
+    '''
+
+    name = os.path.relpath(os.path.abspath(os.path.splitext(filename)[0]), os.path.abspath(settings.ROOTLOC))
+    if name.startswith(os.pardir):
+        # outside the data tree
+        name = os.path.abspath(os.path.splitext(filename)[0]).lstrip(os.sep)
+
+    return name # _preview_name
+
+#************************************************************************
+def save_figure(filename, fig=None):
+    '''
+    Save a figure, leaving the file untouched if the output is identical
+
+    Dates are left out (FIXED_METADATA) and the SVG hash salt fixed, so an
+    unchanged figure renders to the same bytes.  Raster files are compared byte for byte,
+    vector files once their volatile metadata is removed (_normalise_vector).
+    If the figure has changed, and settings.DIFF_REPORT is set, the previous
+    and new versions are written side by side to settings.DIFFLOC and listed
+    in its report.txt.  Vector files are shown using low resolution raster
+    previews, kept in settings.DIFFLOC/previews for the next comparison.
+
+    :param str filename: output filename, including the extension
+    :param obj fig: figure to save (default current figure)
+
+    :returns: True if the file was written
+    '''
+
+    if fig is None:
+        fig = plt.gcf()
+
+    fmt = os.path.splitext(filename)[1][1:].lower()
+    raster = fmt in RASTER_FORMATS
+    buf = io.BytesIO()
+    with plt.rc_context({"svg.hashsalt" : "sotc"}):
+        fig.savefig(buf, format=fmt, metadata=FIXED_METADATA.get(fmt))
+    new = buf.getvalue()
+
+    old = None
+    if os.path.exists(filename):
+        with open(filename, "rb") as infile:
+            old = infile.read()
+        if raster:
+            unchanged = hashlib.sha1(old).digest() == hashlib.sha1(new).digest()
+        else:
+            unchanged = _normalise_vector(old, fmt) == _normalise_vector(new, fmt)
+        if unchanged:
+            print("Unchanged {}".format(filename))
+            return False
+
+    name = _preview_name(filename)
+    old_image = None
+
+    if settings.DIFF_REPORT:
+        if raster:
+            new_image = mpl.image.imread(io.BytesIO(new), format=fmt)
+            if old is not None:
+                old_image = mpl.image.imread(io.BytesIO(old), format=fmt)
+        else:
+            # only for the report, not to decide whether the file has changed
+            preview = os.path.join(settings.DIFFLOC, "previews", name + ".png")
+            if not os.path.exists(os.path.dirname(preview)):
+                os.makedirs(os.path.dirname(preview))
+            if old is not None and os.path.exists(preview):
+                old_image = mpl.image.imread(preview)
+            fig.savefig(preview, format="png", dpi=PREVIEW_DPI)
+            new_image = mpl.image.imread(preview)
+
+    if old_image is not None:
+        distance = np.sum(_image_hash(old_image) != _image_hash(new_image))
+        report = os.path.join(settings.DIFFLOC, name + ".png")
+        if not os.path.exists(os.path.dirname(report)):
+            os.makedirs(os.path.dirname(report))
+        mpl.image.imsave(report, _side_by_side(old_image, new_image))
+        with open(os.path.join(settings.DIFFLOC, "report.txt"), "a") as outfile:
+            outfile.write("{} {} changed - {} of {} hash cells differ\n".format(\
+                    dt.datetime.now().strftime("%Y-%m-%d %H:%M"), filename, distance, _image_hash(new_image).size))
+
+    with open(filename, "wb") as outfile:
+        outfile.write(new)
+
+    return True # save_figure
+
+#************************************************************************
+@profiled("render")
 def scatter_plot_map(outname, data, lons, lats, cmap, bounds, cb_label, title="", figtext=""):
     '''
     Standard scatter map
@@ -68,64 +1512,51 @@ def scatter_plot_map(outname, data, lons, lats, cmap, bounds, cb_label, title=""
      
     norm = mpl.cm.colors.BoundaryNorm(bounds, cmap.N)
 
-    fig = plt.figure(figsize=(8, 5.5))
-
-    plt.clf()
-    ax = plt.axes([0.01, 0.12, 0.98, 0.88], projection=cartopy.crs.Robinson())
-    ax.gridlines() #draw_labels=True)
-    ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-    ax.coastlines()
+    template = get_map_template(("map", False), (8, 5.5), rects=[[0.01, 0.12, 0.98, 0.88]])
+    ax = template.axes[0]
 
-    ext = ax.get_extent() # save the original extent
-
-    scatter = plt.scatter(lons, lats, c=data, cmap=cmap, norm=norm, s=25, \
+    scatter = ax.scatter(lons, lats, c=data, cmap=cmap, norm=norm, s=25, \
                         transform=cartopy.crs.Geodetic(), edgecolor='0.5', linewidth=0.5)
 
-
-    cb=plt.colorbar(scatter, orientation='horizontal', pad=0.05, fraction=0.05, \
-                        aspect=30, ticks=bounds[1:-1], label=cb_label, drawedges=True)
-
-    # thicken border of colorbar and the dividers
-    # http://stackoverflow.com/questions/14477696/customizing-colorbar-border-color-on-matplotlib
+    cb = template.colorbar(scatter, bounds)
     cb.set_ticklabels(["{:g}".format(b) for b in bounds[1:-1]])
     cb.ax.tick_params(axis='x', labelsize=settings.FONTSIZE, direction='in', size=0)
 
     cb.set_label(label=cb_label, fontsize=settings.FONTSIZE)
 
-#    cb.outline.set_color('k')
-    cb.outline.set_linewidth(2)
-    cb.dividers.set_color('k')
-    cb.dividers.set_linewidth(2)
-
-    ax.set_extent(ext, ax.projection) # fix the extent change from colormesh
+    ax.set_extent(template.extents[0], ax.projection) # fix the extent change from colormesh
 
-    plt.title(title)
-    fig.text(0.03, 0.95, figtext, fontsize=settings.FONTSIZE * 0.8)
+    ax.set_title(title)
+    template.text("figtext", 0.03, 0.95, figtext, fontsize=settings.FONTSIZE * 0.8)
 
-    plt.savefig(outname + settings.OUTFMT)
-    plt.close()
+    save_figure(outname + settings.OUTFMT, fig=template.fig)
 
     return # scatter_plot_map
 
 #************************************************************************
-def annual_average(indata):
+def annual_average(indata, min_months=0):
     '''
     Calculates the annual average of monthly data
 
     Checks for array shape if necessary
 
-    :param array indata: input data
+    :param array indata: input data - monthly series starting in January, or (years x 12)
+    :param int min_months: minimum number of valid months for an annual value
 
     :returns: annual mean array
     '''
 
-    # if a 1-D array, reshape
+    # if a 1-D array, bin by year (final year can be partial)
     if len(indata.shape) == 1:
-        newdata = np.ma.reshape(indata, [-1, 12])
+        years, annuals = annual_resample(np.arange(indata.shape[0]) / 12., indata, min_months=min_months)
+    else:
+        annuals = np.ma.mean(indata, axis=1)
+        annuals = np.ma.masked_where(np.ma.count(indata, axis=1) < min_months, annuals)
 
-    return np.ma.mean(newdata, axis=1) # annual_average
+    return annuals # annual_average
 
 #************************************************************************
+@profiled("load")
 def erai_ts_read(data_loc, variable, annual=False):
     '''
     read ERAI data and return
@@ -143,7 +1574,7 @@ def erai_ts_read(data_loc, variable, annual=False):
     elif variable == "sat":
         filename = "tsmm1d_2T_197901-{}12.txt".format(settings.YEAR)
 
-    all_era = np.genfromtxt(data_loc + filename, skip_header=2, skip_footer=29, dtype=(float))
+    all_era = genfromtxt(data_loc + filename, skip_header=2, skip_footer=29, dtype=(float))
 
     # extract the data
     date = all_era[:, 1]
@@ -168,6 +1599,7 @@ def erai_ts_read(data_loc, variable, annual=False):
 
 
 #************************************************************************
+@profiled("load")
 def erai_2dts_read(data_loc, variable):
     '''
     read ERA data and returns hovmuller data
@@ -187,7 +1619,7 @@ def erai_2dts_read(data_loc, variable):
     elif variable == "ltt":
         filename = "timtw_ERA-Int_TLT_197901-{}12.txt".format(settings.YEAR)
 
-    all_era = np.genfromtxt(data_loc + filename, dtype=(float))
+    all_era = genfromtxt(data_loc + filename, dtype=(float))
 
     times = all_era[:, 0]
     data = all_era[:, 1:]
@@ -201,6 +1633,7 @@ def erai_2dts_read(data_loc, variable):
     return times, latitudes, data # era_2dts_read
 
 #************************************************************************
+@profiled("load")
 def era5_ts_read(data_loc, variable, annual=False):
     '''
     read ERA data and return
@@ -253,45 +1686,318 @@ def era5_ts_read(data_loc, variable, annual=False):
         # extract the date
         date = np.array([(date.year + (date.month - 1)/12.)  for date in dt_time ])
 
-    return Timeseries("ERA5", date, globe), \
-        Timeseries("ERA5", date, oceans), \
-        Timeseries("ERA5", date, land),\
-        Timeseries("ERA5", date, tropics) # era5_ts_read
+    return Timeseries("ERA5", date, globe), \
+        Timeseries("ERA5", date, oceans), \
+        Timeseries("ERA5", date, land),\
+        Timeseries("ERA5", date, tropics) # era5_ts_read
+
+#************************************************************************
+def decimal_year_parts(times):
+    '''
+    Split decimal-year times (year + (month - 1)/12.) into years and calendar months
+
+    :param array times: decimal years (whole years for annual data)
+
+    :returns: years, months - integer arrays, months are 0-11
+    '''
+
+    times = np.asarray(times, dtype=np.float64)
+
+    # allow for rounding in stored decimal years
+    years = np.floor(times + 1.e-6).astype(int)
+    months = np.round((times - years) * 12).astype(int) % 12
+
+    return years, months # decimal_year_parts
+
+#************************************************************************
+def get_climatology(times, data, start, end, monthly=False, min_years=0):
+    '''
+    Calculate the climatology over a base period, for a series or a stack of fields
+
+    :param array times: decimal years for the first axis of data
+    :param array data: input data (time x ...)
+    :param int start: first year of base period
+    :param int end: last year of base period (inclusive)
+    :param bool monthly: calculate separate climatology for each calendar month
+    :param int min_years: minimum number of base-period values needed, else climatology masked
+
+    :returns: climatology - masked array (...) or (12 x ...) if monthly
+    '''
+
+    years, months = decimal_year_parts(times)
+    data = np.ma.asarray(data)
+
+    in_base, = np.where((years >= start) & (years <= end))
+    base = data[in_base]
+
+    values = base.filled(0).astype(np.float64)
+    present = (~np.ma.getmaskarray(base)).astype(int)
+
+    if monthly:
+        # accumulate by calendar month in one pass
+        totals = np.zeros((12,) + data.shape[1:])
+        counts = np.zeros((12,) + data.shape[1:], dtype=int)
+        np.add.at(totals, months[in_base], values)
+        np.add.at(counts, months[in_base], present)
+    else:
+        totals = values.sum(axis=0)
+        counts = present.sum(axis=0)
+
+    climatology = np.ma.masked_where((counts == 0) | (counts < min_years), \
+                                         totals / np.where(counts == 0, 1, counts))
+
+    return climatology # get_climatology
+
+#************************************************************************
+def apply_climatology(times, data, climatology, monthly=False):
+    '''
+    Subtract a climatology from data
+
+    :param array times: decimal years for the first axis of data
+    :param array data: input data (time x ...)
+    :param array climatology: climatology from get_climatology
+    :param bool monthly: climatology is for each calendar month
+
+    :returns: anomalies - masked array (time x ...)
+    '''
+
+    if monthly:
+        years, months = decimal_year_parts(times)
+        return np.ma.asarray(data) - climatology[months]
+    else:
+        return np.ma.asarray(data) - climatology # apply_climatology
+
+#************************************************************************
+def rebaseline_anomalies(times, anomalies, start, end, monthly=False, min_years=0):
+    '''
+    Move anomalies onto a new base period (e.g. 1961-90 to 1991-2020)
+
+    :param array times: decimal years for the first axis of anomalies
+    :param array anomalies: anomalies on any base period (time x ...)
+    :param int start: first year of new base period
+    :param int end: last year of new base period (inclusive)
+    :param bool monthly: separate climatology for each calendar month
+    :param int min_years: minimum number of base-period values needed
+
+    :returns: anomalies - masked array (time x ...)
+    '''
+
+    climatology = get_climatology(times, anomalies, start, end, monthly=monthly, min_years=min_years)
+
+    return apply_climatology(times, anomalies, climatology, monthly=monthly) # rebaseline_anomalies
+
+#************************************************************************
+@profiled("compute")
+def calculate_climatology_and_anomalies_1d(indata, start, end, monthly=False, min_years=0):
+    '''
+    Calculate the climatology and anomalies for a 1-d timeseries
+
+    :param array indata: input data - Timeseries object
+    :param float start: start year
+    :param float end: end year
+    :param bool monthly: separate climatology for each calendar month
+    :param int min_years: minimum number of base-period values needed
+
+    :returns: climatology and anomaly Timeseries object
+    '''
+
+    # series which start too late or end too early use what they have
+    climatology = get_climatology(indata.years, indata.data, start, end, monthly=monthly, min_years=min_years)
+
+    outdata = Timeseries(indata.name, indata.times, apply_climatology(indata.years, indata.data, climatology, monthly=monthly))
+
+    return climatology, outdata # apply_climatology
+
+#************************************************************************
+def annual_resample(times, data, how="mean", min_months=0):
+    '''
+    Resample monthly data to annual values, in one pass by binning on year
+
+    Partial years and series starting in any month are handled.
+
+    :param array times: decimal years for the first axis of data
+    :param array data: input data (time x ...)
+    :param str how: aggregation - "mean", "sum" or "max"
+    :param int min_months: minimum number of valid months, else annual value masked
+
+    :returns: years, annuals - integer array (years), masked array (years x ...)
+    '''
+
+    years, months = decimal_year_parts(times)
+    data = np.ma.asarray(data)
+
+    # make sure each year is contiguous
+    if np.any(np.diff(years) < 0):
+        order = np.argsort(years, kind="stable")
+        years = years[order]
+        data = data[order]
+
+    # start of each year's block
+    out_years, starts = np.unique(years, return_index=True)
+
+    present = ~np.ma.getmaskarray(data)
+    counts = np.add.reduceat(present.astype(int), starts, axis=0)
+
+    values = data.astype(np.float64)
+    if how == "mean":
+        annuals = np.add.reduceat(values.filled(0), starts, axis=0) / np.where(counts == 0, 1, counts)
+    elif how == "sum":
+        annuals = np.add.reduceat(values.filled(0), starts, axis=0)
+    elif how == "max":
+        annuals = np.maximum.reduceat(values.filled(-np.inf), starts, axis=0)
+    else:
+        raise ValueError("Unknown annual aggregation {}".format(how))
+
+    annuals = np.ma.masked_where((counts == 0) | (counts < min_months), annuals)
+
+    return out_years, annuals # annual_resample
+
+#************************************************************************
+def annual_timeseries(indata, how="mean", min_months=0):
+    '''
+    Annual Timeseries from a monthly Timeseries
+
+    :param obj indata: monthly Timeseries, times in decimal years or datetimes
+    :param str how: aggregation - "mean", "sum" or "max"
+    :param int min_months: minimum number of valid months
+
+    :returns: Timeseries
+    '''
+
+    years, annuals = annual_resample(indata.years, indata.data, how=how, min_months=min_months)
+
+    return Timeseries(indata.name, years, annuals) # annual_timeseries
+
+#************************************************************************
+@profiled("compute")
+def annual_cube(cube, how="mean", min_months=0):
+    '''
+    Annual cube from a monthly cube
+
+    The time coordinate is taken from the first month in each year.
+
+    :param obj cube: monthly iris cube
+    :param str how: aggregation - "mean", "sum" or "max"
+    :param int min_months: minimum number of valid months
+
+    :returns: cube
+    '''
+
+    time = cube.coord("time")
+    time_dim, = cube.coord_dims(time)
+
+    dt_time = time.units.num2date(time.points)
+    times = np.array([d.year + (d.month - 1)/12. for d in dt_time])
+
+    years, annuals = annual_resample(times, np.moveaxis(np.ma.asarray(cube.data), time_dim, 0), how=how, min_months=min_months)
+
+    # first month in each year
+    years_of_points, months = decimal_year_parts(times)
+    starts = np.searchsorted(years_of_points, years)
+
+    index = [slice(None)] * cube.ndim
+    index[time_dim] = starts
+    annual = cube[tuple(index)].copy(data=np.moveaxis(annuals, 0, time_dim))
+    annual.coord("time").bounds = None
+
+    return annual # annual_cube
+
+#************************************************************************
+SEASONS = ["DJF", "MAM", "JJA", "SON"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+def seasonal_aggregate(monthly, how="mean", min_months=2):
+    '''
+    Seasonal values for all years at once from a stack of monthly fields.
+
+    DJF takes December from the previous year, so is masked in the first year.
+    The input is not modified.
+
+    :param array monthly: (12 x years x ...) masked array, January first
+    :param str how: aggregation - "mean", "max" or "min"
+    :param int min_months: mask seasons with fewer months present
+
+    :returns: seasons - masked array (4 x years x ...), in DJF, MAM, JJA, SON order
+    '''
+
+    monthly = np.ma.asarray(monthly)
+
+    # previous December, then Jan-Nov, so seasons are consecutive triples
+    previous_dec = np.ma.concatenate((np.ma.masked_all((1,) + monthly.shape[2:], dtype=monthly.dtype), monthly[11, :-1]))
+    stack = np.ma.concatenate((previous_dec[np.newaxis], monthly[:11]))
+    stack = stack.reshape((4, 3) + monthly.shape[1:])
+
+    if how == "mean":
+        seasons = np.ma.mean(stack, axis=1)
+    elif how == "max":
+        seasons = np.ma.max(stack, axis=1)
+    elif how == "min":
+        seasons = np.ma.min(stack, axis=1)
+    else:
+        raise ValueError("Unknown seasonal aggregation {}".format(how))
+
+    # mask if fewer than min_months present
+    seasons = np.ma.masked_where(np.ma.count(stack, axis=1) < min_months, seasons)
+
+    return seasons # seasonal_aggregate
+
+#************************************************************************
+def select_month_cubes(cube_list, names):
+    '''
+    The monthly cubes of an index file, January first
+
+    :param obj cube_list: cubes as read from file
+    :param array names: name of each cube (month abbreviations as in MONTHS)
+
+    :returns: list of 12 cubes
+    '''
+
+    names = np.asarray(names)
+
+    return [cube_list[np.where(names == month)[0][0]] for month in MONTHS] # select_month_cubes
 
 #************************************************************************
-def calculate_climatology_and_anomalies_1d(indata, start, end):
+def seasonal_cubes(month_cubes, years, year, how="mean", min_months=2, scale=1., base_period=None):
     '''
-    Calculate the climatology and anomalies for a 1-d timeseries
+    Seasonal (DJF, MAM, JJA, SON) cubes for a single year, from monthly index cubes
 
-    :param array indata: input data - Timeseries object
-    :param float start: start year
-    :param float end: end year
+    :param list month_cubes: 12 cubes (time x lat x lon), January first
+    :param array years: year of each time
+    :param int year: year to select
+    :param str how: aggregation - "mean", "max" or "min"
+    :param int min_months: mask seasons with fewer months present
+    :param float scale: factor to apply to the seasonal values
+    :param tuple base_period: (start, end) years to calculate anomalies from, or None for values
 
-    :returns: climatology and anomaly Timeseries object
+    :returns: list of 4 cubes, with latitude and longitude bounds
     '''
-    # find range to use
-    start_loc, = np.where(indata.times == start)
-    end_loc, = np.where(indata.times == end + 1)
 
-    if len(start_loc) == 0:
-        # series starts too late
-        start_loc = [0]
-    if len(end_loc) == 0:
-        # series ends too early
-        end_loc = [-1]
+    seasons = seasonal_aggregate(np.ma.stack([cube.data for cube in month_cubes]), how=how, min_months=min_months)
+    if scale != 1.:
+        seasons = seasons * scale
 
-    # get the mean and subtract to get anomalies
-    try:
-        climatology = np.mean(indata.data[start_loc : end_loc]) # include last year
-    except TypeError:
-        climatology = np.mean(indata.data[start_loc[0] : end_loc[0]]) # include last year
+    if base_period is not None:
+        # anomalies for all seasons at once, with years first
+        seasons = np.ma.swapaxes(seasons, 0, 1)
+        climatology = get_climatology(years, seasons, base_period[0], base_period[1])
+        seasons = np.ma.swapaxes(apply_climatology(years, seasons, climatology), 0, 1)
 
+    loc, = np.where(np.asarray(years) == year)
 
-    outdata = Timeseries(indata.name, indata.times, indata.data - climatology)
+    season_list = []
+    for s, season in enumerate(SEASONS):
+        season_cube = month_cubes[0][loc[0]].copy(data=seasons[s, loc[0]])
 
-    return climatology, outdata # apply_climatology
+        # fix for plotting
+        season_cube.coord('latitude').guess_bounds()
+        season_cube.coord('longitude').guess_bounds()
+
+        season_list += [season_cube]
+
+    return season_list # seasonal_cubes
 
 #***************************************
+@profiled("compute")
 def median_pairwise_slopes(xdata, ydata, mdi, sigma=1.0):
     '''
     Calculate the median of the pairwise slopes - assumes no missing values
@@ -321,7 +2027,8 @@ def median_pairwise_slopes(xdata, ydata, mdi, sigma=1.0):
     dof = n * (n - 1) // 2
     w = math.sqrt(n * (n - 1) * ((2. * n) + 5.) / 18.)
 
-    percentile_point = scipy.stats.norm.cdf(sigma)*2.
+    # normal cdf, without importing scipy.stats
+    percentile_point = (1. + math.erf(sigma / math.sqrt(2.)))
 
     rank_upper = ((dof + percentile_point * w) / 2.) + 1
     rank_lower = ((dof - percentile_point * w) / 2.) + 1
@@ -377,6 +2084,44 @@ def mpw_plot_points(slope, years, values):
 
 
 #************************************************************************
+def smooth_masked_field(data, sigma=0.5):
+    '''
+    Gaussian-smoothed copy of a 2-D field, for contouring
+
+    gaussian_filter doesn't work with masked arrays, and this messes up
+    things next to masked values.  So masked values are first replaced with
+    the mean of the surrounding 8 values (where there are any), and the
+    original mask is put back afterwards.  The input is not changed.
+
+    :param array data: 2-D (masked) array
+    :param float sigma: standard deviation of the Gaussian kernel, in grid cells
+
+    :returns: masked array
+    '''
+
+    if not np.ma.isMaskedArray(data):
+        return scipy.ndimage.gaussian_filter(np.asarray(data, dtype=np.float64), sigma)
+
+    mask = np.ma.getmaskarray(data)
+
+    # sums and counts of the neighbouring values, without wrapping
+    padded_values = np.pad(data.filled(0).astype(np.float64), 1)
+    padded_present = np.pad((~mask).astype(int), 1)
+    sums = np.zeros(data.shape)
+    counts = np.zeros(data.shape, dtype=int)
+    for dlt in range(3):
+        for dln in range(3):
+            sums += padded_values[dlt : dlt + data.shape[0], dln : dln + data.shape[1]]
+            counts += padded_present[dlt : dlt + data.shape[0], dln : dln + data.shape[1]]
+
+    values = np.ma.getdata(data).astype(np.float64)
+    fill = mask & (counts > 0)
+    values[fill] = sums[fill] / counts[fill]
+
+    return np.ma.array(scipy.ndimage.gaussian_filter(values, sigma), mask=mask) # smooth_masked_field
+
+#************************************************************************
+@profiled("render")
 def plot_smooth_map_iris(outname, cube, cmap, bounds, cb_label, scatter=[], smarker="o",\
                              figtext="", title="", contour=False, cb_extra="", save_netcdf_filename="", tall=False):
     '''
@@ -394,127 +2139,65 @@ def plot_smooth_map_iris(outname, cube, cmap, bounds, cb_label, scatter=[], smar
     norm = mpl.cm.colors.BoundaryNorm(bounds, cmap.N)
 
     if tall:
-        fig = plt.figure(figsize=(8, 5.7))
-        plt.clf()
-        ax = plt.axes([0.01, 0.18, 0.98, 0.78], projection=cartopy.crs.Robinson())
+        template = get_map_template(("map", True), (8, 5.7), rects=[[0.01, 0.18, 0.98, 0.78]])
     else:
-        fig = plt.figure(figsize=(8, 5.5))
-        plt.clf()
-        ax = plt.axes([0.01, 0.12, 0.98, 0.88], projection=cartopy.crs.Robinson())
-
-
-        
-    ax.gridlines() #draw_labels=True)
-    ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-    ax.coastlines()
-
-    ext = ax.get_extent() # save the original extent
+        template = get_map_template(("map", False), (8, 5.5), rects=[[0.01, 0.12, 0.98, 0.88]])
+    fig, ax = template.fig, template.axes[0]
+    ext = template.extents[0]
 
     if contour:
         # http://stackoverflow.com/questions/12274529/how-to-smooth-matplotlib-contour-plot
-        from scipy.ndimage.filters import gaussian_filter
-        sigma = 0.5
-        con_cube = copy.deepcopy(cube)
-
-        """
-        gaussian_filter doesn't work with masked arrays
-        As this messes up things next to masked values,
-        go through each value in the array, if it is masked
-        replace with mean of surrounding 8 values, as long
-        as this itself is not masked
-
-        3-Aug-2017
-        """
-
-        try:
-            new_data = copy.deepcopy(con_cube.data)
-            orig_mask = copy.deepcopy(con_cube.data.mask)
-
-            # spin through each grid-cell
-            for lt in range(con_cube.data.shape[0]):
-                for ln in range(con_cube.data.shape[1]):
-                    # if missing
-                    if con_cube.data.data[lt, ln] == con_cube.data.fill_value:
-                        # take square of values (hope wrapping isn't an issue)
-                        square = con_cube.data[lt-1:lt+2, ln-1:ln+2]
-                        # if there is data to mean, then do and overwrite
-                        if len(square.compressed()) > 0:
-                            new_data[lt, ln] = np.ma.mean(square)
-
-            # replace the data
-            con_cube.data = new_data
-            con_cube.data = gaussian_filter(con_cube.data, sigma)
-            # re-create the mask
-            con_cube.data.mask = orig_mask
-        except AttributeError:
-            # no masked data
-            con_cube.data = gaussian_filter(con_cube.data, sigma)
-
+        # new cube around the smoothed data only - the input cube is left as it is
+        con_cube = cube.copy(data=smooth_masked_field(cube.data, sigma=0.5))
 
-        mesh = iris.plot.contourf(con_cube, bounds, cmap=cmap, norm=norm)
+        mesh = iris.plot.contourf(con_cube, bounds, cmap=cmap, norm=norm, axes=ax)
 
         if save_netcdf_filename != "":
             save_cube_as_netcdf(con_cube, save_netcdf_filename)
 
     else:
-        if settings.OUTFMT in [".eps", ".pdf"]:
-            if cube.coord("latitude").points.shape[0] > 180 or cube.coord("longitude").points.shape[0] > 360:
-                regrid_size = 1.0
-                print("Regridding cube for {} output to {} degree resolution".format(settings.OUTFMT, regrid_size))
-                print("Old Shape {}".format(cube.data.shape))
-                plot_cube = regrid_cube(cube, regrid_size, regrid_size)
-                print("New Shape {}".format(plot_cube.data.shape))
-            else:
-                plot_cube = copy.deepcopy(cube)
-        else:
-            plot_cube = copy.deepcopy(cube)
-        
-        mesh = iris.plot.pcolormesh(plot_cube, cmap=cmap, norm=norm)
+        plot_cube = vector_plot_cube(cube)
+
+        mesh = plot_cube_mesh(ax, plot_cube, cmap, norm)
 
         if save_netcdf_filename != "":
             save_cube_as_netcdf(plot_cube, save_netcdf_filename)
 
+        if settings.TILES:
+            write_map_tiles(outname, plot_cube, cmap, bounds, max_zoom=settings.TILE_ZOOM)
+
     if len(scatter) > 0:
         lons, lats, data = scatter
         if smarker == "o":
-            plt.scatter(lons, lats, c=data, cmap=cmap, norm=norm, s=25, marker="o",\
+            ax.scatter(lons, lats, c=data, cmap=cmap, norm=norm, s=25, marker="o",\
                         transform=cartopy.crs.Geodetic(), edgecolor='0.2', linewidth=0.5)
         elif smarker == "dots":
-            plt.scatter(lons, lats, c="0.1", cmap=cmap, norm=norm, s=2, marker="o",\
+            ax.scatter(lons, lats, c="0.1", cmap=cmap, norm=norm, s=2, marker="o",\
                         transform=cartopy.crs.Geodetic())
 
 
-    cb = plt.colorbar(mesh, orientation='horizontal', pad=0.05, fraction=0.05, \
-                        aspect=30, ticks=bounds[1:-1], label=cb_label, drawedges=True)
-
-    # thicken border of colorbar and the dividers
-    # http://stackoverflow.com/questions/14477696/customizing-colorbar-border-color-on-matplotlib
+    cb = template.colorbar(mesh, bounds)
     cb.set_ticklabels(["{:g}".format(b) for b in bounds[1:-1]])
     cb.ax.tick_params(axis='x', labelsize=settings.FONTSIZE, direction='in', size=0)
 
     cb.set_label(label=cb_label, fontsize=settings.FONTSIZE)
 
-#    cb.outline.set_color('k')
-    cb.outline.set_linewidth(2)
-    cb.dividers.set_color('k')
-    cb.dividers.set_linewidth(2)
-
     if cb_extra != "":
-        fig.text(0.04, 0.07, cb_extra[0], fontsize=settings.FONTSIZE, ha="left")
-        fig.text(0.96, 0.07, cb_extra[1], fontsize=settings.FONTSIZE, ha="right")
+        template.text("cb_extra_left", 0.04, 0.07, cb_extra[0], fontsize=settings.FONTSIZE, ha="left")
+        template.text("cb_extra_right", 0.96, 0.07, cb_extra[1], fontsize=settings.FONTSIZE, ha="right")
 
     ax.set_extent(ext, ax.projection) # fix the extent change from colormesh
 
-    plt.title(title, fontsize=settings.FONTSIZE)
-    fig.text(0.01, 0.95, figtext, fontsize=settings.FONTSIZE)
+    ax.set_title(title, fontsize=settings.FONTSIZE)
+    template.text("figtext", 0.01, 0.95, figtext, fontsize=settings.FONTSIZE)
 
-    plt.savefig(outname + settings.OUTFMT)
-    plt.close()
+    save_figure(outname + settings.OUTFMT, fig=fig)
 
     return # plot_smooth_map_iris
 
 
 #************************************************************************
+@profiled("render")
 def plot_smooth_map_iris_multipanel(outname, cube_list, cmap, bounds, cb_label, \
                                         shape=(1, 1), scatter=[], figtext=[], title=[], figtitle=""):
     '''
@@ -545,34 +2228,28 @@ def plot_smooth_map_iris_multipanel(outname, cube_list, cmap, bounds, cb_label,
 #    if shape[1] == 1:
 #        width = 5
 
-    fig = plt.figure(figsize=(width, height))
+    if height == 15:
+        cbar_rect = [0.05, 0.05, 0.9, 0.04]
+        adjust = {"right" : 0.99, "top" : 0.98, "bottom" : 0.10, "left" : 0.01, "hspace" : 0.3, "wspace" : 0.01}
+    elif height == 12:
+        cbar_rect = [0.05, 0.07, 0.9, 0.04]
+        adjust = {"right" : 0.99, "top" : 0.92, "bottom" : 0.15, "left" : 0.01, "hspace" : 0.1, "wspace" : 0.05}
+    else:
+        cbar_rect = [0.05, 0.09, 0.9, 0.04]
+        adjust = {"right" : 0.99, "top" : 0.92, "bottom" : 0.15, "left" : 0.01, "hspace" : 0.1, "wspace" : 0.05}
 
+    template = get_map_template(("multipanel", shape), (width, height), shape=shape, adjust=adjust, cbar_rect=cbar_rect)
 
     # spin through panels - rows then columns
     for panel in range(number_of_panels):
 
-        ax = plt.subplot(shape[0], shape[1], panel + 1, projection=cartopy.crs.Robinson())
-
-        ax.gridlines() #draw_labels=True)
-        ax.add_feature(cartopy.feature.LAND, zorder=0, facecolor="0.9", edgecolor="k")
-        ax.coastlines()
-
-        ext = ax.get_extent() # save the original extent
+        ax = template.axes[panel]
 
         cube = cube_list[panel]
 
-        if settings.OUTFMT in [".eps", ".pdf"]:
-            if cube.coord("latitude").points.shape[0] > 180 or cube.coord("longitude").points.shape[0] > 360:
-                print("Regridding cube for {} output to 1.0 degree resolution".format(settings.OUTFMT))
-                print("Old Shape {}".format(cube.data.shape))
-                plot_cube = regrid_cube(cube, 1.0, 1.0)
-                print("New Shape {}".format(plot_cube.data.shape))
-            else:
-                plot_cube = copy.deepcopy(cube)
-        else:
-            plot_cube = copy.deepcopy(cube)
+        plot_cube = vector_plot_cube(cube)
 
-        mesh = iris.plot.pcolormesh(plot_cube, cmap=cmap, norm=norm, axes=ax)
+        mesh = plot_cube_mesh(ax, plot_cube, cmap, norm)
 
         if len(scatter) > 0:
             if len(scatter[panel]) > 0:
@@ -586,45 +2263,24 @@ def plot_smooth_map_iris_multipanel(outname, cube_list, cmap, bounds, cb_label,
             ax.title.set_text(title[panel])
             ax.title.set_fontsize(settings.FONTSIZE)
         if len(figtext) > 0:
-            ax.text(0.03, 0.95, figtext[panel], fontsize=settings.FONTSIZE * 0.8, transform=ax.transAxes)
-
-        ax.set_extent(ext, ax.projection) # fix the extent change from colormesh
-
-    if height == 15:
-        cbar_ax = fig.add_axes([0.05, 0.05, 0.9, 0.04])
-    elif height == 12:
-        cbar_ax = fig.add_axes([0.05, 0.07, 0.9, 0.04])
-    elif height == 6:
-        cbar_ax = fig.add_axes([0.05, 0.09, 0.9, 0.04])
+            template.text("figtext{}".format(panel), 0.03, 0.95, figtext[panel], ax=ax, fontsize=settings.FONTSIZE * 0.8)
 
-    cb = fig.colorbar(mesh, cax=cbar_ax, orientation='horizontal', \
-                         ticks=bounds[1:-1], label=cb_label, drawedges=True)
+        ax.set_extent(template.extents[panel], ax.projection) # fix the extent change from colormesh
 
-    # thicken border of colorbar and the dividers
-    # http://stackoverflow.com/questions/14477696/customizing-colorbar-border-color-on-matplotlib
+    cb = template.colorbar(mesh, bounds)
     cb.set_ticklabels(["{:g}".format(b) for b in bounds[1:-1]])
     cb.ax.tick_params(axis='x', labelsize=settings.FONTSIZE, direction='in', size=0)
 
     cb.set_label(label=cb_label, fontsize=settings.FONTSIZE)
 
-#    cb.outline.set_color('k')
-    cb.outline.set_linewidth(2)
-    cb.dividers.set_color('k')
-    cb.dividers.set_linewidth(2)
-
-    plt.figtext(0.5, 0.95, figtitle, fontsize=settings.FONTSIZE, ha="center")
-
-    if height == 15:
-        fig.subplots_adjust(right=0.99, top=0.98, bottom=0.10, left=0.01, hspace=0.3, wspace=0.01)
-    else:
-        fig.subplots_adjust(right=0.99, top=0.92, bottom=0.15, left=0.01, hspace=0.1, wspace=0.05)
+    template.text("figtitle", 0.5, 0.95, figtitle, fontsize=settings.FONTSIZE, ha="center")
 
-    plt.savefig(outname + settings.OUTFMT)
-    plt.close()
+    save_figure(outname + settings.OUTFMT, fig=template.fig)
 
     return # plot_smooth_map_iris_multipanel
 
 #************************************************************************
+@profiled("load")
 def read_merra(filename, variable, domain, anomalies=True):
     """
     Read Merra from Mike B's large file
@@ -657,7 +2313,7 @@ def read_merra(filename, variable, domain, anomalies=True):
         col += "O"
 
     # read the data
-    indata = np.genfromtxt(filename, delimiter=',', dtype=(str), skip_header=1)
+    indata = genfromtxt(filename, delimiter=',', dtype=(str), skip_header=1)
 
     headings = np.array([x.strip() for x in indata[0, :]])
     locs, = np.where(headings == col)
@@ -669,24 +2325,18 @@ def read_merra(filename, variable, domain, anomalies=True):
     months = indata[1:, 0]
 
     # extract what's necessary - reread the file to get as floats
-    indata = np.genfromtxt(filename, delimiter=',', dtype=(float), skip_header=2)
+    indata = genfromtxt(filename, delimiter=',', dtype=(float), skip_header=2)
     indata = np.ma.masked_where(indata == -9.99000000e+08, indata)
 
     values = indata[:, locs]
 
     # convert to annuals
-    months = np.array([int(x[-4:]) for x in months])
-
-    months = months.reshape([-1, 12])
-    years = months[:, 1]
-
-    values = values.reshape([-1, 12])
-
-    annuals = np.mean(values, axis=1)
+    years, annuals = annual_resample(np.array([int(x[-4:]) for x in months]), values)
 
     return Timeseries("MERRA-2", years, annuals) # read_merra
 
 #************************************************************************
+@profiled("load")
 def read_jra55(filename, variable):
     """
     JRA-55 data to be read (from Shinya)
@@ -698,7 +2348,7 @@ def read_jra55(filename, variable):
 
     name = "JRA-55"
 
-    indata = np.genfromtxt(filename, dtype=(float))
+    indata = genfromtxt(filename, dtype=(float))
 
     if variable == "temperature":
         actuals = Timeseries(name, indata[:, 0], indata[:, 1] - 273.1)
@@ -710,6 +2360,7 @@ def read_jra55(filename, variable):
     return actuals, anomalies
 
 #************************************************************************
+@profiled("load")
 def read_20cr(filename, variable):
     """
     20CR data to be read (from Gil & Cathy)
@@ -721,7 +2372,7 @@ def read_20cr(filename, variable):
 
     name = "20CRv3"
 
-    indata = np.genfromtxt(filename, dtype=(float))
+    indata = genfromtxt(filename, dtype=(float))
     
     times = indata[:, 0].astype(int).astype(str)
     years = np.array([t[:4] for t in times]).astype(int)
@@ -741,6 +2392,7 @@ def read_20cr(filename, variable):
 
 
 #************************************************************************
+@profiled("load")
 def read_merra_LT_LS(filename, LT=False, LS=False):
     """
     MERRA Lower Trop/Strat in separate files and different formats
@@ -754,7 +2406,7 @@ def read_merra_LT_LS(filename, LT=False, LS=False):
 
     name = "MERRA-2"
 
-    indata = np.genfromtxt(filename, delimiter=',', dtype=(float), skip_header=2, skip_footer=12)
+    indata = genfromtxt(filename, delimiter=',', dtype=(float), skip_header=2, skip_footer=12)
 
     LT_actuals = Timeseries(name, indata[:, 0], indata[:, 1] - 273.1)
     LT_anoms = Timeseries(name, indata[:, 0], indata[:, 2])
@@ -797,7 +2449,7 @@ def plot_ts_panel(ax, datasets, ls, section, loc="lower right", bbox=(), \
     Plot panel of a timeseries plot - can be a single one
 
     :param obj ax: axes object
-    :param list datasets: list of Timeseries objects to plot
+    :param list datasets: list of Timeseries objects (or a TimeseriesCollection) to plot
     :param int ls: linestyle
     :param str loc: legend location
     :param str section: which section of BAMS to look up colour for.
@@ -813,25 +2465,11 @@ def plot_ts_panel(ax, datasets, ls, section, loc="lower right", bbox=(), \
     assert len(extra_labels) == len(datasets)
 
     for d, dataset in enumerate(datasets):
-        # overwrite
-        try:
-            LS = dataset.ls
-#            print("setting line-style for {} = {}".format(dataset.name, LS))
-        except AttributeError:
-            LS = ls
-            
-        try:
-            LW = dataset.lw
-#            print("setting line-width for {} = {}".format(dataset.name, LW))
-        except AttributeError:
-            LW = lw
+        # a series' own style overrides the panel defaults
+        LS = dataset.style.get("ls", ls)
+        LW = dataset.style.get("lw", lw)
+        ZO = dataset.style.get("zorder", 5)
 
-        try:
-            ZO = dataset.zorder
-#            print("setting zorder for {}".format(dataset.name))
-        except AttributeError:
-            ZO = 5
-        
         ax.plot(dataset.times, dataset.data, c=COLOURS[dataset.name], ls=LS, \
                     label=dataset.name + extra_labels[d], lw=LW, zorder=ZO)
 
@@ -936,6 +2574,7 @@ def make_iris_cube_3d(data, times, time_units, lons, lats, name, units):
     return cube # make_iris_cube_3d
 
 #************************************************************************
+@profiled("render")
 def plot_hovmuller(outname, times, latitudes, data, cmap, bounds, cb_label, figtext="", title="", \
                        cosine=False, extra_ts=Timeseries("BLANK", [0], [0]), background=""):
     '''
@@ -1039,7 +2678,7 @@ def plot_hovmuller(outname, times, latitudes, data, cmap, bounds, cb_label, figt
         ax.xaxis.set_minor_locator(minorLocator)
         thicken_panel_border(ax)
         for tick in ax.xaxis.get_major_ticks():
-            tick.label.set_fontsize(settings.FONTSIZE)
+            tick.label1.set_fontsize(settings.FONTSIZE)
 
         if "TWS" in outname:
                 majorLocator = MultipleLocator(5)
@@ -1050,7 +2689,7 @@ def plot_hovmuller(outname, times, latitudes, data, cmap, bounds, cb_label, figt
     plt.title(title)
     fig.text(0.03, 0.95, figtext, fontsize=settings.FONTSIZE)
 
-    plt.savefig(outname + settings.OUTFMT)
+    save_figure(outname + settings.OUTFMT)
     plt.close()
 
     return # plot_hovmuller
@@ -1074,6 +2713,7 @@ def boxcar(data, kernel):
     return np.convolve(data, np.ones((kernel,))/kernel, mode="same") # boxcar
 
 #*********************************************************
+@profiled("compute")
 def regrid_cube(cube, delta_lat, delta_lon):
 
     lat, lon = cube.coord('latitude'), cube.coord('longitude')
@@ -1086,6 +2726,267 @@ def regrid_cube(cube, delta_lat, delta_lon):
                            iris.analysis.Linear()) # regrid_cube
 
 #*********************************************************
+@profiled("compute")
+def block_average_cube(cube, factor):
+    '''
+    Decimate a 2-D cube by averaging blocks of factor x factor grid cells
+
+    Any partial blocks at the ends of the latitude and longitude axes are dropped.
+
+    :param obj cube: 2-D iris cube with latitude and longitude
+    :param int factor: number of cells along each side of a block
+
+    :returns: cube
+    '''
+
+    data = np.ma.asarray(cube.data)
+    if cube.coord_dims('latitude')[0] > cube.coord_dims('longitude')[0]:
+        data = data.T
+
+    nlat, nlon = data.shape[0] // factor, data.shape[1] // factor
+    blocks = data[:nlat * factor, :nlon * factor].reshape(nlat, factor, nlon, factor)
+    blocks = blocks.transpose(0, 2, 1, 3).reshape(nlat, nlon, factor * factor)
+
+    lat_edges = _cell_edges(cube.coord('latitude'))[:nlat * factor + 1:factor]
+    lon_edges = _cell_edges(cube.coord('longitude'))[:nlon * factor + 1:factor]
+
+    new_cube = iris.cube.Cube(np.ma.mean(blocks, axis=2))
+    new_cube.metadata = cube.metadata
+    for dim, name, edges in ((0, 'latitude', lat_edges), (1, 'longitude', lon_edges)):
+        coord = cube.coord(name)
+        bounds = np.vstack((edges[:-1], edges[1:])).T
+        new_cube.add_dim_coord(iris.coords.DimCoord(np.mean(bounds, axis=1), standard_name=name, units=coord.units, \
+                                                        bounds=bounds, coord_system=coord.coord_system), dim)
+
+    return new_cube # block_average_cube
+
+#*********************************************************
+def vector_plot_cube(cube, max_lat=180, max_lon=360):
+    '''
+    Cube to draw as the data layer of a map
+
+    Data meshes are rasterised in vector (.eps/.pdf) output, so fine grids
+    are only regridded to 1 degree if settings.VECTOR_REGRID is set.
+    In draft mode grids finer than settings.DRAFT_RESOLUTION are block-averaged.
+
+    :param obj cube: 2-D iris cube with latitude and longitude
+    :param int max_lat: largest number of latitudes to draw without regridding
+    :param int max_lon: largest number of longitudes to draw without regridding
+
+    :returns: cube
+    '''
+
+    if settings.DRAFT:
+        spacing = np.median(np.abs(np.diff(cube.coord("latitude").points)))
+        factor = int(settings.DRAFT_RESOLUTION / spacing)
+        if factor > 1:
+            return block_average_cube(cube, factor)
+
+    elif settings.OUTFMT in [".eps", ".pdf"] and settings.VECTOR_REGRID:
+        if cube.coord("latitude").points.shape[0] > max_lat or cube.coord("longitude").points.shape[0] > max_lon:
+            regrid_size = 1.0
+            print("Regridding cube for {} output to {} degree resolution".format(settings.OUTFMT, regrid_size))
+            print("Old Shape {}".format(cube.data.shape))
+            plot_cube = regrid_cube(cube, regrid_size, regrid_size)
+            print("New Shape {}".format(plot_cube.data.shape))
+            return plot_cube
+
+    return cube # vector_plot_cube
+
+#*********************************************************
+AREA_WEIGHTS_CACHE = {}
+
+def _grid_key(coord):
+    '''
+    Hashable definition of a horizontal coordinate (points and bounds)
+    '''
+
+    if coord.bounds is None:
+        bounds = None
+    else:
+        bounds = (str(coord.bounds.dtype), coord.bounds.tobytes())
+
+    return (coord.name(), str(coord.units), str(coord.points.dtype), coord.points.tobytes(), bounds) # _grid_key
+
+#*********************************************************
+def grid_area_weights(cube, cosine=False):
+    '''
+    Weights for the latitude/longitude grid of a cube.
+
+    Cached on the grid definition, so cubes on the same grid share a single,
+    read-only (latitude x longitude) array.
+
+    :param obj cube: iris cube with latitude and longitude coordinates (with bounds unless cosine)
+    :param bool cosine: return cosine-latitude rather than area weights
+
+    :returns: weights - array (latitude x longitude)
+    '''
+
+    key = (cosine, _grid_key(cube.coord('latitude')), _grid_key(cube.coord('longitude')))
+
+    try:
+        return AREA_WEIGHTS_CACHE[key]
+    except KeyError:
+        pass
+
+    # single field on the grid, in latitude, longitude order
+    field = next(cube.slices(['latitude', 'longitude']))
+
+    if cosine:
+        weights = iris.analysis.cartography.cosine_latitude_weights(field)
+    else:
+        weights = iris.analysis.cartography.area_weights(field)
+
+    weights = np.array(weights, dtype=np.float64)
+    weights.setflags(write=False)
+    AREA_WEIGHTS_CACHE[key] = weights
+
+    return weights # grid_area_weights
+
+#*********************************************************
+MEMORY_STATE = {"budget" : None}
+
+def memory_budget():
+    '''
+    Memory that a single operation may use - settings.MEMORY_BUDGET if set,
+    otherwise half of the memory available when first asked
+
+    :returns: int - bytes (0 if unknown, i.e. no limit)
+    '''
+
+    if MEMORY_STATE["budget"] is None:
+        if settings.MEMORY_BUDGET > 0:
+            MEMORY_STATE["budget"] = int(settings.MEMORY_BUDGET * 1.e6)
+        else:
+            MEMORY_STATE["budget"] = 0
+            try:
+                with open("/proc/meminfo", "r") as infile:
+                    for line in infile:
+                        if line.startswith("MemAvailable:"):
+                            MEMORY_STATE["budget"] = int(line.split()[1]) * 1024 // 2
+                            break
+            except IOError:
+                # not Linux
+                pass
+
+    return MEMORY_STATE["budget"] # memory_budget
+
+#*********************************************************
+def chunk_length(n_items, item_bytes, fixed_bytes=0):
+    '''
+    Number of items along the leading axis which can be processed at once
+    within the memory budget
+
+    :param int n_items: length of the leading axis
+    :param int item_bytes: estimated working memory per item
+    :param int fixed_bytes: estimated working memory independent of the chunking
+
+    :returns: int - between 1 and n_items
+    '''
+
+    budget = memory_budget()
+
+    if budget == 0 or fixed_bytes + n_items * item_bytes <= budget:
+        return max(n_items, 1)
+
+    return int(max(1, min(n_items, (budget - fixed_bytes) // max(item_bytes, 1)))) # chunk_length
+
+#*********************************************************
+def estimate_footprint(filenames, expansion=4.):
+    '''
+    Rough memory needed to load and process a set of input files
+
+    :param list filenames: input files (missing files are ignored)
+    :param float expansion: working memory per byte on disk (unpacking, float64, copies)
+
+    :returns: int - bytes
+    '''
+
+    size = sum([os.path.getsize(f) for f in filenames if os.path.exists(f)])
+
+    return int(size * expansion) # estimate_footprint
+
+#*********************************************************
+def split_by_footprint(jobs, footprints):
+    '''
+    Separate jobs which would exceed the memory budget, so that they can be
+    run on their own rather than alongside others
+
+    :param list jobs: jobs to run
+    :param list footprints: estimated memory (bytes) of each job
+
+    :returns: light, heavy - lists of jobs
+    '''
+
+    budget = memory_budget()
+
+    light, heavy = [], []
+    for job, footprint in zip(jobs, footprints):
+        if budget > 0 and footprint > budget:
+            heavy += [job]
+        else:
+            light += [job]
+
+    return light, heavy # split_by_footprint
+
+#*********************************************************
+@profiled("compute")
+def area_weighted_mean_and_coverage(cube, threshold=0., land_fraction=1.):
+    '''
+    Area-weighted mean and coverage of a (time x latitude x longitude) cube.
+
+    Gridboxes with values in fewer than threshold * ntimes are masked throughout.
+    Times are processed in chunks if all at once would exceed the memory budget.
+
+    :param obj cube: iris cube, latitude and longitude with bounds
+    :param float threshold: minimum fraction of times a gridbox needs values
+    :param float land_fraction: fraction of the total area to normalise coverage by
+
+    :returns: mean - masked array (time), area-weighted mean
+              coverage - array (time), fraction of total area (or land) with values
+              norm - float, total weight of all gridboxes
+    '''
+
+    weights = grid_area_weights(cube).reshape(-1)
+
+    lat_dim, = cube.coord_dims('latitude')
+    lon_dim, = cube.coord_dims('longitude')
+
+    # (time x cells) view, without filling or copying the whole cube
+    data = np.ma.asarray(cube.data)
+    data = np.moveaxis(data, [lat_dim, lon_dim], [-2, -1]).reshape(-1, weights.shape[0])
+    ntimes = data.shape[0]
+
+    # filled values, presence and weighted presence, each per cell
+    step = chunk_length(ntimes, weights.shape[0] * (8 + 1 + 8 + 8))
+
+    # mask gridboxes with too few values
+    enough = np.ones(weights.shape[0], dtype=bool)
+    if threshold > 0:
+        counts = np.zeros(weights.shape[0], dtype=np.int64)
+        for start in range(0, ntimes, step):
+            counts += (~np.ma.getmaskarray(data[start : start + step])).sum(axis=0)
+        enough = counts >= threshold * ntimes
+
+    total = np.zeros(ntimes)
+    weighted_sum = np.zeros(ntimes)
+    for start in range(0, ntimes, step):
+        chunk = data[start : start + step]
+
+        present_weights = (~np.ma.getmaskarray(chunk) & enough[np.newaxis, :]) * weights[np.newaxis, :]
+        total[start : start + step] = present_weights.sum(axis=1)
+        weighted_sum[start : start + step] = (present_weights * chunk.filled(0)).sum(axis=1)
+
+    mean = np.ma.masked_where(total == 0, weighted_sum / np.where(total == 0, 1, total))
+
+    # normalise - obtain max area possible with each gridbox = 1
+    norm = weights.sum()
+    coverage = total / (norm * land_fraction)
+
+    return mean, coverage, norm # area_weighted_mean_and_coverage
+
+#*********************************************************
+@profiled("save")
 def save_cube_as_netcdf(cube, filename):
 
     iris.save(cube, filename)
@@ -1103,3 +3004,251 @@ def trendline(trend, years):
     y1 = trend*years[-1] + c
 
     return y0, y1 # trendline
+
+#*********************************************************
+@profiled("compute")
+def coverage_error(obs_coverage, reanalysis, weights, fill_value, chunk_size=None):
+    '''
+    Coverage error of an observational area average, estimated from a reanalysis.
+
+    For each observation month, the reanalysis is area-averaged over all cells
+    and over only those cells the observations cover.  The offset and spread of
+    the residuals over all reanalysis times estimate the coverage error.
+
+    Both averages are matrix products over the flattened grid, so the whole
+    reanalysis is only weighted once, rather than copied for every month.
+
+    :param array obs_coverage: (months x cells) boolean array, True where observations present
+    :param array reanalysis: (times x cells) masked array of reanalysis values
+    :param array weights: (cells) area weights
+    :param float fill_value: value to return for months without observations
+    :param int chunk_size: number of observation months to process at once (from the memory budget if None)
+
+    :returns: offset, st_dev - arrays (months)
+    '''
+
+    reanalysis = np.ma.asarray(reanalysis)
+    weights = np.asarray(weights, dtype=np.float64)
+
+    # weighted reanalysis values and weights, zero where the reanalysis is missing
+    valid = ~np.ma.getmaskarray(reanalysis)
+    valid_weights = valid * weights[np.newaxis, :]
+    weighted_values = valid_weights * reanalysis.filled(0).astype(np.float64)
+
+    # clean mean using all the reanalysis cells
+    total_mean = weighted_values.sum(axis=1) / valid_weights.sum(axis=1)
+
+    n_months = obs_coverage.shape[0]
+    offset = np.zeros(n_months)
+    st_dev = np.zeros(n_months)
+
+    if chunk_size is None:
+        # numerator, denominator, mean and residuals for each reanalysis time
+        chunk_size = chunk_length(n_months, reanalysis.shape[0] * 8 * 4 + reanalysis.shape[1] * 8)
+
+    for start in range(0, n_months, chunk_size):
+        coverage = np.asarray(obs_coverage[start : start + chunk_size], dtype=np.float64)
+
+        # masked means of all reanalysis times, for each observation month (months x times)
+        numerator = np.dot(coverage, weighted_values.T)
+        denominator = np.dot(coverage, valid_weights.T)
+        masked_mean = np.ma.masked_where(denominator == 0, numerator / np.where(denominator == 0, 1, denominator))
+
+        # calculate residuals and find mean and st_dev
+        residuals = masked_mean - total_mean[np.newaxis, :]
+
+        offset[start : start + chunk_size] = np.ma.mean(residuals, axis=1).filled(fill_value)
+        st_dev[start : start + chunk_size] = np.ma.std(residuals, axis=1, ddof=1).filled(fill_value) # to match IDL
+
+        # no data for this month
+        empty, = np.where(coverage.sum(axis=1) == 0)
+        offset[start + empty] = fill_value
+        st_dev[start + empty] = fill_value
+
+    return offset, st_dev # coverage_error
+
+#*********************************************************
+TILE_SIZE = 256
+
+def _tile_lonlat(zoom, x, y):
+    '''
+    Longitudes and latitudes of the pixel centres of a Web-Mercator (XYZ) tile
+
+    :param int zoom: zoom level
+    :param int x: tile column (from 180W)
+    :param int y: tile row (from the north)
+
+    :returns: lons, lats - arrays (TILE_SIZE) for the columns and rows of pixels
+    '''
+
+    pixels = (np.arange(TILE_SIZE) + 0.5) / TILE_SIZE
+    n_tiles = 2**zoom
+
+    lons = (x + pixels) / n_tiles * 360. - 180.
+    lats = np.rad2deg(np.arctan(np.sinh(np.pi * (1. - 2. * (y + pixels) / n_tiles))))
+
+    return lons, lats # _tile_lonlat
+
+#*********************************************************
+def _encode_tile(rgba):
+    '''
+    Encode an RGBA tile as PNG
+
+    :param array rgba: uint8 array (TILE_SIZE x TILE_SIZE x 4)
+
+    :returns: PNG bytes
+    '''
+
+    buf = io.BytesIO()
+    mpl.image.imsave(buf, rgba, format="png")
+
+    return buf.getvalue() # _encode_tile
+
+#*********************************************************
+def _render_tiles(job):
+    '''
+    Colour a batch of tiles, and encode those which have changed - run in
+    the worker processes, so the grid is sent once per batch
+
+    :param tuple job: cell_colours (colour index per cell, plus an extra row
+                      and column of the transparent colour for pixels off the grid),
+                      colours (RGBA uint8), lat_edges, lon_edges (increasing),
+                      tiles [(zoom, x, y)] and old_hashes {name : hash}
+
+    :returns: list of (name, hash, PNG bytes or None if unchanged)
+    '''
+
+    cell_colours, colours, lat_edges, lon_edges, tiles, old_hashes = job
+
+    rendered = []
+    for zoom, x, y in tiles:
+        lons, lats = _tile_lonlat(zoom, x, y)
+
+        rows = np.searchsorted(lat_edges, lats, side="right") - 1
+        rows[(rows < 0) | (rows >= lat_edges.shape[0] - 1)] = -1
+        columns = np.searchsorted(lon_edges - lon_edges[0], (lons - lon_edges[0]) % 360., side="right") - 1
+        columns[columns >= lon_edges.shape[0] - 1] = -1
+
+        rgba = colours[cell_colours[rows[:, np.newaxis], columns[np.newaxis, :]]]
+
+        name = "{}/{}/{}.png".format(zoom, x, y)
+        tile_hash = hashlib.sha1(rgba.tobytes()).hexdigest()
+        if old_hashes.get(name) == tile_hash:
+            rendered += [(name, tile_hash, None)]
+        else:
+            rendered += [(name, tile_hash, _encode_tile(rgba))]
+
+    return rendered # _render_tiles
+
+#*********************************************************
+TILE_POOL = {}
+
+def get_tile_pool(processes=None):
+    '''
+    Worker pool for tiling, created on first use and reused for every map
+
+    :param int processes: number of worker processes (default all CPUs)
+
+    :returns: multiprocessing.Pool
+    '''
+
+    if processes not in TILE_POOL:
+        pool = multiprocessing.Pool(processes)
+        TILE_POOL[processes] = pool
+        atexit.register(pool.terminate)
+
+    return TILE_POOL[processes] # get_tile_pool
+
+#*********************************************************
+@profiled("save")
+def write_map_tiles(outname, cube, cmap, bounds, max_zoom=4, processes=None, pool=None):
+    '''
+    Render a cube as a Web-Mercator tile pyramid, stored in a single zip archive
+
+    Tiles are "z/x/y.png" (zoom 0 to max_zoom), with "index.json" holding a
+    hash of the input (data, grid, colours and zoom) and of each tile.  If the
+    input is unchanged since the last run nothing is done.  Otherwise the
+    tiles are coloured and encoded in parallel, with tiles whose pixels are
+    unchanged copied from the existing archive.
+
+    :param str outname: output filename root (".tiles.zip" appended)
+    :param obj cube: 2-D iris cube with latitude and longitude
+    :param obj cmap: colourmap to use
+    :param array bounds: bounds for discrete colormap
+    :param int max_zoom: deepest zoom level
+    :param int processes: number of worker processes (default all CPUs)
+    :param obj pool: multiprocessing.Pool to use (default from get_tile_pool)
+
+    :returns: number of tiles encoded
+    '''
+
+    # data in latitude, longitude order, latitudes increasing
+    data = np.ma.asarray(cube.data)
+    if cube.coord_dims('latitude')[0] > cube.coord_dims('longitude')[0]:
+        data = data.T
+    lat_edges = _cell_edges(cube.coord('latitude'))
+    if lat_edges[0] > lat_edges[-1]:
+        lat_edges, data = lat_edges[::-1], data[::-1]
+    lon_edges = _cell_edges(cube.coord('longitude'))
+    if lon_edges[0] > lon_edges[-1]:
+        lon_edges, data = lon_edges[::-1], data[:, ::-1]
+
+    colours = np.concatenate((cmap(np.arange(cmap.N), bytes=True), np.zeros((1, 4), dtype=np.uint8)))
+
+    # everything the tiles depend on
+    source = hashlib.sha1()
+    for item in (np.ma.getdata(data), np.ma.getmaskarray(data), lat_edges, lon_edges, colours, \
+                     np.asarray(bounds, dtype=np.float64), np.array([max_zoom, TILE_SIZE])):
+        source.update(np.ascontiguousarray(item).tobytes())
+    source = source.hexdigest()
+
+    filename = outname + ".tiles.zip"
+
+    # hashes from the last run
+    old_index = {}
+    if os.path.exists(filename):
+        with zipfile.ZipFile(filename, "r") as old_archive:
+            old_index = json.loads(old_archive.read("index.json"))
+        if old_index.get("source") == source:
+            print("{}: unchanged".format(filename))
+            return 0
+    # (earlier archives hold only the tile hashes)
+    old_hashes = old_index.get("tiles", old_index)
+
+    # colour index of each cell, with a transparent colour for masked cells
+    # and an extra row and column of it for pixels off the grid
+    norm = mpl.cm.colors.BoundaryNorm(bounds, cmap.N)
+    cell_colours = np.full((data.shape[0] + 1, data.shape[1] + 1), cmap.N)
+    cell_colours[:-1, :-1] = np.ma.filled(np.clip(norm(data), 0, cmap.N - 1), cmap.N)
+
+    # colour and encode in batches, one grid sent per batch
+    tiles = [(zoom, x, y) for zoom in range(max_zoom + 1) for x in range(2**zoom) for y in range(2**zoom)]
+    if pool is None:
+        pool = get_tile_pool(processes)
+    n_batches = min(len(tiles), 4 * (processes or multiprocessing.cpu_count()))
+    jobs = [(cell_colours, colours, lat_edges, lon_edges, tiles[b::n_batches], old_hashes) for b in range(n_batches)]
+
+    index, encoded = {}, {}
+    for batch in pool.map(_render_tiles, jobs):
+        for name, tile_hash, png in batch:
+            index[name] = tile_hash
+            if png is not None:
+                encoded[name] = png
+
+    # PNGs are already compressed, so store
+    with zipfile.ZipFile(filename + ".tmp", "w", zipfile.ZIP_STORED) as archive:
+        old_archive = zipfile.ZipFile(filename, "r") if len(encoded) < len(index) else None
+        for name in sorted(index, key=lambda n: [int(i) for i in n[:-4].split("/")]):
+            if name in encoded:
+                archive.writestr(name, encoded[name])
+            else:
+                archive.writestr(name, old_archive.read(name))
+        archive.writestr("index.json", json.dumps({"source" : source, "tiles" : index}))
+        if old_archive is not None:
+            old_archive.close()
+
+    os.replace(filename + ".tmp", filename)
+
+    print("{}: {} of {} tiles rendered".format(filename, len(encoded), len(index)))
+
+    return len(encoded) # write_map_tiles
@@ -80,22 +80,21 @@ def read_australia(filename, start_year = 1979, mean_then_clim=True):
 
 
     years = np.arange(start_year, int(settings.YEAR) + 1, 1)
-    clim_start, = np.where(years == CLIMSTART)
-    clim_end, = np.where(years == 2010+1)
 
     # two methods of calculating regional anomalies
     if mean_then_clim:
         # take mean of all station series to form regional actuals
         # then subtract climatology taken from regional mean series
         mean_timeseries = np.mean(all_timeseries, axis=0)
-        anomalies = mean_timeseries - (np.mean(mean_timeseries[clim_start[0] : clim_end[0]]))
+        clim = utils.get_climatology(years, mean_timeseries, CLIMSTART, 2010)
+        anomalies = utils.apply_climatology(years, mean_timeseries, clim)
 
     else:
         # calculate climatology for each station, get anomalies for each station
         # then calculate the mean
-        clims = np.mean(all_timeseries[:, clim_start : clim_end], axis=1)
-        all_anomalies = all_timeseries - np.tile(clims, (all_timeseries.shape[1], 1)).transpose()
-        anomalies = np.mean(all_anomalies, axis=0)
+        clims = utils.get_climatology(years, all_timeseries.T, CLIMSTART, 2010)
+        all_anomalies = utils.apply_climatology(years, all_timeseries.T, clims)
+        anomalies = np.ma.mean(all_anomalies, axis=1)
 
     return  aus_lat, aus_lon, np.ma.array(aus_anom_8110, mask=np.zeros(len(aus_anom_8110))), \
         np.ma.array(aus_trend_79_pres, mask=np.zeros(len(aus_trend_79_pres))), \
@@ -420,7 +419,7 @@ def run_all_plots():
             ax.yaxis.set_ticks_position('left')
 
 
-        plt.savefig(settings.IMAGELOC+"WND_land_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"WND_land_ts{}".format(settings.OUTFMT))
         plt.close()
 
     #************************************************************************
@@ -601,7 +600,7 @@ def run_all_plots():
 
         fig.subplots_adjust(right=0.95, top=0.95, hspace=0.001)
 
-        plt.savefig(settings.IMAGELOC+"WND_ocean_ts{}".format(settings.OUTFMT))
+        utils.save_figure(settings.IMAGELOC+"WND_ocean_ts{}".format(settings.OUTFMT))
 
         plt.close()
 
@@ -633,6 +632,8 @@ def run_all_plots():
                                        "Trend from {}-{} (m s".format(TRENDSTART, settings.YEAR)+r'$^{-1}$'+" decade"+r'$^{-1}$)', 
                                    scatter=(lons, lats, trend))
 
+    utils.close_map_templates()
+
     return # run_all_plots
 
 #************************************************************************